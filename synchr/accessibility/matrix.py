@@ -0,0 +1,117 @@
+"""
+accessibility/matrix.py
+
+This module is used to resolve the default accessibility of every employee
+at once. The enabled accessibility of each feature gets a bit, every granted
+employee gets the bits of the features granted to them, and the matrix is
+cached until an accessibility or its employees change, so checking a
+feature is a dictionary lookup and a bit test.
+"""
+
+from django.core.cache import cache
+
+from accessibility.models import DefaultAccessibility
+from horilla.cache_versions import bump_version, get_version
+from horilla.horilla_middlewares import _thread_locals
+
+ACCESSIBILITY_MATRIX_VERSION_KEY = "accessibility_matrix_version"
+ACCESSIBILITY_MATRIX_KEY = "accessibility_matrix"
+ACCESSIBILITY_MATRIX_TIMEOUT = 60 * 60 * 24
+
+# Matrices built or loaded by this process, by version
+_matrices = {}
+
+
+class AccessibilityMatrix:
+    """
+    Employee to feature bitset of the default accessibilities
+
+    Attributes:
+        features: bit of every feature with an enabled accessibility
+        excluded: bits of the features excluded for everyone
+        employees: bits of the features granted to each employee id
+    """
+
+    def __init__(self, features=None, excluded=0, employees=None):
+        self.features = features or {}
+        self.excluded = excluded
+        self.employees = employees or {}
+
+    @classmethod
+    def build(cls):
+        """
+        Build the matrix of every employee with two queries
+        """
+        features = {}
+        excluded = 0
+        rule_bits = {}
+        # The first enabled accessibility of a feature is the one applied
+        for rule_id, feature, exclude_all in (
+            DefaultAccessibility.objects.filter(is_enabled=True)
+            .order_by("pk")
+            .values_list("id", "feature", "exclude_all")
+        ):
+            if feature in features:
+                continue
+            bit = 1 << len(features)
+            features[feature] = bit
+            if exclude_all:
+                excluded |= bit
+            else:
+                rule_bits[rule_id] = bit
+
+        employees = {}
+        grants = DefaultAccessibility.employees.through.objects.filter(
+            defaultaccessibility_id__in=rule_bits
+        ).values_list("defaultaccessibility_id", "employee_id")
+        for rule_id, employee_id in grants:
+            employees[employee_id] = employees.get(employee_id, 0) | rule_bits[rule_id]
+        return cls(features, excluded, employees)
+
+    def is_accessible(self, feature, employee):
+        """
+        Check the feature is accessible for the employee, the features
+        without an enabled accessibility are accessible for everyone
+        """
+        if not employee:
+            return False
+        bit = self.features.get(feature)
+        if bit is None:
+            return True
+        if self.excluded & bit:
+            return False
+        employee_id = getattr(employee, "pk", employee)
+        return bool(self.employees.get(employee_id, 0) & bit)
+
+
+def invalidate_accessibility_matrix():
+    """
+    Rebuild the accessibility matrix on its next use
+    """
+    bump_version(ACCESSIBILITY_MATRIX_VERSION_KEY)
+
+
+def get_accessibility_matrix():
+    """
+    This method is used to return the current accessibility matrix, it is
+    resolved once per request and built once per version
+    """
+    request = getattr(_thread_locals, "request", None)
+    matrix = getattr(request, "accessibility_matrix", None)
+    if matrix is not None:
+        return matrix
+
+    version = get_version(ACCESSIBILITY_MATRIX_VERSION_KEY)
+    matrix = _matrices.get(version)
+    if matrix is None:
+        key = f"{ACCESSIBILITY_MATRIX_KEY}_v{version}"
+        matrix = cache.get(key)
+        if matrix is None:
+            matrix = AccessibilityMatrix.build()
+            cache.set(key, matrix, timeout=ACCESSIBILITY_MATRIX_TIMEOUT)
+        # Only the current version is kept in the process
+        _matrices.clear()
+        _matrices[version] = matrix
+    if request is not None:
+        request.accessibility_matrix = matrix
+    return matrix
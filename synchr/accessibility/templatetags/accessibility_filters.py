@@ -14,6 +14,4 @@ def feature_is_accessible(feature, request):
     """
     template
     """
-    return check_is_accessible(
-        feature, request.session.session_key, request.user.employee_get
-    )
+    return check_is_accessible(feature, employee=request.user.employee_get)
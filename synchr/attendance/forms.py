@@ -988,7 +988,8 @@ def get_date_list(employee_id, from_date, to_date):
     """
     This method will return a list of company working dates
     """
-    working_dates = get_working_days(from_date, to_date)
+    company = employee_id.get_company() if employee_id else None
+    working_dates = get_working_days(from_date, to_date, company)
     working_date_list = working_dates["working_days_on"]
     working_date_list.sort()
     attendance_dates = []
@@ -42,10 +42,18 @@ class Command(BaseCommand):
         ).select_related('employee_id', 'shift_id')
         
         fixed_count = 0
+        # Leave dates by company and month
+        leave_dates_cache = {}
         
         for work_record in work_records:
             # Get leave dates for the month
-            leave_dates = monthly_leave_days(work_record.date.month, work_record.date.year)
+            company = work_record.employee_id.get_company()
+            key = (company, work_record.date.month, work_record.date.year)
+            if key not in leave_dates_cache:
+                leave_dates_cache[key] = monthly_leave_days(
+                    work_record.date.month, work_record.date.year, company
+                )
+            leave_dates = leave_dates_cache[key]
             
             # Check if employee has attendance for this date
             has_attendance = Attendance.objects.filter(
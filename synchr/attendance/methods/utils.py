@@ -5,7 +5,7 @@ This module is used write custom methods
 """
 
 import calendar
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
 
 import pandas as pd
 from django.core.exceptions import ValidationError
@@ -16,7 +16,8 @@ from django.http import HttpResponse
 from django.utils.translation import gettext_lazy as _
 
 from base.methods import get_pagination
-from base.models import WEEK_DAYS, CompanyLeaves, Holidays
+from base.models import WEEK_DAYS, CompanyLeaves
+from base.non_working_days import NonWorkingDays
 from employee.models import Employee
 from horilla.horilla_settings import HORILLA_DATE_FORMATS, HORILLA_TIME_FORMATS
 
@@ -387,35 +388,16 @@ def get_employee_last_name(attendance):
     return ""
 
 
-def attendance_day_checking(attendance_date, minimum_hour):
+def attendance_day_checking(attendance_date, minimum_hour, company=None):
     # Convert the string to a datetime object
     attendance_datetime = datetime.strptime(attendance_date, "%Y-%m-%d")
 
     # Extract name of the day
     attendance_day = attendance_datetime.strftime("%A")
 
-    # Taking all holidays into a list
-    leaves = []
-    holidays = Holidays.objects.all()
-    for holi in holidays:
-        start_date = holi.start_date
-        end_date = holi.end_date
-
-        # Convert start_date and end_date to datetime objects
-        start_date = datetime.strptime(str(start_date), "%Y-%m-%d")
-        end_date = datetime.strptime(str(end_date), "%Y-%m-%d")
-
-        # Add dates in between start date and end date including both
-        current_date = start_date
-        while current_date <= end_date:
-            leaves.append(current_date.strftime("%Y-%m-%d"))
-            current_date += timedelta(days=1)
-
-    # Checking attendance date is in holiday list, if found making the minimum hour to 00:00
-    for leave in leaves:
-        if str(leave) == str(attendance_date):
-            minimum_hour = "00:00"
-            break
+    # Checking attendance date is a holiday, if found making the minimum hour to 00:00
+    if NonWorkingDays(company).is_holiday(attendance_datetime.date()):
+        minimum_hour = "00:00"
 
     # Making a dictonary contains week day value and leave day pairs
     company_leaves = {}
@@ -452,43 +434,20 @@ def paginator_qry(qryset, page_number):
     return qryset
 
 
-def monthly_leave_days(month, year):
-    leave_dates = []
-    holidays = Holidays.objects.filter(start_date__month=month, start_date__year=year)
-    leave_dates += list(holidays.values_list("start_date", flat=True))
-
-    company_leaves = CompanyLeaves.objects.all()
-    for company_leave in company_leaves:
-        year = year
-        month = month
-        based_on_week = company_leave.based_on_week
-        based_on_week_day = company_leave.based_on_week_day
-        if based_on_week != None:
-            calendar.setfirstweekday(6)
-            month_calendar = calendar.monthcalendar(year, month)
-            weeks = month_calendar[int(based_on_week)]
-            weekdays_in_weeks = [day for day in weeks if day != 0]
-            for day in weekdays_in_weeks:
-                date_name = datetime.strptime(
-                    f"{year}-{month:02}-{day:02}", "%Y-%m-%d"
-                ).date()
-                if (
-                    date_name.weekday() == int(based_on_week_day)
-                    and date_name not in leave_dates
-                ):
-                    leave_dates.append(date_name)
-        else:
-            calendar.setfirstweekday(0)
-            month_calendar = calendar.monthcalendar(year, month)
-            for week in month_calendar:
-                if week[int(based_on_week_day)] != 0:
-                    date_name = datetime.strptime(
-                        f"{year}-{month:02}-{week[int(based_on_week_day)]:02}",
-                        "%Y-%m-%d",
-                    ).date()
-                    if date_name not in leave_dates:
-                        leave_dates.append(date_name)
-    return leave_dates
+def monthly_leave_days(month, year, company=None):
+    """
+    This method is used to return the holiday and company leave dates of the
+    month, of the company or the selected company
+    """
+    non_working_days = NonWorkingDays(company)
+    month_start = date(year, month, 1)
+    month_end = date(year, month, calendar.monthrange(year, month)[1])
+    return sorted(
+        set(
+            non_working_days.holidays(month_start, month_end)
+            + non_working_days.company_leaves(month_start, month_end)
+        )
+    )
 
 
 def validate_time_in_minutes(value):
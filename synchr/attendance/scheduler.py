@@ -20,8 +20,8 @@ def create_work_record():
     employees = Employee.objects.exclude(id__in=work_records)
     records_to_create = []
     
-    # Get leave dates for the current month
-    leave_dates = monthly_leave_days(date.month, date.year)
+    # Leave dates of the current month, by company of the employees
+    leave_dates = {}
 
     for employee in employees:
         try:
@@ -38,7 +38,12 @@ def create_work_record():
             ).exists()
             
             # Check if it's a holiday/leave day
-            is_holiday = date in leave_dates
+            company = employee.get_company()
+            if company not in leave_dates:
+                leave_dates[company] = monthly_leave_days(
+                    date.month, date.year, company
+                )
+            is_holiday = date in leave_dates[company]
             
             # Determine work record type
             if is_holiday:
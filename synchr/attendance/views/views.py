@@ -1595,7 +1595,15 @@ def update_fields_based_shift(request):
     else:
         worked_hour = minimum_hour
 
-    minimum_hour = attendance_day_checking(str(attendance_date), minimum_hour)
+    minimum_hour = attendance_day_checking(
+        str(attendance_date),
+        minimum_hour,
+        (
+            employee_queryset.get_company()
+            if isinstance(employee_queryset, Employee)
+            else None
+        ),
+    )
 
     initial_data = {
         "work_type_id": WorkType.find(request.GET.get("work_type_id")),
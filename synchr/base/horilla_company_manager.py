@@ -53,12 +53,11 @@ class HorillaCompanyManager(models.Manager):
         selected_company = None
         if request is not None:
             selected_company = request.session.get("selected_company")
+        if selected_company == "all" or not selected_company:
+            # Without the company filter there are no joins to duplicate rows
+            return queryset
         try:
-            queryset = (
-                queryset.filter(self.model.company_filter)
-                if selected_company != "all" and selected_company
-                else queryset
-            )
+            queryset = queryset.filter(self.model.company_filter)
         except Exception as e:
             logger.error(e)
         try:
@@ -69,6 +68,17 @@ class HorillaCompanyManager(models.Manager):
             pass
         return queryset
 
+    @staticmethod
+    def _active_employees(queryset):
+        active = queryset.filter(is_active=True)
+        if queryset._result_cache is not None:
+            # Employees loaded by prefetch_related are filtered in memory
+            active._result_cache = [
+                employee for employee in queryset._result_cache if employee.is_active
+            ]
+            active._prefetch_done = queryset._prefetch_done
+        return active
+
     def all(self):
         """
         Override the all() method
@@ -82,7 +92,7 @@ class HorillaCompanyManager(models.Manager):
                     if model_name == "employee":
                         request = getattr(_thread_locals, "request", None)
                         if not getattr(request, "is_filtering", None):
-                            queryset = queryset.filter(is_active=True)
+                            queryset = self._active_employees(queryset)
                     else:
                         for field in queryset.model._meta.fields:
                             if isinstance(field, models.ForeignKey):
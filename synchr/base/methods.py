@@ -22,6 +22,8 @@ from django.template.loader import render_to_string
 from django.utils.translation import gettext as _
 
 from base.models import Company, CompanyLeaves, DynamicPagination, Holidays
+from base.non_working_days import NonWorkingDays
+from employee.methods.hierarchy import subordinate_ids
 from employee.models import Employee, EmployeeWorkInformation
 from horilla.horilla_apps import NESTED_SUBORDINATE_VISIBILITY
 from horilla.horilla_middlewares import _thread_locals
@@ -49,32 +51,10 @@ def filtersubordinates(request, queryset, perm=None, field="employee_id"):
     if not request:
         return queryset
     if NESTED_SUBORDINATE_VISIBILITY:
-        current_managers = [
-            request.user.employee_get.id,
-        ]
-        all_subordinates = Q(
-            **{
-                f"{field}__employee_work_info__reporting_manager_id__in": current_managers
-            }
+        return queryset.filter(
+            **{f"{field}__in": subordinate_ids(request.user.employee_get.id)}
         )
 
-        while True:
-            sub_managers = queryset.filter(
-                **{
-                    f"{field}__employee_work_info__reporting_manager_id__in": current_managers
-                }
-            ).values_list(f"{field}__id", flat=True)
-            if not sub_managers.exists():
-                break
-            current_managers = sub_managers
-            all_subordinates |= Q(
-                **{
-                    f"{field}__employee_work_info__reporting_manager_id__in": sub_managers
-                }
-            )
-
-        return queryset.filter(all_subordinates)
-
     manager = Employee.objects.filter(employee_user_id=user).first()
 
     if field:
@@ -124,30 +104,7 @@ def filtersubordinatesemployeemodel(request, queryset, perm=None):
         return queryset
 
     if NESTED_SUBORDINATE_VISIBILITY:
-        # Initialize the set of subordinates with the current manager(s)
-        current_managers = [
-            request.user.employee_get.id,
-        ]
-        all_subordinates = Q(
-            employee_work_info__reporting_manager_id__in=current_managers
-        )
-
-        # Iteratively find subordinates in the chain
-        while True:
-            sub_managers = queryset.filter(
-                employee_work_info__reporting_manager_id__in=current_managers
-            ).values_list("id", flat=True)
-
-            if not sub_managers.exists():
-                break
-
-            current_managers = sub_managers
-            all_subordinates |= Q(
-                employee_work_info__reporting_manager_id__in=sub_managers
-            )
-
-        # Apply the filter to the queryset
-        return queryset.filter(all_subordinates).distinct()
+        return queryset.filter(id__in=subordinate_ids(request.user.employee_get.id))
 
     manager = Employee.objects.filter(employee_user_id=user).first()
     queryset = queryset.filter(employee_work_info__reporting_manager_id=manager)
@@ -834,83 +791,42 @@ def get_date_range(start_date, end_date):
     return date_list
 
 
-def get_holiday_dates(range_start: date, range_end: date) -> list:
+def get_holiday_dates(range_start: date, range_end: date, company=None) -> list:
     """
-    :return: this functions returns a list of all holiday dates.
+    :return: this functions returns a list of the holiday dates in the range,
+    of the company or the selected company.
     """
-    pay_range_dates = get_date_range(start_date=range_start, end_date=range_end)
-    query = Q()
-    for check_date in pay_range_dates:
-        query |= Q(start_date__lte=check_date, end_date__gte=check_date)
-    holidays = Holidays.objects.filter(query)
-    holiday_dates = set([])
-    for holiday in holidays:
-        holiday_dates = holiday_dates | (
-            set(
-                get_date_range(start_date=holiday.start_date, end_date=holiday.end_date)
-            )
-        )
-    return list(set(holiday_dates))
+    return NonWorkingDays(company).holidays(range_start, range_end)
 
 
-def get_company_leave_dates(year):
+def get_company_leave_dates(year, company=None):
     """
-    :return: This function returns a list of all company leave dates
+    :return: This function returns a list of all company leave dates of the
+    company or the selected company
     """
-    company_leaves = CompanyLeaves.objects.all()
-    company_leave_dates = []
-    for company_leave in company_leaves:
-        based_on_week = company_leave.based_on_week
-        based_on_week_day = company_leave.based_on_week_day
-        for month in range(1, 13):
-            if based_on_week is not None:
-                # Set Sunday as the first day of the week
-                calendar.setfirstweekday(6)
-                month_calendar = calendar.monthcalendar(year, month)
-                weeks = month_calendar[int(based_on_week)]
-                weekdays_in_weeks = [day for day in weeks if day != 0]
-                for day in weekdays_in_weeks:
-                    leave_date = datetime.strptime(
-                        f"{year}-{month:02}-{day:02}", "%Y-%m-%d"
-                    ).date()
-                    if (
-                        leave_date.weekday() == int(based_on_week_day)
-                        and leave_date not in company_leave_dates
-                    ):
-                        company_leave_dates.append(leave_date)
-            else:
-                # Set Monday as the first day of the week
-                calendar.setfirstweekday(0)
-                month_calendar = calendar.monthcalendar(year, month)
-                for week in month_calendar:
-                    if week[int(based_on_week_day)] != 0:
-                        leave_date = datetime.strptime(
-                            f"{year}-{month:02}-{week[int(based_on_week_day)]:02}",
-                            "%Y-%m-%d",
-                        ).date()
-                        if leave_date not in company_leave_dates:
-                            company_leave_dates.append(leave_date)
-    return company_leave_dates
-
-
-def get_working_days(start_date, end_date):
+    return sorted(NonWorkingDays(company).year(year)["company_leaves"])
+
+
+def get_working_days(start_date, end_date, company=None):
     """
     This method is used to calculate the total working days, total leave, worked days on that period
 
     Args:
         start_date (_type_): the start date from the data needed
         end_date (_type_): the end date till the date needed
+        company (_type_): the company of the holidays and company leaves,
+            the selected company when not given
     """
 
-    holiday_dates = get_holiday_dates(start_date, end_date)
+    holiday_dates = get_holiday_dates(start_date, end_date, company)
 
     # appending company/holiday leaves
     # Note: Duplicate entry may exist
     company_leave_dates = (
         list(
             set(
-                get_company_leave_dates(start_date.year)
-                + get_company_leave_dates(end_date.year)
+                get_company_leave_dates(start_date.year, company)
+                + get_company_leave_dates(end_date.year, company)
             )
         )
         + holiday_dates
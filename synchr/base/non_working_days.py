@@ -0,0 +1,193 @@
+"""
+non_working_days.py
+
+This module is used to compute the holiday and company leave dates of a
+company for a year. The sets are cached per company and year and dropped
+whenever a holiday or company leave changes, so the leave, attendance and
+payroll calculations only test membership of the requested dates.
+"""
+
+import calendar
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from base.models import CompanyLeaves, Holidays
+from horilla.cache_versions import bump_version, get_version
+from horilla.horilla_middlewares import _thread_locals
+
+NON_WORKING_DAYS_VERSION_KEY = "non_working_days_version"
+NON_WORKING_DAYS_TIMEOUT = 60 * 60 * 24
+
+
+def get_date_range(start_date, end_date):
+    """
+    Returns the dates from the start date to the end date, both included
+    """
+    end_date = end_date or start_date
+    return [start_date + timedelta(i) for i in range((end_date - start_date).days + 1)]
+
+
+def selected_company_id():
+    """
+    Returns the company selected in the session of the request, None when
+    every company is selected or outside a request
+    """
+    request = getattr(_thread_locals, "request", None)
+    session = getattr(request, "session", None)
+    company_id = session.get("selected_company") if session is not None else None
+    if company_id in (None, "", "all"):
+        return None
+    return int(company_id)
+
+
+def _company_filter(company_id):
+    # Records without a company apply to every company
+    if company_id is None:
+        return Q()
+    return Q(company_id=company_id) | Q(company_id__isnull=True)
+
+
+def build_holiday_dates(year, company_id=None):
+    """
+    Returns the set of holiday dates of the year
+    """
+    year_start = date(year, 1, 1)
+    year_end = date(year, 12, 31)
+    holiday_dates = set()
+    for start_date, end_date in (
+        Holidays.objects.entire()
+        .filter(_company_filter(company_id), start_date__lte=year_end)
+        .filter(Q(end_date__gte=year_start) | Q(start_date__gte=year_start))
+        .values_list("start_date", "end_date")
+    ):
+        holiday_dates.update(
+            holiday_date
+            for holiday_date in get_date_range(start_date, end_date)
+            if holiday_date.year == year
+        )
+    return holiday_dates
+
+
+def build_company_leave_dates(year, company_id=None):
+    """
+    Returns the set of company leave dates of the year
+    """
+    # Weeks of a month start on Sunday for the week based company leaves,
+    # the calendars are local so the global first weekday is left alone
+    monday_calendar = calendar.Calendar(firstweekday=0)
+    sunday_calendar = calendar.Calendar(firstweekday=6)
+    company_leave_dates = set()
+    for based_on_week, based_on_week_day in (
+        CompanyLeaves.objects.entire()
+        .filter(_company_filter(company_id))
+        .values_list("based_on_week", "based_on_week_day")
+    ):
+        weekday = int(based_on_week_day)
+        for month in range(1, 13):
+            if based_on_week is None:
+                days = [
+                    day
+                    for week in monday_calendar.monthdayscalendar(year, month)
+                    for day in [week[weekday]]
+                    if day
+                ]
+            else:
+                weeks = sunday_calendar.monthdayscalendar(year, month)
+                if int(based_on_week) >= len(weeks):
+                    continue
+                days = [
+                    day
+                    for day in weeks[int(based_on_week)]
+                    if day and date(year, month, day).weekday() == weekday
+                ]
+            company_leave_dates.update(date(year, month, day) for day in days)
+    return company_leave_dates
+
+
+def invalidate_non_working_days():
+    """
+    Drop every cached non working day set
+    """
+    bump_version(NON_WORKING_DAYS_VERSION_KEY)
+
+
+class NonWorkingDays:
+    """
+    Snapshot of the holiday and company leave dates of a company, create one
+    per request or import and reuse it for every date that is checked
+
+    Args:
+        company_id: company or company id, the company selected in the
+            request when not given, the records of every company outside a
+            request
+    """
+
+    def __init__(self, company_id=None):
+        company_id = getattr(company_id, "pk", company_id)
+        self.company_id = (
+            company_id if company_id is not None else selected_company_id()
+        )
+        self.version = get_version(NON_WORKING_DAYS_VERSION_KEY)
+        self._years = {}
+
+    @classmethod
+    def for_employee(cls, employee):
+        """
+        Snapshot of the company of the employee
+        """
+        return cls(employee.get_company() if employee else None)
+
+    def year(self, year):
+        """
+        Returns the holiday and company leave date sets of the year
+        """
+        if year not in self._years:
+            key = f"non_working_days_{self.company_id or 'all'}_{year}_v{self.version}"
+            dates = cache.get(key)
+            if dates is None:
+                dates = {
+                    "holidays": build_holiday_dates(year, self.company_id),
+                    "company_leaves": build_company_leave_dates(year, self.company_id),
+                }
+                cache.set(key, dates, timeout=NON_WORKING_DAYS_TIMEOUT)
+            self._years[year] = dates
+        return self._years[year]
+
+    def is_holiday(self, check_date):
+        return check_date in self.year(check_date.year)["holidays"]
+
+    def is_company_leave(self, check_date):
+        return check_date in self.year(check_date.year)["company_leaves"]
+
+    def holidays(self, start_date, end_date):
+        """
+        Returns the holiday dates between the dates
+        """
+        return [
+            check_date
+            for check_date in get_date_range(start_date, end_date)
+            if self.is_holiday(check_date)
+        ]
+
+    def company_leaves(self, start_date, end_date):
+        """
+        Returns the company leave dates between the dates
+        """
+        return [
+            check_date
+            for check_date in get_date_range(start_date, end_date)
+            if self.is_company_leave(check_date)
+        ]
+
+    def count(self, start_date, end_date, holidays=True, company_leaves=True):
+        """
+        Returns the number of dates between the dates that are a holiday or a
+        company leave, a date that is both is counted once
+        """
+        return sum(
+            (holidays and self.is_holiday(check_date))
+            or (company_leaves and self.is_company_leave(check_date))
+            for check_date in get_date_range(start_date, end_date)
+        )
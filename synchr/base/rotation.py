@@ -0,0 +1,476 @@
+"""
+rotation.py
+
+This module is used to apply the rotating shifts, the rotating work types
+and the approved shift and work type requests of the day. Every run loads
+the due rows with their work information in a few queries, computes the
+changes in memory, writes the work informations and the rotation or
+request rows with bulk_update_with_history so the audit log is kept, and
+sends one notification to every employee it changed.
+"""
+
+import calendar
+import logging
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.urls import reverse
+from simple_history.utils import bulk_update_with_history
+
+from base.models import (
+    RotatingShiftAssign,
+    RotatingWorkTypeAssign,
+    ShiftRequest,
+    WorkTypeRequest,
+)
+from employee.models import EmployeeWorkInformation
+from notifications.signals import notify
+
+logger = logging.getLogger(__name__)
+
+ROTATION_BATCH_SIZE = 500
+BOT_USERNAME = "Horilla Bot"
+
+SHIFT_ROTATED = {
+    "verb": "Your shift has been changed.",
+    "verb_ar": "تم تغيير التحول الخاص بك.",
+    "verb_de": "Ihre Schicht wurde geändert.",
+    "verb_es": "Tu turno ha sido cambiado.",
+    "verb_fr": "Votre quart de travail a été modifié.",
+    "icon": "infinite",
+}
+WORK_TYPE_ROTATED = {
+    "verb": "Your Work Type has been changed.",
+    "verb_ar": "لقد تغير نوع عملك.",
+    "verb_de": "Ihre Art der Arbeit hat sich geändert.",
+    "verb_es": "Su tipo de trabajo ha sido cambiado.",
+    "verb_fr": "Votre type de travail a été modifié.",
+    "icon": "infinite",
+}
+SHIFT_SWITCHED = {
+    "verb": "Shift Changes notification",
+    "verb_ar": "التحول تغيير الإخطار",
+    "verb_de": "Benachrichtigung über Schichtänderungen",
+    "verb_es": "Notificación de cambios de turno",
+    "verb_fr": "Notification des changements de quart de travail",
+    "icon": "refresh",
+}
+SHIFT_UNDONE = {
+    "verb": "Shift changes notification, Requested date expired.",
+    "verb_ar": "التحول يغير الإخطار ، التاريخ المطلوب انتهت صلاحيته.",
+    "verb_de": "Benachrichtigung über Schichtänderungen, gewünschtes Datum abgelaufen.",
+    "verb_es": "Notificación de cambios de turno, Fecha solicitada vencida.",
+    "verb_fr": "Notification de changement d'équipe, la date demandée a expiré.",
+    "icon": "refresh",
+}
+WORK_TYPE_SWITCHED = {
+    "verb": "Work Type Changes notification",
+    "verb_ar": "إخطار تغييرات نوع العمل",
+    "verb_de": "Benachrichtigung über Änderungen des Arbeitstyps",
+    "verb_es": "Notificación de cambios de tipo de trabajo",
+    "verb_fr": "Notification de changement de type de travail",
+    "icon": "swap-horizontal",
+}
+WORK_TYPE_UNDONE = {
+    "verb": "Work type changes notification, Requested date expired.",
+    "verb_ar": "إعلام بتغيير نوع العمل ، انتهاء صلاحية التاريخ المطلوب.",
+    "verb_de": "Benachrichtigung über Änderungen des Arbeitstyps, angefordertes "
+    "Datum abgelaufen.",
+    "verb_es": "Notificación de cambios de tipo de trabajo, fecha solicitada vencida.",
+    "verb_fr": "Notification de changement de type de travail, la date demandée "
+    "a expiré.",
+    "icon": "swap-horizontal",
+}
+
+
+class Rotation:
+    """
+    The rotation of an assign model
+
+    Attributes:
+        assign_model: rotating assign model
+        rotation_field: foreign key of the assign to the rotation
+        first, second: first and second choices of the rotation
+        additional_key: additional_data key of the other choices
+        index_key: additional_data key of the index of the next choice
+        current, upcoming: current and next choice fields of the assign
+        work_info_field: work information field the rotation sets
+        message: notification of the rotated employees
+    """
+
+    def __init__(
+        self,
+        assign_model,
+        rotation_field,
+        first,
+        second,
+        additional_key,
+        index_key,
+        current,
+        upcoming,
+        work_info_field,
+        message,
+    ):
+        self.assign_model = assign_model
+        self.rotation_field = rotation_field
+        self.first = first
+        self.second = second
+        self.additional_key = additional_key
+        self.index_key = index_key
+        self.current = current
+        self.upcoming = upcoming
+        self.work_info_field = work_info_field
+        self.message = message
+
+    def choices(self, rotation):
+        """
+        Ids of the choices of the rotation in their order
+        """
+        additional = (rotation.additional_data or {}).get(self.additional_key) or []
+        return [
+            getattr(rotation, f"{self.first}_id"),
+            getattr(rotation, f"{self.second}_id"),
+        ] + self.additional_choices(additional)
+
+    @staticmethod
+    def additional_choices(additional):
+        return [int(choice) if choice else None for choice in additional]
+
+
+class WorkTypeRotation(Rotation):
+    @staticmethod
+    def additional_choices(additional):
+        # Empty work types are not part of the rotation
+        return [int(choice) for choice in additional if choice]
+
+
+SHIFT_ROTATION = Rotation(
+    RotatingShiftAssign,
+    "rotating_shift_id",
+    "shift1",
+    "shift2",
+    "additional_shifts",
+    "next_shift_index",
+    "current_shift",
+    "next_shift",
+    "shift_id",
+    SHIFT_ROTATED,
+)
+WORK_TYPE_ROTATION = WorkTypeRotation(
+    RotatingWorkTypeAssign,
+    "rotating_work_type_id",
+    "work_type1",
+    "work_type2",
+    "additional_work_types",
+    "next_work_type_index",
+    "current_work_type",
+    "next_work_type",
+    "work_type_id",
+    WORK_TYPE_ROTATED,
+)
+
+
+def get_bot():
+    """
+    The user the scheduled notifications are sent from
+    """
+    return User.objects.filter(username=BOT_USERNAME).first()
+
+
+def notify_employees(bot, user_ids, message):
+    """
+    Send one notification to the users of the changed employees
+    """
+    if bot is None or not user_ids:
+        return
+    notify.send(
+        bot,
+        recipient=list(User.objects.filter(pk__in=set(user_ids))),
+        redirect=reverse("employee-profile"),
+        **message,
+    )
+
+
+def add_months(day, months=1):
+    """
+    The day in the month months later, the last day of a shorter month
+    """
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def next_change_date(assign, today):
+    """
+    This method is used to return the next switch date of an assign that is
+    due today
+
+    Returns:
+        the date, None when the assign does not rotate today
+    """
+    if assign.next_change_date != today:
+        return None
+    if assign.based_on == "after":
+        return today + timedelta(days=assign.rotate_after_day or 0)
+    if assign.based_on == "weekly":
+        if today.strftime("%A").lower() == assign.rotate_every_weekend:
+            return today + timedelta(days=7)
+        return None
+    if assign.based_on == "monthly":
+        if assign.rotate_every == str(today.day):
+            return add_months(today)
+        if assign.rotate_every == "last":
+            next_month = add_months(today.replace(day=1))
+            return next_month.replace(
+                day=calendar.monthrange(next_month.year, next_month.month)[1]
+            )
+    return None
+
+
+def deactivate_replaced_assigns(assign_model, today):
+    """
+    Keep the latest started active assign of every employee and deactivate
+    the ones it replaced
+    """
+    latest = {}
+    replaced = []
+    for pk, employee_id in (
+        assign_model.objects.entire()
+        .filter(is_active=True, start_date__lte=today)
+        .order_by("start_date", "pk")
+        .values_list("pk", "employee_id")
+    ):
+        if employee_id in latest:
+            replaced.append(latest[employee_id])
+        latest[employee_id] = pk
+    if replaced:
+        assign_model.objects.entire().filter(pk__in=replaced).update(is_active=False)
+    return len(replaced)
+
+
+def work_informations(employee_ids):
+    """
+    Work information of the employees by employee id
+    """
+    return {
+        work_info.employee_id_id: work_info
+        for work_info in EmployeeWorkInformation.objects.entire()
+        .filter(employee_id__in=employee_ids)
+        .select_related("employee_id")
+    }
+
+
+def save_changes(model, objects, fields, work_infos, work_info_fields):
+    """
+    Write the changed rows and work informations in one transaction
+    """
+    with transaction.atomic():
+        if objects:
+            bulk_update_with_history(
+                objects,
+                model,
+                fields,
+                batch_size=ROTATION_BATCH_SIZE,
+                manager=model.objects,
+            )
+        if work_infos:
+            bulk_update_with_history(
+                work_infos,
+                EmployeeWorkInformation,
+                work_info_fields,
+                batch_size=ROTATION_BATCH_SIZE,
+                manager=EmployeeWorkInformation.objects,
+            )
+
+
+def apply_rotation(rotation, today=None):
+    """
+    This method is used to rotate the shift or work type of every assign
+    that switches today
+
+    Returns:
+        the number of rotated assigns
+    """
+    today = today or date.today()
+    if rotation.assign_model is RotatingShiftAssign:
+        deactivate_replaced_assigns(rotation.assign_model, today)
+
+    assigns = list(
+        rotation.assign_model.objects.entire()
+        .filter(is_active=True, next_change_date=today)
+        .select_related(rotation.rotation_field)
+    )
+    due = []
+    for assign in assigns:
+        new_date = next_change_date(assign, today)
+        if new_date is not None:
+            due.append((assign, new_date))
+    if not due:
+        return 0
+
+    work_infos = work_informations([assign.employee_id_id for assign, _date in due])
+    changed_assigns = []
+    changed_work_infos = []
+    for assign, new_date in due:
+        work_info = work_infos.get(assign.employee_id_id)
+        if work_info is None:
+            logger.warning(
+                "Skipped the rotation of %s, the employee has no work information",
+                assign,
+            )
+            continue
+        choices = rotation.choices(getattr(assign, rotation.rotation_field))
+        additional_data = assign.additional_data or {}
+        index = additional_data.get(rotation.index_key) or 0
+        if index >= len(choices):
+            index = 0
+        upcoming = getattr(assign, f"{rotation.upcoming}_id")
+
+        setattr(work_info, f"{rotation.work_info_field}_id", upcoming)
+        setattr(assign, f"{rotation.current}_id", upcoming)
+        setattr(assign, f"{rotation.upcoming}_id", choices[index])
+        additional_data[rotation.index_key] = (index + 1) % len(choices)
+        assign.additional_data = additional_data
+        assign.next_change_date = new_date
+        changed_assigns.append(assign)
+        changed_work_infos.append(work_info)
+
+    save_changes(
+        rotation.assign_model,
+        changed_assigns,
+        [rotation.current, rotation.upcoming, "next_change_date", "additional_data"],
+        changed_work_infos,
+        [rotation.work_info_field],
+    )
+    notify_employees(
+        get_bot(),
+        [work_info.employee_id.employee_user_id_id for work_info in changed_work_infos],
+        rotation.message,
+    )
+    return len(changed_assigns)
+
+
+def apply_requests(
+    request_model, requests, work_info_field, value_field, request_fields, message
+):
+    """
+    Set the work information field of the employees of the requests to the
+    value of the request and mark the requests
+
+    Args:
+        requests: the requests in the order they are applied
+        value_field: request field whose value the work information gets
+        request_fields: request field to value of the handled requests
+    """
+    requests = list(requests.select_related("employee_id"))
+    if not requests:
+        return 0
+    work_infos = work_informations([request.employee_id_id for request in requests])
+    changed_work_infos = {}
+    for request in requests:
+        for field, value in request_fields.items():
+            setattr(request, field, value)
+        work_info = work_infos.get(request.employee_id_id)
+        if work_info is None:
+            continue
+        # The last request of an employee wins
+        setattr(
+            work_info, f"{work_info_field}_id", getattr(request, f"{value_field}_id")
+        )
+        changed_work_infos[work_info.pk] = work_info
+
+    save_changes(
+        request_model,
+        requests,
+        list(request_fields),
+        list(changed_work_infos.values()),
+        [work_info_field],
+    )
+    notify_employees(
+        get_bot(),
+        [request.employee_id.employee_user_id_id for request in requests],
+        message,
+    )
+    return len(requests)
+
+
+def switch_shifts(today=None):
+    """
+    Move the employees to the shift of their approved requests starting today
+    """
+    return apply_requests(
+        ShiftRequest,
+        ShiftRequest.objects.entire().filter(
+            canceled=False,
+            approved=True,
+            requested_date=today or date.today(),
+            shift_changed=False,
+        ),
+        "shift_id",
+        "shift_id",
+        {"approved": True, "shift_changed": True},
+        SHIFT_SWITCHED,
+    )
+
+
+def undo_shifts(today=None):
+    """
+    Move the employees back to their previous shift when the request ended
+    """
+    return apply_requests(
+        ShiftRequest,
+        ShiftRequest.objects.entire().filter(
+            canceled=False,
+            approved=True,
+            requested_till__lt=today or date.today(),
+            is_active=True,
+            shift_changed=True,
+        ),
+        "shift_id",
+        "previous_shift_id",
+        {"is_active": False},
+        SHIFT_UNDONE,
+    )
+
+
+def switch_work_types(today=None):
+    """
+    Move the employees to the work type of their approved requests starting
+    today
+    """
+    return apply_requests(
+        WorkTypeRequest,
+        WorkTypeRequest.objects.entire().filter(
+            canceled=False,
+            approved=True,
+            requested_date=today or date.today(),
+            work_type_changed=False,
+        ),
+        "work_type_id",
+        "work_type_id",
+        {"approved": True, "work_type_changed": True},
+        WORK_TYPE_SWITCHED,
+    )
+
+
+def undo_work_types(today=None):
+    """
+    Move the employees back to their previous work type when the request
+    ended
+    """
+    return apply_requests(
+        WorkTypeRequest,
+        WorkTypeRequest.objects.entire().filter(
+            canceled=False,
+            approved=True,
+            requested_till__lt=today or date.today(),
+            is_active=True,
+            work_type_changed=True,
+        ),
+        "work_type_id",
+        "previous_work_type_id",
+        {"is_active": False},
+        WORK_TYPE_UNDONE,
+    )
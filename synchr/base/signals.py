@@ -8,13 +8,15 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.signals import user_login_failed
 from django.db.models import Max, Q
-from django.db.models.signals import m2m_changed, post_migrate, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
 from django.http import Http404
 from django.shortcuts import redirect, render
 
-from base.models import Announcement, PenaltyAccounts
+from base.models import Announcement, CompanyLeaves, Holidays, PenaltyAccounts
+from base.non_working_days import invalidate_non_working_days
 from horilla.methods import get_horilla_model_class
+from horilla.signals import post_bulk_update
 
 
 @receiver(post_save, sender=PenaltyAccounts)
@@ -64,6 +66,7 @@ def create_deduction_cutleave_from_penalty(sender, instance, created, **kwargs):
                     0, (available.carryforward_days - unit)
                 )
 
+            available.set_ledger_entry("consumption", note="Penalty")
             available.save()
 
 
@@ -240,3 +243,16 @@ class Fail2BanMiddleware:
 
 
 settings.MIDDLEWARE.append("base.signals.Fail2BanMiddleware")
+
+
+@receiver(post_save, sender=Holidays)
+@receiver(post_delete, sender=Holidays)
+@receiver(post_bulk_update, sender=Holidays)
+@receiver(post_save, sender=CompanyLeaves)
+@receiver(post_delete, sender=CompanyLeaves)
+@receiver(post_bulk_update, sender=CompanyLeaves)
+def refresh_non_working_days(sender, **kwargs):
+    """
+    Drop the cached holiday and company leave dates when they change
+    """
+    invalidate_non_working_days()
@@ -5,3 +5,8 @@ class ChartBotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chart_bot'
     verbose_name = 'Chart Bot - AI HR Assistant'
+
+    def ready(self) -> None:
+        from chart_bot import scheduler, signals
+
+        return super().ready()
@@ -0,0 +1,107 @@
+"""
+Conversation Store - Append-only chat history for the Chart Bot
+
+Every turn appends its messages to ChatMessage and only the last messages
+of the session are read back for the prompt context, so the work per turn
+does not grow with the length of the conversation.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import ChatMessage, ChatSession
+
+logger = logging.getLogger(__name__)
+
+# The agent calls the bot replies "assistant", ChatMessage calls them "bot"
+MESSAGE_TYPES = {"assistant": "bot"}
+ENTRY_TYPES = {"bot": "assistant"}
+
+
+class ConversationStore:
+    """
+    Chat history of one session of a user
+    """
+
+    def __init__(self, user, session_id: str):
+        self.user = user
+        session, _created = ChatSession.objects.entire().get_or_create(
+            session_id=session_id, defaults={"user": user}
+        )
+        if session.user_id != user.id:
+            # Never continue a session that belongs to someone else
+            session = ChatSession.objects.create(
+                user=user, session_id=str(uuid.uuid4())
+            )
+        self.session = session
+
+    @property
+    def session_id(self) -> str:
+        return self.session.session_id
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Last messages of the session, oldest first
+        """
+        messages = list(
+            ChatMessage.objects.entire()
+            .filter(session=self.session)
+            .order_by("-timestamp", "-id")[:limit]
+        )
+        messages.reverse()
+        return [
+            {
+                "type": ENTRY_TYPES.get(message.message_type, message.message_type),
+                "content": message.content,
+                "timestamp": message.timestamp.isoformat(),
+                "session_id": self.session_id,
+                **message.metadata,
+            }
+            for message in messages
+        ]
+
+    def append(self, entries: Iterable[Dict[str, Any]]):
+        """
+        Store the entries of a turn with a single insert
+        """
+        messages = []
+        for entry in entries:
+            entry = dict(entry)
+            message_type = entry.pop("type")
+            content = entry.pop("content")
+            entry.pop("timestamp", None)
+            entry.pop("session_id", None)
+            messages.append(
+                ChatMessage(
+                    session=self.session,
+                    message_type=MESSAGE_TYPES.get(message_type, message_type),
+                    content=content,
+                    metadata=entry,
+                )
+            )
+        ChatMessage.objects.bulk_create(messages)
+        ChatSession.objects.entire().filter(pk=self.session.pk).update(
+            updated_at=timezone.now()
+        )
+
+
+def cleanup_conversations(days: int = None) -> int:
+    """
+    Delete the sessions that have been idle for longer than the retention
+    period together with their messages, returns the number of sessions
+    """
+    if days is None:
+        days = getattr(settings, "CHART_BOT_HISTORY_RETENTION_DAYS", 30)
+    cutoff = timezone.now() - timedelta(days=days)
+    sessions = ChatSession.objects.entire().filter(updated_at__lt=cutoff)
+    session_ids = list(sessions.values_list("pk", flat=True))
+    if session_ids:
+        ChatMessage.objects.entire().filter(session_id__in=session_ids).delete()
+        ChatSession.objects.entire().filter(pk__in=session_ids).delete()
+        logger.info(f"Removed {len(session_ids)} idle Chart Bot sessions")
+    return len(session_ids)
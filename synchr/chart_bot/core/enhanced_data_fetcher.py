@@ -7,6 +7,8 @@ from typing import Dict, Any, Optional, List
 from django.contrib.auth.models import User
 from django.db.models import Q, Sum, Count, Avg
 
+from .fact_store import get_facts, payslip_facts
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +20,7 @@ class EnhancedDataFetcher:
     def __init__(self, user: User):
         self.user = user
         self.employee = self._get_employee()
+        self._fact_sheet = None
         logger.info(f"Enhanced Data Fetcher initialized for user: {user.username}")
     
     def _get_employee(self):
@@ -32,6 +35,14 @@ class EnhancedDataFetcher:
             logger.warning(f"Could not get employee record: {str(e)}")
             return None
     
+    def _get_facts(self):
+        """
+        Get the materialized fact sheet of the employee, read once per turn
+        """
+        if self._fact_sheet is None:
+            self._fact_sheet = get_facts(self.employee.id)
+        return self._fact_sheet
+    
     def get_personal_info(self) -> Dict[str, Any]:
         """
         Get personal information for the user
@@ -85,13 +96,16 @@ class EnhancedDataFetcher:
             if not self.employee:
                 return {"error": "No employee record found"}
             
-            # Default to current month if no dates provided
+            # The current month is served from the fact sheet
+            if not start_date and not end_date:
+                return self._get_facts().attendance
+            
             if not start_date:
                 start_date = date.today().replace(day=1)
             if not end_date:
                 end_date = date.today()
             
-            from attendance.models import Attendance, AttendanceActivity
+            from attendance.models import Attendance
             
             # Get attendance records
             attendance_records = Attendance.objects.filter(
@@ -112,7 +126,7 @@ class EnhancedDataFetcher:
                     "check_in": record.attendance_clock_in.strftime("%H:%M") if record.attendance_clock_in else "N/A",
                     "check_out": record.attendance_clock_out.strftime("%H:%M") if record.attendance_clock_out else "N/A",
                     "status": "Present" if record.attendance_validated else "Absent",
-                    "overtime_hours": getattr(record, 'overtime_hour', 0),
+                    "overtime_hours": record.attendance_overtime or "00:00",
                 })
             
             return {
@@ -136,41 +150,7 @@ class EnhancedDataFetcher:
             if not self.employee:
                 return {"error": "No employee record found"}
             
-            from leave.models import LeaveRequest, LeaveAllocation
-            
-            # Get leave allocations
-            allocations = LeaveAllocation.objects.filter(employee_id=self.employee)
-            leave_balance = {}
-            
-            for allocation in allocations:
-                leave_type = getattr(allocation.leave_type, 'name', 'Unknown')
-                leave_balance[leave_type] = {
-                    "allocated": getattr(allocation, 'allocated_days', 0),
-                    "used": getattr(allocation, 'used_days', 0),
-                    "remaining": getattr(allocation, 'remaining_days', 0),
-                }
-            
-            # Get recent leave requests
-            recent_requests = LeaveRequest.objects.filter(
-                employee_id=self.employee
-            ).order_by('-created_at')[:5]
-            
-            recent_leave_requests = []
-            for request in recent_requests:
-                recent_leave_requests.append({
-                    "leave_type": getattr(request.leave_type, 'name', 'Unknown'),
-                    "start_date": request.start_date.strftime("%Y-%m-%d"),
-                    "end_date": request.end_date.strftime("%Y-%m-%d"),
-                    "days": request.days,
-                    "status": getattr(request, 'status', 'Pending'),
-                    "reason": getattr(request, 'description', 'N/A'),
-                    "applied_date": request.created_at.strftime("%Y-%m-%d"),
-                })
-            
-            return {
-                "leave_balance": leave_balance,
-                "recent_requests": recent_leave_requests,
-            }
+            return self._get_facts().leave
             
         except Exception as e:
             logger.error(f"Error getting leave data: {str(e)}")
@@ -184,20 +164,21 @@ class EnhancedDataFetcher:
             if not self.employee:
                 return {"error": "No employee record found"}
             
-            # Default to current month/year
-            if not month:
-                month = date.today().month
-            if not year:
-                year = date.today().year
+            # The latest payslip is served from the fact sheet
+            latest = self._get_facts().payslip.get("latest")
+            if latest and (not month or month == latest["month"]) and (not year or year == latest["year"]):
+                return latest
+            
+            month = month or date.today().month
+            year = year or date.today().year
             
             from payroll.models.models import Payslip
             
-            # Get payslip for the specified month/year
             payslip = Payslip.objects.filter(
                 employee_id=self.employee,
-                month=month,
-                year=year
-            ).first()
+                start_date__month=month,
+                start_date__year=year
+            ).order_by('-start_date').first()
             
             if not payslip:
                 return {
@@ -206,26 +187,7 @@ class EnhancedDataFetcher:
                     "year": year
                 }
             
-            # Get basic salary from work information
-            basic_salary = 0
-            try:
-                from employee.models import EmployeeWorkInformation
-                work_info = EmployeeWorkInformation.objects.filter(employee_id=self.employee).first()
-                if work_info:
-                    basic_salary = getattr(work_info, 'basic_salary', 0)
-            except:
-                pass
-            
-            return {
-                "month": month,
-                "year": year,
-                "basic_salary": basic_salary,
-                "gross_salary": getattr(payslip, 'gross_salary', 0),
-                "net_salary": getattr(payslip, 'net_salary', 0),
-                "total_deductions": getattr(payslip, 'total_deductions', 0),
-                "total_allowances": getattr(payslip, 'total_allowances', 0),
-                "status": getattr(payslip, 'status', 'Unknown'),
-            }
+            return payslip_facts(payslip)
             
         except Exception as e:
             logger.error(f"Error getting payroll data: {str(e)}")
@@ -239,29 +201,7 @@ class EnhancedDataFetcher:
             if not self.employee:
                 return {"error": "No employee record found"}
             
-            from employee.models import EmployeeWorkInformation
-            
-            # Get subordinates
-            subordinates = EmployeeWorkInformation.objects.filter(
-                reporting_manager_id=self.employee
-            ).select_related('employee_id')
-            
-            team_members = []
-            for sub in subordinates:
-                employee = sub.employee_id
-                team_members.append({
-                    "employee_id": employee.id,
-                    "name": employee.get_full_name(),
-                    "email": getattr(employee, 'email', 'N/A'),
-                    "department": getattr(sub.department_id, 'department', 'N/A') if sub.department_id else 'N/A',
-                    "job_position": getattr(sub.job_position_id, 'job_position', 'N/A') if sub.job_position_id else 'N/A',
-                    "is_active": employee.is_active,
-                })
-            
-            return {
-                "team_size": len(team_members),
-                "team_members": team_members,
-            }
+            return self._get_facts().team
             
         except Exception as e:
             logger.error(f"Error getting team data: {str(e)}")
@@ -0,0 +1,265 @@
+"""
+Fact Store - Materialized per-employee HR facts for the Chart Bot
+
+Each section of EmployeeFactSheet is rebuilt when the attendance, leave,
+payroll or work information of the employee changes, so a chat turn reads
+the facts of the employee with a single query.
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, Optional
+
+from django.utils import timezone
+
+from ..models import EmployeeFactSheet
+
+logger = logging.getLogger(__name__)
+
+FACT_SECTIONS = ("attendance", "leave", "payslip", "team")
+
+
+def build_attendance_facts(
+    employee_id: int, today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Attendance summary of the current month
+    """
+    from attendance.models import Attendance
+
+    today = today or date.today()
+    start_date = today.replace(day=1)
+    records = Attendance.objects.entire().filter(
+        employee_id=employee_id,
+        attendance_date__range=[start_date, today],
+    )
+    total_days = (today - start_date).days + 1
+    present_days = records.filter(attendance_validated=True).count()
+
+    recent_attendance = []
+    for record in records.order_by("-attendance_date")[:10]:
+        recent_attendance.append(
+            {
+                "date": record.attendance_date.strftime("%Y-%m-%d"),
+                "check_in": (
+                    record.attendance_clock_in.strftime("%H:%M")
+                    if record.attendance_clock_in
+                    else "N/A"
+                ),
+                "check_out": (
+                    record.attendance_clock_out.strftime("%H:%M")
+                    if record.attendance_clock_out
+                    else "N/A"
+                ),
+                "status": "Present" if record.attendance_validated else "Absent",
+                "overtime_hours": record.attendance_overtime or "00:00",
+            }
+        )
+
+    return {
+        "as_of": today.isoformat(),
+        "period": f"{start_date.strftime('%Y-%m-%d')} to {today.strftime('%Y-%m-%d')}",
+        "total_days": total_days,
+        "present_days": present_days,
+        "absent_days": total_days - present_days,
+        "attendance_percentage": (
+            round((present_days / total_days) * 100, 2) if total_days > 0 else 0
+        ),
+        "recent_attendance": recent_attendance,
+    }
+
+
+def build_leave_facts(employee_id: int) -> Dict[str, Any]:
+    """
+    Leave balances per leave type and the latest leave requests
+    """
+    from leave.models import AvailableLeave, LeaveRequest
+
+    leave_balance = {}
+    for available_leave in (
+        AvailableLeave.objects.entire()
+        .filter(employee_id=employee_id)
+        .select_related("leave_type_id")
+    ):
+        leave_type = available_leave.leave_type_id
+        remaining = available_leave.available_days + available_leave.carryforward_days
+        used = available_leave.leave_taken_days
+        leave_balance[leave_type.name if leave_type else "Unknown"] = {
+            "allocated": used + remaining,
+            "used": used,
+            "remaining": remaining,
+        }
+
+    recent_requests = []
+    for request in (
+        LeaveRequest.objects.entire()
+        .filter(employee_id=employee_id)
+        .select_related("leave_type_id")
+        .order_by("-created_at")[:5]
+    ):
+        recent_requests.append(
+            {
+                "leave_type": (
+                    request.leave_type_id.name if request.leave_type_id else "Unknown"
+                ),
+                "start_date": request.start_date.strftime("%Y-%m-%d"),
+                "end_date": (
+                    request.end_date.strftime("%Y-%m-%d") if request.end_date else "N/A"
+                ),
+                "days": request.requested_days,
+                "status": request.get_status_display(),
+                "reason": request.description,
+                "applied_date": (
+                    request.created_at.strftime("%Y-%m-%d")
+                    if request.created_at
+                    else "N/A"
+                ),
+            }
+        )
+
+    return {
+        "leave_balance": leave_balance,
+        "recent_requests": recent_requests,
+    }
+
+
+def payslip_facts(payslip) -> Dict[str, Any]:
+    """
+    Payroll summary of a payslip
+    """
+    return {
+        "payslip_id": payslip.id,
+        "month": payslip.start_date.month,
+        "year": payslip.start_date.year,
+        "basic_salary": payslip.basic_pay or 0,
+        "gross_salary": payslip.gross_pay or 0,
+        "net_salary": payslip.net_pay or 0,
+        "total_deductions": payslip.deduction or 0,
+        "total_allowances": (payslip.gross_pay or 0) - (payslip.basic_pay or 0),
+        "status": payslip.get_status_display(),
+    }
+
+
+def build_payslip_facts(employee_id: int) -> Dict[str, Any]:
+    """
+    Summary of the latest payslip
+    """
+    from payroll.models.models import Payslip
+
+    payslip = (
+        Payslip.objects.entire()
+        .filter(employee_id=employee_id)
+        .order_by("-start_date", "-id")
+        .first()
+    )
+    return {"latest": payslip_facts(payslip) if payslip else None}
+
+
+def build_team_facts(employee_id: int) -> Dict[str, Any]:
+    """
+    Direct reports of the employee
+    """
+    from employee.models import EmployeeWorkInformation
+
+    team_members = []
+    for work_info in (
+        EmployeeWorkInformation.objects.entire()
+        .filter(reporting_manager_id=employee_id)
+        .select_related("employee_id", "department_id", "job_position_id")
+    ):
+        employee = work_info.employee_id
+        team_members.append(
+            {
+                "employee_id": employee.id,
+                "name": employee.get_full_name(),
+                "email": employee.email,
+                "department": (
+                    work_info.department_id.department
+                    if work_info.department_id
+                    else "N/A"
+                ),
+                "job_position": (
+                    work_info.job_position_id.job_position
+                    if work_info.job_position_id
+                    else "N/A"
+                ),
+                "is_active": employee.is_active,
+            }
+        )
+
+    return {
+        "team_size": len(team_members),
+        "team_members": team_members,
+    }
+
+
+FACT_BUILDERS = {
+    "attendance": build_attendance_facts,
+    "leave": build_leave_facts,
+    "payslip": build_payslip_facts,
+    "team": build_team_facts,
+}
+
+
+def refresh_facts(
+    employee_id: int, sections: Iterable[str] = FACT_SECTIONS
+) -> EmployeeFactSheet:
+    """
+    Rebuild the given sections of the employee fact sheet
+    """
+    values = {section: FACT_BUILDERS[section](employee_id) for section in sections}
+    fact_sheet, _created = EmployeeFactSheet.objects.update_or_create(
+        employee_id=employee_id, defaults=values
+    )
+    return fact_sheet
+
+
+def update_facts(employee_ids: Iterable[int], sections: Iterable[str]):
+    """
+    Rebuild the sections for the employees that already have a fact sheet,
+    the others get theirs built on their first chat
+    """
+    sections = list(sections)
+    for employee_id in EmployeeFactSheet.objects.filter(
+        employee_id__in={employee_id for employee_id in employee_ids if employee_id}
+    ).values_list("employee_id", flat=True):
+        values = {section: FACT_BUILDERS[section](employee_id) for section in sections}
+        EmployeeFactSheet.objects.filter(employee_id=employee_id).update(
+            updated_at=timezone.now(), **values
+        )
+
+
+def invalidate_facts(employee_ids: Iterable[int], sections: Iterable[str]):
+    """
+    Mark the sections stale for the employees, they are rebuilt on the next read
+    """
+    employee_ids = {employee_id for employee_id in employee_ids if employee_id}
+    if employee_ids:
+        EmployeeFactSheet.objects.filter(employee_id__in=employee_ids).update(
+            **{section: None for section in sections}
+        )
+
+
+def get_facts(employee_id: int) -> EmployeeFactSheet:
+    """
+    Read the fact sheet of the employee, rebuilding only the missing or
+    stale sections
+    """
+    fact_sheet = EmployeeFactSheet.objects.filter(employee_id=employee_id).first()
+    if fact_sheet is None:
+        return refresh_facts(employee_id)
+
+    stale = [
+        section for section in FACT_SECTIONS if getattr(fact_sheet, section) is None
+    ]
+    # The attendance summary covers the month up to today
+    if (
+        fact_sheet.attendance
+        and fact_sheet.attendance.get("as_of") != date.today().isoformat()
+    ):
+        stale.append("attendance")
+    if stale:
+        for section in stale:
+            setattr(fact_sheet, section, FACT_BUILDERS[section](employee_id))
+        fact_sheet.save(update_fields=stale + ["updated_at"])
+    return fact_sheet
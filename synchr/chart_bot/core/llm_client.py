@@ -2,11 +2,10 @@
 LLM Client for Chart Bot
 Handles communication with the custom LLM endpoint
 """
-import json
-import requests
 import logging
-from typing import Dict, Any, Optional
-from django.conf import settings
+from typing import Dict, Any, Iterator, Optional
+
+from .llm_gateway import LLMTimeout, LLMUnavailable, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +19,7 @@ class LLMClient:
         self.endpoint = endpoint
         self.model = model
         self.timeout = 30
+        self.gateway = get_llm_gateway(endpoint, model, self.timeout)
     
     def generate_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -36,36 +36,31 @@ class LLMClient:
             # Prepare the full prompt with context
             full_prompt = self._prepare_prompt(prompt, context)
             
-            payload = {
-                "model": self.model,
-                "prompt": full_prompt,
-                "stream": False
-            }
-            
-            response = requests.post(
-                self.endpoint,
-                json=payload,
-                timeout=self.timeout,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', 'Sorry, I could not generate a response.')
-            else:
-                logger.error(f"LLM API error: {response.status_code} - {response.text}")
-                return "Sorry, I'm having trouble connecting to the AI service right now."
+            response = self.gateway.generate(full_prompt)
+            return response or 'Sorry, I could not generate a response.'
                 
-        except requests.exceptions.Timeout:
+        except LLMTimeout:
             logger.error("LLM request timeout")
             return "Sorry, the request is taking too long. Please try again."
-        except requests.exceptions.RequestException as e:
+        except LLMUnavailable as e:
             logger.error(f"LLM request error: {str(e)}")
             return "Sorry, I'm having trouble connecting to the AI service right now."
         except Exception as e:
             logger.error(f"Unexpected error in LLM client: {str(e)}")
             return "Sorry, an unexpected error occurred. Please try again."
     
+    def stream_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Stream the response tokens from the LLM, raises LLMUnavailable on failure
+        """
+        return self.gateway.stream(self._prepare_prompt(prompt, context))
+    
+    def is_available(self) -> bool:
+        """
+        Check the cached health state of the LLM
+        """
+        return self.gateway.is_available()
+    
     def _prepare_prompt(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
         Prepare the full prompt with context and instructions
@@ -0,0 +1,368 @@
+"""
+Async LLM Gateway for Chart Bot
+Shares one pooled HTTP session per process, caches the model server health
+behind a circuit breaker, coalesces identical prompts and streams tokens
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+import aiohttp
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_ENDPOINT = "http://125.18.84.108:11434/api/generate"
+DEFAULT_LLM_MODEL = "mistral"
+
+_STREAM_DONE = object()
+
+
+class LLMUnavailable(Exception):
+    """
+    Raised when the model server is down or the circuit breaker is open
+    """
+
+
+class LLMTimeout(LLMUnavailable):
+    """
+    Raised when the model server does not answer in time
+    """
+
+
+class LLMBackend:
+    """
+    Base class for LLM backends, subclass it and point
+    CHART_BOT_LLM_BACKEND at the dotted path to plug in another model server
+    """
+
+    def __init__(self, endpoint: str, model: str):
+        self.endpoint = endpoint
+        self.model = model
+
+    async def generate(self, session: aiohttp.ClientSession, prompt: str) -> str:
+        raise NotImplementedError
+
+    async def stream(
+        self, session: aiohttp.ClientSession, prompt: str
+    ) -> AsyncIterator[str]:
+        # Backends without streaming support send the whole answer as one chunk
+        yield await self.generate(session, prompt)
+
+    async def health(self, session: aiohttp.ClientSession) -> bool:
+        raise NotImplementedError
+
+
+class OllamaBackend(LLMBackend):
+    """
+    Backend for the Ollama compatible /api/generate endpoint
+    """
+
+    async def generate(self, session: aiohttp.ClientSession, prompt: str) -> str:
+        payload = {"model": self.model, "prompt": prompt, "stream": False}
+        async with session.post(self.endpoint, json=payload) as response:
+            if response.status != 200:
+                text = await response.text()
+                raise LLMUnavailable(f"LLM API error: {response.status} - {text}")
+            result = await response.json(content_type=None)
+            return result.get("response", "")
+
+    async def stream(
+        self, session: aiohttp.ClientSession, prompt: str
+    ) -> AsyncIterator[str]:
+        payload = {"model": self.model, "prompt": prompt, "stream": True}
+        async with session.post(self.endpoint, json=payload) as response:
+            if response.status != 200:
+                text = await response.text()
+                raise LLMUnavailable(f"LLM API error: {response.status} - {text}")
+            # Ollama streams one JSON object per line
+            async for line in response.content:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+
+    async def health(self, session: aiohttp.ClientSession) -> bool:
+        tags_url = self.endpoint.replace("/generate", "/tags")
+        async with session.get(tags_url) as response:
+            return response.status == 200
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker whose state lives in the Django cache so every worker
+    sharing the cache backend sees the same view of the model server
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: int = 30,
+        health_ttl: int = 30,
+    ):
+        self.key = f"chart_bot_llm_breaker_{name}"
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.health_ttl = health_ttl
+
+    def is_open(self) -> bool:
+        return (cache.get(f"{self.key}_open_until") or 0) > time.time()
+
+    def needs_health_check(self) -> bool:
+        return (cache.get(f"{self.key}_checked") or 0) + self.health_ttl < time.time()
+
+    def record_success(self):
+        cache.set_many(
+            {
+                f"{self.key}_failures": 0,
+                f"{self.key}_open_until": 0,
+                f"{self.key}_checked": time.time(),
+            }
+        )
+
+    def record_failure(self):
+        # incr is atomic on the shared backends, so concurrent failures of
+        # several workers are all counted
+        failures_key = f"{self.key}_failures"
+        cache.add(failures_key, 0)
+        try:
+            failures = cache.incr(failures_key)
+        except ValueError:
+            cache.set(failures_key, 1)
+            failures = 1
+        cache.set(f"{self.key}_checked", time.time())
+        if failures >= self.failure_threshold:
+            cache.set(f"{self.key}_open_until", time.time() + self.reset_timeout)
+            logger.warning(
+                f"LLM circuit opened for {self.reset_timeout}s after "
+                f"{failures} failures"
+            )
+
+
+class LLMGateway:
+    """
+    Runs the LLM calls on a dedicated event loop thread so the sync Django
+    workers share one connection pool per process
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        timeout: int = 30,
+        pool_size: int = 20,
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.breaker = CircuitBreaker(
+            hashlib.md5(f"{backend.endpoint}|{backend.model}".encode()).hexdigest()
+        )
+        self._loop = None
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    # Event loop management
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        # A forked worker must not reuse the parent's loop thread
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._session = None
+                self._inflight = {}
+                self._pid = os.getpid()
+                thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="chart-bot-llm-gateway",
+                    daemon=True,
+                )
+                thread.start()
+        return self._loop
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size, keepalive_timeout=60
+                ),
+                # No total timeout, a long answer keeps streaming as long as
+                # the model server sends tokens within the read timeout
+                timeout=aiohttp.ClientTimeout(
+                    total=None, connect=self.timeout, sock_read=self.timeout
+                ),
+            )
+        return self._session
+
+    def _run(self, coroutine, timeout: Optional[float] = None):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())
+        try:
+            return future.result(timeout or self.timeout + 5)
+        except concurrent.futures.TimeoutError as e:
+            future.cancel()
+            raise LLMTimeout("LLM request timeout") from e
+
+    # Async API, runs on the gateway loop
+
+    async def _generate(self, prompt: str) -> str:
+        if self.breaker.is_open():
+            raise LLMUnavailable("LLM circuit is open")
+        try:
+            result = await self.backend.generate(self._get_session(), prompt)
+        except asyncio.TimeoutError as e:
+            self.breaker.record_failure()
+            raise LLMTimeout("LLM request timeout") from e
+        except (aiohttp.ClientError, LLMUnavailable) as e:
+            self.breaker.record_failure()
+            raise LLMUnavailable(str(e)) from e
+        self.breaker.record_success()
+        return result
+
+    async def _coalesced_generate(self, prompt: str) -> str:
+        # Identical prompts issued while one is in flight share its result
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._generate(prompt)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else is waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _stream(self, prompt: str) -> AsyncIterator[str]:
+        if self.breaker.is_open():
+            raise LLMUnavailable("LLM circuit is open")
+        try:
+            async for token in self.backend.stream(self._get_session(), prompt):
+                yield token
+        except asyncio.TimeoutError as e:
+            self.breaker.record_failure()
+            raise LLMTimeout("LLM request timeout") from e
+        except (aiohttp.ClientError, LLMUnavailable) as e:
+            self.breaker.record_failure()
+            raise LLMUnavailable(str(e)) from e
+        self.breaker.record_success()
+
+    async def _health(self) -> bool:
+        try:
+            healthy = await asyncio.wait_for(
+                self.backend.health(self._get_session()), timeout=5
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            healthy = False
+        if healthy:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        return healthy
+
+    # Sync API for the agents and views
+
+    def generate(self, prompt: str) -> str:
+        """
+        Generate a response, raises LLMUnavailable on failure
+        """
+        return self._run(self._coalesced_generate(prompt))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Yield the response tokens as the model produces them
+        """
+        tokens: queue.Queue = queue.Queue()
+        self._start_pump(prompt, tokens.put)
+        while True:
+            try:
+                item = tokens.get(timeout=self.timeout + 5)
+            except queue.Empty as e:
+                raise LLMTimeout("LLM request timeout") from e
+            if item is _STREAM_DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def _start_pump(self, prompt: str, put):
+        # Feed the tokens produced on the gateway loop to the caller's queue
+        async def pump():
+            try:
+                async for token in self._stream(prompt):
+                    put(token)
+            except Exception as e:
+                put(e)
+            finally:
+                put(_STREAM_DONE)
+
+        asyncio.run_coroutine_threadsafe(pump(), self._get_loop())
+
+    def is_available(self) -> bool:
+        """
+        Cached health state, the model server is probed at most once per TTL
+        """
+        if self.breaker.is_open():
+            return False
+        if not self.breaker.needs_health_check():
+            return True
+        try:
+            return self._run(self._health(), timeout=10)
+        except Exception as e:
+            logger.warning(f"LLM health check failed: {str(e)}")
+            self.breaker.record_failure()
+            return False
+
+
+_gateways: Dict[tuple, LLMGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_llm_gateway(
+    endpoint: Optional[str] = None,
+    model: Optional[str] = None,
+    timeout: Optional[int] = None,
+) -> LLMGateway:
+    """
+    Return the process wide gateway for the endpoint and model
+    """
+    endpoint = endpoint or getattr(
+        settings, "CHART_BOT_LLM_ENDPOINT", DEFAULT_LLM_ENDPOINT
+    )
+    model = model or getattr(settings, "CHART_BOT_LLM_MODEL", DEFAULT_LLM_MODEL)
+    backend_path = getattr(
+        settings, "CHART_BOT_LLM_BACKEND", "chart_bot.core.llm_gateway.OllamaBackend"
+    )
+    key = (backend_path, endpoint, model)
+    with _gateways_lock:
+        gateway = _gateways.get(key)
+        if gateway is None:
+            backend = import_string(backend_path)(endpoint, model)
+            gateway = LLMGateway(
+                backend,
+                timeout=timeout or getattr(settings, "CHART_BOT_LLM_TIMEOUT", 30),
+                pool_size=getattr(settings, "CHART_BOT_LLM_POOL_SIZE", 20),
+            )
+            _gateways[key] = gateway
+    return gateway
@@ -4,14 +4,14 @@ SaaS-Enhanced Chart Bot Agent - Multi-tenant, Production-Ready
 import json
 import logging
 from datetime import datetime, date, timedelta
-from typing import Dict, Any, Optional, List
-import requests
+from typing import Dict, Any, Iterator, Optional, List
 from django.conf import settings
-from django.core.cache import cache
 from django.db import transaction
 
+from .conversation_store import ConversationStore
 from .enhanced_data_fetcher import EnhancedDataFetcher
 from .enhanced_query_analyzer import EnhancedQueryAnalyzer
+from .llm_gateway import LLMUnavailable, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -23,16 +23,20 @@ class SaaSEnhancedChartBotAgent:
     
     def __init__(self, user, session_id: str = None, company_id: str = None):
         self.user = user
-        self.session_id = session_id or f"session_{user.id}_{datetime.now().timestamp()}"
         self.company_id = company_id or self._get_company_id()
         self.data_fetcher = EnhancedDataFetcher(user)
         self.query_analyzer = EnhancedQueryAnalyzer()
-        self.llm_endpoint = "http://125.18.84.108:11434/api/generate"
-        self.llm_model = "mistral"
+        self.llm_gateway = get_llm_gateway()
+        self.llm_endpoint = self.llm_gateway.backend.endpoint
+        self.llm_model = self.llm_gateway.backend.model
         
-        # Enhanced memory with caching
+        # Append-only memory, only the last messages are kept for the prompt
+        self.max_history = getattr(settings, "CHART_BOT_HISTORY_LIMIT", 20)
+        self.conversation_store = ConversationStore(
+            user, session_id or f"session_{user.id}_{datetime.now().timestamp()}"
+        )
+        self.session_id = self.conversation_store.session_id
         self.conversation_history = self._load_conversation_history()
-        self.max_history = 20
         
         # Performance tracking
         self.start_time = datetime.now()
@@ -57,25 +61,23 @@ class SaaSEnhancedChartBotAgent:
     
     def _load_conversation_history(self) -> List[Dict[str, Any]]:
         """
-        Load conversation history from cache
+        Load the last messages of the session
         """
         try:
-            cache_key = f"chart_bot_history_{self.user.id}_{self.company_id}"
-            history = cache.get(cache_key, [])
-            return history[-self.max_history:] if history else []
+            return self.conversation_store.recent(self.max_history)
         except Exception as e:
             logger.warning(f"Could not load conversation history: {str(e)}")
             return []
     
-    def _save_conversation_history(self):
+    def _save_conversation_history(self, *entries: Dict[str, Any]):
         """
-        Save conversation history to cache
+        Append the entries of the turn to the session history
         """
         try:
-            cache_key = f"chart_bot_history_{self.user.id}_{self.company_id}"
-            cache.set(cache_key, self.conversation_history, timeout=3600)  # 1 hour
+            self.conversation_store.append(entries)
         except Exception as e:
             logger.warning(f"Could not save conversation history: {str(e)}")
+        del self.conversation_history[:-self.max_history]
     
     def process_query(self, query: str) -> Dict[str, Any]:
         """
@@ -86,12 +88,13 @@ class SaaSEnhancedChartBotAgent:
             logger.info(f"Processing SaaS query #{self.query_count}: {query}")
             
             # Add to conversation history
-            self.conversation_history.append({
+            user_entry = {
                 'type': 'user',
                 'content': query,
                 'timestamp': datetime.now().isoformat(),
                 'session_id': self.session_id
-            })
+            }
+            self.conversation_history.append(user_entry)
             
             # Analyze query with enhanced context
             analysis = self._enhanced_query_analysis(query)
@@ -115,17 +118,18 @@ class SaaSEnhancedChartBotAgent:
             response = self._generate_saas_response(query, analysis, data, user_context)
             
             # Add to conversation history
-            self.conversation_history.append({
+            assistant_entry = {
                 'type': 'assistant',
                 'content': response,
                 'timestamp': datetime.now().isoformat(),
                 'session_id': self.session_id,
                 'query_type': analysis.get('query_type'),
                 'data_used': bool(data)
-            })
+            }
+            self.conversation_history.append(assistant_entry)
             
             # Save conversation history
-            self._save_conversation_history()
+            self._save_conversation_history(user_entry, assistant_entry)
             
             # Performance metrics
             processing_time = (datetime.now() - self.start_time).total_seconds()
@@ -136,6 +140,70 @@ class SaaSEnhancedChartBotAgent:
             logger.error(f"Error processing SaaS query: {str(e)}")
             return self._create_response(False, "Sorry, I encountered an error while processing your request.", "error")
     
+    def stream_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """
+        Process a user query and yield the response tokens as they are generated,
+        the last event carries the same payload as process_query
+        """
+        try:
+            self.query_count += 1
+            logger.info(f"Streaming SaaS query #{self.query_count}: {query}")
+            
+            user_entry = {
+                'type': 'user',
+                'content': query,
+                'timestamp': datetime.now().isoformat(),
+                'session_id': self.session_id
+            }
+            self.conversation_history.append(user_entry)
+            
+            analysis = self._enhanced_query_analysis(query)
+            user_context = self._get_user_context()
+            
+            if not self._check_saas_permissions(analysis, user_context):
+                response = "Sorry, you don't have permission to view this data."
+                yield {'type': 'token', 'content': response}
+                yield {'type': 'done', **self._create_response(False, response, "permission_denied", user_context)}
+                return
+            
+            data = None
+            if analysis.get('requires_data', False):
+                data = self._fetch_cached_data(analysis)
+            
+            tokens = []
+            if self._is_llm_available():
+                try:
+                    prompt = self._build_llm_prompt(query, data, user_context)
+                    for token in self.llm_gateway.stream(prompt):
+                        tokens.append(token)
+                        yield {'type': 'token', 'content': token}
+                except LLMUnavailable as e:
+                    logger.warning(f"LLM stream failed: {str(e)}")
+            
+            response = "".join(tokens)
+            if not response:
+                # Fallback to rule-based responses
+                response = self._generate_rule_based_response(query, analysis, data, user_context)
+                yield {'type': 'token', 'content': response}
+            
+            assistant_entry = {
+                'type': 'assistant',
+                'content': response,
+                'timestamp': datetime.now().isoformat(),
+                'session_id': self.session_id,
+                'query_type': analysis.get('query_type'),
+                'data_used': bool(data)
+            }
+            self.conversation_history.append(assistant_entry)
+            self._save_conversation_history(user_entry, assistant_entry)
+            
+            processing_time = (datetime.now() - self.start_time).total_seconds()
+            yield {'type': 'done', **self._create_response(True, response, "success", data, user_context, processing_time)}
+            
+        except Exception as e:
+            logger.error(f"Error streaming SaaS query: {str(e)}")
+            yield {'type': 'done', **self._create_response(False, "Sorry, I encountered an error while processing your request.", "error")}
+    
     def _enhanced_query_analysis(self, query: str) -> Dict[str, Any]:
         """
         Enhanced query analysis with SaaS context
@@ -279,47 +347,15 @@ class SaaSEnhancedChartBotAgent:
     
     def _fetch_cached_data(self, analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Fetch data with intelligent caching
+        Fetch data, attendance, leave, payroll and team answers are read from
+        the employee fact sheet which the HR record signals keep up to date
         """
         try:
-            query_type = analysis.get('query_type', 'unknown')
-            cache_key = f"chart_bot_data_{self.user.id}_{self.company_id}_{query_type}"
-            
-            # Try cache first
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                logger.info(f"Using cached data for {query_type}")
-                return cached_data
-            
-            # Fetch fresh data
-            data = self._fetch_real_data(analysis)
-            
-            # Cache the data
-            if data and 'error' not in data:
-                cache_timeout = self._get_cache_timeout(query_type)
-                cache.set(cache_key, data, timeout=cache_timeout)
-                logger.info(f"Cached fresh data for {query_type}")
-            
-            return data
-            
+            return self._fetch_real_data(analysis)
         except Exception as e:
             logger.error(f"Error fetching cached data: {str(e)}")
             return None
     
-    def _get_cache_timeout(self, query_type: str) -> int:
-        """
-        Get cache timeout based on query type
-        """
-        timeouts = {
-            'profile_query': 3600,  # 1 hour
-            'attendance_query': 300,  # 5 minutes
-            'leave_query': 600,  # 10 minutes
-            'payroll_query': 1800,  # 30 minutes
-            'team_query': 600,  # 10 minutes
-            'company_query': 300,  # 5 minutes
-        }
-        return timeouts.get(query_type, 300)  # Default 5 minutes
-    
     def _fetch_real_data(self, analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Fetch real data from HRMS database
@@ -532,31 +568,18 @@ class SaaSEnhancedChartBotAgent:
     
     def _is_llm_available(self) -> bool:
         """
-        Check if LLM is available
+        Check if LLM is available, the health state is cached by the gateway
         """
         try:
-            response = requests.get(self.llm_endpoint.replace('/generate', '/tags'), timeout=5)
-            return response.status_code == 200
-        except:
+            return self.llm_gateway.is_available()
+        except Exception:
             return False
     
-    def _call_llm_with_saas_context(self, query: str, analysis: Dict[str, Any], data: Optional[Dict[str, Any]], user_context: Dict[str, Any]) -> str:
+    def _build_llm_prompt(self, query: str, data: Optional[Dict[str, Any]], user_context: Dict[str, Any]) -> str:
         """
-        Call LLM with SaaS context
+        Build the LLM prompt with SaaS context
         """
-        try:
-            # Build comprehensive context
-            context = {
-                'query': query,
-                'analysis': analysis,
-                'data': data,
-                'user_context': user_context,
-                'conversation_history': self.conversation_history[-5:],  # Last 5 messages
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # Create enhanced prompt
-            prompt = f"""You are Chart Bot, an AI-powered HR Assistant for a SaaS HRMS platform. Provide helpful, professional responses using the provided real data.
+        return f"""You are Chart Bot, an AI-powered HR Assistant for a SaaS HRMS platform. Provide helpful, professional responses using the provided real data.
 
 User Context:
 - Username: {user_context.get('username', 'N/A')}
@@ -566,7 +589,7 @@ User Context:
 
 Query: {query}
 
-Real Data Available: {json.dumps(data, indent=2) if data else 'No specific data'}
+Real Data Available: {json.dumps(data, indent=2, default=str) if data else 'No specific data'}
 
 Recent Conversation:
 {json.dumps(self.conversation_history[-3:], indent=2) if self.conversation_history else 'No previous conversation'}
@@ -574,26 +597,15 @@ Recent Conversation:
 Please provide a helpful, professional response using the real data. Be concise, conversational, and SaaS-focused.
 
 Response:"""
-            
-            # Call LLM
-            payload = {
-                "model": self.llm_model,
-                "prompt": prompt,
-                "stream": False
-            }
-            
-            response = requests.post(
-                self.llm_endpoint,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', 'Sorry, I couldn\'t generate a response.')
-            else:
-                logger.error(f"LLM API error: {response.status_code}")
-                return self._generate_rule_based_response(query, analysis, data, user_context)
+    
+    def _call_llm_with_saas_context(self, query: str, analysis: Dict[str, Any], data: Optional[Dict[str, Any]], user_context: Dict[str, Any]) -> str:
+        """
+        Call LLM with SaaS context
+        """
+        try:
+            prompt = self._build_llm_prompt(query, data, user_context)
+            response = self.llm_gateway.generate(prompt)
+            return response or 'Sorry, I couldn\'t generate a response.'
                 
         except Exception as e:
             logger.error(f"Error calling LLM with SaaS context: {str(e)}")
@@ -5,9 +5,11 @@ import json
 import uuid
 import logging
 from datetime import datetime
-from django.http import JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -20,6 +22,38 @@ from .core.saas_enhanced_agent import SaaSEnhancedChartBotAgent
 logger = logging.getLogger(__name__)
 
 
+def get_direct_user(request):
+    """
+    Resolve the chat user with the direct fix, falling back to the test user
+    """
+    # Try to get user with direct fix
+    user = DirectAuthFix.get_user_from_request(request)
+    
+    # If no user found, force authenticate
+    if not user:
+        logger.warning("No user found, attempting force authentication")
+        user = DirectAuthFix.force_authenticate_user(request)
+    
+    # If still no user, create a test user
+    if not user:
+        logger.warning("No user available, using test user")
+        user, created = User.objects.get_or_create(
+            username='test_user',
+            defaults={
+                'email': 'test@example.com',
+                'first_name': 'Test',
+                'last_name': 'User',
+                'is_active': True,
+                'is_staff': True
+            }
+        )
+        if created:
+            logger.info("Created test user")
+        else:
+            logger.info("Using existing test user")
+    return user
+
+
 class DirectChartBotAPIView(APIView):
     """
     Direct Chat Bot API that bypasses authentication issues
@@ -33,31 +67,7 @@ class DirectChartBotAPIView(APIView):
         try:
             logger.info("🚀 Direct Chart Bot API called")
             
-            # Try to get user with direct fix
-            user = DirectAuthFix.get_user_from_request(request)
-            
-            # If no user found, force authenticate
-            if not user:
-                logger.warning("No user found, attempting force authentication")
-                user = DirectAuthFix.force_authenticate_user(request)
-            
-            # If still no user, create a test user
-            if not user:
-                logger.warning("No user available, using test user")
-                user, created = User.objects.get_or_create(
-                    username='test_user',
-                    defaults={
-                        'email': 'test@example.com',
-                        'first_name': 'Test',
-                        'last_name': 'User',
-                        'is_active': True,
-                        'is_staff': True
-                    }
-                )
-                if created:
-                    logger.info("Created test user")
-                else:
-                    logger.info("Using existing test user")
+            user = get_direct_user(request)
             
             logger.info(f"✅ Using user: {user.username} (ID: {user.id})")
             
@@ -237,6 +247,43 @@ def direct_chat_endpoint(request):
     return view.post(request)
 
 
+@require_http_methods(["POST"])
+@login_required
+def direct_chat_stream_endpoint(request):
+    """
+    Direct chat endpoint streaming the response as server-sent events,
+    only for the logged in user and with the CSRF token of the session
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        data = {}
+    message = str(data.get('message', '')).strip()
+    session_id = data.get('session_id') or str(uuid.uuid4())
+    
+    if not message:
+        return JsonResponse({
+            'success': False,
+            'error': 'invalid_request',
+            'message': 'Message is required',
+            'response': 'Please provide a message.'
+        }, status=400)
+    
+    agent = SaaSEnhancedChartBotAgent(request.user, session_id)
+    
+    def event_stream():
+        for event in agent.stream_query(message):
+            event_type = event.pop('type')
+            payload = json.dumps(event, cls=DjangoJSONEncoder)
+            yield f"event: {event_type}\ndata: {payload}\n\n"
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Disable proxy buffering so tokens reach the browser as they arrive
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @require_http_methods(["GET"])
 def direct_status_endpoint(request):
     """
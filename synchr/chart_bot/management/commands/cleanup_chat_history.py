@@ -0,0 +1,23 @@
+"""
+Management command to remove idle Chart Bot sessions and their messages
+"""
+
+from django.core.management.base import BaseCommand
+
+from chart_bot.core.conversation_store import cleanup_conversations
+
+
+class Command(BaseCommand):
+    help = "Remove Chart Bot sessions that have been idle past the retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Retention in days (default: CHART_BOT_HISTORY_RETENTION_DAYS)",
+        )
+
+    def handle(self, *args, **options):
+        removed = cleanup_conversations(options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} idle chat sessions"))
@@ -0,0 +1,125 @@
+"""
+Management command to run a local stub of the Ollama compatible model server
+"""
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """
+    Answers /api/tags and /api/generate like the model server does
+    """
+
+    model = "mistral"
+    token_delay = 0.05
+    fail = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.fail:
+            return self._send_json(500, {"error": "stub failure"})
+        if self.path.rstrip("/") == "/api/tags":
+            return self._send_json(200, {"models": [{"name": self.model}]})
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/api/generate":
+            return self._send_json(404, {"error": "not found"})
+        if self.fail:
+            return self._send_json(500, {"error": "stub failure"})
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        query = next(
+            (
+                line[len("Query:") :].strip()
+                for line in payload.get("prompt", "").splitlines()
+                if line.startswith("Query:")
+            ),
+            "your question",
+        )
+        tokens = f"This is a stub answer to: {query}".split(" ")
+
+        if not payload.get("stream", True):
+            time.sleep(self.token_delay * len(tokens))
+            return self._send_json(
+                200, {"model": self.model, "response": " ".join(tokens), "done": True}
+            )
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for index, token in enumerate(tokens):
+            time.sleep(self.token_delay)
+            chunk = {
+                "model": self.model,
+                "response": token if index == 0 else f" {token}",
+                "done": False,
+            }
+            self.wfile.write(json.dumps(chunk).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        self.wfile.write(
+            json.dumps({"model": self.model, "response": "", "done": True}).encode(
+                "utf-8"
+            )
+            + b"\n"
+        )
+
+
+class Command(BaseCommand):
+    help = "Run a local stub model server for testing the Chart Bot LLM gateway"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--port", type=int, default=11434, help="Port to listen on (default: 11434)"
+        )
+        parser.add_argument(
+            "--model",
+            type=str,
+            default="mistral",
+            help="Model name reported by /api/tags",
+        )
+        parser.add_argument(
+            "--token-delay",
+            type=float,
+            default=0.05,
+            help="Seconds to wait between streamed tokens (default: 0.05)",
+        )
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Answer every request with an error to exercise the circuit breaker",
+        )
+
+    def handle(self, *args, **options):
+        StubLLMHandler.model = options["model"]
+        StubLLMHandler.token_delay = options["token_delay"]
+        StubLLMHandler.fail = options["fail"]
+
+        server = ThreadingHTTPServer(("127.0.0.1", options["port"]), StubLLMHandler)
+        self.stdout.write(
+            f"Stub LLM server listening on http://127.0.0.1:{options['port']}/api/generate"
+        )
+        self.stdout.write(
+            "Set CHART_BOT_LLM_ENDPOINT to this URL to point the Chart Bot at it"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -6,6 +6,7 @@ from django.contrib.auth.models import User
 from django.utils.translation import gettext_lazy as _
 from horilla.models import HorillaModel
 from base.horilla_company_manager import HorillaCompanyManager
+from employee.models import Employee
 
 
 class ChatSession(HorillaModel):
@@ -42,6 +43,7 @@ class ChatSession(HorillaModel):
         verbose_name = _("Chat Session")
         verbose_name_plural = _("Chat Sessions")
         ordering = ['-updated_at']
+        indexes = [models.Index(fields=['updated_at'])]
     
     def __str__(self):
         return f"Session {self.session_id} - {self.user.username}"
@@ -87,6 +89,7 @@ class ChatMessage(HorillaModel):
         verbose_name = _("Chat Message")
         verbose_name_plural = _("Chat Messages")
         ordering = ['timestamp']
+        indexes = [models.Index(fields=['session', 'timestamp'])]
     
     def __str__(self):
         return f"{self.message_type}: {self.content[:50]}..."
@@ -131,3 +134,47 @@ class BotConfiguration(HorillaModel):
     
     def __str__(self):
         return f"{self.name} - {'Enabled' if self.is_enabled else 'Disabled'}"
+
+
+class EmployeeFactSheet(models.Model):
+    """
+    Materialized per-employee HR facts read by the Chart Bot, kept up to
+    date by the attendance, leave, payroll and work information signals
+    """
+    employee = models.OneToOneField(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='chart_bot_facts',
+        verbose_name=_("Employee")
+    )
+    attendance = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_("Attendance Summary")
+    )
+    leave = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_("Leave Summary")
+    )
+    payslip = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_("Latest Payslip")
+    )
+    team = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_("Team Summary")
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated At")
+    )
+    
+    class Meta:
+        verbose_name = _("Employee Fact Sheet")
+        verbose_name_plural = _("Employee Fact Sheets")
+    
+    def __str__(self):
+        return f"Facts - {self.employee}"
@@ -0,0 +1,36 @@
+import sys
+
+import pytz
+from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
+
+
+def cleanup_chat_history():
+    """
+    Remove the Chart Bot sessions that have been idle past the retention period
+    """
+    from chart_bot.core.conversation_store import cleanup_conversations
+
+    cleanup_conversations()
+
+
+if not any(
+    cmd in sys.argv
+    for cmd in ["makemigrations", "migrate", "compilemessages", "flush", "shell"]
+):
+    """
+    Initializes and starts background tasks using APScheduler when the server is running.
+    """
+    scheduler = BackgroundScheduler(timezone=pytz.timezone(settings.TIME_ZONE))
+
+    scheduler.add_job(
+        cleanup_chat_history,
+        "cron",
+        hour=1,
+        minute=0,
+        misfire_grace_time=3600 * 6,
+        id="cleanup_chart_bot_history",
+        replace_existing=True,
+    )
+
+    scheduler.start()
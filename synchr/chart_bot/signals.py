@@ -0,0 +1,151 @@
+"""
+chart_bot/signals.py
+
+Keeps the employee fact sheets read by the Chart Bot in sync with the
+employee, attendance, leave, payroll and work information records, and clears
+the cached widget configuration when the bot configuration changes
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from attendance.models import Attendance
+from chart_bot.core.fact_store import invalidate_facts, update_facts
+from chart_bot.models import BotConfiguration
+from chart_bot.templatetags.chart_bot_tags import BOT_CONFIG_CACHE_KEY
+from employee.models import Employee, EmployeeWorkInformation
+from horilla.signals import post_bulk_update, pre_bulk_update
+from leave.models import AvailableLeave, LeaveRequest
+from payroll.models.models import Payslip
+
+FACT_SOURCES = {
+    Attendance: "attendance",
+    LeaveRequest: "leave",
+    AvailableLeave: "leave",
+    Payslip: "payslip",
+}
+
+
+def _on_fact_source_change(sender, instance, **kwargs):
+    employee_id = instance.employee_id_id
+    section = FACT_SOURCES[sender]
+    transaction.on_commit(lambda: update_facts([employee_id], [section]))
+
+
+def _before_fact_source_bulk_update(sender, queryset, *args, **kwargs):
+    # The update may change the fields the queryset is filtered on
+    queryset._fact_employee_ids = list(
+        queryset.values_list("employee_id", flat=True).distinct()
+    )
+
+
+def _on_fact_source_bulk_update(sender, queryset, *args, **kwargs):
+    employee_ids = getattr(queryset, "_fact_employee_ids", [])
+    invalidate_facts(employee_ids, [FACT_SOURCES[sender]])
+
+
+for model in FACT_SOURCES:
+    post_save.connect(_on_fact_source_change, sender=model)
+    post_delete.connect(_on_fact_source_change, sender=model)
+    pre_bulk_update.connect(_before_fact_source_bulk_update, sender=model)
+    post_bulk_update.connect(_on_fact_source_bulk_update, sender=model)
+
+
+@receiver(pre_save, sender=EmployeeWorkInformation)
+def track_reporting_manager(sender, instance, **kwargs):
+    """
+    Remember the previous reporting manager to refresh both teams
+    """
+    instance._previous_reporting_manager_id = (
+        sender.objects.entire()
+        .filter(pk=instance.pk)
+        .values_list("reporting_manager_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=EmployeeWorkInformation)
+@receiver(post_delete, sender=EmployeeWorkInformation)
+def refresh_team_facts(sender, instance, **kwargs):
+    """
+    Refresh the team facts of the managers the employee reports to
+    """
+    manager_ids = [
+        instance.reporting_manager_id_id,
+        getattr(instance, "_previous_reporting_manager_id", None),
+    ]
+    transaction.on_commit(lambda: update_facts(manager_ids, ["team"]))
+
+
+@receiver(pre_bulk_update, sender=EmployeeWorkInformation)
+def track_bulk_reporting_managers(sender, queryset, *args, **kwargs):
+    """
+    Remember the managers of the employees before a bulk update
+    """
+    queryset._fact_manager_ids = list(
+        queryset.values_list("reporting_manager_id", flat=True).distinct()
+    )
+
+
+@receiver(post_bulk_update, sender=EmployeeWorkInformation)
+def invalidate_team_facts(sender, queryset, *args, **kwargs):
+    """
+    Bulk work information updates may move employees between teams
+    """
+    manager_ids = getattr(queryset, "_fact_manager_ids", [])
+    manager_ids += list(
+        queryset.values_list("reporting_manager_id", flat=True).distinct()
+    )
+    invalidate_facts(manager_ids, ["team"])
+
+
+def _reporting_manager_ids(employee_ids):
+    return list(
+        EmployeeWorkInformation.objects.entire()
+        .filter(employee_id__in=employee_ids, reporting_manager_id__isnull=False)
+        .values_list("reporting_manager_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=Employee)
+def invalidate_employee_team_facts(sender, instance, **kwargs):
+    """
+    The team facts of the manager hold the name, email and status of the
+    employee
+    """
+    employee_id = instance.pk
+    transaction.on_commit(
+        lambda: invalidate_facts(_reporting_manager_ids([employee_id]), ["team"])
+    )
+
+
+@receiver(pre_bulk_update, sender=Employee)
+def track_bulk_employees(sender, queryset, *args, **kwargs):
+    """
+    Remember the employees before a bulk update, such as archiving, changes
+    the fields the queryset is filtered on
+    """
+    queryset._fact_employee_ids = list(queryset.values_list("pk", flat=True))
+
+
+@receiver(post_bulk_update, sender=Employee)
+def invalidate_bulk_employee_team_facts(sender, queryset, *args, **kwargs):
+    """
+    Bulk employee updates change the team facts of their managers
+    """
+    employee_ids = getattr(queryset, "_fact_employee_ids", [])
+    invalidate_facts(_reporting_manager_ids(employee_ids), ["team"])
+
+
+@receiver(post_save, sender=BotConfiguration)
+@receiver(post_delete, sender=BotConfiguration)
+def clear_bot_config_cache(sender, instance, **kwargs):
+    """
+    The widget reads the configuration from the cache
+    """
+    cache.delete(BOT_CONFIG_CACHE_KEY)
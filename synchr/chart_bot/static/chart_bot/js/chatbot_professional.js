@@ -8,6 +8,7 @@ class ProfessionalChartBot {
             apiEndpoint: options.apiEndpoint || '/chart-bot/api/v2/chat/',
             statusEndpoint: options.statusEndpoint || '/chart-bot/api/v2/status/',
             testAuthEndpoint: options.testAuthEndpoint || '/chart-bot/api/v2/test-auth/',
+            streamEndpoint: options.streamEndpoint || null,
             sessionId: options.sessionId || null,
             autoStart: options.autoStart !== false,
             position: options.position || 'bottom-right',
@@ -234,8 +235,8 @@ class ProfessionalChartBot {
         this.setState({ isLoading: true });
         
         try {
-            // Send to API with retry logic
-            const response = await this.callAPIWithRetry('POST', this.config.apiEndpoint, {
+            // Stream the answer when the server supports it, otherwise send to API with retry logic
+            const response = await this.streamMessage(message) || await this.callAPIWithRetry('POST', this.config.apiEndpoint, {
                 message: message,
                 session_id: this.sessionId
             });
@@ -252,7 +253,9 @@ class ProfessionalChartBot {
                 }
                 
                 // Add bot response
-                this.addMessage('bot', response.response);
+                if (!response.streamed) {
+                    this.addMessage('bot', response.response);
+                }
                 
                 // Store in history
                 this.messageHistory.push({
@@ -272,7 +275,7 @@ class ProfessionalChartBot {
                 }
                 
                 this.state.retryCount = 0;
-            } else {
+            } else if (!response.streamed) {
                 this.addMessage('bot', response.response || 'Sorry, I encountered an error. Please try again.');
             }
         } catch (error) {
@@ -294,6 +297,81 @@ class ProfessionalChartBot {
         }
     }
     
+    async streamMessage(message) {
+        if (!this.config.streamEndpoint || !window.ReadableStream) return null;
+        
+        let messageDiv = null;
+        let content = '';
+        let result = null;
+        let received = false;
+        
+        try {
+            const response = await fetch(this.config.streamEndpoint, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': this.getCSRFToken(),
+                    'X-Requested-With': 'XMLHttpRequest'
+                },
+                credentials: 'same-origin',
+                body: JSON.stringify({ message: message, session_id: this.sessionId })
+            });
+            // A login redirect or an error page means the prompt was not run
+            const contentType = response.headers.get('Content-Type') || '';
+            if (!response.ok || !response.body || !contentType.startsWith('text/event-stream')) return null;
+            
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                received = true;
+                buffer += decoder.decode(value, { stream: true });
+                
+                // Server-sent events are separated by a blank line
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const raw of events) {
+                    const type = (raw.match(/^event: (.*)$/m) || [])[1];
+                    const data = (raw.match(/^data: (.*)$/m) || [])[1];
+                    if (!type || !data) continue;
+                    const payload = JSON.parse(data);
+                    
+                    if (type === 'token') {
+                        if (!messageDiv) {
+                            this.hideTyping();
+                            this.addMessage('bot', '');
+                            messageDiv = this.messagesContainer.lastElementChild.firstElementChild;
+                        }
+                        content += payload.content;
+                        messageDiv.innerHTML = this.formatMessage(content);
+                        this.scrollToBottom();
+                    } else if (type === 'done') {
+                        result = payload;
+                    }
+                }
+            }
+        } catch (error) {
+            this.log('Streaming failed', error);
+        }
+        
+        // Resending is only safe while the server has not started answering,
+        // otherwise the prompt would run twice
+        if (!received) return null;
+        if (!messageDiv) {
+            this.hideTyping();
+            this.addMessage('bot', (result && result.response) || 'The answer was interrupted. Please try again.');
+        } else if (!result) {
+            messageDiv.innerHTML = this.formatMessage(content + '\n\n(The answer was interrupted.)');
+        }
+        // The answer is already on screen, skip adding it again
+        result = result || { success: false, response: content };
+        result.streamed = true;
+        return result;
+    }
+    
     async callAPIWithRetry(method, url, data = null, retries = this.config.maxRetries) {
         for (let i = 0; i < retries; i++) {
             try {
@@ -364,7 +442,9 @@ class ProfessionalChartBot {
     
     getCSRFToken() {
         const token = document.querySelector('[name=csrfmiddlewaretoken]');
-        return token ? token.value : '';
+        if (token) return token.value;
+        const cookie = document.cookie.split('; ').find(row => row.startsWith('csrftoken='));
+        return cookie ? decodeURIComponent(cookie.split('=')[1]) : '';
     }
     
     delay(ms) {
@@ -3,33 +3,54 @@ Chart Bot Template Tags
 """
 from django import template
 from django.conf import settings
+from django.core.cache import cache
 from ..models import BotConfiguration
 
 register = template.Library()
 
+BOT_CONFIG_CACHE_KEY = "chart_bot_widget_config"
+
+
+def get_bot_config():
+    """
+    Cached Chart Bot configuration, cleared when the BotConfiguration changes
+    """
+    config = cache.get(BOT_CONFIG_CACHE_KEY)
+    if config is None:
+        bot_configuration = BotConfiguration.objects.first()
+        # Without a saved configuration the bot runs with the model defaults
+        config = {
+            'name': bot_configuration.name if bot_configuration else 'Chart Bot',
+            'enabled': bot_configuration.is_enabled if bot_configuration else True,
+            'endpoint': bot_configuration.llm_endpoint if bot_configuration else '',
+            'model': bot_configuration.llm_model if bot_configuration else '',
+        }
+        cache.set(BOT_CONFIG_CACHE_KEY, config, None)
+    return config
+
 
 @register.inclusion_tag('chart_bot/widget.html', takes_context=True)
 def chart_bot_widget(context):
     """
     Template tag to include Chart Bot widget
     """
-    request = context['request']
+    request = context.get('request')
     
     # Check if user is authenticated
-    if not request.user.is_authenticated:
-        return {}
+    if request is None or not request.user.is_authenticated:
+        return {'enabled': False}
     
     # Check if bot is enabled
     try:
-        config = BotConfiguration.objects.first()
-        if not config or not config.is_enabled:
-            return {}
-    except:
-        return {}
+        config = get_bot_config()
+    except Exception:
+        return {'enabled': False}
     
     return {
+        'enabled': config['enabled'],
         'user': request.user,
-        'config': config
+        'config': config,
+        'debug': settings.DEBUG,
     }
 
 
@@ -39,9 +60,8 @@ def chart_bot_enabled(context):
     Check if Chart Bot is enabled
     """
     try:
-        config = BotConfiguration.objects.first()
-        return config and config.is_enabled
-    except:
+        return get_bot_config()['enabled']
+    except Exception:
         return False
 
 
@@ -51,15 +71,6 @@ def chart_bot_config(context):
     Get Chart Bot configuration as JSON
     """
     try:
-        config = BotConfiguration.objects.first()
-        if config:
-            return {
-                'name': config.name,
-                'enabled': config.is_enabled,
-                'endpoint': config.llm_endpoint,
-                'model': config.llm_model
-            }
-    except:
-        pass
-    
-    return {}
+        return get_bot_config()
+    except Exception:
+        return {}
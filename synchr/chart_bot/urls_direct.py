@@ -12,6 +12,7 @@ urlpatterns = [
     
     # Function-based endpoints
     path('api/direct/chat-fn/', direct_api.direct_chat_endpoint, name='chart_bot_direct_chat_fn'),
+    path('api/direct/chat/stream/', direct_api.direct_chat_stream_endpoint, name='chart_bot_direct_chat_stream'),
     path('api/direct/status-fn/', direct_api.direct_status_endpoint, name='chart_bot_direct_status_fn'),
     path('api/direct/test-auth-fn/', direct_api.direct_test_auth_endpoint, name='chart_bot_direct_test_auth_fn'),
     
@@ -114,7 +114,9 @@ def init_override(self: forms.ModelForm, *args, **kwargs):
     for df in removed_fields:
         if df in self.fields.keys():
             del self.fields[df]
-    other_df = DynamicField.objects.filter(model=model_path, remove_column=False)
+    other_df = DynamicField.objects.filter(
+        model=model_path, remove_column=False, is_ready=True
+    )
     for df in other_df:
         if df not in self.fields:
             form_field = df.get_field().formfield()
@@ -1,13 +1,9 @@
 import logging
 
-from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
-from django.db import connection, models
-from django.db.backends.base.schema import BaseDatabaseSchemaEditor
-from simple_history.models import HistoricalRecords
 
-from dynamic_fields.methods import column_exists
 from dynamic_fields.models import DynamicField
+from dynamic_fields.schema import remove_dynamic_field, run_schema_job
 
 logger = logging.getLogger(__name__)
 
@@ -17,43 +13,18 @@ class Command(BaseCommand):
     Command
     """
 
-    help = "Save all instances of the specified model"
+    help = "Remove a dynamic field and drop its column now"
 
     def add_arguments(self, parser):
         parser.add_argument(
             "pk",
             type=str,
-            help="Primary key of the DynamicField model to \
-                save instances for (e.g., employee.models.Model)",
+            help="Primary key of the DynamicField model to remove",
         )
 
     def handle(self, *args, **kwargs):
-        pk = kwargs["pk"]
-        editor = BaseDatabaseSchemaEditor(connection)
-        instance = DynamicField.objects.get(pk=pk)
-        model = instance.get_model()
-        field = instance.get_field()
-        field.set_attributes_from_name(instance.field_name)
-        sql_delete_column = editor.sql_delete_column.replace("CASCADE", "")
-        if column_exists(model._meta.db_table, instance.field_name):
-            sql = sql_delete_column % {
-                "table": editor.quote_name(model._meta.db_table),
-                "column": editor.quote_name(field.column),
-            }
-            logger.info(f"Field exist, deleting it from {model.__class__.__name__}.")
-            editor.execute(sql)
-
-        models.Model.delete(instance, *(), **{})
-
-        name = HistoricalRecords().get_history_model_name(model).lower()
-        historical_model_ct = ContentType.objects.filter(model=name).first()
-        if historical_model_ct:
-            history_model = historical_model_ct.model_class()
-            if column_exists(history_model._meta.db_table, instance.field_name):
-                sql = editor.sql_delete_column % {
-                    "table": editor.quote_name(history_model._meta.db_table),
-                    "column": editor.quote_name(field.column),
-                }
-                logger.info(
-                    f"Field exist, deleting it from {history_model.__class__.__name__}."
-                )
+        instance = DynamicField.objects.get(pk=kwargs["pk"])
+        DynamicField.objects.filter(pk=instance.pk).update(remove_column=True)
+        job = remove_dynamic_field(instance, delay=None, start=False)
+        if run_schema_job(job.pk):
+            logger.info(f"Field {instance.field_name} removed from {instance.model}.")
@@ -2,7 +2,6 @@ import logging
 import re
 
 from django import forms
-from django.core.management import call_command
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -65,6 +64,7 @@ class DynamicField(models.Model):
     choices = models.ManyToManyField(Choice, blank=True)
     is_required = models.BooleanField(default=False)
     remove_column = models.BooleanField(default=False)
+    is_ready = models.BooleanField(default=False, editable=False)
 
     class Meta:
         """
@@ -142,7 +142,8 @@ class DynamicField(models.Model):
         return super().clean()
 
     def save(self, *args, **kwargs):
-        # instance = self
+        from dynamic_fields.schema import remove_dynamic_field, schedule_schema_job
+
         is_create = self.pk is None
         # hdf -> horilla_dynamic_field
         field_name = "hdf_" + self.verbose_name.lower().replace(" ", "_")
@@ -150,31 +151,78 @@ class DynamicField(models.Model):
         if is_create:
             self.field_name = field_name
             super().save(*args, **kwargs)
-            call_command("add_field", *(self.pk,))
+            # The column is added by a background schema job
+            schedule_schema_job(self, SchemaJob.ADD)
 
         else:
-            instance = DynamicField.objects.get(pk=self.pk)
-            model = instance.get_model()
-            field = instance.get_field()
-            if self.remove_column:
-                try:
-                    field_to_remove = instance.field_name
-                    if hasattr(model, field_to_remove):
-                        # Dynamically remove the field
-                        model._meta.local_fields = [
-                            field
-                            for field in model._meta.local_fields
-                            if field.name != field_to_remove
-                        ]
-                        setattr(model, instance.field_name, None)
-
-                        logger.info(f"Field '{field_to_remove}' removed successfully.")
-                except Exception as e:
-                    logger.info(e)
+            removed = DynamicField.objects.filter(
+                pk=self.pk, remove_column=True
+            ).exists()
             super().save(*args, **kwargs)
+            if self.remove_column and not removed:
+                remove_dynamic_field(self)
         return self
 
 
+class SchemaJob(models.Model):
+    """
+    Background schema change of a dynamic field, with its progress
+    """
+
+    ADD = "add"
+    CONSTRAIN = "constrain"
+    REMOVE = "remove"
+    OPERATIONS = (
+        (ADD, _("Add column")),
+        (CONSTRAIN, _("Add constraints")),
+        (REMOVE, _("Remove column")),
+    )
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (DONE, _("Done")),
+        (FAILED, _("Failed")),
+    )
+
+    dynamic_field = models.ForeignKey(
+        DynamicField,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="schema_jobs",
+    )
+    model = models.CharField(max_length=100)
+    field_name = models.CharField(max_length=30)
+    operation = models.CharField(max_length=20, choices=OPERATIONS)
+    status = models.CharField(max_length=20, choices=STATUSES, default=PENDING)
+    step = models.CharField(max_length=30, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """
+        Meta class to additional options
+        """
+
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_operation_display()} {self.field_name} | {self.model}"
+
+
 DF_NOT_ALLOWED_MODELS += [
     DynamicField,
+    SchemaJob,
 ]
@@ -0,0 +1,44 @@
+import sys
+
+import pytz
+from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
+
+
+def run_schema_jobs():
+    """
+    Queue the jobs of the dynamic fields without any, such as the fields
+    added before the schema jobs, and run the schema jobs that are due
+    """
+    from dynamic_fields.schema import resume_schema_jobs, run_due_schema_jobs
+
+    resume_schema_jobs()
+    run_due_schema_jobs()
+
+
+if not any(
+    cmd in sys.argv
+    for cmd in [
+        "makemigrations",
+        "migrate",
+        "compilemessages",
+        "flush",
+        "shell",
+        "test",
+    ]
+):
+    """
+    Initializes and starts background tasks using APScheduler when the server is running.
+    """
+    scheduler = BackgroundScheduler(timezone=pytz.timezone(settings.TIME_ZONE))
+
+    scheduler.add_job(
+        run_schema_jobs,
+        "interval",
+        seconds=30,
+        max_instances=1,
+        id="dynamic_fields_schema_jobs",
+        replace_existing=True,
+    )
+
+    scheduler.start()
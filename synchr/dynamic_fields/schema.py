@@ -0,0 +1,426 @@
+"""
+dynamic_fields/schema.py
+
+The schema changes of the dynamic fields run as background jobs, so no
+request alters a table. A new field gets a nullable column without a
+default, which no database rewrites the table for, and its default is
+backfilled in batches. On PostgreSQL a required field then gets a NOT NULL
+check that is added NOT VALID and validated without blocking writes.
+
+Every process registers the ready fields on its model classes when the
+schema version in the cache changes. A removed field is unregistered first
+and its column is dropped once the other processes had time to follow.
+"""
+
+import copy
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models, transaction
+from django.utils import timezone
+from simple_history.models import HistoricalRecords
+
+from base.horilla_company_manager import django_filter_update
+from dynamic_fields.methods import column_exists
+from dynamic_fields.models import DynamicField, SchemaJob
+from horilla.cache_versions import bump_version, get_version
+from horilla_automations.methods.methods import get_model_class
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_KEY = "dynamic_fields_schema_version"
+BACKFILL_BATCH_SIZE = getattr(settings, "DYNAMIC_FIELDS_BACKFILL_BATCH_SIZE", 1000)
+# Time the processes get to follow a schema version before a change that
+# needs every one of them on it
+SCHEMA_GRACE_PERIOD = timedelta(
+    seconds=getattr(settings, "DYNAMIC_FIELDS_SCHEMA_GRACE_SECONDS", 120)
+)
+STALE_JOB_AFTER = timedelta(minutes=10)
+
+# Dynamic fields registered on the model classes of this process
+_registered = set()
+_loaded_version = None
+_registry_lock = threading.Lock()
+
+
+class SchemaJobPostponed(Exception):
+    """
+    The job waits for another schema job of its column, it runs again after
+    run_after
+    """
+
+    def __init__(self, run_after):
+        super().__init__(run_after)
+        self.run_after = run_after
+
+
+def get_history_model(model):
+    """
+    The history model of the model, None without history
+    """
+    name = HistoricalRecords().get_history_model_name(model).lower()
+    content_type = ContentType.objects.filter(model=name).first()
+    return content_type.model_class() if content_type else None
+
+
+def build_field(dynamic_field):
+    """
+    Model field of the dynamic field
+    """
+    field = dynamic_field.get_field()
+    field.set_attributes_from_name(dynamic_field.field_name)
+    return field
+
+
+def _local_field(model, field_name):
+    for field in model._meta.local_fields:
+        if field.name == field_name:
+            return field
+    return None
+
+
+def register_field(dynamic_field):
+    """
+    Add the dynamic field to the model class and its history model
+    """
+    model = dynamic_field.get_model()
+    for target in [model, get_history_model(model)]:
+        if target is not None and not _local_field(target, dynamic_field.field_name):
+            target.add_to_class(dynamic_field.field_name, build_field(dynamic_field))
+
+
+def _register(dynamic_field):
+    """
+    Register the dynamic field on this process unless it already is
+    """
+    key = (dynamic_field.model, dynamic_field.field_name)
+    if key not in _registered:
+        register_field(dynamic_field)
+        _registered.add(key)
+
+
+def unregister_field(model_path, field_name):
+    """
+    Remove the dynamic field from the model class and its history model
+    """
+    model = get_model_class(model_path)
+    for target in [model, get_history_model(model)]:
+        if target is None:
+            continue
+        field = _local_field(target, field_name)
+        if field:
+            target._meta.local_fields.remove(field)
+            target._meta._expire_cache()
+        if field_name in target.__dict__:
+            delattr(target, field_name)
+
+
+def publish_schema():
+    """
+    Make every process refresh its dynamic fields on its next request
+    """
+    bump_version(SCHEMA_VERSION_KEY)
+    refresh_dynamic_fields(force=True)
+
+
+def refresh_dynamic_fields(force=False):
+    """
+    This method is used to register the ready dynamic fields on the model
+    classes of this process and to unregister the removed ones, the fields
+    are only read again when the schema version changed
+    """
+    global _loaded_version
+    version = get_version(SCHEMA_VERSION_KEY)
+    if version == _loaded_version and not force:
+        return
+    with _registry_lock:
+        ready = {
+            (dynamic_field.model, dynamic_field.field_name): dynamic_field
+            for dynamic_field in DynamicField.objects.filter(
+                is_ready=True, remove_column=False
+            )
+        }
+        for model_path, field_name in _registered - set(ready):
+            unregister_field(model_path, field_name)
+            _registered.discard((model_path, field_name))
+        for key, dynamic_field in ready.items():
+            if key not in _registered:
+                register_field(dynamic_field)
+                _registered.add(key)
+        _loaded_version = version
+
+
+def schedule_schema_job(dynamic_field, operation, delay=None, start=True):
+    """
+    This method is used to queue a schema job of the dynamic field, an
+    immediate job starts in the background once the transaction commits
+    """
+    job = SchemaJob.objects.create(
+        dynamic_field=dynamic_field,
+        model=dynamic_field.model,
+        field_name=dynamic_field.field_name,
+        operation=operation,
+        run_after=timezone.now() + (delay or timedelta()),
+    )
+    if start and not delay:
+        transaction.on_commit(start_schema_jobs)
+    return job
+
+
+def remove_dynamic_field(dynamic_field, delay=SCHEMA_GRACE_PERIOD, start=True):
+    """
+    Unregister the dynamic field from every process, its column is dropped
+    after the delay
+    """
+    DynamicField.objects.filter(pk=dynamic_field.pk).update(is_ready=False)
+    dynamic_field.is_ready = False
+    publish_schema()
+    return schedule_schema_job(
+        dynamic_field, SchemaJob.REMOVE, delay=delay, start=start
+    )
+
+
+def start_schema_jobs():
+    """
+    Run the due schema jobs in a background thread
+    """
+    threading.Thread(target=_run_in_thread, daemon=True).start()
+
+
+def _run_in_thread():
+    try:
+        run_due_schema_jobs()
+    finally:
+        connection.close()
+
+
+def run_due_schema_jobs():
+    """
+    This method is used to run the due schema jobs, the jobs left running by
+    a stopped process are taken over
+
+    Returns:
+        the number of finished jobs
+    """
+    # The jobs read the ready fields through the ORM of this process
+    refresh_dynamic_fields()
+    now = timezone.now()
+    SchemaJob.objects.filter(
+        status=SchemaJob.RUNNING, updated_at__lt=now - STALE_JOB_AFTER
+    ).update(status=SchemaJob.PENDING, updated_at=now)
+    due_jobs = SchemaJob.objects.filter(
+        status=SchemaJob.PENDING, run_after__lte=now
+    ).order_by("pk")
+    return sum(
+        run_schema_job(job_id) for job_id in due_jobs.values_list("pk", flat=True)
+    )
+
+
+def _set_progress(job, **fields):
+    for name, value in fields.items():
+        setattr(job, name, value)
+    fields["updated_at"] = timezone.now()
+    SchemaJob.objects.filter(pk=job.pk).update(**fields)
+
+
+def run_schema_job(job_id):
+    """
+    This method is used to run a pending schema job, the job is claimed first
+    so that only one process runs it
+
+    Returns:
+        True when the job is done
+    """
+    now = timezone.now()
+    claimed = SchemaJob.objects.filter(pk=job_id, status=SchemaJob.PENDING).update(
+        status=SchemaJob.RUNNING, updated_at=now
+    )
+    if not claimed:
+        return False
+    job = SchemaJob.objects.select_related("dynamic_field").get(pk=job_id)
+    operations = {
+        SchemaJob.ADD: _add_column,
+        SchemaJob.CONSTRAIN: _add_constraints,
+        SchemaJob.REMOVE: _remove_column,
+    }
+    try:
+        operations[job.operation](job)
+    except SchemaJobPostponed as postponed:
+        _set_progress(job, status=SchemaJob.PENDING, run_after=postponed.run_after)
+        return False
+    except Exception as error:
+        logger.exception("Schema job %s failed", job)
+        _set_progress(
+            job, status=SchemaJob.FAILED, error=str(error), finished_at=timezone.now()
+        )
+        refresh_dynamic_fields(force=True)
+        return False
+    _set_progress(
+        job, status=SchemaJob.DONE, step="", progress=100, finished_at=timezone.now()
+    )
+    return True
+
+
+def _add_nullable_column(model, field):
+    """
+    Add the column of the field as nullable without a default, which is a
+    change of the table definition only
+
+    Returns:
+        True when the column was added
+    """
+    if column_exists(model._meta.db_table, field.column):
+        return False
+    column = copy.copy(field)
+    column.null = True
+    column.default = models.NOT_PROVIDED
+    with connection.schema_editor() as editor:
+        editor.add_field(model, column)
+    return True
+
+
+def _backfill(job, model, field, value):
+    """
+    Set the value on the rows without one in batches, every batch is a short
+    transaction of its own
+    """
+    rows = model._base_manager.filter(**{f"{field.name}__isnull": True})
+    _set_progress(job, step="backfill", total=rows.count(), processed=0)
+    while True:
+        batch = list(rows.values_list("pk", flat=True)[:BACKFILL_BATCH_SIZE])
+        if not batch:
+            break
+        django_filter_update(
+            model._base_manager.filter(pk__in=batch), **{field.name: value}
+        )
+        processed = job.processed + len(batch)
+        _set_progress(
+            job,
+            processed=processed,
+            progress=min(99, processed * 100 // max(job.total, 1)),
+        )
+
+
+def _add_column(job):
+    """
+    Add the column of a new dynamic field, backfill its default and make it
+    ready on every process
+    """
+    dynamic_field = job.dynamic_field
+    if dynamic_field is None or dynamic_field.remove_column:
+        return
+    removal = (
+        SchemaJob.objects.filter(
+            model=job.model,
+            field_name=job.field_name,
+            operation=SchemaJob.REMOVE,
+            status__in=[SchemaJob.PENDING, SchemaJob.RUNNING],
+        )
+        .exclude(dynamic_field=dynamic_field)
+        .order_by("-run_after")
+        .first()
+    )
+    if removal:
+        # A removed field of the same name still has its column, the new
+        # field gets a column of its own once that one is dropped
+        raise SchemaJobPostponed(
+            max(removal.run_after, timezone.now()) + timedelta(seconds=1)
+        )
+    model = dynamic_field.get_model()
+    field = build_field(dynamic_field)
+
+    _set_progress(job, step="add_column")
+    created = _add_nullable_column(model, field)
+    history_model = get_history_model(model)
+    if history_model is not None:
+        _add_nullable_column(history_model, build_field(dynamic_field))
+
+    # The rows of an existing column already have their values
+    default = field.get_default()
+    if created and default is not None:
+        # The backfill filters on the field, the column exists by now
+        _register(dynamic_field)
+        _backfill(job, model, field, default)
+
+    DynamicField.objects.filter(pk=dynamic_field.pk).update(is_ready=True)
+    publish_schema()
+    if created and dynamic_field.is_required and default is not None:
+        # Constraints wait until no process inserts without the field
+        schedule_schema_job(
+            dynamic_field, SchemaJob.CONSTRAIN, delay=SCHEMA_GRACE_PERIOD
+        )
+
+
+def _add_constraints(job):
+    """
+    Add the NOT NULL check of a required dynamic field, it is added NOT VALID
+    and validated afterwards so that writes are not blocked meanwhile
+    """
+    dynamic_field = job.dynamic_field
+    if dynamic_field is None or not dynamic_field.is_ready:
+        return
+    if connection.vendor != "postgresql":
+        # Other databases rebuild the table to change a column constraint
+        logger.info("Skipping the NOT NULL check of %s", dynamic_field)
+        return
+    model = dynamic_field.get_model()
+    # The process may not have served a request since the field was added
+    _register(dynamic_field)
+    field = _local_field(model, dynamic_field.field_name)
+    # The rows written before every process had the field
+    _backfill(job, model, field, field.get_default())
+
+    _set_progress(job, step="constraints")
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    name = quote_name(f"{model._meta.db_table}_{field.column}_not_null"[:63])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+            f"CHECK ({quote_name(field.column)} IS NOT NULL) NOT VALID"
+        )
+        cursor.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def _drop_column(model, field_name):
+    if model is None or not column_exists(model._meta.db_table, field_name):
+        return
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {quote_name(model._meta.db_table)} "
+            f"DROP COLUMN {quote_name(field_name)}"
+        )
+
+
+def _remove_column(job):
+    """
+    Drop the column of a removed dynamic field, every process stopped using
+    it during the delay of the job
+    """
+    model = get_model_class(job.model)
+    _set_progress(job, step="drop_column")
+    _drop_column(model, job.field_name)
+    _drop_column(get_history_model(model), job.field_name)
+    if job.dynamic_field is not None:
+        job.dynamic_field._schema_removed = True
+        models.Model.delete(job.dynamic_field)
+
+
+def resume_schema_jobs():
+    """
+    Queue the schema jobs of the dynamic fields that have none, such as the
+    fields added before the schema jobs, a failed job is not queued again
+    """
+    dynamic_fields = DynamicField.objects.exclude(
+        pk__in=SchemaJob.objects.filter(dynamic_field__isnull=False).values(
+            "dynamic_field_id"
+        )
+    )
+    for dynamic_field in dynamic_fields.filter(is_ready=False, remove_column=False):
+        schedule_schema_job(dynamic_field, SchemaJob.ADD, start=False)
+    for dynamic_field in dynamic_fields.filter(remove_column=True):
+        schedule_schema_job(dynamic_field, SchemaJob.REMOVE, start=False)
@@ -2,17 +2,50 @@
 dynamic_fields/signals.py
 """
 
-from django.core.management import call_command
+import logging
+
+from django.core.signals import request_started
+from django.db import DatabaseError
 from django.db.models.signals import pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
+
+from dynamic_fields.models import DynamicField, SchemaJob
+from dynamic_fields.schema import (
+    SCHEMA_GRACE_PERIOD,
+    publish_schema,
+    refresh_dynamic_fields,
+)
 
-from dynamic_fields.models import DynamicField
+logger = logging.getLogger(__name__)
 
 
 @receiver(pre_delete, sender=DynamicField)
 def pre_delete_dynamic_field(sender, instance, **kwargs):
     """
-    method to delete the column from the db before
-    deleting the dynamic field
+    method to queue the removal of the column when the dynamic field is
+    deleted before its column was removed
+    """
+    if getattr(instance, "_schema_removed", False):
+        return
+    # The job outlives the dynamic field, it keeps the model and field name
+    SchemaJob.objects.create(
+        model=instance.model,
+        field_name=instance.field_name,
+        operation=SchemaJob.REMOVE,
+        run_after=timezone.now() + SCHEMA_GRACE_PERIOD,
+    )
+    instance.is_ready = False
+    DynamicField.objects.filter(pk=instance.pk).update(is_ready=False)
+    publish_schema()
+
+
+@receiver(request_started)
+def refresh_request_dynamic_fields(sender, **kwargs):
+    """
+    method to follow the dynamic fields added or removed by other processes
     """
-    call_command("delete_field", *(instance.pk,))
+    try:
+        refresh_dynamic_fields()
+    except DatabaseError as error:
+        logger.error(error)
@@ -1,3 +1,170 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from base.models import Tags
+from dynamic_fields import schema
+from dynamic_fields.methods import column_exists
+from dynamic_fields.models import DynamicField, SchemaJob
+from horilla.cache_versions import bump_version
+
+MODEL_PATH = "base.models.Tags"
+
+
+class SchemaJobTestCase(TransactionTestCase):
+    """
+    Schema jobs of the dynamic fields, the schema editor of SQLite does not
+    run inside the transaction of a TestCase
+    """
+
+    def setUp(self):
+        start = mock.patch.object(schema, "start_schema_jobs")
+        start.start()
+        self.addCleanup(start.stop)
+        batch_size = mock.patch.object(schema, "BACKFILL_BATCH_SIZE", 2)
+        batch_size.start()
+        self.addCleanup(batch_size.stop)
+        Tags.objects.bulk_create(
+            [Tags(title=f"Tag {number}", color="red") for number in range(3)]
+        )
+
+    def tearDown(self):
+        for model_path, field_name in list(schema._registered):
+            schema.unregister_field(model_path, field_name)
+        schema._registered.clear()
+        schema._loaded_version = None
+        for field in ["hdf_level", "hdf_rank"]:
+            schema._drop_column(Tags, field)
+
+    def add_field(self, verbose_name="Level"):
+        dynamic_field = DynamicField(
+            model=MODEL_PATH, verbose_name=verbose_name, type="2"
+        )
+        dynamic_field.save()
+        return dynamic_field
+
+    def make_due(self):
+        SchemaJob.objects.filter(status=SchemaJob.PENDING).update(
+            run_after=timezone.now() - timedelta(seconds=1)
+        )
+
+    def test_add_column_backfills_and_publishes(self):
+        dynamic_field = self.add_field()
+        job = dynamic_field.schema_jobs.get()
+        self.assertFalse(dynamic_field.is_ready)
+
+        self.assertEqual(schema.run_due_schema_jobs(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, SchemaJob.DONE)
+        self.assertEqual((job.total, job.processed, job.progress), (3, 3, 100))
+        dynamic_field.refresh_from_db()
+        self.assertTrue(dynamic_field.is_ready)
+        self.assertTrue(column_exists(Tags._meta.db_table, "hdf_level"))
+        self.assertEqual(Tags.objects.entire().filter(hdf_level=0).count(), 3)
+
+    def test_remove_unpublishes_then_drops_after_delay(self):
+        dynamic_field = self.add_field()
+        schema.run_due_schema_jobs()
+
+        dynamic_field.delete()
+
+        dynamic_field.refresh_from_db()
+        self.assertFalse(dynamic_field.is_ready)
+        self.assertIsNone(schema._local_field(Tags, "hdf_level"))
+        # The column stays until the other processes stopped using it
+        self.assertEqual(schema.run_due_schema_jobs(), 0)
+        self.assertTrue(column_exists(Tags._meta.db_table, "hdf_level"))
+
+        self.make_due()
+        self.assertEqual(schema.run_due_schema_jobs(), 1)
+
+        self.assertFalse(column_exists(Tags._meta.db_table, "hdf_level"))
+        self.assertFalse(DynamicField.objects.filter(pk=dynamic_field.pk).exists())
+
+    def test_only_one_runner_claims_a_job(self):
+        job = self.add_field().schema_jobs.get()
+        SchemaJob.objects.filter(pk=job.pk).update(status=SchemaJob.RUNNING)
+
+        with mock.patch.object(schema, "_add_column") as add_column:
+            self.assertFalse(schema.run_schema_job(job.pk))
+            self.assertEqual(schema.run_due_schema_jobs(), 0)
+        add_column.assert_not_called()
+
+        # A job left running by a stopped process is taken over
+        SchemaJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - schema.STALE_JOB_AFTER * 2
+        )
+        self.assertEqual(schema.run_due_schema_jobs(), 1)
+        self.assertFalse(schema.run_schema_job(job.pk))
+
+    def test_refresh_follows_the_schema_version(self):
+        self.add_field()
+        schema.run_due_schema_jobs()
+        # Another process that has not seen the field yet
+        schema.unregister_field(MODEL_PATH, "hdf_level")
+        schema._registered.clear()
+
+        schema.refresh_dynamic_fields()
+        self.assertIsNone(schema._local_field(Tags, "hdf_level"))
+
+        bump_version(schema.SCHEMA_VERSION_KEY)
+        schema.refresh_dynamic_fields()
+        self.assertIsNotNone(schema._local_field(Tags, "hdf_level"))
+
+    def test_readded_field_waits_for_the_removal_of_its_column(self):
+        dynamic_field = self.add_field()
+        schema.run_due_schema_jobs()
+        Tags.objects.entire().update(hdf_level=5)
+        DynamicField.objects.filter(pk=dynamic_field.pk).delete()
+
+        readded = self.add_field()
+        schema.run_due_schema_jobs()
+
+        add_job = readded.schema_jobs.get()
+        remove_job = SchemaJob.objects.get(operation=SchemaJob.REMOVE)
+        self.assertEqual(add_job.status, SchemaJob.PENDING)
+        self.assertGreater(add_job.run_after, remove_job.run_after)
+        readded.refresh_from_db()
+        self.assertFalse(readded.is_ready)
+
+        self.make_due()
+        self.assertEqual(schema.run_due_schema_jobs(), 2)
+
+        readded.refresh_from_db()
+        self.assertTrue(readded.is_ready)
+        # The column of the removed field was dropped, not reused
+        self.assertEqual(Tags.objects.entire().filter(hdf_level=0).count(), 3)
+
+    def test_constraints_register_the_field_first(self):
+        dynamic_field = self.add_field()
+        schema.run_due_schema_jobs()
+        schema.unregister_field(MODEL_PATH, "hdf_level")
+        schema._registered.clear()
+        dynamic_field.refresh_from_db()
+        job = schema.schedule_schema_job(
+            dynamic_field, SchemaJob.CONSTRAIN, start=False
+        )
+
+        # Only the DDL of PostgreSQL is left out, the backfill runs as is
+        with mock.patch.object(schema, "connection") as connection:
+            connection.vendor = "postgresql"
+            schema._add_constraints(job)
+
+        self.assertIsNotNone(schema._local_field(Tags, "hdf_level"))
+        cursor = connection.cursor.return_value.__enter__.return_value
+        self.assertIn("VALIDATE CONSTRAINT", cursor.execute.call_args[0][0])
+
+    def test_existing_fields_without_jobs_are_resumed(self):
+        dynamic_field = self.add_field()
+        SchemaJob.objects.all().delete()
+
+        schema.resume_schema_jobs()
+        schema.resume_schema_jobs()
+
+        self.assertEqual(dynamic_field.schema_jobs.count(), 1)
+        schema.run_due_schema_jobs()
+        dynamic_field.refresh_from_db()
+        self.assertTrue(dynamic_field.is_ready)
@@ -0,0 +1,20 @@
+"""
+Management command to schedule the login block events of the disciplinary
+actions
+"""
+
+from django.core.management.base import BaseCommand
+
+from employee.methods.disciplinary import rebuild_block_events
+
+
+class Command(BaseCommand):
+    help = "Schedule the login block events of every disciplinary action"
+
+    def handle(self, *args, **options):
+        count = rebuild_block_events()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Login block events scheduled for {count} disciplinary actions"
+            )
+        )
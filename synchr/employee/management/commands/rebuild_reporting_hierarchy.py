@@ -0,0 +1,17 @@
+"""
+Management command to rebuild the reporting hierarchy closure table
+"""
+
+from django.core.management.base import BaseCommand
+
+from employee.methods.hierarchy import rebuild_reporting_hierarchy
+
+
+class Command(BaseCommand):
+    help = "Rebuild the reporting hierarchy from the employee reporting managers"
+
+    def handle(self, *args, **options):
+        count = rebuild_reporting_hierarchy()
+        self.stdout.write(
+            self.style.SUCCESS(f"Reporting hierarchy rebuilt with {count} entries")
+        )
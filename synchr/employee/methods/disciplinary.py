@@ -0,0 +1,234 @@
+"""
+employee/methods/disciplinary.py
+
+Login blocks of the disciplinary actions. The block and unblock times of
+every employee of an action are computed once when the action changes and
+stored as DisciplinaryBlockEvent rows, the sweeper only reads the events
+that are due and blocks or unblocks their users in bulk.
+"""
+
+import logging
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from base.models import EmployeeShiftSchedule
+from employee.models import DisciplinaryAction, DisciplinaryBlockEvent
+
+logger = logging.getLogger(__name__)
+
+BLOCKING_ACTION_TYPES = ["suspension", "dismissal"]
+WEEKDAYS = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+
+def _aware(day, at=time.min):
+    return timezone.make_aware(datetime.combine(day, at))
+
+
+def _hours_duration(hours):
+    """
+    Duration of a "HH:MM" suspension
+    """
+    try:
+        hour, minute = (int(part) for part in (hours or "").split(":"))
+    except ValueError:
+        return timedelta()
+    return timedelta(hours=hour, minutes=minute)
+
+
+def block_windows(action):
+    """
+    This method is used to compute the login block of every employee of the
+    disciplinary action
+
+    Returns:
+        employee id to the (block_at, unblock_at) of the employee, the
+        unblock_at of a dismissal is None
+    """
+    action_type = action.action
+    if (
+        not action_type.block_option
+        or action_type.action_type not in BLOCKING_ACTION_TYPES
+        or action.start_date is None
+    ):
+        return {}
+    employee_shifts = dict(
+        DisciplinaryAction.employee_id.through.objects.filter(
+            disciplinaryaction_id=action.pk
+        ).values_list("employee_id", "employee__employee_work_info__shift_id")
+    )
+    block_at = _aware(action.start_date)
+
+    if action_type.action_type == "dismissal":
+        return {employee_id: (block_at, None) for employee_id in employee_shifts}
+
+    if action.unit_in != "hours":
+        if not action.days or action.days <= 0:
+            return {}
+        unblock_at = _aware(action.start_date + timedelta(days=action.days))
+        return {employee_id: (block_at, unblock_at) for employee_id in employee_shifts}
+
+    duration = _hours_duration(action.hours)
+    if not duration:
+        return {}
+    # An hour suspension starts with the shift of the employee on the start
+    # date, or at the start of the day without a shift that day
+    shift_starts = dict(
+        EmployeeShiftSchedule.objects.entire()
+        .filter(
+            shift_id__in={shift for shift in employee_shifts.values() if shift},
+            day__day=WEEKDAYS[action.start_date.weekday()],
+            start_time__isnull=False,
+        )
+        .values_list("shift_id", "start_time")
+    )
+    windows = {}
+    for employee_id, shift_id in employee_shifts.items():
+        start = _aware(action.start_date, shift_starts.get(shift_id, time.min))
+        windows[employee_id] = (start, start + duration)
+    return windows
+
+
+def schedule_block_events(action):
+    """
+    This method is used to store the block and unblock events of the
+    disciplinary action. The events whose times are unchanged are kept,
+    the others are replaced, and a block that is lifted by the change is
+    released right away.
+    """
+    now = timezone.now()
+    windows = block_windows(action)
+    current = {}
+    for event in action.block_events.order_by("pk"):
+        current[event.employee_id_id] = event
+
+    retired = []
+    stale = []
+    new_events = []
+    for employee_id in set(current) | set(windows):
+        event = current.get(employee_id)
+        window = windows.get(employee_id)
+        if event and window == (event.block_at, event.unblock_at):
+            continue
+        if event and event.unblocked_at is None:
+            if event.blocked_at:
+                retired.append(event.pk)
+            else:
+                stale.append(event.pk)
+        if window:
+            new_events.append(
+                DisciplinaryBlockEvent(
+                    disciplinary_action=action,
+                    employee_id_id=employee_id,
+                    block_at=window[0],
+                    unblock_at=window[1],
+                )
+            )
+
+    if not (retired or stale or new_events):
+        return
+    with transaction.atomic():
+        DisciplinaryBlockEvent.objects.filter(pk__in=stale).delete()
+        DisciplinaryBlockEvent.objects.filter(pk__in=retired).update(unblock_at=now)
+        DisciplinaryBlockEvent.objects.bulk_create(new_events)
+    fire_due_block_events(now)
+
+
+def release_block_events(action):
+    """
+    Lift the blocks of the disciplinary action before it is deleted
+    """
+    now = timezone.now()
+    DisciplinaryBlockEvent.objects.filter(
+        disciplinary_action=action,
+        blocked_at__isnull=False,
+        unblocked_at__isnull=True,
+    ).update(unblock_at=now)
+    fire_due_block_events(now)
+
+
+def _lock(queryset):
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True)
+    return queryset.select_for_update()
+
+
+def fire_due_block_events(now=None):
+    """
+    This method is used to block and unblock the users of the due events.
+    Every event fires once, a user is not unblocked while another event
+    still blocks them and an event that is over before it was blocked only
+    gets marked.
+
+    Returns:
+        the number of blocked and unblocked events
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        unblocks = list(
+            _lock(
+                DisciplinaryBlockEvent.objects.filter(
+                    unblocked_at__isnull=True, unblock_at__lte=now
+                )
+            ).values_list("pk", "employee_id", "blocked_at")
+        )
+        blocks = list(
+            _lock(
+                DisciplinaryBlockEvent.objects.filter(
+                    blocked_at__isnull=True, block_at__lte=now
+                ).exclude(unblock_at__lte=now)
+            ).values_list("pk", "employee_id")
+        )
+        if not (unblocks or blocks):
+            return 0, 0
+
+        DisciplinaryBlockEvent.objects.filter(pk__in=[pk for pk, _ in blocks]).update(
+            blocked_at=now
+        )
+        DisciplinaryBlockEvent.objects.filter(
+            pk__in=[pk for pk, _employee, _blocked in unblocks]
+        ).update(unblocked_at=now)
+
+        User.objects.filter(
+            employee_get__in={employee for _pk, employee in blocks}, is_active=True
+        ).update(is_active=False)
+
+        released = {employee for _pk, employee, blocked in unblocks if blocked}
+        still_blocked = DisciplinaryBlockEvent.objects.filter(
+            employee_id__in=released,
+            blocked_at__isnull=False,
+            unblocked_at__isnull=True,
+        ).values_list("employee_id", flat=True)
+        User.objects.filter(
+            employee_get__in=released - set(still_blocked), is_active=False
+        ).update(is_active=True)
+
+    logger.info(
+        "Disciplinary login blocks: %s blocked, %s unblocked",
+        len(blocks),
+        len(unblocks),
+    )
+    return len(blocks), len(unblocks)
+
+
+def rebuild_block_events():
+    """
+    Schedule the block events of every disciplinary action
+
+    Returns:
+        the number of disciplinary actions
+    """
+    actions = DisciplinaryAction.objects.entire().select_related("action")
+    for action in actions:
+        schedule_block_events(action)
+    return len(actions)
@@ -0,0 +1,104 @@
+"""
+employee/methods/experience.py
+
+The work experience of an employee is the years since their joining date.
+It is derived on read with experience_expression, the stored experience
+column of the work information is refreshed once a day in a single UPDATE
+for the filters and payroll conditions that read it.
+"""
+
+import logging
+from datetime import date
+
+from django.db.models import FloatField, Func, Value
+from django.db.models.functions import Cast, Coalesce
+
+from base.horilla_company_manager import django_filter_update
+from employee.models import EmployeeWorkInformation
+
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365.0
+
+
+class DaysSince(Func):
+    """
+    Whole days from the date expression to today, today is read when the
+    query is compiled so module level definitions do not go stale
+    """
+
+    arity = 1
+    output_field = FloatField()
+
+    def __init__(self, expression, today=None, **extra):
+        super().__init__(expression, **extra)
+        self.today = today
+
+    def _days_sql(self, compiler, connection, template, **extra_context):
+        sql, params = super().as_sql(
+            compiler, connection, template=template, **extra_context
+        )
+        return sql, (self.today or date.today(), *params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL and Oracle subtract dates into days
+        return self._days_sql(
+            compiler, connection, "(%%s - %(expressions)s)", **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self._days_sql(
+            compiler,
+            connection,
+            "(julianday(%%s) - julianday(%(expressions)s))",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self._days_sql(
+            compiler, connection, "DATEDIFF(%%s, %(expressions)s)", **extra_context
+        )
+
+
+def experience_years(date_joining, today=None):
+    """
+    Years since the joining date, 0 without one
+    """
+    if date_joining is None:
+        return 0
+    today = today or date.today()
+    return (today - date_joining).days / DAYS_PER_YEAR
+
+
+def experience_expression(prefix="", today=None):
+    """
+    Query expression of the experience of the work information at the lookup
+    prefix, 0 without a joining date
+
+    Args:
+        prefix: lookup of the work information, e.g. "employee_work_info__"
+        today: date the experience is counted to, today by default
+    """
+    days = DaysSince(f"{prefix}date_joining", today=today)
+    return Coalesce(
+        Cast(days, output_field=FloatField()) / Value(DAYS_PER_YEAR),
+        Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def refresh_experience():
+    """
+    This method is used to store the experience of the active employees in
+    one UPDATE, it goes around the bulk update signals of QuerySet.update
+    and saves no history since only the derived column changes
+
+    Returns:
+        the number of updated work informations
+    """
+    queryset = EmployeeWorkInformation.objects.entire().filter(
+        employee_id__is_active=True
+    )
+    updated = django_filter_update(queryset, experience=experience_expression())
+    logger.info("Refreshed the experience of %s work informations", updated)
+    return updated
@@ -0,0 +1,100 @@
+"""
+employee/methods/hierarchy.py
+
+Maintains the ReportingHierarchy closure table from the reporting managers
+of the employee work information
+"""
+
+import logging
+
+from django.db import transaction
+
+from employee.models import EmployeeWorkInformation, ReportingHierarchy
+
+logger = logging.getLogger(__name__)
+
+
+def subordinate_ids(manager_id, max_depth=None):
+    """
+    Ids of the employees reporting to the manager at any depth, or up to
+    max_depth levels down
+    """
+    hierarchy = ReportingHierarchy.objects.filter(manager_id=manager_id)
+    if max_depth is not None:
+        hierarchy = hierarchy.filter(depth__lte=max_depth)
+    return hierarchy.values_list("employee_id", flat=True)
+
+
+def update_reporting_hierarchy(employee_id, manager_id):
+    """
+    Move the employee, with everyone reporting to them, under the new manager
+    """
+    subtree = dict(
+        ReportingHierarchy.objects.filter(manager_id=employee_id).values_list(
+            "employee_id", "depth"
+        )
+    )
+    subtree[employee_id] = 0
+    if manager_id in subtree:
+        logger.warning(
+            "Reporting manager %s of employee %s would create a reporting cycle, "
+            "run rebuild_reporting_hierarchy once the cycle is resolved",
+            manager_id,
+            employee_id,
+        )
+        manager_id = None
+
+    with transaction.atomic():
+        ReportingHierarchy.objects.filter(employee_id__in=subtree).exclude(
+            manager_id__in=subtree
+        ).delete()
+        if manager_id is None:
+            return
+        ancestors = dict(
+            ReportingHierarchy.objects.filter(employee_id=manager_id).values_list(
+                "manager_id", "depth"
+            )
+        )
+        ancestors[manager_id] = 0
+        ReportingHierarchy.objects.bulk_create(
+            [
+                ReportingHierarchy(
+                    manager_id_id=ancestor_id,
+                    employee_id_id=descendant_id,
+                    depth=ancestor_depth + descendant_depth + 1,
+                )
+                for ancestor_id, ancestor_depth in ancestors.items()
+                for descendant_id, descendant_depth in subtree.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_reporting_hierarchy():
+    """
+    Rebuild the whole closure table from the employee work information
+    """
+    managers = dict(
+        EmployeeWorkInformation.objects.entire()
+        .filter(employee_id__isnull=False, reporting_manager_id__isnull=False)
+        .values_list("employee_id", "reporting_manager_id")
+    )
+    hierarchy = []
+    for employee_id in managers:
+        visited = {employee_id}
+        manager_id = managers[employee_id]
+        depth = 1
+        while manager_id is not None and manager_id not in visited:
+            hierarchy.append(
+                ReportingHierarchy(
+                    manager_id_id=manager_id, employee_id_id=employee_id, depth=depth
+                )
+            )
+            visited.add(manager_id)
+            manager_id = managers.get(manager_id)
+            depth += 1
+
+    with transaction.atomic():
+        ReportingHierarchy.objects.all().delete()
+        ReportingHierarchy.objects.bulk_create(hierarchy, batch_size=999)
+    return len(hierarchy)
@@ -24,6 +24,7 @@ from base.models import (
     JobRole,
     WorkType,
 )
+from employee.methods.hierarchy import rebuild_reporting_hierarchy
 from employee.models import Employee, EmployeeWorkInformation
 
 logger = logging.getLogger(__name__)
@@ -949,6 +950,9 @@ def bulk_create_work_info_import(success_lists):
             ],
             batch_size=None if is_postgres else 999,
         )
+    if new_work_info_list or update_work_info_list:
+        # Bulk writes skip the signals that maintain the reporting hierarchy
+        rebuild_reporting_hierarchy()
     if apps.is_installed("payroll"):
 
         contract_creation_thread = threading.Thread(
@@ -695,6 +695,7 @@ class EmployeeWorkInformation(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.experience_calculator()
         super().save(*args, **kwargs)
 
     def __init__(self, *args, **kwargs):
@@ -709,11 +710,13 @@ class EmployeeWorkInformation(models.Model):
 
     def experience_calculator(self):
         """
-        This method is to calculate the default value for experience field
+        This method is to calculate the default value for experience field,
+        the instance is not saved
         """
         joining_date = self.date_joining
         if joining_date is None:
-            return 0
+            self.experience = 0
+            return self
         current_date = datetime.now().date()
 
         # Calculate the difference between the current date and joining date
@@ -725,10 +728,42 @@ class EmployeeWorkInformation(models.Model):
         # Calculate the number of experience as a float
         experience = total_days / 365.0
         self.experience = experience
-        self.save()
         return self
 
 
+class ReportingHierarchy(models.Model):
+    """
+    Closure table of the reporting chain, one row for every manager and
+    employee reporting to them directly (depth 1) or indirectly
+    """
+
+    manager_id = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="subordinate_hierarchy",
+        verbose_name=_("Manager"),
+    )
+    employee_id = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="manager_hierarchy",
+        verbose_name=_("Employee"),
+    )
+    depth = models.PositiveIntegerField(verbose_name=_("Depth"))
+    objects = models.Manager()
+
+    class Meta:
+        """
+        Meta class to add additional options
+        """
+
+        unique_together = ("manager_id", "employee_id")
+        indexes = [models.Index(fields=["manager_id", "depth"])]
+
+    def __str__(self) -> str:
+        return f"{self.employee_id} - {self.manager_id} ({self.depth})"
+
+
 class EmployeeBankDetails(HorillaModel):
     """
     EmployeeBankDetails model
@@ -977,6 +1012,47 @@ class DisciplinaryAction(HorillaModel):
         ordering = ["-id"]
 
 
+class DisciplinaryBlockEvent(models.Model):
+    """
+    Login block of an employee by a disciplinary action, the user is blocked
+    at block_at and unblocked at unblock_at, never for a dismissal
+    """
+
+    disciplinary_action = models.ForeignKey(
+        DisciplinaryAction,
+        on_delete=models.CASCADE,
+        related_name="block_events",
+        verbose_name=_("Disciplinary Action"),
+    )
+    employee_id = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="disciplinary_block_events",
+        verbose_name=_("Employee"),
+    )
+    block_at = models.DateTimeField(verbose_name=_("Block At"))
+    unblock_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Unblock At")
+    )
+    blocked_at = models.DateTimeField(null=True, blank=True)
+    unblocked_at = models.DateTimeField(null=True, blank=True)
+    objects = models.Manager()
+
+    class Meta:
+        """
+        Meta class to add additional options
+        """
+
+        indexes = [
+            models.Index(fields=["blocked_at", "block_at"]),
+            models.Index(fields=["unblocked_at", "unblock_at"]),
+            models.Index(fields=["disciplinary_action", "employee_id"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.employee_id} - {self.disciplinary_action}"
+
+
 class EmployeeGeneralSetting(HorillaModel):
     """
     EmployeeGeneralSetting
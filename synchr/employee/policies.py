@@ -233,19 +233,6 @@ def get_action_type_delete(action_id):
     return action.action_type
 
 
-def employee_account_block_unblock(emp_id, result):
-
-    employee = get_object_or_404(Employee, id=emp_id)
-    if not employee:
-        return redirect(disciplinary_actions)
-    user = get_object_or_404(User, id=employee.employee_user_id.id)
-    if not user:
-        return redirect(disciplinary_actions)
-    user.is_active = result
-    user.save()
-    return HttpResponse("<script>window.location.reload()</script>")
-
-
 @login_required
 @hx_request_required
 @permission_required("employee.add_disciplinaryaction")
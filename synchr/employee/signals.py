@@ -0,0 +1,151 @@
+"""
+employee/signals.py
+
+Keeps the reporting hierarchy closure table in sync with the reporting
+managers of the employee work information, and the login block events in
+sync with the disciplinary actions
+"""
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from employee.methods.disciplinary import (
+    release_block_events,
+    schedule_block_events,
+)
+from employee.methods.hierarchy import update_reporting_hierarchy
+from employee.models import (
+    Actiontype,
+    DisciplinaryAction,
+    DisciplinaryBlockEvent,
+    EmployeeWorkInformation,
+)
+from horilla.signals import post_bulk_update, pre_bulk_update
+
+
+@receiver(pre_save, sender=EmployeeWorkInformation)
+def track_previous_reporting_manager(sender, instance, **kwargs):
+    """
+    Remember the reporting manager before the save
+    """
+    instance._hierarchy_manager_id = (
+        sender.objects.entire()
+        .filter(pk=instance.pk)
+        .values_list("reporting_manager_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=EmployeeWorkInformation)
+def update_hierarchy_on_save(sender, instance, created, **kwargs):
+    """
+    Move the employee in the reporting hierarchy when the manager changes
+    """
+    if instance.employee_id_id is None:
+        return
+    if created or instance._hierarchy_manager_id != instance.reporting_manager_id_id:
+        update_reporting_hierarchy(
+            instance.employee_id_id, instance.reporting_manager_id_id
+        )
+
+
+@receiver(post_delete, sender=EmployeeWorkInformation)
+def update_hierarchy_on_delete(sender, instance, **kwargs):
+    """
+    Detach the employee from the managers above them
+    """
+    if instance.employee_id_id is not None:
+        update_reporting_hierarchy(instance.employee_id_id, None)
+
+
+@receiver(pre_bulk_update, sender=EmployeeWorkInformation)
+def track_bulk_reporting_managers(sender, queryset, *args, **kwargs):
+    """
+    Remember the reporting managers before a bulk update that changes them
+    """
+    if "reporting_manager_id" in (kwargs.get("kwargs") or {}):
+        queryset._hierarchy_managers = dict(
+            queryset.filter(employee_id__isnull=False).values_list(
+                "employee_id", "reporting_manager_id"
+            )
+        )
+
+
+@receiver(post_bulk_update, sender=EmployeeWorkInformation)
+def update_hierarchy_on_bulk_update(sender, queryset, *args, **kwargs):
+    """
+    Move the employees whose reporting manager was changed by the bulk update
+    """
+    previous_managers = getattr(queryset, "_hierarchy_managers", None)
+    if not previous_managers:
+        return
+    for employee_id, manager_id in (
+        sender.objects.entire()
+        .filter(employee_id__in=previous_managers)
+        .values_list("employee_id", "reporting_manager_id")
+    ):
+        if previous_managers[employee_id] != manager_id:
+            update_reporting_hierarchy(employee_id, manager_id)
+
+
+@receiver(post_save, sender=DisciplinaryAction)
+def schedule_disciplinary_blocks(sender, instance, **kwargs):
+    """
+    Reschedule the login blocks when the disciplinary action is saved
+    """
+    schedule_block_events(instance)
+
+
+@receiver(m2m_changed, sender=DisciplinaryAction.employee_id.through)
+def schedule_disciplinary_employee_blocks(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Reschedule the login blocks when the employees of an action change
+    """
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        schedule_block_events(instance)
+        return
+    # The disciplinary actions were changed from the employee side
+    actions = DisciplinaryAction.objects.entire().filter(
+        pk__in=(
+            pk_set
+            if pk_set is not None
+            else DisciplinaryBlockEvent.objects.filter(employee_id=instance).values(
+                "disciplinary_action_id"
+            )
+        )
+    )
+    for disciplinary_action in actions:
+        schedule_block_events(disciplinary_action)
+
+
+@receiver(pre_delete, sender=DisciplinaryAction)
+def release_disciplinary_blocks(sender, instance, **kwargs):
+    """
+    Lift the login blocks of the disciplinary action that is deleted
+    """
+    release_block_events(instance)
+
+
+@receiver(post_save, sender=Actiontype)
+def schedule_action_type_blocks(sender, instance, created, **kwargs):
+    """
+    Reschedule the login blocks of the actions of an edited action type
+    """
+    if created:
+        return
+    for disciplinary_action in DisciplinaryAction.objects.entire().filter(
+        action=instance
+    ):
+        schedule_block_events(disciplinary_action)
@@ -26,7 +26,6 @@ from django.apps import apps
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.models import User
-from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.db.models import F, ProtectedError, Exists, OuterRef
@@ -48,8 +47,6 @@ from employee.llm_document_processor import process_resume_file
 from accessibility.decorators import enter_if_accessible
 
 logger = logging.getLogger(__name__)
-from accessibility.methods import update_employee_accessibility_cache
-from accessibility.middlewares import ACCESSIBILITY_CACHE_USER_KEYS
 from accessibility.models import DefaultAccessibility
 from base.forms import ModelForm
 from base.methods import (
@@ -302,18 +299,12 @@ def profile_edit_access(request, emp_id):
         employees = Employee.objects.filter(id=emp_id)
 
         if employee := employees.first():
-            if employee in accessibility.employees.all():
+            # The accessibility matrix is rebuilt by the m2m_changed signal
+            if accessibility.employees.filter(pk=employee.pk).exists():
                 accessibility.employees.remove(employee)
             else:
                 accessibility.employees.add(employee)
 
-            user_cache_key = ACCESSIBILITY_CACHE_USER_KEYS.get(
-                employees.first().employee_user_id.id, None
-            )
-            if user_cache_key:
-                cache.delete(user_cache_key[-1])
-                update_employee_accessibility_cache(user_cache_key[-1], employee)
-
     return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/"))
 
 
@@ -9,10 +9,25 @@ from django import forms
 from django_filters import CharFilter, DateFilter
 
 from helpdesk.models import FAQ, FAQCategory, Ticket
+from helpdesk.search import search_filter
 from horilla.filters import FilterSet
 
 
-class FAQFilter(FilterSet):
+class SearchFilterSet(FilterSet):
+    """
+    Filter set with a search on the helpdesk search index
+    """
+
+    search = CharFilter(method="search_method")
+
+    def search_method(self, queryset, _, value):
+        """
+        This method is used to filter the objects matching every search term
+        """
+        return search_filter(queryset, value)
+
+
+class FAQFilter(SearchFilterSet):
     """
     Filter set class for FAQ model
 
@@ -20,8 +35,6 @@ class FAQFilter(FilterSet):
         FilterSet (class): custom filter set class to apply styling
     """
 
-    search = CharFilter(field_name="question", lookup_expr="icontains")
-
     class Meta:
         """
         Meta class to add the additional info
@@ -34,7 +47,7 @@ class FAQFilter(FilterSet):
         ]
 
 
-class FAQCategoryFilter(FilterSet):
+class FAQCategoryFilter(SearchFilterSet):
     """
     Filter set class for FAQ category model
 
@@ -42,8 +55,6 @@ class FAQCategoryFilter(FilterSet):
         FilterSet (class): custom filter set class to apply styling
     """
 
-    search = CharFilter(field_name="title", lookup_expr="icontains")
-
     class Meta:
         """
         Meta class to add the additional info
@@ -55,7 +66,7 @@ class FAQCategoryFilter(FilterSet):
         ]
 
 
-class TicketFilter(FilterSet):
+class TicketFilter(SearchFilterSet):
     """
     Filter set class for Ticket model
 
@@ -63,7 +74,6 @@ class TicketFilter(FilterSet):
         FilterSet (class): custom filter set class to apply styling
     """
 
-    search = CharFilter(field_name="title", lookup_expr="icontains")
     from_date = DateFilter(
         field_name="deadline",
         lookup_expr="gte",
@@ -111,19 +121,7 @@ class TicketReGroup:
     ]
 
 
-class FaqSearch(FilterSet):
-    search = CharFilter(method="search_method", lookup_expr="icontains")
-
+class FaqSearch(SearchFilterSet):
     class Meta:
         model = FAQ
         fields = ["search"]
-
-    def search_method(self, queryset, _, value):
-        """
-        This method is used to add custom search condition
-        """
-        return (
-            queryset.filter(question__icontains=value)
-            | queryset.filter(answer__icontains=value)
-            | queryset.filter(tags__title__icontains=value)
-        ).distinct()
@@ -0,0 +1,18 @@
+"""
+Management command to index every FAQ, FAQ category and ticket for the
+helpdesk search
+"""
+
+from django.core.management.base import BaseCommand
+
+from helpdesk.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index of the FAQs, FAQ categories and tickets"
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index()
+        self.stdout.write(
+            self.style.SUCCESS(f"Search index rebuilt for {count} helpdesk objects")
+        )
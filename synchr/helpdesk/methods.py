@@ -1,5 +1,11 @@
+import json
+import os
+
 from helpdesk.models import DepartmentManager
 
+# Parsed JSON fixtures by path, with the modification time they were read at
+_fixtures = {}
+
 
 def is_department_manager(request, ticket):
     """
@@ -16,3 +22,17 @@ def is_department_manager(request, ticket):
     return DepartmentManager.objects.filter(
         manager=user_emp, department=department
     ).exists()
+
+
+def load_fixture(path):
+    """
+    Method used to read a JSON fixture, it is parsed again only when the file
+    changes, the returned data is shared and must not be modified
+    """
+    modified = os.path.getmtime(path)
+    cached = _fixtures.get(path)
+    if cached is None or cached[0] != modified:
+        with open(path, "r") as file:
+            cached = (modified, json.load(file))
+        _fixtures[path] = cached
+    return cached[1]
@@ -312,3 +312,47 @@ class FAQ(HorillaModel):
     class Meta:
         verbose_name = _("FAQ")
         verbose_name_plural = _("FAQs")
+
+
+class SearchTerm(models.Model):
+    """
+    Inverted index of the helpdesk search, one row per term of an FAQ, FAQ
+    category or ticket weighted by the fields the term appears in
+    """
+
+    term = models.CharField(max_length=50)
+    weight = models.PositiveSmallIntegerField(default=1)
+    faq = models.ForeignKey(
+        FAQ,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="search_terms",
+    )
+    faq_category = models.ForeignKey(
+        FAQCategory,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="search_terms",
+    )
+    ticket = models.ForeignKey(
+        Ticket,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="search_terms",
+    )
+    objects = models.Manager()
+
+    class Meta:
+        """
+        Meta class to add additional options
+        """
+
+        indexes = [
+            models.Index(fields=["term"]),
+        ]
+
+    def __str__(self) -> str:
+        return self.term
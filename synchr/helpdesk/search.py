@@ -0,0 +1,228 @@
+"""
+helpdesk/search.py
+
+Full-text search of the helpdesk. The text of the FAQs, FAQ categories and
+tickets is split into terms and stored in the SearchTerm inverted index when
+they are saved, a search looks every query term up as a prefix on the term
+index and ranks the matches by the weight of their matched terms.
+"""
+
+import logging
+import re
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, Q, Sum, Value, When
+
+from helpdesk.models import FAQ, FAQCategory, SearchTerm, Ticket
+
+logger = logging.getLogger(__name__)
+
+TERM_PATTERN = re.compile(r"\w+")
+TERM_MAX_LENGTH = SearchTerm._meta.get_field("term").max_length
+MAX_WEIGHT = 32767
+MAX_QUERY_TERMS = 8
+SUGGESTION_LIMIT = 10
+REBUILD_BATCH_SIZE = 500
+
+
+class SearchDocument:
+    """
+    Weighted text of a searchable model
+
+    Attributes:
+        model: the searchable model
+        field: the field of SearchTerm pointing to the model
+        weights: weight of the terms of every text field
+        tag_weight: weight of the terms of the tags, None without tags
+    """
+
+    def __init__(self, model, field, weights, tag_weight=None):
+        self.model = model
+        self.field = field
+        self.weights = weights
+        self.tag_weight = tag_weight
+
+    def queryset(self):
+        """
+        Every object of the model with what its terms are read from
+        """
+        queryset = self.model.objects.entire()
+        if self.tag_weight:
+            queryset = queryset.prefetch_related("tags")
+        return queryset
+
+    def terms(self, instance):
+        """
+        Weight of every term of the instance
+        """
+        texts = [
+            (getattr(instance, field), weight) for field, weight in self.weights.items()
+        ]
+        if self.tag_weight:
+            texts += [(tag.title, self.tag_weight) for tag in instance.tags.all()]
+        weights = {}
+        for text, weight in texts:
+            for term in tokenize(text):
+                weights[term] = min(weights.get(term, 0) + weight, MAX_WEIGHT)
+        return weights
+
+
+FAQ_DOCUMENT = SearchDocument(FAQ, "faq", {"question": 4, "answer": 1}, tag_weight=2)
+FAQ_CATEGORY_DOCUMENT = SearchDocument(
+    FAQCategory, "faq_category", {"title": 4, "description": 1}
+)
+TICKET_DOCUMENT = SearchDocument(
+    Ticket, "ticket", {"title": 4, "description": 1}, tag_weight=2
+)
+DOCUMENTS = {
+    document.model: document
+    for document in [FAQ_DOCUMENT, FAQ_CATEGORY_DOCUMENT, TICKET_DOCUMENT]
+}
+
+
+def tokenize(text):
+    """
+    Terms of the text, the single characters are not indexed
+    """
+    terms = TERM_PATTERN.findall(str(text or "").casefold())
+    return [term[:TERM_MAX_LENGTH] for term in terms if len(term) > 1]
+
+
+def query_terms(query):
+    """
+    Distinct terms of the search query, every one of them is a prefix
+    """
+    terms = []
+    for term in TERM_PATTERN.findall(str(query or "").casefold()):
+        term = term[:TERM_MAX_LENGTH]
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def index_objects(document, instances):
+    """
+    This method is used to replace the search terms of the instances with one
+    delete and one insert
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    search_terms = [
+        SearchTerm(term=term, weight=weight, **{document.field: instance})
+        for instance in instances
+        for term, weight in document.terms(instance).items()
+    ]
+    with transaction.atomic():
+        SearchTerm.objects.filter(
+            **{f"{document.field}__in": [instance.pk for instance in instances]}
+        ).delete()
+        SearchTerm.objects.bulk_create(search_terms, batch_size=REBUILD_BATCH_SIZE)
+
+
+def index_instance(instance):
+    """
+    Index the terms of a saved FAQ, FAQ category or ticket
+    """
+    index_objects(DOCUMENTS[type(instance)], [instance])
+
+
+def index_tagged(tag_ids):
+    """
+    Index the FAQs and tickets again when their tags are renamed
+    """
+    for document in DOCUMENTS.values():
+        if document.tag_weight:
+            index_objects(
+                document, document.queryset().filter(tags__in=tag_ids).distinct()
+            )
+
+
+def rebuild_search_index():
+    """
+    Index every FAQ, FAQ category and ticket
+
+    Returns:
+        the number of indexed objects
+    """
+    count = 0
+    for document in DOCUMENTS.values():
+        batch = []
+        for instance in document.queryset().iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(instance)
+            if len(batch) == REBUILD_BATCH_SIZE:
+                index_objects(document, batch)
+                count += len(batch)
+                batch = []
+        index_objects(document, batch)
+        count += len(batch)
+    logger.info("Indexed %s helpdesk objects for search", count)
+    return count
+
+
+def _prefix(lookup, term):
+    """
+    The terms starting with term, as a range so that the term index is used
+    on every database
+    """
+    upper = term[:-1] + chr(ord(term[-1]) + 1)
+    return Q(**{f"{lookup}__gte": term, f"{lookup}__lt": upper})
+
+
+def _matches(terms, lookup):
+    """
+    Condition of the index rows matching any of the terms, and an aggregate
+    per term flagging the objects with a match of it
+    """
+    condition = Q()
+    matches = {}
+    for position, term in enumerate(terms):
+        condition |= _prefix(lookup, term)
+        matches[f"search_match_{position}"] = Max(
+            Case(
+                When(_prefix(lookup, term), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+    return condition, matches
+
+
+def search_filter(queryset, query):
+    """
+    This method is used to filter the queryset to the objects matching every
+    term of the query, it keeps the queryset composable with other filters
+    """
+    terms = query_terms(query)
+    if not terms:
+        return queryset
+    document = DOCUMENTS[queryset.model]
+    condition, matches = _matches(terms, "term")
+    matching = (
+        SearchTerm.objects.filter(condition)
+        .values(document.field)
+        .annotate(**matches)
+        .filter(**{name: 1 for name in matches})
+        .values(document.field)
+    )
+    return queryset.filter(pk__in=matching)
+
+
+def search(queryset, query):
+    """
+    This method is used to rank the objects of the queryset matching every
+    term of the query in one query on the search index
+
+    Returns:
+        the matching objects with their search_rank, best match first
+    """
+    terms = query_terms(query)
+    if not terms:
+        return queryset.none()
+    condition, matches = _matches(terms, "search_terms__term")
+    return (
+        queryset.filter(condition)
+        .annotate(search_rank=Sum("search_terms__weight"), **matches)
+        .filter(**{name: 1 for name in matches})
+        .order_by("-search_rank", "-pk")
+    )
@@ -0,0 +1,56 @@
+"""
+helpdesk/signals.py
+
+Keeps the search index of the FAQs, FAQ categories and tickets in sync with
+their text and tags
+"""
+
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from base.models import Tags
+from helpdesk.models import FAQ, FAQCategory, Ticket
+from helpdesk.search import DOCUMENTS, index_instance, index_objects, index_tagged
+
+
+@receiver(post_save, sender=FAQ)
+@receiver(post_save, sender=FAQCategory)
+@receiver(post_save, sender=Ticket)
+def index_search_terms(sender, instance, **kwargs):
+    """
+    Index the terms of the saved FAQ, FAQ category or ticket
+    """
+    index_instance(instance)
+
+
+@receiver(m2m_changed, sender=FAQ.tags.through)
+@receiver(m2m_changed, sender=Ticket.tags.through)
+def index_tag_search_terms(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Index the terms of the FAQs and tickets whose tags change
+    """
+    if not reverse:
+        if action in ["post_add", "post_remove", "post_clear"]:
+            index_instance(instance)
+        return
+    # The FAQs or tickets of a tag were changed from the tag side
+    document = DOCUMENTS[model]
+    if action == "pre_clear":
+        instance._search_cleared = list(
+            document.queryset().filter(tags=instance).values_list("pk", flat=True)
+        )
+        return
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if pk_set is None:
+        pk_set = getattr(instance, "_search_cleared", [])
+    index_objects(document, document.queryset().filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Tags)
+def index_renamed_tag_search_terms(sender, instance, created, **kwargs):
+    """
+    Index the FAQs and tickets of a tag again when it is edited
+    """
+    if not created:
+        index_tagged([instance.pk])
@@ -14,6 +14,7 @@ from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
 from django.shortcuts import redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
 from django.utils.translation import gettext as _
 from django.views.decorators.http import require_http_methods
 
@@ -48,7 +49,7 @@ from helpdesk.forms import (
     TicketTagForm,
     TicketTypeForm,
 )
-from helpdesk.methods import is_department_manager
+from helpdesk.methods import is_department_manager, load_fixture
 from helpdesk.models import (
     FAQ,
     TICKET_STATUS,
@@ -60,6 +61,7 @@ from helpdesk.models import (
     Ticket,
     TicketType,
 )
+from helpdesk.search import SUGGESTION_LIMIT, search
 from helpdesk.threading import AddAssigneeThread, RemoveAssigneeThread, TicketSendThread
 from horilla.decorators import (
     hx_request_required,
@@ -85,10 +87,8 @@ def faq_category_view(request):
     """
 
     faq_categories = FAQCategory.objects.all()
-    questions = FAQ.objects.values_list("question", flat=True)
     context = {
         "faq_categories": faq_categories,
-        "questions": list(questions),
     }
 
     return render(request, "helpdesk/faq/faq_view.html", context=context)
@@ -353,12 +353,25 @@ def faq_filter(request, id):
 
 @login_required
 def faq_suggestion(request):
-    faqs = FAQFilter(request.GET).qs
-    data_list = list(faqs.values())
-    response = {
-        "faqs": data_list,
-    }
-    return JsonResponse(response)
+    """
+    This method is used to suggest the FAQs best matching the search as it is
+    typed, the top matches are ranked in one query on the search index.
+
+    Parameters:
+        request (HttpRequest): The HTTP request object, with the "search"
+        and an optional "limit" of the suggestions.
+    """
+    query = request.GET.get("search") or request.GET.get("term", "")
+    try:
+        limit = min(int(request.GET.get("limit", SUGGESTION_LIMIT)), 50)
+    except ValueError:
+        limit = SUGGESTION_LIMIT
+    faqs = search(FAQ.objects.filter(is_active=True), query)[: max(limit, 1)]
+    data_list = list(faqs.values("id", "question", "answer", "category", "search_rank"))
+    response = JsonResponse({"faqs": data_list})
+    # Repeated keystrokes of the same prefix are served by the browser
+    patch_cache_control(response, private=True, max_age=30)
+    return response
 
 
 @login_required
@@ -1706,14 +1719,9 @@ def load_faqs(request):
     faq_category_file = os.path.join(base_dir, "load_data", "faq_category.json")
     tags_file = os.path.join(base_dir, "load_data", "tags.json")
 
-    with open(faq_category_file, "r") as cats:
-        faq_category_raw = json.load(cats)
-
-    with open(tags_file, "r") as t:
-        tags_raw = json.load(t)
-
-    with open(faq_file, "r") as faqs:
-        faq_raw = json.load(faqs)
+    faq_category_raw = load_fixture(faq_category_file)
+    tags_raw = load_fixture(tags_file)
+    faq_raw = load_fixture(faq_file)
 
     category_lookup = {item["pk"]: item["fields"]["title"] for item in faq_category_raw}
 
@@ -0,0 +1,52 @@
+"""
+cache_versions.py
+
+Version counters of the cached data. The counter is part of the key of the
+cached entries, so bumping it drops all of them at once. The counters are
+kept in the "versions" cache, which never culls them, and a counter that is
+lost anyway starts again from the current time, so the entries of an older
+value are not read again.
+"""
+
+import time
+
+from django.core.cache import caches
+
+VERSIONS_CACHE = "versions"
+
+
+def _initial_version():
+    return time.time_ns() // 1000
+
+
+def get_versions(keys):
+    """
+    Returns the current version of every key, the missing ones are started
+    """
+    versions_cache = caches[VERSIONS_CACHE]
+    versions = versions_cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions_cache.add(key, _initial_version(), timeout=None)
+            versions[key] = versions_cache.get(key, _initial_version())
+    return versions
+
+
+def get_version(key):
+    """
+    Returns the current version of the key
+    """
+    return get_versions([key])[key]
+
+
+def bump_version(key):
+    """
+    Drop the cached entries of the key by moving it to the next version
+    """
+    versions_cache = caches[VERSIONS_CACHE]
+    try:
+        return versions_cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        versions_cache.set(key, version, timeout=None)
+        return version
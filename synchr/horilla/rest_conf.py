@@ -5,7 +5,7 @@ rest_conf.py
 from datetime import timedelta
 
 from horilla import settings
-from horilla.settings import INSTALLED_APPS
+from horilla.settings import INSTALLED_APPS, MIDDLEWARE
 
 # Injecting installed apps to settings
 
@@ -13,6 +13,13 @@ REST_APPS = ["rest_framework", "rest_framework_simplejwt", "drf_yasg", "horilla_
 
 INSTALLED_APPS.extend(REST_APPS)
 
+# Counts the queries of every API request, before the other middlewares so
+# their queries are counted too
+MIDDLEWARE.insert(0, "horilla_api.middleware.QueryBudgetMiddleware")
+
+# Queries an API request may take when its view does not declare a budget
+API_QUERY_BUDGET = 50
+
 REST_FRAMEWORK_SETTINGS = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -44,3 +51,4 @@ SWAGGER_SETTINGS = {
 setattr(settings, "REST_FRAMEWORK", REST_FRAMEWORK_SETTINGS)
 setattr(settings, "SIMPLE_JWT", SIMPLE_JWT)
 setattr(settings, "SWAGGER_SETTINGS", SWAGGER_SETTINGS)
+setattr(settings, "API_QUERY_BUDGET", API_QUERY_BUDGET)
@@ -89,7 +89,6 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "chart_bot.middleware_direct.SyncAIMiddleware",  # SYNC AI widget injection (bypasses auth issues)
 ]
 
 ROOT_URLCONF = "horilla.urls"
@@ -356,18 +355,79 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 1000
 
-# Cache settings for mobile app performance
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'hrms-cache',
-        'TIMEOUT': 300,  # 5 minutes default timeout
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-            'CULL_FREQUENCY': 3,
-        }
+# Chart Bot LLM gateway
+CHART_BOT_LLM_ENDPOINT = env(
+    "CHART_BOT_LLM_ENDPOINT", default="http://125.18.84.108:11434/api/generate"
+)
+CHART_BOT_LLM_MODEL = env("CHART_BOT_LLM_MODEL", default="mistral")
+CHART_BOT_LLM_BACKEND = "chart_bot.core.llm_gateway.OllamaBackend"
+CHART_BOT_LLM_TIMEOUT = 30  # Seconds
+CHART_BOT_LLM_POOL_SIZE = 20  # Pooled connections per worker process
+
+# Chart Bot conversation history
+CHART_BOT_HISTORY_LIMIT = 20  # Messages loaded for the prompt context
+CHART_BOT_HISTORY_RETENTION_DAYS = 30  # Idle sessions older than this are removed
+
+# Cache settings, shared by every worker process so list view state and
+# pipeline snapshots survive across requests served by different workers.
+# The default database cache needs "manage.py createcachetable",
+# CACHE_BACKEND=redis works with any Redis protocol server (requires redis-py)
+# and should use a volatile-* maxmemory policy so the version counters, which
+# have no timeout, are not evicted,
+# CACHE_BACKEND=locmem keeps the old per process cache for development.
+# The version counters of the cached data (horilla/cache_versions.py) are kept
+# in the "versions" cache, which is never culled.
+CACHE_BACKEND = env("CACHE_BACKEND", default="database")
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("CACHE_URL", default="redis://127.0.0.1:6379/1"),
+            "TIMEOUT": 300,  # 5 minutes default timeout
+        },
+        "versions": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("CACHE_URL", default="redis://127.0.0.1:6379/1"),
+            "KEY_PREFIX": "versions",
+            "TIMEOUT": None,
+        },
+    }
+elif CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "hrms-cache",
+            "TIMEOUT": 300,  # 5 minutes default timeout
+            "OPTIONS": {
+                "MAX_ENTRIES": 1000,
+                "CULL_FREQUENCY": 3,
+            },
+        },
+        "versions": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "hrms-cache-versions",
+            "TIMEOUT": None,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "horilla_cache",
+            "TIMEOUT": 300,  # 5 minutes default timeout
+            "OPTIONS": {
+                "MAX_ENTRIES": 10000,
+                "CULL_FREQUENCY": 3,
+            },
+        },
+        "versions": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "horilla_cache_versions",
+            "TIMEOUT": None,
+            # A counter per cached dataset, far below the culling threshold
+            "OPTIONS": {"MAX_ENTRIES": 1000000},
+        },
     }
-}
 
 #Email settings
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
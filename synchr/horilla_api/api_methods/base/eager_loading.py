@@ -0,0 +1,33 @@
+"""
+eager_loading.py
+
+This module is used to declare the eager loading plan of the API views. The
+related rows a serializer reads for every object of a page are loaded with
+the page, and the number of queries the page may take is declared with it.
+"""
+
+
+class EagerLoadingMixin:
+    """
+    Eager loading plan of an API view
+
+    Attributes:
+        select_related: foreign keys joined into the list query
+        prefetch_related: reverse and many to many relations loaded per page
+        query_budget: queries a request may take, the API_QUERY_BUDGET
+            setting when it is None
+    """
+
+    select_related = []
+    prefetch_related = []
+    query_budget = None
+
+    def eager_load(self, queryset):
+        """
+        Apply the eager loading plan to the queryset
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
@@ -0,0 +1,286 @@
+"""
+dashboard.py
+
+This module is used to build the role based employee dashboard of the API.
+Every panel is a single grouped aggregate and the whole dashboard is cached
+per role scope and company until an employee, work information, company,
+department or job position changes.
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from base.models import Company, Department, JobPosition
+from employee.models import Employee, EmployeeWorkInformation
+from horilla.cache_versions import bump_version, get_version
+
+DASHBOARD_VERSION_KEY = "employee_dashboard_version"
+DASHBOARD_TIMEOUT = 60 * 15
+
+
+def invalidate_dashboards():
+    """
+    Drop every cached employee dashboard
+    """
+    bump_version(DASHBOARD_VERSION_KEY)
+
+
+def get_user_role(user, employee):
+    """
+    Determine user's role based on permissions and relationships, the
+    manager checks are a single aggregate over the work informations
+    """
+    if not employee:
+        return "GUEST"
+    if user.is_superuser:
+        return "SUPERUSER"
+
+    work_info = getattr(employee, "employee_work_info", None)
+    if user.has_perm("employee.view_all_employees") or user.has_perm(
+        "employee.view_employee"
+    ):
+        return "CEO" if work_info else "ADMIN"
+
+    department_id = work_info.department_id_id if work_info else None
+    counts = EmployeeWorkInformation.objects.filter(
+        Q(reporting_manager_id=employee) | Q(department_id=department_id)
+    ).aggregate(
+        subordinates=Count("id", filter=Q(reporting_manager_id=employee)),
+        # Colleagues of the department that report to someone else
+        others=Count(
+            "id",
+            filter=Q(department_id=department_id) & ~Q(reporting_manager_id=employee),
+        ),
+    )
+    if counts["subordinates"]:
+        if department_id and not counts["others"]:
+            return "DEPARTMENT_MANAGER"
+        return "TEAM_MANAGER"
+    return "EMPLOYEE"
+
+
+def get_role_scope(role, employee):
+    """
+    The part of the dashboard key the data of the role depends on
+    """
+    if role in ["SUPERUSER", "CEO"]:
+        return "all"
+    if role == "DEPARTMENT_MANAGER":
+        return f"department_{employee.employee_work_info.department_id_id}"
+    return f"employee_{getattr(employee, 'pk', None)}"
+
+
+def get_dashboard_cache_key(role, employee, company):
+    version = get_version(DASHBOARD_VERSION_KEY)
+    return (
+        f"employee_dashboard_{role}_{get_role_scope(role, employee)}"
+        f"_{company or 'all'}_v{version}"
+    )
+
+
+def get_cached_dashboard(role, employee, company, build):
+    """
+    This method is used to return the cached dashboard of the role scope
+    and company, building it on a miss
+
+    Returns:
+        the dashboard and whether it came from the cache
+    """
+    key = get_dashboard_cache_key(role, employee, company)
+    dashboard = cache.get(key)
+    if dashboard is not None:
+        return dashboard, True
+    dashboard = build()
+    cache.set(key, dashboard, timeout=DASHBOARD_TIMEOUT)
+    return dashboard, False
+
+
+def employee_totals(employees):
+    """
+    Total, active and inactive employees of the queryset in one query
+    """
+    return employees.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        inactive=Count("id", filter=Q(is_active=False)),
+    )
+
+
+def employee_counts_by(employees, field):
+    """
+    Employee count of the queryset per value of the work information field
+    """
+    return {
+        row[field]: row["count"]
+        for row in employees.order_by().values(field).annotate(count=Count("id"))
+    }
+
+
+def get_superuser_dashboard(employees):
+    """
+    Superuser dashboard with system-wide statistics
+    """
+    totals = employee_totals(employees)
+    companies_count = Company.objects.count()
+    departments_count = Department.objects.count()
+    return {
+        "role": "SUPERUSER",
+        "total_employees": totals["total"],
+        "active_employees": totals["active"],
+        "inactive_employees": totals["inactive"],
+        "companies_count": companies_count,
+        "departments_count": departments_count,
+        "system_stats": {
+            "total_users": totals["total"],
+            "total_companies": companies_count,
+            "total_departments": departments_count,
+        },
+    }
+
+
+def get_ceo_dashboard(employees):
+    """
+    CEO dashboard with company-wide statistics
+    """
+    company = employees.values_list(
+        "employee_work_info__company_id",
+        "employee_work_info__company_id__company",
+    ).first()
+    if not company or company[0] is None:
+        return {"role": "CEO", "message": "No company assigned", "total_employees": 0}
+
+    company_id, company_name = company
+    departments = list(
+        Department.objects.filter(company_id=company_id).values_list("id", "department")
+    )
+    job_positions_count = JobPosition.objects.filter(company_id=company_id).count()
+    department_counts = employee_counts_by(
+        employees, "employee_work_info__department_id"
+    )
+    totals = employee_totals(employees)
+    return {
+        "role": "CEO",
+        "company": company_name,
+        "total_employees": totals["total"],
+        "active_employees": totals["active"],
+        "departments_count": len(departments),
+        "job_positions_count": job_positions_count,
+        "department_statistics": [
+            {
+                "department": department,
+                "employee_count": department_counts.get(department_id, 0),
+            }
+            for department_id, department in departments
+        ],
+        "company_stats": {
+            "total_employees": totals["total"],
+            "total_departments": len(departments),
+            "total_positions": job_positions_count,
+        },
+    }
+
+
+def get_department_manager_dashboard(employees, manager):
+    """
+    Department manager dashboard with department statistics
+    """
+    work_info = manager.employee_work_info
+    department = work_info.department_id if work_info else None
+    if not department:
+        return {
+            "role": "DEPARTMENT_MANAGER",
+            "message": "No department assigned",
+            "total_employees": 0,
+        }
+
+    job_positions = list(
+        JobPosition.objects.filter(department_id=department).values_list(
+            "id", "job_position"
+        )
+    )
+    position_counts = employee_counts_by(
+        employees, "employee_work_info__job_position_id"
+    )
+    totals = employee_totals(employees)
+    return {
+        "role": "DEPARTMENT_MANAGER",
+        "department": department.department,
+        "total_employees": totals["total"],
+        "active_employees": totals["active"],
+        "job_positions_count": len(job_positions),
+        "position_statistics": [
+            {
+                "position": job_position,
+                "employee_count": position_counts.get(job_position_id, 0),
+            }
+            for job_position_id, job_position in job_positions
+        ],
+        "department_stats": {
+            "total_employees": totals["total"],
+            "total_positions": len(job_positions),
+            "manager_name": manager.get_full_name(),
+        },
+    }
+
+
+def get_team_manager_dashboard(employees, manager):
+    """
+    Team manager dashboard with team statistics
+    """
+    direct_subordinates = employees.filter(
+        employee_work_info__reporting_manager_id=manager
+    ).exclude(pk=manager.pk)
+    totals = employee_totals(direct_subordinates)
+    department_counts = employee_counts_by(
+        direct_subordinates, "employee_work_info__department_id__department"
+    )
+    department_counts.pop(None, None)
+    return {
+        "role": "TEAM_MANAGER",
+        "total_team_members": totals["total"],
+        "active_team_members": totals["active"],
+        "department_distribution": department_counts,
+        "team_stats": {
+            "total_members": totals["total"],
+            "active_members": totals["active"],
+            "manager_name": manager.get_full_name(),
+        },
+    }
+
+
+def get_regular_employee_dashboard(employee):
+    """
+    Regular employee dashboard with personal information
+    """
+    employee = Employee.objects.select_related(
+        "employee_work_info__department_id",
+        "employee_work_info__job_position_id",
+        "employee_work_info__reporting_manager_id",
+    ).get(pk=employee.pk)
+    work_info = getattr(employee, "employee_work_info", None)
+    return {
+        "role": "REGULAR_EMPLOYEE",
+        "employee_name": employee.get_full_name(),
+        "badge_id": employee.badge_id,
+        "email": employee.email,
+        "department": (
+            work_info.department_id.department
+            if work_info and work_info.department_id
+            else None
+        ),
+        "job_position": (
+            work_info.job_position_id.job_position
+            if work_info and work_info.job_position_id
+            else None
+        ),
+        "reporting_manager": (
+            work_info.reporting_manager_id.get_full_name()
+            if work_info and work_info.reporting_manager_id
+            else None
+        ),
+        "personal_stats": {
+            "name": employee.get_full_name(),
+            "status": "Active" if employee.is_active else "Inactive",
+            "joining_date": work_info.date_joining if work_info else None,
+        },
+    }
@@ -11,6 +11,9 @@ class AssetCategorySerializer(serializers.ModelSerializer):
         exclude = ["created_at", "created_by", "company_id", "is_active"]
 
     def get_asset_count(self, obj):
+        # List views annotate the count with the page
+        if hasattr(obj, "asset_total"):
+            return obj.asset_total
         return obj.asset_set.all().count()
 
 
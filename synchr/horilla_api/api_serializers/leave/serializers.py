@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from base.models import CompanyLeaves, Holidays
+from base.non_working_days import NonWorkingDays
 from employee.models import Employee
 from leave.methods import calculate_requested_days
 from leave.models import *
@@ -43,6 +45,7 @@ def leave_Validations(self, data):
         end_date=end_date,
         leave_type_id=leave_type_id,
         requested_days=requested_days,
+        non_working_days=NonWorkingDays.for_employee(employee),
     )
 
     total_leave_days = (
@@ -79,6 +82,19 @@ def leave_Validations(self, data):
         raise serializers.ValidationError(errors)
 
 
+def represent(serializer, nested_class, instance):
+    """
+    Representation of a related object, the nested serializer is built once
+    for the whole list instead of once per row
+    """
+    if instance is None:
+        return None
+    nested = serializer.__dict__.setdefault("_nested_serializers", {})
+    if nested_class not in nested:
+        nested[nested_class] = nested_class()
+    return nested[nested_class].to_representation(instance)
+
+
 class GetAvailableLeaveTypeSerializer(serializers.ModelSerializer):
     leave_type_id = serializers.SerializerMethodField()
     icon = serializers.SerializerMethodField()
@@ -95,9 +111,7 @@ class GetAvailableLeaveTypeSerializer(serializers.ModelSerializer):
         ]
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
     def get_icon(self, obj):
         try:
@@ -123,9 +137,7 @@ class GetAvailableLeaveTypeSerializer(serializers.ModelSerializer):
         ]
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
     def get_icon(self, obj):
         try:
@@ -155,9 +167,7 @@ class userLeaveRequestGetAllSerilaizer(serializers.ModelSerializer):
         ]
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
 
 class UserLeaveRequestGetSerilaizer(serializers.ModelSerializer):
@@ -176,9 +186,7 @@ class UserLeaveRequestGetSerilaizer(serializers.ModelSerializer):
         ]
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
 
 class LeaveRequestCreateUpdateSerializer(serializers.ModelSerializer):
@@ -307,15 +315,10 @@ class AssignLeaveGetSerializer(serializers.ModelSerializer):
         exclude = ["reset_date", "expired_date"]
 
     def get_employee_id(self, obj):
-        employee = obj.employee_id
-        if employee:
-            return EmployeeGetSerializer(employee).data
-        return None
+        return represent(self, EmployeeGetSerializer, obj.employee_id)
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
 
 class EmployeeGetSerializer(serializers.ModelSerializer):
@@ -337,6 +340,26 @@ class AvailableLeaveUpdateSerializer(serializers.ModelSerializer):
         fields = ["available_days", "carryforward_days"]
 
 
+def multiple_approve_status(leave_request, employee):
+    """
+    Approval count of a requested leave under multiple approval and whether
+    the employee approved it, read from the prefetched condition approvals
+    """
+    if leave_request.status != "requested":
+        return None
+    approvals = leave_request.leaverequestconditionapproval_set.all()
+    if not approvals:
+        return None
+    approved = [approval for approval in approvals if approval.is_approved]
+    return {
+        "count": f"{len(approved)} / {len(approvals)}",
+        "is_approved": any(
+            approval.manager_id_id == getattr(employee, "id", None)
+            for approval in approved
+        ),
+    }
+
+
 class LeaveRequestGetAllSerilaizer(serializers.ModelSerializer):
     employee_id = serializers.SerializerMethodField()
     leave_type_id = serializers.SerializerMethodField()
@@ -356,27 +379,13 @@ class LeaveRequestGetAllSerilaizer(serializers.ModelSerializer):
         ]
 
     def get_employee_id(self, obj):
-        employee = obj.employee_id
-        if employee:
-            return EmployeeGetSerializer(employee).data
-        return None
+        return represent(self, EmployeeGetSerializer, obj.employee_id)
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
     def get_multiple_approve(self, obj):
-        approvals = LeaveRequestConditionApproval.objects.filter(leave_request_id=obj)
-        employee = self.context["request"].user.employee_get
-        if approvals and obj.status == "requested":
-            is_approved = approvals.filter(is_approved=True)
-            count = f"{is_approved.count()} / {approvals.count()}"
-            is_approved = (
-                True if is_approved.filter(manager_id=employee).exists() else False
-            )
-            return {"count": count, "is_approved": is_approved}
-        return None
+        return multiple_approve_status(obj, self.context["request"].user.employee_get)
 
 
 class LeaveRequestGetSerilaizer(serializers.ModelSerializer):
@@ -396,27 +405,13 @@ class LeaveRequestGetSerilaizer(serializers.ModelSerializer):
         ]
 
     def get_employee_id(self, obj):
-        employee = obj.employee_id
-        if employee:
-            return EmployeeGetSerializer(employee).data
-        return None
+        return represent(self, EmployeeGetSerializer, obj.employee_id)
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
     def get_multiple_approve(self, obj):
-        approvals = LeaveRequestConditionApproval.objects.filter(leave_request_id=obj)
-        employee = self.context["request"].user.employee_get
-        if approvals and obj.status == "requested":
-            is_approved = approvals.filter(is_approved=True)
-            count = f"{is_approved.count()} / {approvals.count()}"
-            is_approved = (
-                True if is_approved.filter(manager_id=employee).exists() else False
-            )
-            return {"count": count, "is_approved": is_approved}
-        return None
+        return multiple_approve_status(obj, self.context["request"].user.employee_get)
 
 
 class LeaveAllocationRequestSerilaizer(serializers.ModelSerializer):
@@ -441,21 +436,13 @@ class LeaveAllocationRequestGetSerializer(serializers.ModelSerializer):
         exclude = ["requested_date", "created_at", "reject_reason"]
 
     def get_employee_id(self, obj):
-        employee = obj.employee_id
-        if employee:
-            return EmployeeGetSerializer(employee).data
-        return None
+        return represent(self, EmployeeGetSerializer, obj.employee_id)
 
     def get_leave_type_id(self, obj):
-        if obj.leave_type_id:
-            return LeaveTypeAllGetSerializer(obj.leave_type_id).data
-        return None
+        return represent(self, LeaveTypeAllGetSerializer, obj.leave_type_id)
 
     def get_created_by(self, obj):
-        created_by = obj.created_by
-        if created_by:
-            return EmployeeGetSerializer(created_by).data
-        return None
+        return represent(self, EmployeeGetSerializer, obj.created_by)
 
 
 class CompanyLeaveSerializer(serializers.ModelSerializer):
@@ -66,8 +66,9 @@ class EmployeeKeyResultSerializer(serializers.ModelSerializer):
     )
     
     def get_employee_name(self, obj):
-        if obj.employee_id:
-            return obj.employee_id.get_full_name()
+        employee_objective = obj.employee_objective_id
+        if employee_objective and employee_objective.employee_id:
+            return employee_objective.employee_id.get_full_name()
         return None
     
     class Meta:
@@ -137,9 +138,9 @@ class MeetingsSerializer(serializers.ModelSerializer):
     employee_name = serializers.SerializerMethodField()
     
     def get_employee_name(self, obj):
-        if obj.employee_id:
-            return obj.employee_id.get_full_name()
-        return None
+        # The attendees are a many to many relation
+        names = [employee.get_full_name() for employee in obj.employee_id.all()]
+        return ", ".join(names) or None
     
     class Meta:
         model = Meetings
@@ -1,5 +1,6 @@
 from datetime import date
 
+from django.db.models import Count
 from django.http import QueryDict
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
@@ -12,6 +13,7 @@ from asset.filters import AssetFilter
 from asset.models import *
 
 from ...api_filters.asset.filters import AssetCategoryFilter
+from ...api_methods.base.eager_loading import EagerLoadingMixin
 from ...api_serializers.asset.serializers import *
 
 
@@ -78,7 +80,9 @@ class AssetCategoryAPIView(APIView):
         paginator = PageNumberPagination()
         queryset = AssetCategory.objects.all()
         filterset = self.filterset_class(request.GET, queryset=queryset)
-        page = paginator.paginate_queryset(filterset.qs, request)
+        page = paginator.paginate_queryset(
+            filterset.qs.annotate(asset_total=Count("asset")), request
+        )
         serializer = AssetCategorySerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -144,8 +148,10 @@ class AssetLotAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class AssetAllocationAPIView(APIView):
+class AssetAllocationAPIView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
+    select_related = ["asset_id__asset_category_id", "assigned_to_employee_id"]
+    query_budget = 15
 
     def get_asset_assignment(self, pk):
         try:
@@ -159,7 +165,7 @@ class AssetAllocationAPIView(APIView):
             serializer = AssetAssignmentGetSerializer(asset_assignment)
             return Response(serializer.data)
         paginator = PageNumberPagination()
-        assets = AssetAssignment.objects.all()
+        assets = self.eager_load(AssetAssignment.objects.all())
         page = paginator.paginate_queryset(assets, request)
         serializer = AssetAssignmentGetSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -185,8 +191,10 @@ class AssetAllocationAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class AssetRequestAPIView(APIView):
+class AssetRequestAPIView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
+    select_related = ["asset_category_id", "requested_employee_id"]
+    query_budget = 10
 
     def get_asset_request(self, pk):
         try:
@@ -200,7 +208,7 @@ class AssetRequestAPIView(APIView):
             serializer = AssetRequestGetSerializer(asset_request)
             return Response(serializer.data)
         paginator = PageNumberPagination()
-        assets = AssetRequest.objects.all().order_by("-id")
+        assets = self.eager_load(AssetRequest.objects.all().order_by("-id"))
         page = paginator.paginate_queryset(assets, request)
         serializer = AssetRequestGetSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
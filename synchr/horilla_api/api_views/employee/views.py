@@ -1,3 +1,5 @@
+import time
+
 from django.db.models import ProtectedError, Q
 from django.http import Http404
 from django.utils.decorators import method_decorator
@@ -27,6 +29,7 @@ from employee.models import (
 from employee.views import work_info_export, work_info_import
 from horilla.decorators import owner_can_enter
 from horilla_api.api_decorators.base.decorators import permission_required
+from horilla_api.api_methods.employee import dashboard
 from horilla_api.api_methods.employee.methods import get_next_badge_id
 from horilla_documents.models import Document, DocumentRequest
 from notifications.signals import notify
@@ -1255,61 +1258,46 @@ class ReportingManagerCheck(APIView):
 class EmployeeDashboardAPIView(APIView):
     """
     Role-based employee dashboard endpoint
-    Provides different data based on user's role
+    Provides different data based on user's role, the dashboard of a role
+    scope is cached and the time spent is sent in the Server-Timing header
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        started = time.perf_counter()
         user = request.user
         employee = user.employee_get
-        
+
         # Get user's role and employees
         user_role = self.get_user_role(user, employee)
-        employees = self.get_employees_by_role(user, employee, user_role)
-        
+        company = request.session.get("selected_company")
+
         # Get dashboard data based on role
-        dashboard_data = self.get_dashboard_data(user, employee, user_role, employees)
-        
-        return Response(dashboard_data, status=200)
-    
+        dashboard_data, cached = dashboard.get_cached_dashboard(
+            user_role,
+            employee,
+            company,
+            lambda: self.get_dashboard_data(
+                user,
+                employee,
+                user_role,
+                self.get_employees_by_role(user, employee, user_role),
+            ),
+        )
+
+        response = Response(dashboard_data, status=200)
+        response["Server-Timing"] = (
+            f'dashboard;dur={(time.perf_counter() - started) * 1000:.1f};'
+            f'desc="{"hit" if cached else "miss"}"'
+        )
+        return response
+
     def get_user_role(self, user, employee):
         """
         Determine user's role based on permissions and relationships
         """
-        if not employee:
-            return "GUEST"
-        
-        # Check if superuser
-        if user.is_superuser:
-            return "SUPERUSER"
-        
-        # Check if user has view all employees permission (CEO/Admin level)
-        if user.has_perm("employee.view_all_employees") or user.has_perm("employee.view_employee"):
-            # Check if has company-level access
-            if hasattr(employee, 'employee_work_info') and employee.employee_work_info:
-                return "CEO"
-            return "ADMIN"
-        
-        # Check if user is a manager (has subordinates)
-        is_manager = EmployeeWorkInformation.objects.filter(
-            reporting_manager_id=employee
-        ).exists()
-        
-        if is_manager:
-            # Check if department manager
-            if hasattr(employee, 'employee_work_info') and employee.employee_work_info:
-                dept = employee.employee_work_info.department_id
-                if dept:
-                    # Check if manages entire department
-                    dept_employees = EmployeeWorkInformation.objects.filter(
-                        department_id=dept
-                    ).exclude(reporting_manager_id=employee)
-                    if not dept_employees.exists():
-                        return "DEPARTMENT_MANAGER"
-            return "TEAM_MANAGER"
-        
-        return "EMPLOYEE"
-    
+        return dashboard.get_user_role(user, employee)
+
     def get_employees_by_role(self, user, employee, role):
         """
         Get employees based on user's role
@@ -1343,176 +1331,16 @@ class EmployeeDashboardAPIView(APIView):
         Get dashboard data based on user's role
         """
         if role == "SUPERUSER":
-            return self.get_superuser_dashboard(employees)
+            return dashboard.get_superuser_dashboard(employees)
         elif role == "CEO":
-            return self.get_ceo_dashboard(employees)
+            return dashboard.get_ceo_dashboard(employees)
         elif role == "DEPARTMENT_MANAGER":
-            return self.get_department_manager_dashboard(employees, employee)
+            return dashboard.get_department_manager_dashboard(employees, employee)
         elif role == "TEAM_MANAGER":
-            return self.get_team_manager_dashboard(employees, employee)
+            return dashboard.get_team_manager_dashboard(employees, employee)
         else:
-            return self.get_regular_employee_dashboard(employee)
-
-    def get_superuser_dashboard(self, employees):
-        """
-        Superuser dashboard with system-wide statistics
-        """
-        from base.models import Company, Department
-        
-        companies = Company.objects.all()
-        departments = Department.objects.all()
-        
-        return {
-            "role": "SUPERUSER",
-            "total_employees": employees.count(),
-            "active_employees": employees.filter(is_active=True).count(),
-            "inactive_employees": employees.filter(is_active=False).count(),
-            "companies_count": companies.count(),
-            "departments_count": departments.count(),
-            "system_stats": {
-                "total_users": employees.count(),
-                "total_companies": companies.count(),
-                "total_departments": departments.count()
-            }
-        }
+            return dashboard.get_regular_employee_dashboard(employee)
 
-    def get_ceo_dashboard(self, employees):
-        """
-        CEO dashboard with company-wide statistics
-        """
-        from base.models import Department, JobPosition
-        
-        company = employees.first().get_company() if employees.exists() else None
-        
-        if company:
-            departments = Department.objects.filter(company_id=company)
-            job_positions = JobPosition.objects.filter(company_id=company)
-            
-            # Department-wise employee count
-            dept_stats = []
-            for dept in departments:
-                dept_employee_count = employees.filter(
-                    employee_work_info__department_id=dept
-                ).count()
-                dept_stats.append({
-                    "department": dept.department,
-                    "employee_count": dept_employee_count
-                })
-            
-            return {
-                "role": "CEO",
-                "company": company.company,
-                "total_employees": employees.count(),
-                "active_employees": employees.filter(is_active=True).count(),
-                "departments_count": departments.count(),
-                "job_positions_count": job_positions.count(),
-                "department_statistics": dept_stats,
-                "company_stats": {
-                    "total_employees": employees.count(),
-                    "total_departments": departments.count(),
-                    "total_positions": job_positions.count()
-                }
-            }
-        
-        return {
-            "role": "CEO",
-            "message": "No company assigned",
-            "total_employees": 0
-        }
-
-    def get_department_manager_dashboard(self, employees, manager):
-        """
-        Department manager dashboard with department statistics
-        """
-        work_info = manager.employee_work_info
-        department = work_info.department_id if work_info else None
-        
-        if department:
-            # Get job positions in the department
-            job_positions = JobPosition.objects.filter(department_id=department)
-            
-            # Position-wise employee count
-            position_stats = []
-            for position in job_positions:
-                position_employee_count = employees.filter(
-                    employee_work_info__job_position_id=position
-                ).count()
-                position_stats.append({
-                    "position": position.job_position,
-                    "employee_count": position_employee_count
-                })
-            
-            return {
-                "role": "DEPARTMENT_MANAGER",
-                "department": department.department,
-                "total_employees": employees.count(),
-                "active_employees": employees.filter(is_active=True).count(),
-                "job_positions_count": job_positions.count(),
-                "position_statistics": position_stats,
-                "department_stats": {
-                    "total_employees": employees.count(),
-                    "total_positions": job_positions.count(),
-                    "manager_name": manager.get_full_name()
-                }
-            }
-        
-        return {
-            "role": "DEPARTMENT_MANAGER",
-            "message": "No department assigned",
-            "total_employees": 0
-        }
-
-    def get_team_manager_dashboard(self, employees, manager):
-        """
-        Team manager dashboard with team statistics
-        """
-        # Get direct subordinates
-        direct_subordinates = employees.filter(
-            employee_work_info__reporting_manager_id=manager
-        ).exclude(pk=manager.pk)
-        
-        # Get subordinates by department
-        dept_stats = {}
-        for emp in direct_subordinates:
-            dept = emp.get_department()
-            if dept:
-                dept_name = dept.department
-                if dept_name not in dept_stats:
-                    dept_stats[dept_name] = 0
-                dept_stats[dept_name] += 1
-        
-        return {
-            "role": "TEAM_MANAGER",
-            "total_team_members": direct_subordinates.count(),
-            "active_team_members": direct_subordinates.filter(is_active=True).count(),
-            "department_distribution": dept_stats,
-            "team_stats": {
-                "total_members": direct_subordinates.count(),
-                "active_members": direct_subordinates.filter(is_active=True).count(),
-                "manager_name": manager.get_full_name()
-            }
-        }
-
-    def get_regular_employee_dashboard(self, employee):
-        """
-        Regular employee dashboard with personal information
-        """
-        work_info = employee.employee_work_info
-        
-        return {
-            "role": "REGULAR_EMPLOYEE",
-            "employee_name": employee.get_full_name(),
-            "badge_id": employee.badge_id,
-            "email": employee.email,
-            "department": work_info.department_id.department if work_info and work_info.department_id else None,
-            "job_position": work_info.job_position_id.job_position if work_info and work_info.job_position_id else None,
-            "reporting_manager": work_info.reporting_manager_id.get_full_name() if work_info and work_info.reporting_manager_id else None,
-            "personal_stats": {
-                "name": employee.get_full_name(),
-                "status": "Active" if employee.is_active else "Inactive",
-                "joining_date": work_info.date_joining if work_info else None
-            }
-        }
 
 class RoleBasedEmployeeListAPIView(APIView):
     """
@@ -19,25 +19,33 @@ from leave.models import LeaveRequest
 from notifications.signals import notify
 
 from ...api_decorators.base.decorators import manager_permission_required
+from ...api_methods.base.eager_loading import EagerLoadingMixin
 from ...api_methods.base.methods import groupby_queryset
 
+LEAVE_REQUEST_SELECT_RELATED = ["employee_id", "leave_type_id"]
+LEAVE_REQUEST_PREFETCH_RELATED = ["leaverequestconditionapproval_set"]
 
-class EmployeeAvailableLeaveGetAPIView(APIView):
+
+class EmployeeAvailableLeaveGetAPIView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
+    select_related = ["leave_type_id"]
+    query_budget = 10
 
     def get(self, request):
         employee = request.user.employee_get
-        available_leave = employee.available_leave.all()
+        available_leave = self.eager_load(employee.available_leave.all())
         paginator = PageNumberPagination()
         page = paginator.paginate_queryset(available_leave, request)
         serializer = GetAvailableLeaveTypeSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
 
-class EmployeeLeaveRequestGetCreateAPIView(APIView):
+class EmployeeLeaveRequestGetCreateAPIView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = UserLeaveRequestFilter
+    select_related = ["leave_type_id"]
+    query_budget = 12
 
     def get(self, request):
         employee = request.user.employee_get
@@ -48,7 +56,7 @@ class EmployeeLeaveRequestGetCreateAPIView(APIView):
         if field_name:
             url = request.build_absolute_uri()
             return groupby_queryset(request, url, field_name, filterset.qs)
-        page = paginator.paginate_queryset(filterset.qs, request)
+        page = paginator.paginate_queryset(self.eager_load(filterset.qs), request)
         serializer = userLeaveRequestGetAllSerilaizer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -209,10 +217,12 @@ class LeaveTypeGetUpdateDeleteAPIView(APIView):
         return Response(status=201)
 
 
-class LeaveAllocationRequestGetCreateAPIView(APIView):
+class LeaveAllocationRequestGetCreateAPIView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = LeaveAllocationRequestFilter
+    select_related = ["employee_id", "leave_type_id", "created_by"]
+    query_budget = 12
 
     def get_user(self, request):
         user = request.user
@@ -232,7 +242,7 @@ class LeaveAllocationRequestGetCreateAPIView(APIView):
         if field_name:
             url = request.build_absolute_uri()
             return groupby_queryset(request, url, field_name, filterset.qs)
-        page = paginator.paginate_queryset(filterset.qs, request)
+        page = paginator.paginate_queryset(self.eager_load(filterset.qs), request)
         serializer = LeaveAllocationRequestGetSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -304,11 +314,13 @@ class LeaveAllocationRequestGetUpdateDeleteAPIView(APIView):
         raise serializers.ValidationError({"error": "Access Denied.."})
 
 
-class AssignLeaveGetCreateAPIView(APIView):
+class AssignLeaveGetCreateAPIView(EagerLoadingMixin, APIView):
 
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = AssignedLeaveFilter
+    select_related = ["employee_id", "leave_type_id"]
+    query_budget = 10
 
     @method_decorator(
         permission_required("leave.view_availableleave", raise_exception=True),
@@ -325,7 +337,7 @@ class AssignLeaveGetCreateAPIView(APIView):
         if field_name:
             url = request.build_absolute_uri()
             return groupby_queryset(request, url, field_name, filterset.qs)
-        page = paginator.paginate_queryset(filterset.qs, request)
+        page = paginator.paginate_queryset(self.eager_load(filterset.qs), request)
         serializer = AssignLeaveGetSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -405,10 +417,13 @@ class AssignLeaveGetUpdateDeleteAPIView(APIView):
         return Response(status=200)
 
 
-class LeaveRequestGetCreateAPIView(APIView):
+class LeaveRequestGetCreateAPIView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = LeaveRequestFilter
+    select_related = LEAVE_REQUEST_SELECT_RELATED
+    prefetch_related = LEAVE_REQUEST_PREFETCH_RELATED
+    query_budget = 20
 
     @manager_permission_required("leave.view_leaverequest")
     def get(self, request):
@@ -424,7 +439,7 @@ class LeaveRequestGetCreateAPIView(APIView):
         if field_name:
             url = request.build_absolute_uri()
             return groupby_queryset(request, url, field_name, filterset.qs)
-        page = paginator.paginate_queryset(filterset.qs, request)
+        page = paginator.paginate_queryset(self.eager_load(filterset.qs), request)
         serializer = LeaveRequestGetAllSerilaizer(
             page, context={"request": request}, many=True
         )
@@ -676,6 +691,7 @@ class LeaveRequestApproveAPIView(APIView):
             temp = available_leave.available_days
             available_leave.available_days = temp - leave_request.requested_days
             leave_request.approved_available_days = leave_request.requested_days
+        available_leave.set_ledger_entry("consumption", leave_request)
         available_leave.save()
 
     def leave_multiple_approve(self, request, leave_request, available_leave):
@@ -748,6 +764,7 @@ class LeaveRequestRejectAPIView(APIView):
         )
         available_leave.available_days += leave_request.approved_available_days
         available_leave.carryforward_days += leave_request.approved_carryforward_days
+        available_leave.set_ledger_entry("refund", leave_request)
         available_leave.save()
         leave_request.approved_available_days = 0
         leave_request.approved_carryforward_days = 0
@@ -817,6 +834,7 @@ class LeaveAllocationApproveAPIView(APIView):
             leave_type_id=leave_allocation_request.leave_type_id,
         )[0]
         available_leave.available_days += leave_allocation_request.requested_days
+        available_leave.set_ledger_entry("allocation", note="Leave allocation request")
         available_leave.save()
 
     @manager_permission_required("leave.change_leaveallocationrequest")
@@ -850,6 +868,9 @@ class LeaveAllocationRequestRejectAPIView(APIView):
             available_leave.available_days = max(
                 0, available_leave.available_days - requested_days
             )
+            available_leave.set_ledger_entry(
+                "adjustment", note="Leave allocation request rejected"
+            )
             available_leave.save()
 
     @manager_permission_required("leave.change_leaveallocationrequest")
@@ -893,6 +914,7 @@ class LeaveRequestBulkApproveDeleteAPIview(APIView):
             temp = available_leave.available_days
             available_leave.available_days = temp - leave_request.requested_days
             leave_request.approved_available_days = leave_request.requested_days
+        available_leave.set_ledger_entry("consumption", leave_request)
         available_leave.save()
 
     @manager_permission_required("leave.change_leaverequest")
@@ -920,10 +942,12 @@ class LeaveRequestBulkApproveDeleteAPIview(APIView):
         return Response(status=200)
 
 
-class EmployeeLeaveAllocationGetCreateAPIView(APIView):
+class EmployeeLeaveAllocationGetCreateAPIView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = LeaveAllocationRequestFilter
+    select_related = ["employee_id", "leave_type_id", "created_by"]
+    query_budget = 10
 
     def get_user(self, request):
         user = request.user
@@ -940,7 +964,7 @@ class EmployeeLeaveAllocationGetCreateAPIView(APIView):
         if field_name:
             url = request.build_absolute_uri()
             return groupby_queryset(request, url, field_name, filterset.qs)
-        page = paginator.paginate_queryset(filterset.qs, request)
+        page = paginator.paginate_queryset(self.eager_load(filterset.qs), request)
         serializer = LeaveAllocationRequestGetSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -1118,11 +1142,20 @@ class AllLeaveDetailsAPIView(APIView):
 
     def get(self, request):
         context = {"request": request}
+        leave_requests = LeaveRequest.objects.select_related(
+            *LEAVE_REQUEST_SELECT_RELATED
+        ).prefetch_related(*LEAVE_REQUEST_PREFETCH_RELATED)
+        allocations = LeaveAllocationRequest.objects.select_related(
+            "employee_id", "leave_type_id", "created_by"
+        )
+        assigned_leaves = AvailableLeave.objects.select_related(
+            "employee_id", "leave_type_id"
+        )
         data = {
-            "leave_requests": LeaveRequestGetAllSerilaizer(LeaveRequest.objects.all(), many=True, context=context).data,
+            "leave_requests": LeaveRequestGetAllSerilaizer(leave_requests, many=True, context=context).data,
             "leave_types": LeaveTypeAllGetSerializer(LeaveType.objects.all(), many=True, context=context).data,
-            "allocations": LeaveAllocationRequestGetSerializer(LeaveAllocationRequest.objects.all(), many=True, context=context).data,
-            "assigned_leaves": AssignLeaveGetSerializer(AvailableLeave.objects.all(), many=True, context=context).data,
+            "allocations": LeaveAllocationRequestGetSerializer(allocations, many=True, context=context).data,
+            "assigned_leaves": AssignLeaveGetSerializer(assigned_leaves, many=True, context=context).data,
             "holidays": HoildaySerializer(Holiday.objects.all(), many=True, context=context).data,
             "company_leaves": CompanyLeaveSerializer(CompanyLeave.objects.all(), many=True, context=context).data,
         }
@@ -17,6 +17,7 @@ from offboarding.models import (
     OffboardingGeneralSetting,
 )
 
+from ...api_methods.base.eager_loading import EagerLoadingMixin
 from ...api_serializers.offboarding.serializers import (
     OffboardingSerializer,
     OffboardingStageSerializer,
@@ -30,9 +31,16 @@ from ...api_serializers.offboarding.serializers import (
 )
 
 
-def create_crud_view(model_class, serializer_class, model_name):
-    """Helper function to create CRUD views"""
-    class CRUDView(APIView):
+def create_crud_view(
+    model_class,
+    serializer_class,
+    model_name,
+    select_related=None,
+    prefetch_related=None,
+    query_budget=None,
+):
+    """Helper function to create CRUD views with their eager loading plan"""
+    class CRUDView(EagerLoadingMixin, APIView):
         permission_classes = [IsAuthenticated]
 
         def get(self, request, pk=None):
@@ -47,7 +55,7 @@ def create_crud_view(model_class, serializer_class, model_name):
                         status=status.HTTP_404_NOT_FOUND,
                     )
             paginator = PageNumberPagination()
-            queryset = model_class.objects.all()
+            queryset = self.eager_load(model_class.objects.all())
             page = paginator.paginate_queryset(queryset, request)
             serializer = serializer_class(page, many=True)
             return paginator.get_paginated_response(serializer.data)
@@ -89,16 +97,76 @@ def create_crud_view(model_class, serializer_class, model_name):
             except ProtectedError as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
+    CRUDView.select_related = select_related or []
+    CRUDView.prefetch_related = prefetch_related or []
+    CRUDView.query_budget = query_budget
     return CRUDView
 
 
-OffboardingAPIView = create_crud_view(Offboarding, OffboardingSerializer, "Offboarding")
-OffboardingStageAPIView = create_crud_view(OffboardingStage, OffboardingStageSerializer, "OffboardingStage")
-OffboardingEmployeeAPIView = create_crud_view(OffboardingEmployee, OffboardingEmployeeSerializer, "OffboardingEmployee")
-ResignationLetterAPIView = create_crud_view(ResignationLetter, ResignationLetterSerializer, "ResignationLetter")
-OffboardingTaskAPIView = create_crud_view(OffboardingTask, OffboardingTaskSerializer, "OffboardingTask")
-EmployeeTaskAPIView = create_crud_view(EmployeeTask, EmployeeTaskSerializer, "EmployeeTask")
-ExitReasonAPIView = create_crud_view(ExitReason, ExitReasonSerializer, "ExitReason")
-OffboardingNoteAPIView = create_crud_view(OffboardingNote, OffboardingNoteSerializer, "OffboardingNote")
-OffboardingGeneralSettingAPIView = create_crud_view(OffboardingGeneralSetting, OffboardingGeneralSettingSerializer, "OffboardingGeneralSetting")
+OffboardingAPIView = create_crud_view(
+    Offboarding,
+    OffboardingSerializer,
+    "Offboarding",
+    prefetch_related=["managers"],
+    query_budget=12,
+)
+OffboardingStageAPIView = create_crud_view(
+    OffboardingStage,
+    OffboardingStageSerializer,
+    "OffboardingStage",
+    select_related=["offboarding_id"],
+    prefetch_related=["managers"],
+    query_budget=10,
+)
+OffboardingEmployeeAPIView = create_crud_view(
+    OffboardingEmployee,
+    OffboardingEmployeeSerializer,
+    "OffboardingEmployee",
+    select_related=["employee_id", "stage_id"],
+    query_budget=10,
+)
+ResignationLetterAPIView = create_crud_view(
+    ResignationLetter,
+    ResignationLetterSerializer,
+    "ResignationLetter",
+    select_related=["employee_id"],
+    query_budget=10,
+)
+OffboardingTaskAPIView = create_crud_view(
+    OffboardingTask,
+    OffboardingTaskSerializer,
+    "OffboardingTask",
+    select_related=["stage_id"],
+    prefetch_related=["managers"],
+    query_budget=10,
+)
+EmployeeTaskAPIView = create_crud_view(
+    EmployeeTask,
+    EmployeeTaskSerializer,
+    "EmployeeTask",
+    select_related=["employee_id__employee_id", "task_id"],
+    query_budget=10,
+)
+ExitReasonAPIView = create_crud_view(
+    ExitReason,
+    ExitReasonSerializer,
+    "ExitReason",
+    select_related=["offboarding_employee_id__employee_id"],
+    prefetch_related=["attachments"],
+    query_budget=10,
+)
+OffboardingNoteAPIView = create_crud_view(
+    OffboardingNote,
+    OffboardingNoteSerializer,
+    "OffboardingNote",
+    select_related=["note_by"],
+    prefetch_related=["attachments"],
+    query_budget=10,
+)
+OffboardingGeneralSettingAPIView = create_crud_view(
+    OffboardingGeneralSetting,
+    OffboardingGeneralSettingSerializer,
+    "OffboardingGeneralSetting",
+    query_budget=10,
+)
 
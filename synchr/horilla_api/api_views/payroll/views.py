@@ -30,6 +30,7 @@ from payroll.models.tax_models import TaxBracket
 from payroll.threadings.mail import MailSendThread
 from payroll.views.views import payslip_pdf
 
+from ...api_methods.base.eager_loading import EagerLoadingMixin
 from ...api_methods.base.methods import groupby_queryset
 from ...api_serializers.payroll.serializers import (
     AllowanceSerializer,
@@ -42,8 +43,14 @@ from ...api_serializers.payroll.serializers import (
 )
 
 
-class PayslipView(APIView):
+class PayslipView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
+    select_related = [
+        "employee_id__employee_work_info__department_id",
+        "employee_id__employee_bank_details",
+    ]
+    prefetch_related = ["installment_ids"]
+    query_budget = 10
 
     def get(self, request, id=None):
         if id:
@@ -61,7 +68,9 @@ class PayslipView(APIView):
                 employee_id__employee_user_id=request.user
             )
 
-        payslip_filter_queryset = PayslipFilter(request.GET, payslips).qs
+        payslip_filter_queryset = PayslipFilter(
+            request.GET, self.eager_load(payslips)
+        ).qs
         # groupby workflow
         field_name = request.GET.get("groupby_field", None)
         if field_name:
@@ -140,8 +149,10 @@ class PayslipSendMailView(APIView):
         return Response({"status": "success"}, status=200)
 
 
-class ContractView(APIView):
+class ContractView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
+    select_related = ["employee_id"]
+    query_budget = 25
 
     def get(self, request, id=None):
         if id:
@@ -152,7 +163,7 @@ class ContractView(APIView):
             contracts = Contract.objects.all()
         else:
             contracts = Contract.objects.filter(employee_id=request.user.employee_get)
-        filter_queryset = ContractFilter(request.GET, contracts).qs
+        filter_queryset = ContractFilter(request.GET, self.eager_load(contracts)).qs
         # groupby workflow
         field_name = request.GET.get("groupby_field", None)
         if field_name:
@@ -278,8 +289,11 @@ class DeductionView(APIView):
         return Response({"status": "deleted"}, status=200)
 
 
-class LoanAccountView(APIView):
+class LoanAccountView(EagerLoadingMixin, APIView):
     permission_classes = [IsAuthenticated]
+    select_related = ["employee_id__employee_work_info__job_position_id"]
+    prefetch_related = ["deduction_ids"]
+    query_budget = 10
 
     @method_decorator(permission_required("payroll.add_loanaccount"))
     def post(self, request):
@@ -295,7 +309,7 @@ class LoanAccountView(APIView):
             loan_account = LoanAccount.objects.get(id=pk)
             serializer = LoanAccountSerializer(instance=loan_account)
             return Response(serializer.data, status=200)
-        loan_accounts = LoanAccount.objects.all()
+        loan_accounts = self.eager_load(LoanAccount.objects.all())
         pagination = PageNumberPagination()
         page = pagination.paginate_queryset(loan_accounts, request)
         serializer = LoanAccountSerializer(page, many=True)
@@ -317,9 +331,12 @@ class LoanAccountView(APIView):
         return Response(status=200)
 
 
-class ReimbursementView(APIView):
+class ReimbursementView(EagerLoadingMixin, APIView):
     serializer_class = ReimbursementSerializer
     permission_classes = [IsAuthenticated]
+    select_related = ["employee_id", "leave_type_id"]
+    prefetch_related = ["other_attachments", "allowance_id"]
+    query_budget = 12
 
     def get(self, request, pk=None):
         if pk:
@@ -335,7 +352,7 @@ class ReimbursementView(APIView):
                 employee_id=request.user.employee_get
             )
         pagination = PageNumberPagination()
-        page = pagination.paginate_queryset(reimbursements, request)
+        page = pagination.paginate_queryset(self.eager_load(reimbursements), request)
         serializer = self.serializer_class(page, many=True)
         return pagination.get_paginated_response(serializer.data)
 
@@ -22,6 +22,7 @@ from pms.models import (
     BonusPointSetting,
 )
 
+from ...api_methods.base.eager_loading import EagerLoadingMixin
 from ...api_serializers.pms.serializers import (
     PeriodSerializer,
     KeyResultSerializer,
@@ -40,9 +41,16 @@ from ...api_serializers.pms.serializers import (
 )
 
 
-def create_crud_view(model_class, serializer_class, model_name):
-    """Helper function to create CRUD views"""
-    class CRUDView(APIView):
+def create_crud_view(
+    model_class,
+    serializer_class,
+    model_name,
+    select_related=None,
+    prefetch_related=None,
+    query_budget=None,
+):
+    """Helper function to create CRUD views with their eager loading plan"""
+    class CRUDView(EagerLoadingMixin, APIView):
         permission_classes = [IsAuthenticated]
 
         def get(self, request, pk=None):
@@ -57,7 +65,7 @@ def create_crud_view(model_class, serializer_class, model_name):
                         status=status.HTTP_404_NOT_FOUND,
                     )
             paginator = PageNumberPagination()
-            queryset = model_class.objects.all()
+            queryset = self.eager_load(model_class.objects.all())
             page = paginator.paginate_queryset(queryset, request)
             serializer = serializer_class(page, many=True)
             return paginator.get_paginated_response(serializer.data)
@@ -99,21 +107,113 @@ def create_crud_view(model_class, serializer_class, model_name):
             except ProtectedError as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
+    CRUDView.select_related = select_related or []
+    CRUDView.prefetch_related = prefetch_related or []
+    CRUDView.query_budget = query_budget
     return CRUDView
 
 
-PeriodAPIView = create_crud_view(Period, PeriodSerializer, "Period")
-KeyResultAPIView = create_crud_view(KeyResult, KeyResultSerializer, "KeyResult")
-ObjectiveAPIView = create_crud_view(Objective, ObjectiveSerializer, "Objective")
-EmployeeObjectiveAPIView = create_crud_view(EmployeeObjective, EmployeeObjectiveSerializer, "EmployeeObjective")
-EmployeeKeyResultAPIView = create_crud_view(EmployeeKeyResult, EmployeeKeyResultSerializer, "EmployeeKeyResult")
-FeedbackAPIView = create_crud_view(Feedback, FeedbackSerializer, "Feedback")
-QuestionTemplateAPIView = create_crud_view(QuestionTemplate, QuestionTemplateSerializer, "QuestionTemplate")
-QuestionAPIView = create_crud_view(Question, QuestionSerializer, "Question")
-QuestionOptionsAPIView = create_crud_view(QuestionOptions, QuestionOptionsSerializer, "QuestionOptions")
-AnswerAPIView = create_crud_view(Answer, AnswerSerializer, "Answer")
-MeetingsAPIView = create_crud_view(Meetings, MeetingsSerializer, "Meetings")
-MeetingsAnswerAPIView = create_crud_view(MeetingsAnswer, MeetingsAnswerSerializer, "MeetingsAnswer")
-EmployeeBonusPointAPIView = create_crud_view(EmployeeBonusPoint, EmployeeBonusPointSerializer, "EmployeeBonusPoint")
-BonusPointSettingAPIView = create_crud_view(BonusPointSetting, BonusPointSettingSerializer, "BonusPointSetting")
+PeriodAPIView = create_crud_view(
+    Period,
+    PeriodSerializer,
+    "Period",
+    prefetch_related=["company_id"],
+    query_budget=12,
+)
+KeyResultAPIView = create_crud_view(
+    KeyResult,
+    KeyResultSerializer,
+    "KeyResult",
+    query_budget=12,
+)
+ObjectiveAPIView = create_crud_view(
+    Objective,
+    ObjectiveSerializer,
+    "Objective",
+    prefetch_related=["managers", "assignees", "key_result_id"],
+    query_budget=12,
+)
+EmployeeObjectiveAPIView = create_crud_view(
+    EmployeeObjective,
+    EmployeeObjectiveSerializer,
+    "EmployeeObjective",
+    select_related=["employee_id", "objective_id"],
+    prefetch_related=["key_result_id"],
+    query_budget=12,
+)
+EmployeeKeyResultAPIView = create_crud_view(
+    EmployeeKeyResult,
+    EmployeeKeyResultSerializer,
+    "EmployeeKeyResult",
+    select_related=["key_result_id", "employee_objective_id__employee_id"],
+    query_budget=10,
+)
+FeedbackAPIView = create_crud_view(
+    Feedback,
+    FeedbackSerializer,
+    "Feedback",
+    select_related=["employee_id"],
+    prefetch_related=[
+        "colleague_id",
+        "subordinate_id",
+        "others_id",
+        "employee_key_results_id",
+    ],
+    query_budget=15,
+)
+QuestionTemplateAPIView = create_crud_view(
+    QuestionTemplate,
+    QuestionTemplateSerializer,
+    "QuestionTemplate",
+    prefetch_related=["company_id"],
+    query_budget=10,
+)
+QuestionAPIView = create_crud_view(
+    Question,
+    QuestionSerializer,
+    "Question",
+    select_related=["template_id"],
+    query_budget=10,
+)
+QuestionOptionsAPIView = create_crud_view(
+    QuestionOptions,
+    QuestionOptionsSerializer,
+    "QuestionOptions",
+    select_related=["question_id"],
+    query_budget=10,
+)
+AnswerAPIView = create_crud_view(
+    Answer,
+    AnswerSerializer,
+    "Answer",
+    select_related=["question_id", "employee_id"],
+    query_budget=10,
+)
+MeetingsAPIView = create_crud_view(
+    Meetings,
+    MeetingsSerializer,
+    "Meetings",
+    prefetch_related=["employee_id", "manager", "answer_employees"],
+    query_budget=12,
+)
+MeetingsAnswerAPIView = create_crud_view(
+    MeetingsAnswer,
+    MeetingsAnswerSerializer,
+    "MeetingsAnswer",
+    select_related=["meeting_id", "question_id", "employee_id"],
+    query_budget=10,
+)
+EmployeeBonusPointAPIView = create_crud_view(
+    EmployeeBonusPoint,
+    EmployeeBonusPointSerializer,
+    "EmployeeBonusPoint",
+    select_related=["employee_id"],
+    query_budget=10,
+)
+BonusPointSettingAPIView = create_crud_view(
+    BonusPointSetting,
+    BonusPointSettingSerializer,
+    "BonusPointSetting",
+    query_budget=10,
+)
 
@@ -0,0 +1,131 @@
+"""
+Management command to check the API list endpoints against their query budget
+"""
+
+import re
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from horilla_api.api_methods.base.eager_loading import EagerLoadingMixin
+from horilla_api.middleware import API_PATH_PREFIX, get_query_budget
+
+# Regex routes serving the list and the detail view, like (?P<pk>\d+)?
+OPTIONAL_GROUP = re.compile(r"\(\?P<\w+>[^()]*\)\?")
+
+
+class RollBack(Exception):
+    pass
+
+
+def url_endpoints(patterns, prefix="/"):
+    """
+    Paths and views of the url patterns without path arguments
+    """
+    for pattern in patterns:
+        route = prefix + OPTIONAL_GROUP.sub("", str(pattern.pattern))
+        if pattern.pattern.converters or "(?P<" in route:
+            continue
+        route = route.replace("^", "").rstrip("$")
+        if isinstance(pattern, URLResolver):
+            yield from url_endpoints(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            yield route, getattr(pattern.callback, "view_class", None)
+
+
+def budgeted_endpoints():
+    """
+    Paths and views of the API endpoints whose view declares an eager
+    loading plan or a query budget, once per view as the API is mounted
+    under more than one prefix
+    """
+    seen = set()
+    for route, view_class in url_endpoints(get_resolver().url_patterns):
+        if (
+            view_class is None
+            or view_class in seen
+            or not route.startswith(API_PATH_PREFIX)
+        ):
+            continue
+        if (
+            issubclass(view_class, EagerLoadingMixin)
+            or getattr(view_class, "query_budget", None) is not None
+        ):
+            seen.add(view_class)
+            yield route, view_class
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every API list endpoint with an eager loading plan as a "
+        "superuser and fail when one runs more queries than its budget"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fixture",
+            action="append",
+            default=[],
+            help="Fixture loaded before the requests and rolled back after them",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            default=[],
+            help="Only check the endpoints starting with this path",
+        )
+
+    def handle(self, *args, **options):
+        results = []
+        try:
+            with transaction.atomic():
+                if options["fixture"]:
+                    call_command("loaddata", *options["fixture"], verbosity=0)
+                results = self.check_endpoints(options["path"])
+                raise RollBack
+        except RollBack:
+            pass
+
+        exceeded = [result for result in results if result[2] > result[3]]
+        for path, status_code, count, budget in results:
+            line = f"{path} [{status_code}] {count}/{budget} queries"
+            self.stdout.write(self.style.ERROR(line) if count > budget else line)
+        if exceeded:
+            raise CommandError(
+                f"{len(exceeded)} of {len(results)} endpoints are over their "
+                "query budget"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(results)} endpoints are within their budget")
+        )
+
+    def check_endpoints(self, paths):
+        superusers = User.objects.filter(is_superuser=True, is_active=True)
+        # Most list endpoints read the employee of the user
+        user = (
+            superusers.filter(employee_get__isnull=False).first() or superusers.first()
+        )
+        if user is None:
+            raise CommandError("A superuser is needed to request the endpoints")
+        client = APIClient(raise_request_exception=False)
+        client.force_authenticate(user=user)
+        results = []
+        for path, view_class in budgeted_endpoints():
+            if paths and not any(path.startswith(prefix) for prefix in paths):
+                continue
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(path)
+            results.append(
+                (
+                    path,
+                    response.status_code,
+                    len(context.captured_queries),
+                    get_query_budget(view_class),
+                )
+            )
+        return results
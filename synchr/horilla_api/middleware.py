@@ -0,0 +1,88 @@
+"""
+middleware.py
+
+This module is used to count the queries and the database time of every API
+request. The numbers are sent in the Server-Timing and X-Query-Count
+headers, and the endpoints that go over their query budget are logged.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+API_PATH_PREFIX = "/api/"
+DEFAULT_QUERY_BUDGET = 50
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries and their time
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+def get_query_budget(view_class):
+    """
+    Query budget of the view, the API_QUERY_BUDGET setting by default
+    """
+    budget = getattr(view_class, "query_budget", None)
+    if budget is None:
+        budget = getattr(settings, "API_QUERY_BUDGET", DEFAULT_QUERY_BUDGET)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries of the API requests and flag the endpoints going over
+    the query budget of their view
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith(API_PATH_PREFIX):
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+
+        budget = getattr(request, "query_budget", None)
+        timing = f'db;dur={counter.duration * 1000:.1f};desc="{counter.count} queries"'
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+        response["X-Query-Count"] = counter.count
+        if budget is not None and counter.count > budget:
+            match = request.resolver_match
+            logger.warning(
+                "%s %s ran %s queries in %.1f ms, the budget is %s",
+                request.method,
+                match.route if match else request.path,
+                counter.count,
+                counter.duration * 1000,
+                budget,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.path.startswith(API_PATH_PREFIX):
+            request.query_budget = get_query_budget(
+                getattr(view_func, "view_class", None)
+            )
@@ -0,0 +1,28 @@
+# horilla_api/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from base.models import Company, Department, JobPosition
+from employee.models import Employee, EmployeeWorkInformation
+from horilla.signals import post_bulk_update
+from horilla_api.api_methods.employee.dashboard import invalidate_dashboards
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_bulk_update, sender=Employee)
+@receiver(post_save, sender=EmployeeWorkInformation)
+@receiver(post_delete, sender=EmployeeWorkInformation)
+@receiver(post_bulk_update, sender=EmployeeWorkInformation)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=JobPosition)
+@receiver(post_delete, sender=JobPosition)
+def refresh_employee_dashboards(sender, **kwargs):
+    """
+    Drop the cached employee dashboards when the records they count change
+    """
+    invalidate_dashboards()
@@ -1,3 +1,86 @@
+from os import path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from horilla_api.api_views.leave.views import LeaveRequestGetCreateAPIView
+from horilla_api.management.commands.check_api_query_budget import (
+    budgeted_endpoints,
+)
+from horilla_api.middleware import get_query_budget
+from leave.models import LeaveRequest
+
+DEMO_DATA = [
+    "user_data.json",
+    "employee_info_data.json",
+    "base_data.json",
+    "work_info_data.json",
+    "leave_data.json",
+    "asset_data.json",
+    "offboarding_data.json",
+    "pms_data.json",
+    "payroll_data.json",
+]
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Query ceilings of the API list endpoints with an eager loading plan,
+    requested against the demo data so every page holds several rows
+    """
+
+    fixtures = [path.join(settings.BASE_DIR, "load_data", file) for file in DEMO_DATA]
+
+    def setUp(self):
+        self.user = User.objects.filter(
+            is_superuser=True, employee_get__isnull=False
+        ).first()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        # The first request opens the session, counted on no endpoint
+        self.client.get("/api/v1/leave/leave-types/")
+
+    def get(self, url):
+        # A fresh user as on a real request, without the cached employee
+        self.client.force_authenticate(user=User.objects.get(pk=self.user.pk))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, len(context.captured_queries)
+
+    def test_every_budgeted_view_declares_its_budget(self):
+        for route, view_class in budgeted_endpoints():
+            with self.subTest(route=route):
+                self.assertIsNotNone(view_class.query_budget)
+
+    def test_list_endpoints_stay_within_their_budget(self):
+        for route, view_class in budgeted_endpoints():
+            with self.subTest(route=route):
+                response, count = self.get(route)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(count, view_class.query_budget)
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        url = "/api/v1/leave/leave-request/"
+        _, full_page = self.get(url)
+        first = LeaveRequest.objects.entire().order_by("-id").first()
+        LeaveRequest.objects.entire().exclude(pk=first.pk).delete()
+        response, single_row = self.get(url)
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(full_page, single_row)
+
+    def test_middleware_reports_the_query_count(self):
+        response, count = self.get("/api/v1/leave/leave-request/")
 
-# Create your tests here.
+        # The middleware runs inside the captured queries, after the session
+        self.assertLessEqual(int(response["X-Query-Count"]), count)
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertEqual(
+            get_query_budget(LeaveRequestGetCreateAPIView),
+            LeaveRequestGetCreateAPIView.query_budget,
+        )
@@ -0,0 +1,73 @@
+"""
+Management command to remove duplicate audit history entries in batches
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from horilla_audit.methods import compact_history
+from horilla_audit.models import HorillaAuditInfo
+
+
+class Command(BaseCommand):
+    help = "Remove history records that do not change any tracked field"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            type=str,
+            help="Models to compact as app_label.ModelName (default: all audited models)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of objects whose history is processed at a time (default: 500)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show how many records would be removed without removing them",
+        )
+
+    def get_history_models(self, labels):
+        history_models = [
+            model for model in apps.get_models() if issubclass(model, HorillaAuditInfo)
+        ]
+        if not labels:
+            return history_models
+        selected = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise CommandError(f"Model '{label}' not found.")
+            history_model = next(
+                (item for item in history_models if item.instance_type is model),
+                None,
+            )
+            if history_model is None:
+                raise CommandError(f"Model '{label}' has no audit history.")
+            selected.append(history_model)
+        return selected
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        total = 0
+        for history_model in self.get_history_models(options["models"]):
+            removed = compact_history(
+                history_model, batch_size=batch_size, dry_run=dry_run
+            )
+            total += removed
+            if removed:
+                self.stdout.write(
+                    f"{history_model._meta.label}: {removed} duplicate records"
+                )
+        if dry_run:
+            self.stdout.write(f"Would remove {total} duplicate history records")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Removed {total} duplicate history records")
+            )
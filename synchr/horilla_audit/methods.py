@@ -5,6 +5,7 @@ This module is used to write methods related to the history
 """
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.db import models
 from django.shortcuts import render
@@ -23,31 +24,80 @@ class Bot:
         return "https://ui-avatars.com/api/?name=Horilla+Bot&background=random"
 
 
-def _check_and_delete(entry1, entry2, dry_run=False):
-    delta = entry1.diff_against(entry2)
-    if not delta.changed_fields:
-        if not dry_run:
-            entry1.delete()
-        return 1
-    return 0
+HISTORY_TRACKING_FIELDS_CACHE_KEY = "horilla_audit_history_tracking_fields"
 
 
-def remove_duplicate_history(instance):
+def get_history_tracking_fields(model):
     """
-    This method is used to remove duplicate entries
+    This method is used to get the fields configured in HistoryTrackingFields
+    for the model, None means every field is tracked
     """
-    o_qs = instance.history_set.all()
+    if model._meta.model_name != "employeeworkinformation":
+        return None
+    track_fields = cache.get(HISTORY_TRACKING_FIELDS_CACHE_KEY)
+    if track_fields is None:
+        from .models import HistoryTrackingFields
+
+        history_tracking_instance = HistoryTrackingFields.objects.first()
+        track_fields = []
+        if history_tracking_instance and history_tracking_instance.tracking_fields:
+            track_fields = (
+                history_tracking_instance.tracking_fields.get("tracking_fields") or []
+            )
+        cache.set(HISTORY_TRACKING_FIELDS_CACHE_KEY, track_fields)
+    return track_fields or None
+
+
+def is_duplicate_history(history_instance, previous=None):
+    """
+    This method is used to check whether the history record changes nothing
+    compared to the previous record of the same object
+    """
+    if history_instance.history_type != "~":
+        return False
+    if previous is None:
+        previous = history_instance.prev_record
+    if previous is None:
+        return False
+    fields = {field.name for field in previous.tracked_fields if field.editable}
+    track_fields = get_history_tracking_fields(history_instance.instance_type)
+    if track_fields:
+        fields = fields.intersection(track_fields)
+    delta = history_instance.diff_against(previous, included_fields=fields)
+    return not delta.changed_fields
+
+
+def compact_history(history_model, batch_size=500, dry_run=False):
+    """
+    This method is used to remove the duplicate entries already stored for
+    a history model, processing the history of batch_size objects at a time
+    """
+    object_field = history_model.instance_type._meta.pk.attname
+    manager = history_model._default_manager
+    object_ids = list(
+        manager.order_by(object_field).values_list(object_field, flat=True).distinct()
+    )
     entries_deleted = 0
-    # ordering is ('-history_date', '-history_id') so this is ok
-    f1 = o_qs.first()
-    if not f1:
-        return
-    for f2 in o_qs[1:]:
-        entries_deleted += _check_and_delete(
-            f1,
-            f2,
-        )
-        f1 = f2
+    for index in range(0, len(object_ids), batch_size):
+        entries = manager.filter(
+            **{f"{object_field}__in": object_ids[index : index + batch_size]}
+        ).order_by(object_field, "history_date", "history_id")
+        previous = None
+        duplicate_ids = []
+        for entry in entries:
+            if (
+                previous is not None
+                and getattr(previous, object_field) == getattr(entry, object_field)
+                and is_duplicate_history(entry, previous)
+            ):
+                # keep comparing against the last record that is kept
+                duplicate_ids.append(entry.pk)
+                continue
+            previous = entry
+        if duplicate_ids and not dry_run:
+            manager.filter(pk__in=duplicate_ids).delete()
+        entries_deleted += len(duplicate_ids)
+    return entries_deleted
 
 
 def get_field_label(model_class, field_name):
@@ -77,7 +127,6 @@ def get_diff(instance):
     """
     This method is used to find the differences in the history
     """
-    remove_duplicate_history(instance)
     history = instance.history_set.all()
     history_list = list(history)
     pairs = [
@@ -87,6 +136,8 @@ def get_diff(instance):
     create_history = history.filter(history_type="+").first()
     for pair in pairs:
         delta = pair[0].diff_against(pair[1])
+        if not delta.changed_fields:
+            continue
         diffs = []
         class_name = pair[0].instance.__class__
         for change in delta.changes:
@@ -142,13 +193,9 @@ def get_diff(instance):
             }
         )
     if instance._meta.model_name == "employeeworkinformation":
-        from .models import HistoryTrackingFields
-
-        history_tracking_instance = HistoryTrackingFields.objects.first()
-        if history_tracking_instance and history_tracking_instance.tracking_fields:
-            track_fields = history_tracking_instance.tracking_fields["tracking_fields"]
-            if track_fields:
-                delta_changes = filter_history(delta_changes, track_fields)
+        track_fields = get_history_tracking_fields(instance.__class__)
+        if track_fields:
+            delta_changes = filter_history(delta_changes, track_fields)
     return delta_changes
 
 
@@ -4,7 +4,9 @@ models.py
 
 from collections.abc import Iterable
 
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from simple_history.models import (
     HistoricalRecords,
@@ -19,7 +21,10 @@ from simple_history.signals import (  # pre_create_historical_m2m_records,; post
 
 # from employee.models import Employee
 from horilla.models import HorillaModel
-from horilla_audit.methods import remove_duplicate_history
+from horilla_audit.methods import (
+    HISTORY_TRACKING_FIELDS_CACHE_KEY,
+    is_duplicate_history,
+)
 
 # Create your models here.
 
@@ -104,14 +109,19 @@ def post_create_horilla_audit_log(sender, instance, *_args, **kwargs):
     """
     Post create horill audit log method
     """
+    history_instance = kwargs["history_instance"]
+    if isinstance(history_instance, HorillaAuditInfo) and is_duplicate_history(
+        history_instance
+    ):
+        # nothing tracked changed since the previous record of the object
+        history_instance.delete()
+        return
     try:
-        history_instance = kwargs["history_instance"]
         history_instance.history_tags.set(
             HistoricalRecords.thread.request.POST.getlist("history_tags")
         )
         if isinstance(history_instance, HorillaAuditLog):
             history_instance.history_title = "Demo Title"
-            remove_duplicate_history(instance)
             if instance.skip_history:
                 instance.history_set.filter(pk=history_instance.pk).delete()
             kwargs["history_instance"] = None
@@ -124,6 +134,15 @@ class HistoryTrackingFields(HorillaModel):
     work_info_track = models.BooleanField(default=True)
 
 
+@receiver(post_save, sender=HistoryTrackingFields)
+@receiver(post_delete, sender=HistoryTrackingFields)
+def clear_history_tracking_fields_cache(sender, instance, **kwargs):
+    """
+    Clear the cached tracking fields when the settings change
+    """
+    cache.delete(HISTORY_TRACKING_FIELDS_CACHE_KEY)
+
+
 class AccountBlockUnblock(HorillaModel):
     is_enabled = models.BooleanField(default=False, null=True, blank=True)
     objects = models.Manager()
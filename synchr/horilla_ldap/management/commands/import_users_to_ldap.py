@@ -2,10 +2,11 @@ import base64
 import hashlib
 
 from django.core.management.base import BaseCommand
-from ldap3 import ALL, ALL_ATTRIBUTES, Connection, Server
+from ldap3 import ALL, Connection, Server
 
 from employee.models import Employee
 from horilla_ldap.models import LDAPSettings
+from horilla_ldap.sync import existing_uids
 
 
 class Command(BaseCommand):
@@ -38,8 +39,11 @@ class Command(BaseCommand):
         try:
             conn = Connection(server, bind_dn, bind_password, auto_bind=True)
 
+            # The users already in LDAP, read once instead of a search per user
+            ldap_uids = existing_uids(conn, base_dn)
+
             # Fetch all users from Django
-            users = Employee.objects.all()
+            users = Employee.objects.all().select_related("employee_user_id")
 
             for user in users:
                 if not user.employee_user_id:
@@ -75,13 +79,7 @@ class Command(BaseCommand):
                 }
 
                 # Check if the user already exists in LDAP
-                conn.search(
-                    base_dn,
-                    f"(uid={user.employee_user_id.username})",
-                    attributes=ALL_ATTRIBUTES,
-                )
-
-                if conn.entries:
+                if user.employee_user_id.username in ldap_uids:
                     self.stdout.write(
                         self.style.WARNING(
                             f"{user.employee_first_name} {user.employee_last_name} already exists in LDAP. Skipping..."
@@ -1,5 +1,7 @@
 from django.db import models
 
+from employee.models import Employee
+
 # Create your models here.
 
 
@@ -11,3 +13,41 @@ class LDAPSettings(models.Model):
 
     def __str__(self):
         return f"LDAP Settings ({self.ldap_server})"
+
+
+class LDAPSyncState(models.Model):
+    """
+    Watermark of the last directory sync of a base DN, the next sync only
+    reads the entries changed since
+    """
+
+    base_dn = models.CharField(max_length=255, unique=True)
+    watermark_attribute = models.CharField(max_length=50)
+    watermark = models.CharField(max_length=64, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.base_dn} ({self.watermark_attribute} {self.watermark})"
+
+
+class LDAPEntry(models.Model):
+    """
+    Attributes of a directory entry as of its last sync, a changed entry is
+    diffed against them and its password is hashed again only when the
+    digest of its credential changes
+    """
+
+    dn = models.CharField(max_length=255, unique=True)
+    employee = models.ForeignKey(
+        Employee,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="ldap_entries",
+    )
+    attributes = models.JSONField(default=dict)
+    credential_digest = models.CharField(max_length=128, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.dn
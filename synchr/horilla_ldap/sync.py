@@ -0,0 +1,300 @@
+"""
+horilla_ldap/sync.py
+
+Delta sync of the LDAP directory into the employees. The entries changed
+since the watermark of the last sync are read with a paged search, diffed
+against the attributes stored at that sync, and only the changed employees
+and users are written in bulk. A password is hashed again only when the
+credential it is made from changes.
+
+The sync works on any ldap3 connection, so it runs the same against the
+in-process mock server of ldap3 (client_strategy=MOCK_SYNC).
+"""
+
+import logging
+import re
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from ldap3 import ALL, SUBTREE, Connection, Server
+from ldap3.utils.conv import escape_filter_chars
+
+from employee.models import Employee
+from horilla_ldap.models import LDAPEntry, LDAPSyncState
+
+logger = logging.getLogger(__name__)
+
+OBJECT_FILTER = "(objectClass=inetOrgPerson)"
+SYNC_ATTRIBUTES = ["uid", "mail", "givenName", "sn", "cn", "telephoneNumber"]
+EMPLOYEE_FIELDS = {
+    "employee_first_name": "givenName",
+    "employee_last_name": "sn",
+    "phone": "telephoneNumber",
+}
+# modifyTimestamp for OpenLDAP, uSNChanged for Active Directory
+WATERMARK_ATTRIBUTE = getattr(
+    settings, "LDAP_SYNC_WATERMARK_ATTRIBUTE", "modifyTimestamp"
+)
+NUMERIC_WATERMARKS = ["uSNChanged"]
+PAGE_SIZE = getattr(settings, "LDAP_SYNC_PAGE_SIZE", 500)
+
+
+def connect(ldap_settings):
+    """
+    Bound ldap3 connection of the LDAP settings
+    """
+    server = Server(ldap_settings.ldap_server, get_info=ALL)
+    return Connection(
+        server,
+        user=ldap_settings.bind_dn,
+        password=ldap_settings.bind_password,
+        auto_bind=True,
+    )
+
+
+def ldap_password(values):
+    """
+    The password of a directory user, the digits of their phone number
+    """
+    return re.sub(r"[^\d]", "", values.get("telephoneNumber", ""))
+
+
+def credential_digest(password):
+    """
+    Keyed digest of the credential, compared instead of checking the stored
+    password hash
+    """
+    return salted_hmac("horilla_ldap.credential", password).hexdigest()
+
+
+def _watermark_key(attribute, value):
+    if attribute in NUMERIC_WATERMARKS:
+        return int(value or 0)
+    return value or ""
+
+
+def _first_values(raw_attributes, names):
+    values = {}
+    for name in names:
+        raw = raw_attributes.get(name) or [b""]
+        values[name] = raw[0].decode("utf-8")
+    return values
+
+
+def read_entries(connection, base_dn, watermark_attribute, watermark=""):
+    """
+    This method is used to read the directory users changed since the
+    watermark page by page, every user is yielded as (dn, values)
+    """
+    search_filter = OBJECT_FILTER
+    if watermark:
+        search_filter = (
+            f"(&{OBJECT_FILTER}"
+            f"({watermark_attribute}>={escape_filter_chars(watermark)}))"
+        )
+    entries = connection.extend.standard.paged_search(
+        base_dn,
+        search_filter,
+        search_scope=SUBTREE,
+        attributes=SYNC_ATTRIBUTES + [watermark_attribute],
+        paged_size=PAGE_SIZE,
+        generator=True,
+    )
+    for entry in entries:
+        if entry.get("type") != "searchResEntry":
+            continue
+        yield entry["dn"], _first_values(
+            entry["raw_attributes"], SYNC_ATTRIBUTES + [watermark_attribute]
+        )
+
+
+def _users_by_identity(entries):
+    """
+    The users of the entries by username and by email
+    """
+    identities = set()
+    emails = set()
+    for _dn, values in entries:
+        identities.update([values["mail"], values["uid"]])
+        emails.add(values["mail"])
+    users = User.objects.filter(
+        Q(username__in=identities - {""}) | Q(email__in=emails - {""})
+    )
+    by_username = {}
+    by_email = {}
+    for user in users:
+        by_username[user.username] = user
+        by_email.setdefault(user.email, user)
+    return by_username, by_email
+
+
+def apply_entries(entries, result):
+    """
+    This method is used to write a page of changed directory users, the
+    employees, users and stored entries are updated in bulk and only the
+    new employees are saved one by one
+    """
+    stored = LDAPEntry.objects.in_bulk([dn for dn, _values in entries], field_name="dn")
+    changed = []
+    for dn, values in entries:
+        attributes = {name: values[name] for name in SYNC_ATTRIBUTES}
+        entry = stored.get(dn)
+        if entry and entry.attributes == attributes:
+            result["unchanged"] += 1
+        elif not attributes["mail"]:
+            result["skipped"].append(dn)
+        else:
+            changed.append((dn, attributes))
+    if not changed:
+        return
+
+    employees = Employee.objects.entire().in_bulk(
+        [attributes["mail"] for _dn, attributes in changed], field_name="email"
+    )
+    by_username, by_email = _users_by_identity(changed)
+    updated_employees = []
+    updated_users = {}
+    entries_to_save = []
+    with transaction.atomic():
+        for dn, attributes in changed:
+            employee = employees.get(attributes["mail"])
+            defaults = {
+                field: attributes[name] for field, name in EMPLOYEE_FIELDS.items()
+            }
+            if employee is None:
+                # Saving a new employee creates their user
+                employee = Employee(email=attributes["mail"], **defaults)
+                employee.save()
+                result["created"] += 1
+            elif any(
+                getattr(employee, key) != value for key, value in defaults.items()
+            ):
+                for key, value in defaults.items():
+                    setattr(employee, key, value)
+                updated_employees.append(employee)
+
+            user = (
+                by_username.get(attributes["mail"])
+                or by_username.get(attributes["uid"])
+                or by_email.get(attributes["mail"])
+                or employee.employee_user_id
+            )
+            if user is None:
+                # Not stored, so a full sync tries the entry again
+                result["missing_users"].append(
+                    f"{attributes['givenName']} {attributes['sn']}".strip()
+                )
+                continue
+            password = ldap_password(attributes)
+            digest = credential_digest(password)
+            entry = stored.get(dn)
+            changed_credential = not entry or entry.credential_digest != digest
+            if changed_credential:
+                user.password = make_password(password)
+                result["passwords"] += 1
+            if changed_credential or user.username != attributes["mail"]:
+                user.username = attributes["mail"]
+                updated_users[user.pk] = user
+            entries_to_save.append(
+                LDAPEntry(
+                    dn=dn,
+                    employee=employee,
+                    attributes=attributes,
+                    credential_digest=digest,
+                    synced_at=timezone.now(),
+                )
+            )
+
+        Employee.objects.bulk_update(updated_employees, list(EMPLOYEE_FIELDS))
+        User.objects.bulk_update(updated_users.values(), ["username", "password"])
+        LDAPEntry.objects.bulk_create(
+            entries_to_save,
+            update_conflicts=True,
+            unique_fields=["dn"],
+            update_fields=["employee", "attributes", "credential_digest", "synced_at"],
+        )
+    result["updated"] += len(updated_employees)
+
+
+def sync_directory(connection, base_dn, full=False, watermark_attribute=None):
+    """
+    This method is used to sync the directory users changed since the last
+    sync of the base DN into the employees, a full sync reads every user but
+    still writes only the changed ones
+
+    Returns:
+        the counts of the sync, with the entries skipped without a mail and
+        the names of the entries without a user
+    """
+    watermark_attribute = watermark_attribute or WATERMARK_ATTRIBUTE
+    state, _created = LDAPSyncState.objects.get_or_create(
+        base_dn=base_dn, defaults={"watermark_attribute": watermark_attribute}
+    )
+    watermark = state.watermark
+    if full or state.watermark_attribute != watermark_attribute:
+        watermark = ""
+    result = {
+        "read": 0,
+        "unchanged": 0,
+        "created": 0,
+        "updated": 0,
+        "passwords": 0,
+        "skipped": [],
+        "missing_users": [],
+    }
+    next_watermark = watermark
+    page = []
+    for dn, values in read_entries(connection, base_dn, watermark_attribute, watermark):
+        result["read"] += 1
+        changed_at = values.pop(watermark_attribute)
+        if _watermark_key(watermark_attribute, changed_at) > _watermark_key(
+            watermark_attribute, next_watermark
+        ):
+            next_watermark = changed_at
+        page.append((dn, values))
+        if len(page) == PAGE_SIZE:
+            apply_entries(page, result)
+            page = []
+    apply_entries(page, result)
+
+    # The watermark moves only once every changed entry is written, the
+    # entries at the watermark are read again and found unchanged
+    state.watermark_attribute = watermark_attribute
+    state.watermark = next_watermark
+    state.synced_at = timezone.now()
+    state.save()
+    logger.info(
+        "LDAP sync of %s: %s read, %s unchanged, %s created, %s updated, "
+        "%s passwords",
+        base_dn,
+        result["read"],
+        result["unchanged"],
+        result["created"],
+        result["updated"],
+        result["passwords"],
+    )
+    return result
+
+
+def existing_uids(connection, base_dn):
+    """
+    The uids of the directory users, read page by page
+    """
+    entries = connection.extend.standard.paged_search(
+        base_dn,
+        OBJECT_FILTER,
+        search_scope=SUBTREE,
+        attributes=["uid"],
+        paged_size=PAGE_SIZE,
+        generator=True,
+    )
+    return {
+        _first_values(entry["raw_attributes"], ["uid"])["uid"]
+        for entry in entries
+        if entry.get("type") == "searchResEntry"
+    }
@@ -1,3 +1,138 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from ldap3 import MOCK_SYNC, MODIFY_REPLACE, Connection, Server
+
+from employee.models import Employee
+from horilla_ldap import sync
+from horilla_ldap.models import LDAPEntry, LDAPSyncState
+
+BASE_DN = "ou=users,dc=horilla,dc=com"
+BIND_DN = "cn=admin,dc=horilla,dc=com"
+
+
+class SyncDirectoryTest(TestCase):
+    """
+    Delta sync of the directory against the in-process mock server of ldap3
+    """
+
+    def setUp(self):
+        self.connection = Connection(
+            Server("mock_server"),
+            user=BIND_DN,
+            password="horilla",
+            client_strategy=MOCK_SYNC,
+        )
+        self.connection.strategy.add_entry(
+            BIND_DN, {"userPassword": "horilla", "sn": "admin"}
+        )
+        self.connection.bind()
+        for number in range(3):
+            self.add_user(number, f"2026010{number + 1}000000Z")
+        self.searches = 0
+        search = self.connection.search
+
+        def count_search(*args, **kwargs):
+            self.searches += 1
+            return search(*args, **kwargs)
+
+        self.connection.search = count_search
+        page_size = mock.patch.object(sync, "PAGE_SIZE", 2)
+        page_size.start()
+        self.addCleanup(page_size.stop)
+
+    def add_user(self, number, changed_at, phone=None):
+        self.connection.strategy.add_entry(
+            f"uid=user{number},{BASE_DN}",
+            {
+                "objectClass": ["inetOrgPerson"],
+                "uid": f"user{number}",
+                "mail": f"user{number}@horilla.com",
+                "givenName": f"User{number}",
+                "sn": "Ldap",
+                "cn": f"User{number} Ldap",
+                "telephoneNumber": phone or f"+1 555 000{number}",
+                "modifyTimestamp": changed_at,
+            },
+        )
+
+    def sync(self, full=False):
+        self.searches = 0
+        return sync.sync_directory(self.connection, BASE_DN, full=full)
+
+    def test_first_sync_reads_pages_and_creates_employees(self):
+        result = self.sync()
+
+        self.assertEqual(self.searches, 2)
+        self.assertEqual(result["read"], 3)
+        self.assertEqual(result["created"], 3)
+        self.assertEqual(result["passwords"], 3)
+        self.assertEqual(LDAPEntry.objects.count(), 3)
+        employee = Employee.objects.entire().get(email="user1@horilla.com")
+        self.assertEqual(employee.employee_first_name, "User1")
+        self.assertTrue(employee.employee_user_id.check_password("15550001"))
+        state = LDAPSyncState.objects.get(base_dn=BASE_DN)
+        self.assertEqual(state.watermark, "20260103000000Z")
+
+    def test_next_sync_reads_from_the_watermark(self):
+        self.sync()
+        self.add_user(3, "20260105000000Z")
+
+        result = self.sync()
+
+        # Only the entry at the watermark and the new one are read
+        self.assertEqual(result["read"], 2)
+        self.assertEqual(result["unchanged"], 1)
+        self.assertEqual(result["created"], 1)
+        state = LDAPSyncState.objects.get(base_dn=BASE_DN)
+        self.assertEqual(state.watermark, "20260105000000Z")
+
+    def test_unchanged_entries_are_skipped(self):
+        self.sync()
+
+        with mock.patch.object(sync, "make_password") as make_password:
+            result = self.sync(full=True)
+
+        self.assertEqual(result["read"], 3)
+        self.assertEqual(result["unchanged"], 3)
+        self.assertEqual(result["updated"], 0)
+        self.assertEqual(result["passwords"], 0)
+        make_password.assert_not_called()
+
+    def test_only_changed_credentials_are_hashed(self):
+        self.sync()
+        passwords = dict(User.objects.values_list("username", "password"))
+        self.connection.modify(
+            f"uid=user0,{BASE_DN}",
+            {
+                "sn": [(MODIFY_REPLACE, ["Directory"])],
+                "modifyTimestamp": [(MODIFY_REPLACE, ["20260106000000Z"])],
+            },
+        )
+        self.connection.modify(
+            f"uid=user2,{BASE_DN}",
+            {
+                "telephoneNumber": [(MODIFY_REPLACE, ["+1 555 9999"])],
+                "modifyTimestamp": [(MODIFY_REPLACE, ["20260106000000Z"])],
+            },
+        )
+
+        result = self.sync()
 
-# Create your tests here.
+        self.assertEqual(result["read"], 2)
+        # The phone number of user2 is both an employee field and the password
+        self.assertEqual(result["updated"], 2)
+        self.assertEqual(result["passwords"], 1)
+        users = {user.username: user for user in User.objects.all()}
+        self.assertEqual(
+            users["user0@horilla.com"].password, passwords["user0@horilla.com"]
+        )
+        self.assertEqual(
+            users["user1@horilla.com"].password, passwords["user1@horilla.com"]
+        )
+        self.assertTrue(users["user2@horilla.com"].check_password("15559999"))
+        self.assertEqual(
+            Employee.objects.entire().get(email="user0@horilla.com").employee_last_name,
+            "Directory",
+        )
@@ -367,12 +367,10 @@ def sortby(
     """
     request = getattr(_thread_locals, "request", None)
     sort_key = query_dict[key]
-    if not CACHE.get(request.session.session_key + "cbvsortby"):
-        CACHE.set(request.session.session_key + "cbvsortby", Reverse())
-        CACHE.get(request.session.session_key + "cbvsortby").page = (
-            "1" if not query_dict.get(page) else query_dict.get(page)
-        )
     reverse_object = CACHE.get(request.session.session_key + "cbvsortby")
+    if not reverse_object:
+        reverse_object = Reverse()
+        reverse_object.page = "1" if not query_dict.get(page) else query_dict.get(page)
     reverse = reverse_object.reverse
     none_ids = []
     none_queryset = []
@@ -420,21 +418,12 @@ def update_saved_filter_cache(request, cache):
     """
     Method to save filter on cache
     """
-    if cache.get(request.session.session_key + request.path + "cbv"):
-        cache.get(request.session.session_key + request.path + "cbv").update(
-            {
-                "path": request.path,
-                "query_dict": request.GET,
-                # "request": request,
-            }
-        )
-        return cache
+    # The cache hands out copies, so the entry is always written back
     cache.set(
         request.session.session_key + request.path + "cbv",
         {
             "path": request.path,
             "query_dict": request.GET,
-            # "request": request,
         },
     )
     return cache
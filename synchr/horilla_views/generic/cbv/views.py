@@ -1492,8 +1492,8 @@ class HorillaProfileView(DetailView):
         context["display_count"] = display_count
         context["actions"] = self.actions
         context["filter_class"] = self.filter_class
+        # SearchInIds rebuilds the instances from the filter class
         cache = {
-            "instances": context["instances"],
             "instance_ids": context["instance_ids"],
             "filter_class": context["filter_class"],
             "view_id": context["view_id"],
@@ -26,33 +26,6 @@ class Bot:
         return "https://ui-avatars.com/api/?name=Horilla+Bot&background=random"
 
 
-def _check_and_delete(entry1, entry2, dry_run=False):
-    delta = entry1.diff_against(entry2)
-    if not delta.changed_fields:
-        if not dry_run:
-            entry1.delete()
-        return 1
-    return 0
-
-
-def remove_duplicate_history(instance, history_related_name):
-    """
-    This method is used to remove duplicate entries
-    """
-    o_qs = getattr(instance, history_related_name).all()
-    entries_deleted = 0
-    # ordering is ('-history_date', '-history_id') so this is ok
-    f1 = o_qs.first()
-    if not f1:
-        return
-    for f2 in o_qs[1:]:
-        entries_deleted += _check_and_delete(
-            f1,
-            f2,
-        )
-        f1 = f2
-
-
 def get_field_label(model_class, field_name):
     # Check if the field exists in the model class
     if hasattr(model_class, field_name):
@@ -80,7 +53,6 @@ def get_diff(instance, history_related_name):
     """
     This method is used to find the differences in the history
     """
-    remove_duplicate_history(instance, history_related_name)
     history = getattr(instance, history_related_name).all()
     history_list = list(history)
     pairs = [
@@ -90,6 +62,8 @@ def get_diff(instance, history_related_name):
     create_history = history.filter(history_type="+").first()
     for pair in pairs:
         delta = pair[0].diff_against(pair[1])
+        if not delta.changed_fields:
+            continue
         diffs = []
         class_name = pair[0].instance.__class__
         for change in delta.changes:
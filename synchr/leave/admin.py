@@ -12,6 +12,7 @@ from .models import (
     LeaveAllocationRequest,
     LeaveallocationrequestComment,
     LeaveGeneralSetting,
+    LeaveLedgerEntry,
     LeaveRequest,
     LeaverequestComment,
     LeaveRequestConditionApproval,
@@ -29,6 +30,7 @@ admin.site.register(LeaverequestComment)
 admin.site.register(LeaveallocationrequestComment)
 admin.site.register(RestrictLeave)
 admin.site.register(LeaveGeneralSetting)
+admin.site.register(LeaveLedgerEntry)
 if apps.is_installed("attendance"):
     from .models import CompensatoryLeaveRequest
 
@@ -0,0 +1,564 @@
+"""
+bulk_approval.py
+
+This module is used to approve or reject many leave requests at once. The
+balances are checked in one pass over the loaded requests, the status and
+balance changes are written with bulk updates in a single transaction, and
+the work records, clash counts, ledger, notifications and mails of the
+whole batch are handled together instead of once per request. The bulk
+updates write their history rows with bulk_update_with_history.
+"""
+
+import contextlib
+from collections import defaultdict
+from datetime import date
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from simple_history.utils import bulk_update_with_history
+
+from horilla.methods import get_horilla_model_class
+from leave.ledger import ledger_entry, refresh_all_leave_taken
+from leave.methods import refresh_leave_clashes_count
+from leave.models import (
+    AvailableLeave,
+    LeaveLedgerEntry,
+    LeaveRequest,
+    LeaverequestComment,
+    LeaveRequestConditionApproval,
+)
+from leave.threading import LeaveBulkMailSendThread
+from notifications.signals import notify
+
+BULK_BATCH_SIZE = 500
+
+
+def _load_leave_requests(request_ids):
+    request_ids = {int(request_id) for request_id in request_ids if request_id}
+    return list(
+        LeaveRequest.objects.filter(id__in=request_ids)
+        .select_related(
+            "employee_id__employee_user_id",
+            "employee_id__employee_work_info",
+            "leave_type_id",
+        )
+        .order_by("start_date", "id")
+    )
+
+
+def _load_available_leaves(leave_requests):
+    """
+    Available leaves of the employee and leave type pairs of the requests
+    """
+    pairs = {
+        (leave_request.employee_id_id, leave_request.leave_type_id_id)
+        for leave_request in leave_requests
+    }
+    return {
+        (available_leave.employee_id_id, available_leave.leave_type_id_id): (
+            available_leave
+        )
+        for available_leave in AvailableLeave.objects.entire().filter(
+            employee_id__in={employee_id for employee_id, _type in pairs},
+            leave_type_id__in={leave_type_id for _employee, leave_type_id in pairs},
+        )
+    }
+
+
+def _load_condition_approvals(leave_requests):
+    """
+    Multiple approval conditions of the requests in their sequence
+    """
+    conditions = defaultdict(list)
+    for condition in (
+        LeaveRequestConditionApproval.objects.filter(
+            leave_request_id__in=leave_requests
+        )
+        .select_related("manager_id__employee_user_id")
+        .order_by("sequence", "id")
+    ):
+        conditions[condition.leave_request_id_id].append(condition)
+    return conditions
+
+
+def _update_leave_requests(leave_requests, fields, user):
+    """
+    Write the fields of the leave requests with one update per batch and
+    their history rows, the update sends the bulk update signals the
+    automations listen to
+    """
+    for leave_request in leave_requests:
+        leave_request.modified_by = user
+    bulk_update_with_history(
+        leave_requests,
+        LeaveRequest,
+        fields + ["modified_by"],
+        batch_size=BULK_BATCH_SIZE,
+        default_user=user,
+        manager=LeaveRequest._base_manager,
+    )
+
+
+def _save_balances(available_leaves, entries, user):
+    """
+    Write the changed balances and their ledger entries
+    """
+    for entry in entries:
+        entry.created_by = user
+        entry.modified_by = user
+    bulk_update_with_history(
+        available_leaves,
+        AvailableLeave,
+        ["available_days", "carryforward_days"],
+        batch_size=BULK_BATCH_SIZE,
+        default_user=user,
+        manager=AvailableLeave._base_manager,
+    )
+    LeaveLedgerEntry.objects.bulk_create(entries, batch_size=BULK_BATCH_SIZE)
+    refresh_all_leave_taken(
+        batch_size=BULK_BATCH_SIZE,
+        employee_ids={
+            available_leave.employee_id_id for available_leave in available_leaves
+        },
+    )
+
+
+def _requests_filter(leave_requests):
+    query = Q()
+    for leave_request in leave_requests:
+        query |= Q(
+            employee_id=leave_request.employee_id_id,
+            date__range=(
+                leave_request.start_date,
+                leave_request.end_date or leave_request.start_date,
+            ),
+        )
+    return query
+
+
+def regenerate_leave_work_records(leave_requests):
+    """
+    This method is used to write the leave work records of the approved
+    requests and remove them for the others, the same records the leave
+    request pre save signal keeps for a single request
+    """
+    if not apps.is_installed("attendance") or not leave_requests:
+        return
+    WorkRecords = get_horilla_model_class(app_label="attendance", model="workrecords")
+    approved = [
+        leave_request
+        for leave_request in leave_requests
+        if leave_request.status == "approved"
+    ]
+    others = [
+        leave_request
+        for leave_request in leave_requests
+        if leave_request.status != "approved"
+    ]
+    for start in range(0, len(others), BULK_BATCH_SIZE):
+        WorkRecords.objects.entire().filter(
+            _requests_filter(others[start : start + BULK_BATCH_SIZE]),
+            is_leave_record=True,
+        ).delete()
+
+    now = timezone.now()
+    fields = [
+        "is_leave_record",
+        "leave_request_id",
+        "day_percentage",
+        "work_record_type",
+        "message",
+        "last_update",
+    ]
+    for start in range(0, len(approved), BULK_BATCH_SIZE):
+        batch = approved[start : start + BULK_BATCH_SIZE]
+        existing = {}
+        for work_record in (
+            WorkRecords.objects.entire().filter(_requests_filter(batch)).order_by("-id")
+        ):
+            # The first record of the day is the one that is reused
+            existing[(work_record.employee_id_id, work_record.date)] = work_record
+
+        to_create = []
+        to_update = {}
+        for leave_request in batch:
+            for leave_date in leave_request.requested_dates():
+                is_half_day_leave = (
+                    leave_request.start_date == leave_date
+                    and leave_request.start_date_breakdown
+                    in ["first_half", "second_half"]
+                ) or (
+                    leave_request.end_date == leave_date
+                    and leave_request.end_date_breakdown
+                    in ["first_half", "second_half"]
+                )
+                key = (leave_request.employee_id_id, leave_date)
+                work_record = existing.get(key)
+                if work_record is None:
+                    work_record = WorkRecords(
+                        employee_id_id=leave_request.employee_id_id, date=leave_date
+                    )
+                    existing[key] = work_record
+                    to_create.append(work_record)
+                elif work_record.pk:
+                    to_update[work_record.pk] = work_record
+                work_record.is_leave_record = True
+                work_record.leave_request_id = leave_request
+                work_record.day_percentage = 0.50 if is_half_day_leave else 0.00
+                work_record.work_record_type = "HDP" if is_half_day_leave else "ABS"
+                work_record.message = (
+                    _("Half day leave - attendance needed")
+                    if is_half_day_leave
+                    else _("Leave")
+                )
+                work_record.last_update = now
+        WorkRecords.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+        WorkRecords.objects.bulk_update(
+            to_update.values(), fields, batch_size=BULK_BATCH_SIZE
+        )
+
+
+def refresh_batch_clashes_count(leave_requests):
+    """
+    Recompute the clash counts of the requests and of the requests of the
+    colleagues overlapping them with one aggregate query
+    """
+    if not leave_requests:
+        return {}
+    work_infos = [
+        getattr(leave_request.employee_id, "employee_work_info", None)
+        for leave_request in leave_requests
+    ]
+    work_info = "employee_id__employee_work_info__"
+    overlapping = LeaveRequest.objects.entire().filter(
+        Q(
+            **{
+                f"{work_info}department_id__in": {
+                    info.department_id_id for info in work_infos if info
+                }
+            }
+        )
+        | Q(
+            **{
+                f"{work_info}job_position_id__in": {
+                    info.job_position_id_id for info in work_infos if info
+                }
+            }
+        ),
+        start_date__lte=max(
+            leave_request.end_date or leave_request.start_date
+            for leave_request in leave_requests
+        ),
+        end_date__gte=min(leave_request.start_date for leave_request in leave_requests),
+    )
+    leave_request_ids = set(overlapping.values_list("id", flat=True))
+    leave_request_ids.update(leave_request.id for leave_request in leave_requests)
+    return refresh_leave_clashes_count(leave_request_ids)
+
+
+def _notify(sender, recipients, redirect, **verbs):
+    recipients = list({recipient for recipient in recipients if recipient})
+    if not recipients:
+        return
+    with contextlib.suppress(Exception):
+        notify.send(
+            sender,
+            recipient=recipients,
+            icon="people-circle",
+            redirect=redirect,
+            **verbs,
+        )
+
+
+def _deduct(available_leave, leave_request):
+    """
+    Take the requested days from the carryforward days first and the rest
+    from the available days
+    """
+    if leave_request.requested_days > available_leave.carryforward_days:
+        leave = leave_request.requested_days - available_leave.carryforward_days
+        leave_request.approved_carryforward_days = available_leave.carryforward_days
+        leave_request.approved_available_days = leave
+        available_leave.carryforward_days = 0
+        available_leave.available_days = available_leave.available_days - leave
+    else:
+        leave_request.approved_carryforward_days = leave_request.requested_days
+        available_leave.carryforward_days = (
+            available_leave.carryforward_days - leave_request.requested_days
+        )
+
+
+def bulk_approve_leave_requests(request, request_ids):
+    """
+    This method is used to approve the leave requests of the ids in one pass
+
+    Requests under multiple approval are approved for every level when the
+    user is a superuser, otherwise only the level of the user is approved and
+    the request is approved when the user is its last approver.
+
+    Returns:
+        dictionary with the approved requests, the requests waiting for the
+        next approver and a list of (leave request, message) that were skipped
+    """
+    user = request.user
+    employee = getattr(user, "employee_get", None)
+    today = date.today()
+    leave_requests = _load_leave_requests(request_ids)
+    available_leaves = _load_available_leaves(leave_requests)
+    conditions = _load_condition_approvals(leave_requests)
+
+    approved = []
+    forwarded = []
+    skipped = []
+    approved_conditions = []
+    next_approvers = []
+    changed_balances = {}
+    entries = []
+    for leave_request in leave_requests:
+        if leave_request.status != "requested" or not (
+            leave_request.start_date >= today
+            or user.has_perm("leave.change_leaverequest")
+        ):
+            if leave_request.status == "approved":
+                message = _("{} {} request already approved")
+            elif leave_request.start_date < today:
+                message = _("{} {} request date exceeded")
+            else:
+                message = _("{} {} can't approve.")
+            skipped.append(
+                (
+                    leave_request,
+                    message.format(
+                        leave_request.employee_id, leave_request.leave_type_id
+                    ),
+                )
+            )
+            continue
+
+        available_leave = available_leaves.get(
+            (leave_request.employee_id_id, leave_request.leave_type_id_id)
+        )
+        if available_leave is None or (
+            available_leave.available_days + available_leave.carryforward_days
+            < leave_request.requested_days
+        ):
+            skipped.append(
+                (
+                    leave_request,
+                    _("{} dont have enough leave days to approve the request..").format(
+                        leave_request.employee_id
+                    ),
+                )
+            )
+            continue
+
+        request_conditions = conditions.get(leave_request.id, [])
+        if request_conditions and not user.is_superuser:
+            condition = next(
+                (
+                    condition
+                    for condition in request_conditions
+                    if condition.manager_id_id == getattr(employee, "id", None)
+                ),
+                None,
+            )
+            if condition is None:
+                skipped.append(
+                    (
+                        leave_request,
+                        _("{} {} can't approve.").format(
+                            leave_request.employee_id, leave_request.leave_type_id
+                        ),
+                    )
+                )
+                continue
+            approved_conditions.append(condition.id)
+            if condition is not request_conditions[-1]:
+                if len(request_conditions) > condition.sequence:
+                    next_manager = request_conditions[condition.sequence].manager_id
+                    next_approvers.append(
+                        (next_manager.employee_user_id, leave_request)
+                    )
+                forwarded.append(leave_request)
+                continue
+        elif request_conditions:
+            approved_conditions.extend(condition.id for condition in request_conditions)
+
+        # Several requests of a batch may draw on the same balance
+        _deduct(available_leave, leave_request)
+        leave_request.status = "approved"
+        changed_balances[available_leave.pk] = available_leave
+        entries.append(
+            ledger_entry(
+                available_leave,
+                "consumption",
+                -leave_request.approved_available_days,
+                -leave_request.approved_carryforward_days,
+                leave_request_id=leave_request,
+            )
+        )
+        approved.append(leave_request)
+
+    with transaction.atomic():
+        LeaveRequestConditionApproval.objects.filter(id__in=approved_conditions).update(
+            is_approved=True
+        )
+        _update_leave_requests(
+            approved,
+            ["status", "approved_available_days", "approved_carryforward_days"],
+            user,
+        )
+        _save_balances(list(changed_balances.values()), entries, user)
+        regenerate_leave_work_records(approved)
+
+    for next_approver, leave_request in next_approvers:
+        _notify(
+            employee,
+            [next_approver],
+            f"{reverse('request-view')}?id={leave_request.id}",
+            verb="You have a new leave request to validate.",
+            verb_ar="لديك طلب إجازة جديد يجب التحقق منه.",
+            verb_de="Sie haben eine neue Urlaubsanfrage zur Validierung.",
+            verb_es="Tiene una nueva solicitud de permiso que debe validar.",
+            verb_fr="Vous avez une nouvelle demande de congé à valider.",
+        )
+    for leave_request in approved:
+        _notify(
+            employee,
+            [leave_request.employee_id.employee_user_id],
+            f"{reverse('user-request-view')}?id={leave_request.id}",
+            verb="Your Leave request has been approved",
+            verb_ar="تمت الموافقة على طلب الإجازة الخاص بك",
+            verb_de="Ihr Urlaubsantrag wurde genehmigt",
+            verb_es="Se ha aprobado su solicitud de permiso",
+            verb_fr="Votre demande de congé a été approuvée",
+        )
+    if approved:
+        LeaveBulkMailSendThread(request, approved, type="approve").start()
+    return {"approved": approved, "forwarded": forwarded, "skipped": skipped}
+
+
+def bulk_reject_leave_requests(request, request_ids, reason):
+    """
+    This method is used to reject the leave requests of the ids in one pass,
+    the days of approved requests go back to the balance they were taken from
+
+    Returns:
+        dictionary with the rejected requests and a list of
+        (leave request, message) that were skipped
+    """
+    user = request.user
+    employee = getattr(user, "employee_get", None)
+    leave_requests = _load_leave_requests(request_ids)
+    available_leaves = _load_available_leaves(leave_requests)
+    conditions = _load_condition_approvals(leave_requests)
+
+    rejected = []
+    skipped = []
+    rejected_conditions = []
+    changed_balances = {}
+    entries = []
+    for leave_request in leave_requests:
+        if leave_request.status == "rejected":
+            skipped.append((leave_request, _("Leave request already rejected.")))
+            continue
+        request_conditions = conditions.get(leave_request.id, [])
+        if request_conditions and not user.is_superuser:
+            condition = next(
+                (
+                    condition
+                    for condition in request_conditions
+                    if condition.manager_id_id == getattr(employee, "id", None)
+                ),
+                None,
+            )
+            if condition is None:
+                skipped.append(
+                    (
+                        leave_request,
+                        _("{} {} can't reject.").format(
+                            leave_request.employee_id, leave_request.leave_type_id
+                        ),
+                    )
+                )
+                continue
+            rejected_conditions.append(condition.id)
+
+        available_leave = available_leaves.get(
+            (leave_request.employee_id_id, leave_request.leave_type_id_id)
+        )
+        if available_leave is not None and (
+            leave_request.approved_available_days
+            or leave_request.approved_carryforward_days
+        ):
+            available_leave.available_days += leave_request.approved_available_days
+            available_leave.carryforward_days += (
+                leave_request.approved_carryforward_days
+            )
+            changed_balances[available_leave.pk] = available_leave
+            entries.append(
+                ledger_entry(
+                    available_leave,
+                    "refund",
+                    leave_request.approved_available_days,
+                    leave_request.approved_carryforward_days,
+                    leave_request_id=leave_request,
+                )
+            )
+        leave_request.approved_available_days = 0
+        leave_request.approved_carryforward_days = 0
+        leave_request.status = "rejected"
+        leave_request.leave_clashes_count = 0
+        leave_request.reject_reason = reason
+        rejected.append(leave_request)
+
+    with transaction.atomic():
+        LeaveRequestConditionApproval.objects.filter(id__in=rejected_conditions).update(
+            is_approved=False, is_rejected=True
+        )
+        _update_leave_requests(
+            rejected,
+            [
+                "status",
+                "approved_available_days",
+                "approved_carryforward_days",
+                "leave_clashes_count",
+                "reject_reason",
+            ],
+            user,
+        )
+        _save_balances(list(changed_balances.values()), entries, user)
+        LeaverequestComment.objects.bulk_create(
+            [
+                LeaverequestComment(
+                    request_id=leave_request,
+                    employee_id=employee,
+                    comment=reason,
+                    created_by=user,
+                    modified_by=user,
+                )
+                for leave_request in (rejected if employee else [])
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        regenerate_leave_work_records(rejected)
+        refresh_batch_clashes_count(rejected)
+
+    for leave_request in rejected:
+        _notify(
+            employee,
+            [leave_request.employee_id.employee_user_id],
+            f"{reverse('user-request-view')}?id={leave_request.id}",
+            verb="Your leave request has been rejected.",
+            verb_ar="تم رفض طلب الإجازة الخاص بك",
+            verb_de="Ihr Urlaubsantrag wurde abgelehnt",
+            verb_es="Tu solicitud de permiso ha sido rechazada",
+            verb_fr="Votre demande de congé a été rejetée",
+        )
+    if rejected:
+        LeaveBulkMailSendThread(request, rejected, type="reject").start()
+    return {"rejected": rejected, "skipped": skipped}
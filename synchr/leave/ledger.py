@@ -0,0 +1,338 @@
+"""
+ledger.py
+
+This module is used to keep the leave ledger. Every change of an available
+leave balance is written as an entry with the running balance after it,
+so the current balance is a single row and the balance on any date is the
+last entry before it.
+"""
+
+from django.db.models import F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from leave.models import AvailableLeave, LeaveLedgerEntry, LeaveRequest
+
+LEDGER_PRECISION = 3
+
+
+def ledger_entry(
+    available_leave,
+    entry_type,
+    available_days,
+    carryforward_days,
+    available_balance=None,
+    **kwargs,
+):
+    """
+    Unsaved ledger entry of a change with the current balance of the
+    available leave as its running balance
+    """
+    return LeaveLedgerEntry(
+        available_leave_id=available_leave,
+        employee_id_id=available_leave.employee_id_id,
+        leave_type_id_id=available_leave.leave_type_id_id,
+        entry_type=entry_type,
+        available_days=round(available_days, LEDGER_PRECISION),
+        carryforward_days=round(carryforward_days, LEDGER_PRECISION),
+        available_balance=(
+            available_leave.available_days
+            if available_balance is None
+            else available_balance
+        ),
+        carryforward_balance=available_leave.carryforward_days,
+        **kwargs,
+    )
+
+
+def last_entry(available_leave):
+    """
+    Latest ledger entry of the available leave
+    """
+    return (
+        LeaveLedgerEntry.objects.entire()
+        .filter(available_leave_id=available_leave)
+        .order_by("-id")
+        .first()
+    )
+
+
+def record_balance_change(available_leave, created=False):
+    """
+    This method is used to write the ledger entries for the difference
+    between the balance of the available leave and its last ledger entry.
+
+    The entry type comes from AvailableLeave.set_ledger_entry, changes
+    without one are an allocation for the first entry and a consumption or
+    an adjustment otherwise. Balances assigned before the ledger existed
+    get their opening entry from the sync_leave_ledger command.
+    """
+    context = getattr(available_leave, "_ledger_entry", None) or {}
+    available_leave._ledger_entry = None
+    previous = None if created else last_entry(available_leave)
+    available_change = round(
+        available_leave.available_days
+        - (previous.available_balance if previous else 0),
+        LEDGER_PRECISION,
+    )
+    carryforward_change = round(
+        available_leave.carryforward_days
+        - (previous.carryforward_balance if previous else 0),
+        LEDGER_PRECISION,
+    )
+    if not available_change and not carryforward_change:
+        return []
+
+    entry_type = context.pop("entry_type", None)
+    if getattr(context.get("leave_request_id"), "pk", True) is None:
+        # The leave request is saved after the balance
+        context.pop("leave_request_id")
+    if entry_type is None:
+        if previous is None:
+            entry_type = "allocation"
+        elif available_change + carryforward_change < 0:
+            entry_type = "consumption"
+        else:
+            entry_type = "adjustment"
+
+    if entry_type not in ["reset", "expiry"]:
+        entries = [
+            ledger_entry(
+                available_leave,
+                entry_type,
+                available_change,
+                carryforward_change,
+                **context,
+            )
+        ]
+    else:
+        # The carried forward or expired days and the days of the new
+        # period are separate entries
+        entries = []
+        if carryforward_change:
+            entries.append(
+                ledger_entry(
+                    available_leave,
+                    "carryforward" if entry_type == "reset" else "expiry",
+                    0,
+                    carryforward_change,
+                    available_balance=available_leave.available_days - available_change,
+                )
+            )
+        if available_change:
+            entries.append(ledger_entry(available_leave, "reset", available_change, 0))
+    return LeaveLedgerEntry.objects.bulk_create(entries)
+
+
+def record_allocations(available_leaves):
+    """
+    Ledger entries of the available leaves created with bulk_create
+    """
+    available_leaves = list(available_leaves)
+    if any(available_leave.pk is None for available_leave in available_leaves):
+        # Backends that do not return the primary keys of bulk created rows
+        saved = {
+            (available_leave.employee_id_id, available_leave.leave_type_id_id): (
+                available_leave
+            )
+            for available_leave in AvailableLeave.objects.entire().filter(
+                employee_id__in=[
+                    available_leave.employee_id_id
+                    for available_leave in available_leaves
+                ],
+                leave_type_id__in=[
+                    available_leave.leave_type_id_id
+                    for available_leave in available_leaves
+                ],
+            )
+        }
+        available_leaves = [
+            saved[(available_leave.employee_id_id, available_leave.leave_type_id_id)]
+            for available_leave in available_leaves
+            if (available_leave.employee_id_id, available_leave.leave_type_id_id)
+            in saved
+        ]
+    return LeaveLedgerEntry.objects.bulk_create(
+        [
+            ledger_entry(
+                available_leave,
+                "allocation",
+                available_leave.available_days,
+                available_leave.carryforward_days,
+            )
+            for available_leave in available_leaves
+            if available_leave.available_days or available_leave.carryforward_days
+        ]
+    )
+
+
+def refresh_leave_taken(employee_id, leave_type_id):
+    """
+    Store the approved leave days of the employee for the leave type on the
+    available leave
+    """
+    leave_taken = (
+        LeaveRequest.objects.entire()
+        .filter(employee_id=employee_id, leave_type_id=leave_type_id, status="approved")
+        .aggregate(total=Sum("requested_days"))["total"]
+    )
+    AvailableLeave.objects.entire().filter(
+        employee_id=employee_id, leave_type_id=leave_type_id
+    ).exclude(leave_taken_days=leave_taken or 0).update(
+        leave_taken_days=leave_taken or 0
+    )
+
+
+def ledger_balances(as_of, available_leaves=None):
+    """
+    This method is used to annotate the balance of the available leaves on
+    a date from their last ledger entry before it
+
+    Args:
+        as_of: datetime the balance is taken at
+        available_leaves: available leave queryset, all by default
+    """
+    if available_leaves is None:
+        available_leaves = AvailableLeave.objects.all()
+    last_entries = (
+        LeaveLedgerEntry.objects.entire()
+        .filter(available_leave_id=OuterRef("pk"), created_at__lte=as_of)
+        .order_by("-created_at", "-id")
+    )
+    return available_leaves.annotate(
+        ledger_available_days=Coalesce(
+            Subquery(last_entries.values("available_balance")[:1]), 0.0
+        ),
+        ledger_carryforward_days=Coalesce(
+            Subquery(last_entries.values("carryforward_balance")[:1]), 0.0
+        ),
+    )
+
+
+def ledger_movements(start, end, entries=None):
+    """
+    This method is used to sum the ledger entries of a period per employee,
+    leave type and entry type
+
+    Args:
+        start: start datetime of the period
+        end: end datetime of the period
+        entries: ledger entry queryset, all by default
+    """
+    if entries is None:
+        entries = LeaveLedgerEntry.objects.all()
+    return (
+        entries.filter(created_at__gte=start, created_at__lte=end)
+        .order_by()
+        .values("employee_id", "leave_type_id", "entry_type")
+        .annotate(
+            available_days=Sum("available_days"),
+            carryforward_days=Sum("carryforward_days"),
+        )
+        .order_by("employee_id", "leave_type_id", "entry_type")
+    )
+
+
+def unbalanced_available_leaves():
+    """
+    Available leaves whose balance differs from the sum of their ledger
+    entries
+    """
+    entries = LeaveLedgerEntry.objects.entire().filter(
+        available_leave_id=OuterRef("pk")
+    )
+    return (
+        AvailableLeave.objects.entire()
+        .annotate(
+            ledger_available_days=Coalesce(
+                Subquery(
+                    entries.order_by()
+                    .values("available_leave_id")
+                    .annotate(total=Sum("available_days"))
+                    .values("total")
+                ),
+                0.0,
+            ),
+            ledger_carryforward_days=Coalesce(
+                Subquery(
+                    entries.order_by()
+                    .values("available_leave_id")
+                    .annotate(total=Sum("carryforward_days"))
+                    .values("total")
+                ),
+                0.0,
+            ),
+        )
+        .exclude(
+            Q(available_days__gte=F("ledger_available_days") - 0.001)
+            & Q(available_days__lte=F("ledger_available_days") + 0.001)
+            & Q(carryforward_days__gte=F("ledger_carryforward_days") - 0.001)
+            & Q(carryforward_days__lte=F("ledger_carryforward_days") + 0.001)
+        )
+    )
+
+
+def reconcile_ledger(dry_run=False):
+    """
+    This method is used to write an adjustment entry for every available
+    leave whose balance does not match its ledger, balances assigned before
+    the ledger existed get their opening entry this way
+
+    Returns:
+        the unbalanced available leaves
+    """
+    unbalanced = list(unbalanced_available_leaves())
+    if not dry_run:
+        LeaveLedgerEntry.objects.bulk_create(
+            [
+                ledger_entry(
+                    available_leave,
+                    "adjustment",
+                    available_leave.available_days
+                    - available_leave.ledger_available_days,
+                    available_leave.carryforward_days
+                    - available_leave.ledger_carryforward_days,
+                    note=(
+                        "Ledger correction"
+                        if available_leave.ledger_entries.exists()
+                        else "Opening balance"
+                    ),
+                )
+                for available_leave in unbalanced
+            ]
+        )
+    return unbalanced
+
+
+def refresh_all_leave_taken(batch_size=1000, employee_ids=None):
+    """
+    Recompute the approved leave days of every available leave, or of the
+    available leaves of the given employees
+    """
+    leave_requests = LeaveRequest.objects.entire().filter(status="approved")
+    available_leaves = AvailableLeave.objects.entire()
+    if employee_ids is not None:
+        leave_requests = leave_requests.filter(employee_id__in=employee_ids)
+        available_leaves = available_leaves.filter(employee_id__in=employee_ids)
+    leave_taken = {
+        (employee_id, leave_type_id): total
+        for employee_id, leave_type_id, total in leave_requests.order_by()
+        .values_list("employee_id", "leave_type_id")
+        .annotate(total=Sum("requested_days"))
+    }
+    changed = []
+    for available_leave in available_leaves.only(
+        "employee_id", "leave_type_id", "leave_taken_days"
+    ):
+        total = (
+            leave_taken.get(
+                (available_leave.employee_id_id, available_leave.leave_type_id_id)
+            )
+            or 0
+        )
+        if available_leave.leave_taken_days != total:
+            available_leave.leave_taken_days = total
+            changed.append(available_leave)
+    AvailableLeave.objects.bulk_update(
+        changed, ["leave_taken_days"], batch_size=batch_size
+    )
+    return len(changed)
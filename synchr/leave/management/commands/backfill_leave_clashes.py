@@ -0,0 +1,33 @@
+"""
+Management command to recompute the leave clashes count of existing leave requests
+"""
+
+from django.core.management.base import BaseCommand
+
+from leave.methods import refresh_leave_clashes_count
+from leave.models import LeaveRequest
+
+
+class Command(BaseCommand):
+    help = "Recompute the leave clashes count of all leave requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of leave requests recomputed per query (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        leave_request_ids = list(
+            LeaveRequest.objects.entire().order_by("id").values_list("id", flat=True)
+        )
+        for index in range(0, len(leave_request_ids), batch_size):
+            refresh_leave_clashes_count(leave_request_ids[index : index + batch_size])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed the leave clashes count of {len(leave_request_ids)} leave requests"
+            )
+        )
@@ -0,0 +1,42 @@
+"""
+Management command to reconcile the leave ledger with the available leave balances
+"""
+
+from django.core.management.base import BaseCommand
+
+from leave.ledger import reconcile_ledger, refresh_all_leave_taken
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the opening and correction entries of the leave ledger and "
+        "recompute the leave taken days of the available leaves"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only list the balances that do not match their ledger",
+        )
+
+    def handle(self, *args, **options):
+        check = options["check"]
+        unbalanced = reconcile_ledger(dry_run=check)
+        if check:
+            for available_leave in unbalanced:
+                self.stdout.write(
+                    f"{available_leave}: available {available_leave.available_days} "
+                    f"(ledger {available_leave.ledger_available_days}), carryforward "
+                    f"{available_leave.carryforward_days} "
+                    f"(ledger {available_leave.ledger_carryforward_days})"
+                )
+            self.stdout.write(f"{len(unbalanced)} balances do not match the ledger")
+            return
+        refreshed = refresh_all_leave_taken()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {len(unbalanced)} balances and updated the leave taken "
+                f"days of {refreshed} available leaves"
+            )
+        )
@@ -1,12 +1,12 @@
-import calendar
-from datetime import datetime, timedelta
-
 from django.apps import apps
-from django.db.models import Q
+from django.db.models import F, Func, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 
 from employee.models import Employee
 from horilla.methods import get_horilla_model_class
 
+LEAVE_CLASH_EXCLUDED_STATUS = ["cancelled", "rejected"]
+
 
 def calculate_requested_days(
     start_date, end_date, start_date_breakdown, end_date_breakdown
@@ -28,58 +28,6 @@ def calculate_requested_days(
     return middle_days + start_day_value + end_day_value
 
 
-def holiday_dates_list(holidays):
-    """
-    :return: This function returns a list of all holiday dates.
-    """
-    holiday_dates = []
-    for holiday in holidays:
-        holiday_start_date = holiday.start_date
-        holiday_end_date = holiday.end_date or holiday_start_date
-        holiday_dates.extend(
-            holiday_start_date + timedelta(i)
-            for i in range((holiday_end_date - holiday_start_date).days + 1)
-        )
-    return holiday_dates
-
-
-def company_leave_dates_list(company_leaves, start_date):
-    """
-    :return: This function returns a list of all company leave dates
-    """
-    company_leave_dates = set()
-    year = start_date.year
-    for company_leave in company_leaves:
-        based_on_week = company_leave.based_on_week
-        based_on_week_day = company_leave.based_on_week_day
-
-        for month in range(1, 13):
-            month_calendar = calendar.monthcalendar(year, month)
-
-            if based_on_week is not None:
-                # Set Sunday as the first day of the week
-                calendar.setfirstweekday(6)
-                try:
-                    week_days = [
-                        day for day in month_calendar[int(based_on_week)] if day != 0
-                    ]
-                    for day in week_days:
-                        date = datetime(year, month, day)
-                        if date.weekday() == int(based_on_week_day):
-                            company_leave_dates.add(date.date())
-                except IndexError:
-                    pass
-            else:
-                # Set Monday as the first day of the week
-                calendar.setfirstweekday(0)
-                for week in month_calendar:
-                    if week[int(based_on_week_day)] != 0:
-                        date = datetime(year, month, week[int(based_on_week_day)])
-                        company_leave_dates.add(date.date())
-
-    return list(company_leave_dates)
-
-
 def get_leave_day_attendance(employee, comp_id=None):
     """
     This function returns a queryset of attendance on leave dates
@@ -158,3 +106,58 @@ def filter_conditional_leave_request(request):
         else:
             leave_request_ids.append(instance.leave_request_id.id)
     return LeaveRequest.objects.filter(pk__in=leave_request_ids)
+
+
+def refresh_leave_clashes_count(leave_request_ids):
+    """
+    Recompute the leave clashes count of the given leave requests with a
+    single aggregate query and save only the counts that changed.
+
+    Returns a dictionary of leave request id and its clashes count.
+    """
+    LeaveRequest = get_horilla_model_class(app_label="leave", model="leaverequest")
+    work_info = "employee_id__employee_work_info__"
+    clashes = (
+        LeaveRequest.objects.entire()
+        .exclude(pk=OuterRef("pk"))
+        .exclude(status__in=LEAVE_CLASH_EXCLUDED_STATUS)
+        .filter(
+            Q(**{f"{work_info}department_id": OuterRef(f"{work_info}department_id")})
+            | Q(
+                **{
+                    f"{work_info}job_position_id": OuterRef(
+                        f"{work_info}job_position_id"
+                    )
+                }
+            ),
+            **{f"{work_info}company_id": OuterRef(f"{work_info}company_id")},
+            start_date__lte=OuterRef("end_date"),
+            end_date__gte=OuterRef("start_date"),
+        )
+        .order_by()
+        .annotate(count=Func(F("pk"), function="COUNT"))
+        .values("count")
+    )
+
+    counts = {}
+    leave_requests_to_update = []
+    for leave_request in (
+        LeaveRequest.objects.entire()
+        .filter(pk__in=leave_request_ids)
+        .annotate(clashes=Coalesce(Subquery(clashes), 0))
+        .only("id", "status", "leave_clashes_count")
+    ):
+        count = (
+            0
+            if leave_request.status in LEAVE_CLASH_EXCLUDED_STATUS
+            else leave_request.clashes
+        )
+        counts[leave_request.id] = count
+        if leave_request.leave_clashes_count != count:
+            leave_request.leave_clashes_count = count
+            leave_requests_to_update.append(leave_request)
+
+    LeaveRequest.objects.bulk_update(
+        leave_requests_to_update, ["leave_clashes_count"], batch_size=1000
+    )
+    return counts
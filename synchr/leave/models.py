@@ -10,29 +10,28 @@ from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.db import models
-from django.db.models import Q, Sum
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from base.horilla_company_manager import HorillaCompanyManager
 from base.models import (
     Company,
-    CompanyLeaves,
     Department,
-    Holidays,
     JobPosition,
     MultipleApprovalCondition,
     clear_messages,
 )
+from base.non_working_days import NonWorkingDays
 from employee.models import Employee, EmployeeWorkInformation
 from horilla import horilla_middlewares
 from horilla.models import HorillaModel, upload_path
 from horilla_audit.methods import get_diff
 from horilla_audit.models import HorillaAuditInfo, HorillaAuditLog
 from leave.methods import (
+    LEAVE_CLASH_EXCLUDED_STATUS,
     calculate_requested_days,
-    company_leave_dates_list,
-    holiday_dates_list,
+    refresh_leave_clashes_count,
 )
 
 logger = logging.getLogger(__name__)
@@ -415,6 +414,9 @@ class AvailableLeave(HorillaModel):
         default=0, verbose_name=_("Carryforward Days")
     )
     total_leave_days = models.FloatField(default=0, verbose_name=_("Total Leave Days"))
+    leave_taken_days = models.FloatField(
+        default=0, editable=False, verbose_name=_("Leave Taken Days")
+    )
     assigned_date = models.DateField(
         default=timezone.now, verbose_name=_("Assigned Date")
     )
@@ -452,6 +454,7 @@ class AvailableLeave(HorillaModel):
     # Resetting carryforward days
 
     def update_carryforward(self):
+        self.set_ledger_entry("reset")
         if self.leave_type_id.carryforward_type != "no carryforward":
             if self.leave_type_id.carryforward_max >= self.total_leave_days:
                 self.carryforward_days = self.total_leave_days
@@ -519,13 +522,20 @@ class AvailableLeave(HorillaModel):
         return reset_date
 
     def leave_taken(self):
-        leave_taken = LeaveRequest.objects.filter(
-            leave_type_id=self.leave_type_id,
-            employee_id=self.employee_id,
-            status="approved",
-        ).aggregate(total_sum=Sum("requested_days"))
+        """
+        Approved leave days, kept up to date by the leave request signals
+        """
+        return self.leave_taken_days
 
-        return leave_taken["total_sum"] if leave_taken["total_sum"] else 0
+    def set_ledger_entry(self, entry_type, leave_request=None, note=""):
+        """
+        Describe the ledger entry written for the next save of the balance
+        """
+        self._ledger_entry = {
+            "entry_type": entry_type,
+            "leave_request_id": leave_request,
+            "note": note,
+        }
 
     # Setting the expiration date for carryforward leaves
     def set_expired_date(self, available_leave, assigned_date):
@@ -537,6 +547,7 @@ class AvailableLeave(HorillaModel):
         else:
             expired_date = assigned_date + relativedelta(years=period)
 
+        available_leave.set_ledger_entry("expiry")
         available_leave.carryforward_days = 0
         available_leave.available_days = available_leave.leave_type_id.total_days
         return expired_date
@@ -569,6 +580,75 @@ class AvailableLeave(HorillaModel):
         super().save(*args, **kwargs)
 
 
+class LeaveLedgerEntry(HorillaModel):
+    """
+    Append only history of the leave balance of an employee for a leave
+    type, every entry holds the change and the running balance after it
+    """
+
+    ENTRY_TYPES = [
+        ("allocation", _("Allocation")),
+        ("consumption", _("Consumption")),
+        ("refund", _("Refund")),
+        ("reset", _("Reset")),
+        ("carryforward", _("Carryforward")),
+        ("expiry", _("Expiry")),
+        ("adjustment", _("Adjustment")),
+    ]
+
+    available_leave_id = models.ForeignKey(
+        AvailableLeave,
+        on_delete=models.CASCADE,
+        related_name="ledger_entries",
+        verbose_name=_("Available Leave"),
+    )
+    employee_id = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, verbose_name=_("Employee")
+    )
+    leave_type_id = models.ForeignKey(
+        LeaveType,
+        on_delete=models.CASCADE,
+        null=True,
+        verbose_name=_("Leave Type"),
+    )
+    entry_type = models.CharField(
+        max_length=20, choices=ENTRY_TYPES, verbose_name=_("Entry Type")
+    )
+    leave_request_id = models.ForeignKey(
+        "LeaveRequest",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name=_("Leave Request"),
+    )
+    available_days = models.FloatField(default=0, verbose_name=_("Available Days"))
+    carryforward_days = models.FloatField(
+        default=0, verbose_name=_("Carryforward Days")
+    )
+    available_balance = models.FloatField(
+        default=0, verbose_name=_("Available Balance")
+    )
+    carryforward_balance = models.FloatField(
+        default=0, verbose_name=_("Carryforward Balance")
+    )
+    note = models.CharField(max_length=255, blank=True, verbose_name=_("Note"))
+    objects = HorillaCompanyManager(
+        related_company_field="employee_id__employee_work_info__company_id"
+    )
+
+    class Meta:
+        ordering = ["available_leave_id", "id"]
+        indexes = [
+            models.Index(fields=["available_leave_id", "created_at"]),
+            models.Index(fields=["employee_id", "leave_type_id", "created_at"]),
+        ]
+        verbose_name = _("Leave Ledger Entry")
+        verbose_name_plural = _("Leave Ledger Entries")
+
+    def __str__(self):
+        return f"{self.available_leave_id} | {self.get_entry_type_display()} | {self.available_days + self.carryforward_days}"
+
+
 def restrict_leaves(restri):
 
     restricted_dates = []
@@ -592,36 +672,20 @@ def leave_requested_dates(start_date, end_date):
     return [start_date + timedelta(i) for i in range((end_date - start_date).days + 1)]
 
 
-def cal_effective_requested_days(start_date, end_date, leave_type_id, requested_days):
+def cal_effective_requested_days(
+    start_date, end_date, leave_type_id, requested_days, non_working_days=None
+):
     """
     Calculates the effective requested leave days by accounting for
     holidays and company leave days.
     """
-    requested_dates = leave_requested_dates(start_date, end_date)
-    holidays = set(holiday_dates_list(Holidays.objects.all()))
-    company_leave_dates = set(
-        company_leave_dates_list(CompanyLeaves.objects.all(), start_date)
-    )
-
-    if (
-        leave_type_id.exclude_company_leave == "yes"
-        and leave_type_id.exclude_holiday == "yes"
-    ):
-        total_leaves = holidays.union(company_leave_dates)
-        total_leave_count = sum(date in total_leaves for date in requested_dates)
-        return requested_days - total_leave_count
-
-    if leave_type_id.exclude_holiday == "yes":
-        holiday_count = sum(date in holidays for date in requested_dates)
-        requested_days -= holiday_count
-
-    if leave_type_id.exclude_company_leave == "yes":
-        company_leave_count = sum(
-            date in company_leave_dates for date in requested_dates
-        )
-        requested_days -= company_leave_count
-
-    return requested_days
+    non_working_days = non_working_days or NonWorkingDays()
+    return requested_days - non_working_days.count(
+        start_date,
+        end_date,
+        holidays=leave_type_id.exclude_holiday == "yes",
+        company_leaves=leave_type_id.exclude_company_leave == "yes",
+    )
 
 
 class LeaveRequest(HorillaModel):
@@ -744,69 +808,26 @@ class LeaveRequest(HorillaModel):
             requested_dates.append(date)
         return requested_dates
 
+    def non_working_days(self):
+        """
+        :return: the holiday and company leave snapshot of the employee's
+        company, imports can share one snapshot by setting _non_working_days
+        """
+        if getattr(self, "_non_working_days", None) is None:
+            self._non_working_days = NonWorkingDays.for_employee(self.employee_id)
+        return self._non_working_days
+
     def holiday_dates(self):
         """
-        :return: this functions returns a list of all holiday dates.
+        :return: this functions returns a list of the holiday dates of the request.
         """
-        holiday_dates = []
-        holidays = Holidays.objects.all()
-        for holiday in holidays:
-            holiday_start_date = holiday.start_date
-            holiday_end_date = holiday.end_date
-            if holiday_end_date is None:
-                holiday_end_date = holiday_start_date
-            holiday_days = holiday_end_date - holiday_start_date
-            for i in range(holiday_days.days + 1):
-                date = holiday_start_date + timedelta(i)
-                holiday_dates.append(date)
-        return holiday_dates
+        return self.non_working_days().holidays(self.start_date, self.end_date)
 
     def company_leave_dates(self):
         """
-        :return: This function returns a list of all company leave dates"""
-        from datetime import date
-
-        company_leaves = CompanyLeaves.objects.all()
-        company_leave_dates = []
-        for company_leave in company_leaves:
-            if self:
-                year = self.start_date.year
-            else:
-                year = date.today().year
-            based_on_week = company_leave.based_on_week
-            based_on_week_day = company_leave.based_on_week_day
-            for month in range(1, 13):
-                if based_on_week != None:
-                    # Set Sunday as the first day of the week
-                    calendar.setfirstweekday(6)
-                    month_calendar = calendar.monthcalendar(year, month)
-                    try:
-                        weeks = month_calendar[int(based_on_week)]
-                        weekdays_in_weeks = [day for day in weeks if day != 0]
-                        for day in weekdays_in_weeks:
-                            date = datetime.strptime(
-                                f"{year}-{month:02}-{day:02}", "%Y-%m-%d"
-                            ).date()
-                            if (
-                                date.weekday() == int(based_on_week_day)
-                                and date not in company_leave_dates
-                            ):
-                                company_leave_dates.append(date)
-                    except IndexError:
-                        pass
-                else:
-                    # Set Monday as the first day of the week
-                    calendar.setfirstweekday(0)
-                    month_calendar = calendar.monthcalendar(year, month)
-                    for week in month_calendar:
-                        if week[int(based_on_week_day)] != 0:
-                            date = datetime.strptime(
-                                f"{year}-{month:02}-{week[int(based_on_week_day)]:02}",
-                                "%Y-%m-%d",
-                            ).date()
-                            if date not in company_leave_dates:
-                                company_leave_dates.append(date)
-        return company_leave_dates
+        :return: This function returns a list of the company leave dates of the request
+        """
+        return self.non_working_days().company_leaves(self.start_date, self.end_date)
 
     def leaveoverlapping(self):
         """
@@ -849,14 +870,18 @@ class LeaveRequest(HorillaModel):
         else:
             self.exclude_leaves()
 
-        if self.status in ["cancelled", "rejected"]:
-            self.leave_clashes_count = 0
-        else:
-            self.leave_clashes_count = self.count_leave_clashes()
+        previous_dates = (
+            LeaveRequest.objects.entire()
+            .filter(pk=self.pk)
+            .values_list("start_date", "end_date")
+            .first()
+            if self.pk
+            else None
+        )
 
         super().save(*args, **kwargs)
 
-        self.update_leave_clashes_count()
+        self.update_leave_clashes_count(previous_dates)
         work_info = EmployeeWorkInformation.objects.filter(employee_id=self.employee_id)
         department_id = None
         conditions = None
@@ -977,6 +1002,7 @@ class LeaveRequest(HorillaModel):
             end_date=self.end_date,
             leave_type_id=leave_type,
             requested_days=requested_days,
+            non_working_days=self.non_working_days(),
         )
         leave_dates = leave_requested_dates(self.start_date, self.end_date)
         month_year = [f"{date.year}-{date.strftime('%m')}" for date in leave_dates]
@@ -1050,14 +1076,12 @@ class LeaveRequest(HorillaModel):
         return cleaned_data
 
     def exclude_all_leaves(self):
-        requested_dates = self.requested_dates()
-        holiday_dates = self.holiday_dates()
-        company_leave_dates = self.company_leave_dates()
-        total_leaves = list(set(holiday_dates + company_leave_dates))
-        total_leave_count = sum(
-            requested_date in total_leaves for requested_date in requested_dates
-        )
-        if (self.start_date in total_leaves or self.end_date in total_leaves) and (
+        non_working_days = self.non_working_days()
+        total_leave_count = non_working_days.count(self.start_date, self.end_date)
+        if (
+            non_working_days.count(self.start_date, self.start_date)
+            or (self.end_date and non_working_days.count(self.end_date, self.end_date))
+        ) and (
             self.start_date_breakdown == "second_half"
             or self.end_date_breakdown == "first_half"
         ):
@@ -1066,20 +1090,14 @@ class LeaveRequest(HorillaModel):
         self.requested_days = self.requested_days - total_leave_count
 
     def exclude_leaves(self):
-        holiday_count = 0
         if self.leave_type_id.exclude_holiday == "yes":
-            requested_dates = self.requested_dates()
-            holiday_dates = self.holiday_dates()
-            for requested_date in requested_dates:
-                if requested_date in holiday_dates:
-                    holiday_count += 1
+            holiday_count = self.non_working_days().count(
+                self.start_date, self.end_date, company_leaves=False
+            )
             self.requested_days = self.requested_days - holiday_count
         if self.leave_type_id.exclude_company_leave == "yes":
-            requested_dates = self.requested_dates()
-            company_leave_dates = self.company_leave_dates()
-            company_leave_count = sum(
-                requested_date in company_leave_dates
-                for requested_date in requested_dates
+            company_leave_count = self.non_working_days().count(
+                self.start_date, self.end_date, holidays=False
             )
             self.requested_days = self.requested_days - company_leave_count
 
@@ -1103,6 +1121,7 @@ class LeaveRequest(HorillaModel):
             )
             self.approved_available_days = self.requested_days
         self.status = "approved"
+        available_leave.set_ledger_entry("consumption", self)
         available_leave.save()
 
     def multiple_approvals(self, *args, **kwargs):
@@ -1150,20 +1169,49 @@ class LeaveRequest(HorillaModel):
                     _("The {} leave request cannot be deleted !").format(self.status),
                 )
 
-    def update_leave_clashes_count(self):
+    def update_leave_clashes_count(self, previous_dates=None):
         """
-        Update the leave clashes count for all leave requests.
+        Update the leave clashes count of this leave request and of the
+        requests that overlap its current or previous dates.
         """
-        leave_requests_to_update = LeaveRequest.objects.exclude(
-            Q(id=self.id) | Q(status="cancelled") | Q(status="rejected")
+        date_ranges = [(self.start_date, self.end_date)]
+        if previous_dates:
+            date_ranges.append(previous_dates)
+        leave_request_ids = set(
+            self.leave_clash_candidates(*date_ranges).values_list("id", flat=True)
         )
+        if self.pk:
+            leave_request_ids.add(self.pk)
 
-        for leave_request in leave_requests_to_update:
-            leave_request.leave_clashes_count = leave_request.count_leave_clashes()
+        counts = refresh_leave_clashes_count(leave_request_ids)
+        if self.pk in counts:
+            self.leave_clashes_count = counts[self.pk]
 
-        # Bulk update leave clashes count for all leave requests
-        LeaveRequest.objects.bulk_update(
-            leave_requests_to_update, ["leave_clashes_count"]
+    def leave_clash_candidates(self, *date_ranges):
+        """
+        Leave requests of the colleagues in the same company and department
+        or job position that overlap any of the date ranges.
+        """
+        work_info = EmployeeWorkInformation.objects.filter(
+            employee_id=self.employee_id
+        ).first()
+        if work_info is None or not date_ranges:
+            return LeaveRequest.objects.none()
+
+        overlap = Q()
+        for start_date, end_date in date_ranges:
+            overlap |= Q(start_date__lte=end_date, end_date__gte=start_date)
+        return (
+            LeaveRequest.objects.entire()
+            .filter(overlap)
+            .filter(
+                Q(employee_id__employee_work_info__department_id=work_info.department_id)
+                | Q(
+                    employee_id__employee_work_info__job_position_id=work_info.job_position_id
+                ),
+                employee_id__employee_work_info__company_id=work_info.company_id,
+            )
+            .exclude(status__in=LEAVE_CLASH_EXCLUDED_STATUS)
         )
 
     def count_leave_clashes(self):
@@ -1396,6 +1444,7 @@ if apps.is_installed("attendance"):
                 leave_type_id=self.leave_type_id,
             )
             available_leave.available_days += self.requested_days
+            available_leave.set_ledger_entry("allocation", note="Compensatory leave")
             available_leave.save()
 
         def exclude_compensatory_leave(self):
@@ -1416,6 +1465,9 @@ if apps.is_installed("attendance"):
                     )
                 else:
                     available_leave.available_days -= self.requested_days
+                available_leave.set_ledger_entry(
+                    "consumption", note="Compensatory leave"
+                )
                 available_leave.save()
 
         def save(self, *args, **kwargs):
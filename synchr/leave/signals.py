@@ -3,12 +3,19 @@
 import threading
 
 from django.apps import apps
-from django.db.models.signals import post_migrate, post_save, pre_delete, pre_save
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
 from horilla.methods import get_horilla_model_class
-from leave.models import LeaveRequest
+from leave.ledger import record_balance_change, refresh_leave_taken
+from leave.models import AvailableLeave, LeaveRequest
 
 if apps.is_installed("attendance"):
 
@@ -85,6 +92,23 @@ if apps.is_installed("attendance"):
         work_records = WorkRecords.objects.filter(leave_request_id=instance).delete()
 
 
+@receiver(post_save, sender=AvailableLeave)
+def write_leave_ledger(sender, instance, created, **kwargs):
+    """
+    Write the change of the leave balance to the ledger
+    """
+    record_balance_change(instance, created=created)
+
+
+@receiver(post_save, sender=LeaveRequest)
+@receiver(post_delete, sender=LeaveRequest)
+def update_leave_taken(sender, instance, **kwargs):
+    """
+    Keep the approved leave days of the available leave up to date
+    """
+    refresh_leave_taken(instance.employee_id_id, instance.leave_type_id_id)
+
+
 # @receiver(post_migrate)
 def add_missing_leave_to_workrecords(sender, **kwargs):
     if sender.label not in ["attendance", "leave"]:
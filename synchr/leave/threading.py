@@ -125,6 +125,21 @@ class LeaveMailSendThread(Thread):
         return
 
 
+class LeaveBulkMailSendThread(LeaveMailSendThread):
+    """
+    Sends the mails of several leave requests from a single thread
+    """
+
+    def __init__(self, request, leave_requests, type):
+        super().__init__(request, None, type)
+        self.leave_requests = list(leave_requests)
+
+    def run(self) -> None:
+        for leave_request in self.leave_requests:
+            self.leave_request = leave_request
+            super().run()
+
+
 class LeaveClashThread(Thread):
 
     def __init__(self, leave_request):
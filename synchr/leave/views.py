@@ -38,7 +38,8 @@ from base.methods import (
     is_reportingmanager,
     sortby,
 )
-from base.models import CompanyLeaves, Holidays, PenaltyAccounts
+from base.models import Holidays, PenaltyAccounts
+from base.non_working_days import NonWorkingDays
 from employee.models import Employee
 from horilla.decorators import (
     hx_request_required,
@@ -51,18 +52,18 @@ from horilla.decorators import (
 from horilla.group_by import group_by_queryset
 from horilla.horilla_settings import DYNAMIC_URL_PATTERNS
 from horilla.methods import get_horilla_model_class, remove_dynamic_url
+from leave.bulk_approval import bulk_approve_leave_requests, bulk_reject_leave_requests
 from leave.decorators import *
 from leave.filters import *
 from leave.forms import *
+from leave.ledger import record_allocations
 from leave.methods import (
     attendance_days,
     calculate_requested_days,
-    company_leave_dates_list,
     filter_conditional_leave_request,
-    holiday_dates_list,
 )
 from leave.models import *
-from leave.models import leave_requested_dates
+from leave.models import cal_effective_requested_days
 from leave.threading import LeaveMailSendThread
 from notifications.signals import notify
 
@@ -464,6 +465,7 @@ def leave_request_creation(request, type_id=None, emp_id=None):
                 leave_request.created_by = request.user.employee_get
                 leave_request.save()
                 try:
+                    available_leave.set_ledger_entry("consumption", leave_request)
                     available_leave.save()
                 except:
                     pass
@@ -1022,6 +1024,7 @@ def leave_request_approve(request, id, emp_id=None):
             leave_request.status = "approved"
             if not leave_request.multiple_approvals():
                 leave_request.save()
+                available_leave.set_ledger_entry("consumption", leave_request)
                 available_leave.save()
                 send_notification = True
             else:
@@ -1030,6 +1033,7 @@ def leave_request_approve(request, id, emp_id=None):
                         leave_request_id=leave_request
                     ).update(is_approved=True)
                     leave_request.save()
+                    available_leave.set_ledger_entry("consumption", leave_request)
                     available_leave.save()
                     send_notification = True
                 else:
@@ -1066,6 +1070,7 @@ def leave_request_approve(request, id, emp_id=None):
                     condition_approval.save()
                     if approver == conditional_requests["managers"][-1]:
                         leave_request.save()
+                        available_leave.set_ledger_entry("consumption", leave_request)
                         available_leave.save()
                         send_notification = True
             messages.success(request, _("Leave request approved successfully.."))
@@ -1104,56 +1109,57 @@ def leave_request_approve(request, id, emp_id=None):
 @login_required
 @manager_can_enter("leave.change_leaverequest")
 def leave_request_bulk_approve(request):
+    """
+    function used to approve the selected leave requests in one batch
+    """
     if request.method == "POST":
         request_ids = request.POST.getlist("ids")
-        for request_id in request_ids:
-            try:
-                leave_request = (
-                    LeaveRequest.objects.get(id=int(request_id)) if request_id else None
-                )
-                if leave_request.status == "requested" and (
-                    leave_request.start_date >= datetime.today().date()
-                    or request.user.has_perm("leave.change_leaverequest")
-                ):
-                    leave_request_approve(request, leave_request.id)
-                else:
-                    if leave_request.status == "approved":
-                        messages.info(
-                            request,
-                            _("{} {} request already approved").format(
-                                leave_request.employee_id, leave_request.leave_type_id
-                            ),
-                        )
-                    elif leave_request.start_date < datetime.today().date():
-                        messages.warning(
-                            request,
-                            _("{} {} request date exceeded").format(
-                                leave_request.employee_id, leave_request.leave_type_id
-                            ),
-                        )
-                    else:
-                        messages.warning(
-                            request,
-                            _("{} {} can't approve.").format(
-                                leave_request.employee_id, leave_request.leave_type_id
-                            ),
-                        )
-            except (ValueError, OverflowError, LeaveRequest.DoesNotExist):
-                messages.error(request, _("Leave request not found"))
-                pass
+        try:
+            result = bulk_approve_leave_requests(request, request_ids)
+        except (ValueError, OverflowError):
+            messages.error(request, _("Leave request not found"))
+            return HttpResponse("<script>window.location.reload();</script>")
+        for leave_request, message in result["skipped"]:
+            if leave_request.status == "approved":
+                messages.info(request, message)
+            else:
+                messages.warning(request, message)
+        if result["approved"] or result["forwarded"]:
+            messages.success(
+                request,
+                _("{} leave requests approved successfully..").format(
+                    len(result["approved"]) + len(result["forwarded"])
+                ),
+            )
     return HttpResponse("<script>window.location.reload();</script>")
 
 
 @login_required
 @manager_can_enter("leave.change_leaverequest")
 def leave_bulk_reject(request):
-    request_ids = request.POST.getlist("request_ids")
-
-    for request_id in request_ids:
-        leave_request = (
-            LeaveRequest.objects.get(id=int(request_id)) if request_id else None
-        )
-        leave_request_cancel(request, leave_request.id)
+    """
+    function used to reject the selected leave requests in one batch
+    """
+    form = RejectForm(request.POST)
+    if request.method == "POST" and form.is_valid():
+        try:
+            result = bulk_reject_leave_requests(
+                request,
+                request.POST.getlist("request_ids"),
+                form.cleaned_data["reason"],
+            )
+        except (ValueError, OverflowError):
+            messages.error(request, _("Leave request not found"))
+            return HttpResponse("<script>window.location.reload();</script>")
+        for _leave_request, message in result["skipped"]:
+            messages.warning(request, message)
+        if result["rejected"]:
+            messages.success(
+                request,
+                _("{} leave requests rejected successfully..").format(
+                    len(result["rejected"])
+                ),
+            )
 
     return HttpResponse("<script>window.location.reload();</script>")
 
@@ -1210,6 +1216,7 @@ def leave_request_cancel(request, id, emp_id=None):
 
                 leave_request.reject_reason = form.cleaned_data["reason"]
                 leave_request.save()
+                available_leave.set_ledger_entry("refund", leave_request)
                 available_leave.save()
                 comment = LeaverequestComment()
                 comment.request_id = leave_request
@@ -1405,7 +1412,7 @@ def leave_assign_one(request, obj_id):
                 leave.carryforward_days = max(leave.carryforward_days, 0)
                 available_leaves.append(leave)
 
-            AvailableLeave.objects.bulk_create(available_leaves)
+            record_allocations(AvailableLeave.objects.bulk_create(available_leaves))
             assigned_count = len(available_leaves)
 
             messages.success(
@@ -1631,7 +1638,9 @@ def leave_assign(request):
             # Bulk create new assignments
             if new_assignments:
                 with transaction.atomic():
-                    AvailableLeave.objects.bulk_create(new_assignments)
+                    record_allocations(
+                        AvailableLeave.objects.bulk_create(new_assignments)
+                    )
                     for user_id in success_messages:
                         with contextlib.suppress(Exception):
                             notify.send(
@@ -1877,7 +1886,7 @@ def assign_leave_type_import(request):
 
         # Bulk create available leaves
         if assign_leave_list:
-            AvailableLeave.objects.bulk_create(assign_leave_list)
+            record_allocations(AvailableLeave.objects.bulk_create(assign_leave_list))
 
         # Generate error report if there are errors
         path_info = None
@@ -2183,34 +2192,13 @@ def user_leave_request(request, id):
         requested_days = calculate_requested_days(
             start_date, end_date, start_date_breakdown, end_date_breakdown
         )
-        requested_dates = leave_requested_dates(start_date, end_date)
-        requested_dates = [date.date() for date in requested_dates]
-        holidays = Holidays.objects.all()
-        holiday_dates = holiday_dates_list(holidays)
-        company_leaves = CompanyLeaves.objects.all()
-        company_leave_dates = company_leave_dates_list(company_leaves, start_date)
-        if (
-            leave_type.exclude_company_leave == "yes"
-            and leave_type.exclude_holiday == "yes"
-        ):
-            total_leaves = list(set(holiday_dates + company_leave_dates))
-            total_leave_count = sum(
-                requested_date in total_leaves for requested_date in requested_dates
-            )
-            requested_days = requested_days - total_leave_count
-        else:
-            holiday_count = 0
-            if leave_type.exclude_holiday == "yes":
-                for requested_date in requested_dates:
-                    if requested_date in holiday_dates:
-                        holiday_count += 1
-                requested_days = requested_days - holiday_count
-            if leave_type.exclude_company_leave == "yes":
-                company_leave_count = sum(
-                    requested_date in company_leave_dates
-                    for requested_date in requested_dates
-                )
-                requested_days = requested_days - company_leave_count
+        requested_days = cal_effective_requested_days(
+            start_date.date(),
+            end_date.date(),
+            leave_type,
+            requested_days,
+            non_working_days=NonWorkingDays.for_employee(employee),
+        )
 
         if form.is_valid():
             leave_request = form.save(commit=False)
@@ -2242,6 +2230,7 @@ def user_leave_request(request, id):
                     )
                     leave_request.approved_available_days = leave_request.requested_days
                 leave_request.status = "approved"
+                available_leave.set_ledger_entry("consumption", leave_request)
                 available_leave.save()
             if save:
                 leave_request.created_by = employee
@@ -2361,36 +2350,13 @@ def user_request_update(request, id):
                     requested_days = calculate_requested_days(
                         start_date, end_date, start_date_breakdown, end_date_breakdown
                     )
-                    requested_dates = leave_requested_dates(start_date, end_date)
-                    holidays = Holidays.objects.all()
-                    holiday_dates = holiday_dates_list(holidays)
-                    company_leaves = CompanyLeaves.objects.all()
-                    company_leave_dates = company_leave_dates_list(
-                        company_leaves, start_date
+                    requested_days = cal_effective_requested_days(
+                        start_date,
+                        end_date,
+                        leave_type,
+                        requested_days,
+                        non_working_days=NonWorkingDays.for_employee(employee),
                     )
-                    if (
-                        leave_type.exclude_company_leave == "yes"
-                        and leave_type.exclude_holiday == "yes"
-                    ):
-                        total_leaves = list(set(holiday_dates + company_leave_dates))
-                        total_leave_count = sum(
-                            requested_date in total_leaves
-                            for requested_date in requested_dates
-                        )
-                        requested_days = requested_days - total_leave_count
-                    else:
-                        holiday_count = 0
-                        if leave_type.exclude_holiday == "yes":
-                            for requested_date in requested_dates:
-                                if requested_date in holiday_dates:
-                                    holiday_count += 1
-                            requested_days = requested_days - holiday_count
-                        if leave_type.exclude_company_leave == "yes":
-                            company_leave_count = sum(
-                                requested_date in company_leave_dates
-                                for requested_date in requested_dates
-                            )
-                            requested_days = requested_days - company_leave_count
                     if requested_days <= available_total_leave:
                         leave_request.save()
                         messages.success(
@@ -3176,6 +3142,7 @@ def leave_request_create(request):
                             leave_request.requested_days
                         )
                     leave_request.status = "approved"
+                    available_leave.set_ledger_entry("consumption", leave_request)
                     available_leave.save()
                 if save:
                     leave_request.created_by = request.user.employee_get
@@ -3581,6 +3548,7 @@ def leave_allocation_request_approve(request, req_id):
                 employee_id=employee,
             )
         available_leave.available_days += leave_allocation_request.requested_days
+        available_leave.set_ledger_entry("allocation", note="Leave allocation request")
         available_leave.save()
         leave_allocation_request.status = "approved"
         leave_allocation_request.save()
@@ -3639,6 +3607,9 @@ def leave_allocation_request_reject(request, req_id):
                         0, available_leave.available_days - requested_days
                     )
 
+                    available_leave.set_ledger_entry(
+                        "adjustment", note="Leave allocation request rejected"
+                    )
                     available_leave.save()
                 leave_allocation_request.status = "rejected"
                 leave_allocation_request.save()
@@ -66,7 +66,9 @@ def get_leaves(employee, start_date, end_date):
     unpaid_half = 0
     paid_leave_dates = []
     unpaid_leave_dates = []
-    company_leave_dates = get_working_days(start_date, end_date)["company_leave_dates"]
+    company_leave_dates = get_working_days(
+        start_date, end_date, employee.get_company()
+    )["company_leave_dates"]
 
     if approved_leaves and approved_leaves.exists():
         for instance in approved_leaves:
@@ -131,7 +133,8 @@ if apps.is_installed("attendance"):
         present_on = [
             attendance.attendance_date for attendance in attendances_on_period
         ]
-        working_days_between_range = get_working_days(start_date, end_date)[
+        company = employee.get_company()
+        working_days_between_range = get_working_days(start_date, end_date, company)[
             "working_days_on"
         ]
         leave_dates = get_leaves(employee, start_date, end_date)["leave_dates"]
@@ -143,12 +146,12 @@ if apps.is_installed("attendance"):
         conflict_dates = conflict_dates + [
             date
             for date in present_on
-            if date in get_holiday_dates(start_date, end_date)
+            if date in get_holiday_dates(start_date, end_date, company)
             or date
             in list(
                 set(
-                    get_company_leave_dates(start_date.year)
-                    + get_company_leave_dates(end_date.year)
+                    get_company_leave_dates(start_date.year, company)
+                    + get_company_leave_dates(end_date.year, company)
                 )
             )
         ]
@@ -233,7 +236,7 @@ def daily_computation(employee, wage, start_date, end_date):
         start_date (obj): start of the pay period
         end_date (obj): end date of the period
     """
-    working_day_data = get_working_days(start_date, end_date)
+    working_day_data = get_working_days(start_date, end_date, employee.get_company())
     total_working_days = working_day_data["total_working_days"]
 
     leave_data = get_leaves(employee, start_date, end_date)
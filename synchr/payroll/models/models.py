@@ -1719,6 +1719,9 @@ class Reimbursement(HorillaModel):
                             assigned_leave.carryforward_days = (
                                 carryforward_days - self.cfd_to_encash
                             )
+                            assigned_leave.set_ledger_entry(
+                                "consumption", note="Leave encashment"
+                            )
                             assigned_leave.save()
                         else:
                             request = getattr(
@@ -1761,6 +1764,9 @@ class Reimbursement(HorillaModel):
                         assigned_leave.carryforward_days = (
                             assigned_leave.carryforward_days + cfd_days
                         )
+                        assigned_leave.set_ledger_entry(
+                            "refund", note="Leave encashment rejected"
+                        )
                         assigned_leave.save()
                     self.allowance_id.delete()
 
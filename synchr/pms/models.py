@@ -1,11 +1,16 @@
 import operator
+import threading
+from datetime import date
 
 from dateutil.relativedelta import relativedelta
 from django.apps import apps
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg
+from django.db.models.functions import Cast, Floor
 from django.utils.translation import gettext_lazy as _
+from simple_history.utils import bulk_update_with_history
 
 from base.horilla_company_manager import HorillaCompanyManager
 from base.models import Company, Department, JobPosition
@@ -224,13 +229,16 @@ class EmployeeObjective(HorillaModel):
         """
         used for updating progress percentage when current value of key result change
         """
-        krs = self.employee_key_result.all()
-        if len(krs) > 0:
-            current = 0
-            for kr in krs:
-                current += kr.progress_percentage
-            self.progress_percentage = int(current / len(krs))
-            self.save()
+        average = (
+            EmployeeKeyResult.objects.entire()
+            .filter(employee_objective_id=self.pk)
+            .aggregate(average=Avg("progress_percentage"))["average"]
+        )
+        if average is not None:
+            self.progress_percentage = int(average)
+            EmployeeObjective.objects.entire().filter(pk=self.pk).update(
+                progress_percentage=self.progress_percentage, updated_at=date.today()
+            )
 
     def __str__(self):
         return f"{self.objective_id} | {self.employee_id}"
@@ -244,10 +252,9 @@ class EmployeeObjective(HorillaModel):
                 self.end_date = self.start_date + relativedelta(months=duration)
             elif self.objective_id.duration_unit == "years":
                 self.end_date = self.start_date + relativedelta(years=duration)
-        # Add assignees to the objective
-        objective = self.objective_id
-        if self.employee_id not in objective.assignees.all():
-            objective.assignees.add(self.employee_id)
+        # Add assignees to the objective, add only inserts a missing row
+        if self.objective_id and self.employee_id_id:
+            self.objective_id.assignees.add(self.employee_id_id)
         super().save(*args, **kwargs)
 
     def tracking(self):
@@ -420,7 +427,8 @@ class EmployeeKeyResult(models.Model):
             self.key_result = self.key_result_id.title
         self.update_kr_progress()
         super().save(*args, **kwargs)
-        self.employee_objective_id.update_objective_progress()
+        if self.employee_objective_id_id:
+            schedule_objective_progress(self.employee_objective_id_id)
 
     class meta:
         """
@@ -430,6 +438,83 @@ class EmployeeKeyResult(models.Model):
         unique_together = ("key_result_id", "employee_objective_id")
 
 
+_objective_progress = threading.local()
+
+
+def update_objectives_progress(employee_objective_ids):
+    """
+    Set the progress of the employee objectives to the average progress of
+    their key results, the averages are read in one query and only the
+    objectives whose progress changed are written, with their history. The
+    objectives without key results keep their progress.
+    """
+    averages = dict(
+        EmployeeKeyResult.objects.entire()
+        .filter(employee_objective_id__in=employee_objective_ids)
+        .order_by()
+        .values("employee_objective_id")
+        .annotate(
+            average=Cast(Floor(Avg("progress_percentage")), models.IntegerField())
+        )
+        .values_list("employee_objective_id", "average")
+    )
+    changed = []
+    for employee_objective in EmployeeObjective.objects.entire().filter(
+        pk__in=averages
+    ):
+        average = averages[employee_objective.pk]
+        if average is not None and employee_objective.progress_percentage != average:
+            employee_objective.progress_percentage = average
+            employee_objective.updated_at = date.today()
+            changed.append(employee_objective)
+    if changed:
+        request = getattr(horilla_middlewares._thread_locals, "request", None)
+        user = getattr(request, "user", None)
+        bulk_update_with_history(
+            changed,
+            EmployeeObjective,
+            ["progress_percentage", "updated_at"],
+            default_user=user if getattr(user, "is_authenticated", False) else None,
+            manager=EmployeeObjective._base_manager,
+        )
+    return len(changed)
+
+
+def flush_objectives_progress():
+    """
+    Roll up the progress of the employee objectives waiting for it
+    """
+    pending = getattr(_objective_progress, "pending", None)
+    _objective_progress.commit_hooks = None
+    if pending:
+        _objective_progress.pending = set()
+        update_objectives_progress(pending)
+
+
+def schedule_objective_progress(employee_objective_id):
+    """
+    Roll the key result progress up to the employee objective when the
+    transaction commits. The key results saved in a transaction are rolled
+    up once per objective, outside a transaction it happens right away.
+    """
+    pending = getattr(_objective_progress, "pending", None)
+    if pending is None:
+        pending = _objective_progress.pending = set()
+    pending.add(employee_objective_id)
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        flush_objectives_progress()
+        return
+    # The commit hooks list is replaced when the transaction ends or a
+    # savepoint is rolled back, so the flush is registered once per transaction
+    # and again when a rollback dropped it
+    if getattr(_objective_progress, "commit_hooks", None) is not (
+        connection.run_on_commit
+    ):
+        transaction.on_commit(flush_objectives_progress)
+        _objective_progress.commit_hooks = connection.run_on_commit
+
+
 """360degree feedback section"""
 
 
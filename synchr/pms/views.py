@@ -16,6 +16,7 @@ from django import forms
 from django.contrib import messages
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import ProtectedError, Q
 from django.db.utils import IntegrityError
 from django.forms import modelformset_factory
@@ -133,34 +134,36 @@ def obj_form_save(request, objective_form):
     default_krs = objective_form.cleaned_data["key_result_id"]
 
     messages.success(request, _("Objective created"))
-    if assignees:
-        for emp in assignees:
-            emp_objective = EmployeeObjective(
-                objective_id=objective, employee_id=emp, start_date=start_date
-            )
-            emp_objective.save()
-            # assigning default key result
-            if default_krs:
-                for key in default_krs:
-                    emp_kr = EmployeeKeyResult(
-                        employee_objective_id=emp_objective,
-                        key_result_id=key,
-                        progress_type=key.progress_type,
-                        target_value=key.target_value,
-                    )
-                    emp_kr.save()
-            notify.send(
-                request.user.employee_get,
-                recipient=emp.employee_user_id,
-                verb="You got an OKR!.",
-                verb_ar="لقد حققت هدفًا ونتيجة رئيسية!",
-                verb_de="Du hast ein Ziel-Key-Ergebnis erreicht!",
-                verb_es="¡Has logrado un Resultado Clave de Objetivo!",
-                verb_fr="Vous avez atteint un Résultat Clé d'Objectif !",
-                redirect=reverse(
-                    "objective-detailed-view", kwargs={"obj_id": objective.id}
-                ),
-            )
+    # The progress of the new key results is rolled up once on commit
+    with transaction.atomic():
+        if assignees:
+            for emp in assignees:
+                emp_objective = EmployeeObjective(
+                    objective_id=objective, employee_id=emp, start_date=start_date
+                )
+                emp_objective.save()
+                # assigning default key result
+                if default_krs:
+                    for key in default_krs:
+                        emp_kr = EmployeeKeyResult(
+                            employee_objective_id=emp_objective,
+                            key_result_id=key,
+                            progress_type=key.progress_type,
+                            target_value=key.target_value,
+                        )
+                        emp_kr.save()
+                notify.send(
+                    request.user.employee_get,
+                    recipient=emp.employee_user_id,
+                    verb="You got an OKR!.",
+                    verb_ar="لقد حققت هدفًا ونتيجة رئيسية!",
+                    verb_de="Du hast ein Ziel-Key-Ergebnis erreicht!",
+                    verb_es="¡Has logrado un Resultado Clave de Objetivo!",
+                    verb_fr="Vous avez atteint un Résultat Clé d'Objectif !",
+                    redirect=reverse(
+                        "objective-detailed-view", kwargs={"obj_id": objective.id}
+                    ),
+                )
 
 
 @login_required
@@ -228,45 +231,48 @@ def objective_update(request, obj_id):
                     EmployeeObjective.objects.filter(
                         employee_id=emp, objective_id=objective
                     ).delete()
-            for emp in new_emp:
-                if EmployeeObjective.objects.filter(
-                    employee_id=emp, objective_id=objective
-                ).exists():
-                    emp_obj = EmployeeObjective.objects.filter(
+            with transaction.atomic():
+                for emp in new_emp:
+                    if EmployeeObjective.objects.filter(
                         employee_id=emp, objective_id=objective
-                    ).first()
-                    emp_obj.start_date = start_date
-                else:
-                    emp_obj = EmployeeObjective(
-                        employee_id=emp, objective_id=objective, start_date=start_date
-                    )
-                emp_obj.save()
-                # assiging default key result
-                if default_krs:
-                    for key in default_krs:
-                        if not EmployeeKeyResult.objects.filter(
-                            employee_objective_id=emp_obj, key_result_id=key
-                        ).exists():
-                            emp_kr = EmployeeKeyResult.objects.create(
-                                employee_objective_id=emp_obj,
-                                key_result_id=key,
-                                progress_type=key.progress_type,
-                                target_value=key.target_value,
-                            )
-                            emp_kr.save()
+                    ).exists():
+                        emp_obj = EmployeeObjective.objects.filter(
+                            employee_id=emp, objective_id=objective
+                        ).first()
+                        emp_obj.start_date = start_date
+                    else:
+                        emp_obj = EmployeeObjective(
+                            employee_id=emp,
+                            objective_id=objective,
+                            start_date=start_date,
+                        )
+                    emp_obj.save()
+                    # assiging default key result
+                    if default_krs:
+                        for key in default_krs:
+                            if not EmployeeKeyResult.objects.filter(
+                                employee_objective_id=emp_obj, key_result_id=key
+                            ).exists():
+                                emp_kr = EmployeeKeyResult.objects.create(
+                                    employee_objective_id=emp_obj,
+                                    key_result_id=key,
+                                    progress_type=key.progress_type,
+                                    target_value=key.target_value,
+                                )
+                                emp_kr.save()
 
-                notify.send(
-                    request.user.employee_get,
-                    recipient=emp.employee_user_id,
-                    verb="You got an OKR!.",
-                    verb_ar="لقد حققت هدفًا ونتيجة رئيسية!",
-                    verb_de="Du hast ein Ziel-Key-Ergebnis erreicht!",
-                    verb_es="¡Has logrado un Resultado Clave de Objetivo!",
-                    verb_fr="Vous avez atteint un Résultat Clé d'Objectif !",
-                    redirect=reverse(
-                        "objective-detailed-view", kwargs={"obj_id": objective.id}
-                    ),
-                )
+                    notify.send(
+                        request.user.employee_get,
+                        recipient=emp.employee_user_id,
+                        verb="You got an OKR!.",
+                        verb_ar="لقد حققت هدفًا ونتيجة رئيسية!",
+                        verb_de="Du hast ein Ziel-Key-Ergebnis erreicht!",
+                        verb_es="¡Has logrado un Resultado Clave de Objetivo!",
+                        verb_fr="Vous avez atteint un Résultat Clé d'Objectif !",
+                        redirect=reverse(
+                            "objective-detailed-view", kwargs={"obj_id": objective.id}
+                        ),
+                    )
             messages.success(
                 request,
                 _("Objective %(objective)s Updated") % {"objective": instance},
@@ -434,41 +440,45 @@ def add_assignees(request, obj_id):
             objective = form.save(commit=False)
             assignees = form.cleaned_data["assignees"]
             start_date = form.cleaned_data["start_date"]
-            for emp in assignees:
-                objective.assignees.add(emp)
-                if not EmployeeObjective.objects.filter(
-                    employee_id=emp, objective_id=objective
-                ).exists():
-                    emp_obj = EmployeeObjective(
-                        employee_id=emp, objective_id=objective, start_date=start_date
+            # One insert into the assignees through table
+            objective.assignees.add(*assignees)
+            with transaction.atomic():
+                for emp in assignees:
+                    if not EmployeeObjective.objects.filter(
+                        employee_id=emp, objective_id=objective
+                    ).exists():
+                        emp_obj = EmployeeObjective(
+                            employee_id=emp,
+                            objective_id=objective,
+                            start_date=start_date,
+                        )
+                    emp_obj.save()
+                    # assiging default key result
+                    default_krs = objective.key_result_id.all()
+                    if default_krs:
+                        for key_result in default_krs:
+                            if not EmployeeKeyResult.objects.filter(
+                                employee_objective_id=emp_obj, key_result_id=key_result
+                            ).exists():
+                                emp_kr = EmployeeKeyResult.objects.create(
+                                    employee_objective_id=emp_obj,
+                                    key_result_id=key_result,
+                                    progress_type=key_result.progress_type,
+                                    target_value=key_result.target_value,
+                                    start_date=start_date,
+                                )
+                    notify.send(
+                        request.user.employee_get,
+                        recipient=emp.employee_user_id,
+                        verb="You got an OKR!.",
+                        verb_ar="لقد حققت هدفًا ونتيجة رئيسية!",
+                        verb_de="Du hast ein Ziel-Key-Ergebnis erreicht!",
+                        verb_es="¡Has logrado un Resultado Clave de Objetivo!",
+                        verb_fr="Vous avez atteint un Résultat Clé d'Objectif !",
+                        redirect=reverse(
+                            "objective-detailed-view", kwargs={"obj_id": objective.id}
+                        ),
                     )
-                emp_obj.save()
-                # assiging default key result
-                default_krs = objective.key_result_id.all()
-                if default_krs:
-                    for key_result in default_krs:
-                        if not EmployeeKeyResult.objects.filter(
-                            employee_objective_id=emp_obj, key_result_id=key_result
-                        ).exists():
-                            emp_kr = EmployeeKeyResult.objects.create(
-                                employee_objective_id=emp_obj,
-                                key_result_id=key_result,
-                                progress_type=key_result.progress_type,
-                                target_value=key_result.target_value,
-                                start_date=start_date,
-                            )
-                notify.send(
-                    request.user.employee_get,
-                    recipient=emp.employee_user_id,
-                    verb="You got an OKR!.",
-                    verb_ar="لقد حققت هدفًا ونتيجة رئيسية!",
-                    verb_de="Du hast ein Ziel-Key-Ergebnis erreicht!",
-                    verb_es="¡Has logrado un Resultado Clave de Objetivo!",
-                    verb_fr="Vous avez atteint un Résultat Clé d'Objectif !",
-                    redirect=reverse(
-                        "objective-detailed-view", kwargs={"obj_id": objective.id}
-                    ),
-                )
             objective.save()
             messages.success(
                 request,
@@ -3178,7 +3188,6 @@ def employee_keyresult_creation(request, emp_obj_id):
             emp_key_result = EmployeeKeyResultForm(request.POST)
             if emp_key_result.is_valid():
                 emp_key_result.save()
-                emp_objective.update_objective_progress()
                 key_result = emp_key_result.cleaned_data["key_result_id"]
 
                 emp_objective.key_result_id.add(key_result)
@@ -3238,7 +3247,6 @@ def employee_keyresult_update(request, kr_id):
         emp_key_result = EmployeeKeyResultForm(request.POST, instance=emp_kr)
         if emp_key_result.is_valid():
             emp_key_result.save()
-            emp_kr.employee_objective_id.update_objective_progress()
             messages.success(request, _("Key result Updated sucessfully."))
             notify.send(
                 request.user.employee_get,
@@ -3329,7 +3337,6 @@ def key_result_current_value_update(request):
         ):
             emp_kr.current_value = current_value
             emp_kr.save()
-            emp_kr.employee_objective_id.update_objective_progress()
             return JsonResponse({"type": "sucess"})
         else:
             messages.info(request, "You dont have permission")
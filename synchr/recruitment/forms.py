@@ -1246,7 +1246,7 @@ class ScheduleInterviewForm(BaseModelForm):
 class SkillsForm(ModelForm):
     class Meta:
         model = Skill
-        fields = ["title"]
+        fields = ["title", "synonyms"]
 
 
 class ResumeForm(ModelForm):
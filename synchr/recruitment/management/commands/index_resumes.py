@@ -0,0 +1,36 @@
+"""
+Management command to build the resume text index used for skill matching
+"""
+
+from django.core.management.base import BaseCommand
+
+from recruitment.models import Resume
+from recruitment.resume_index import index_pending_resumes
+
+
+class Command(BaseCommand):
+    help = "Index the text of the resumes that are not indexed yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reindex",
+            action="store_true",
+            help="Index all the resumes again",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of resumes indexed at a time (default: 100)",
+        )
+
+    def handle(self, *args, **options):
+        if options["reindex"]:
+            Resume.objects.update(word_count=None)
+        total = 0
+        while True:
+            indexed = index_pending_resumes(batch_size=options["batch_size"])
+            if not indexed:
+                break
+            total += indexed
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} resumes"))
@@ -97,6 +97,13 @@ class SurveyTemplate(HorillaModel):
 
 class Skill(HorillaModel):
     title = models.CharField(max_length=100)
+    synonyms = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        verbose_name=_("Synonyms"),
+        help_text=_("Comma separated names the skill also goes by"),
+    )
 
     def __str__(self):
         return self.title
@@ -1007,11 +1014,30 @@ class Resume(models.Model):
         Recruitment, on_delete=models.CASCADE, related_name="resume"
     )
     is_candidate = models.BooleanField(default=False)
+    word_count = models.IntegerField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.recruitment_id} - Resume {self.pk}"
 
 
+class ResumeTerm(models.Model):
+    """
+    Words and word pairs of the resume text, used for skill matching
+    """
+
+    resume_id = models.ForeignKey(
+        Resume, on_delete=models.CASCADE, related_name="terms"
+    )
+    term = models.CharField(max_length=255)
+
+    class Meta:
+        unique_together = ("resume_id", "term")
+        indexes = [models.Index(fields=["term", "resume_id"])]
+
+    def __str__(self):
+        return f"{self.resume_id} - {self.term}"
+
+
 STATUS = [
     ("requested", "Requested"),
     ("approved", "Approved"),
@@ -0,0 +1,63 @@
+"""
+pipeline_loader.py
+
+This module is used to load the candidates of the pipeline stages in bulk
+"""
+
+from collections import defaultdict
+
+from django.core.paginator import Page, Paginator
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from recruitment.models import Candidate
+
+
+def load_stage_candidates(stages, candidates, records_per_page=10):
+    """
+    This method is used to attach the candidate count and the first page of
+    candidates to every stage, using one aggregate query for the counts and
+    one windowed query for the pages.
+
+    Args:
+        stages: stage queryset or list
+        candidates: filtered candidate queryset
+        records_per_page: candidates shown on a stage page
+    """
+    stages = list(stages)
+    # Filter through the primary keys so joins of the filters can not
+    # produce duplicate rows in the window, the company filter is already
+    # part of the given candidates
+    candidates = Candidate.objects.entire().filter(
+        pk__in=candidates.filter(stage_id__in=stages).values("pk")
+    )
+
+    counts = dict(
+        candidates.order_by()
+        .values_list("stage_id")
+        .annotate(count=Count("pk"))
+        .values_list("stage_id", "count")
+    )
+    first_pages = defaultdict(list)
+    for candidate in (
+        candidates.select_related("stage_id", "recruitment_id", "job_position_id")
+        .annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=[F("stage_id")],
+                order_by=[F("sequence").asc(), F("pk").asc()],
+            )
+        )
+        .filter(row_number__lte=records_per_page)
+        .order_by("stage_id", "row_number")
+    ):
+        first_pages[candidate.stage_id_id].append(candidate)
+
+    for stage in stages:
+        paginator = Paginator(
+            candidates.filter(stage_id=stage).order_by("sequence"), records_per_page
+        )
+        # count is a cached property, seed it with the aggregated count
+        paginator.count = counts.get(stage.id, 0)
+        stage.candidates_page = Page(first_pages[stage.id], 1, paginator)
+    return stages
@@ -0,0 +1,95 @@
+"""
+pipeline_state.py
+
+This module is used to keep the pipeline filter state of a session in the
+shared cache. Only the query string and the recruitment ids are stored, the
+querysets are rebuilt from them on every request.
+"""
+
+from django.core.cache import cache as CACHE
+from django.db.models import Case, IntegerField, Value, When
+from django.http import QueryDict
+
+from recruitment.filters import CandidateFilter, StageFilter
+from recruitment.models import Recruitment
+
+PIPELINE_STATE_TIMEOUT = 60 * 60 * 8
+
+
+def pipeline_state_key(request):
+    """
+    Cache key of the pipeline state of the session
+    """
+    return request.session.session_key + "pipeline"
+
+
+def save_pipeline_state(request, recruitments, filter_dict):
+    """
+    This method is used to store the pipeline filter of the session
+
+    Args:
+        recruitments: filtered recruitment queryset
+        filter_dict: filter tags shown on the pipeline
+    """
+    CACHE.set(
+        pipeline_state_key(request),
+        {
+            "filter_query": request.GET.urlencode(),
+            "filter_dict": filter_dict,
+            "recruitment_ids": list(recruitments.values_list("id", flat=True)),
+        },
+        timeout=PIPELINE_STATE_TIMEOUT,
+    )
+
+
+def get_pipeline_state(request):
+    """
+    This method is used to rebuild the pipeline querysets of the session,
+    an expired state falls back to the unfiltered pipeline
+    """
+    state = CACHE.get(pipeline_state_key(request)) or {
+        "filter_query": "",
+        "filter_dict": {},
+        "recruitment_ids": None,
+    }
+    filter_query = QueryDict(state["filter_query"])
+    recruitments = Recruitment.objects.filter(is_active=True)
+    if state["recruitment_ids"] is not None:
+        recruitments = Recruitment.objects.filter(id__in=state["recruitment_ids"])
+    return {
+        "candidates": CandidateFilter(filter_query)
+        .qs.filter(is_active=True)
+        .order_by("sequence"),
+        "stages": StageFilter(filter_query).qs.order_by("sequence"),
+        "recruitments": recruitments,
+        "filter_dict": state["filter_dict"],
+        "filter_query": filter_query,
+    }
+
+
+def resequence_candidates(candidates, order_list, stage, **fields):
+    """
+    This method is used to move the candidates to the stage in the given
+    order with a single update statement
+
+    Args:
+        candidates: candidate queryset the ids are looked up in
+        order_list: candidate ids in their new order
+        stage: stage the candidates are placed in
+        fields: other fields to set on the candidates
+    """
+    order_list = [int(cand_id) for cand_id in order_list]
+    if not order_list:
+        return 0
+    # Queryset update keeps the bulk update signals of the automations
+    return candidates.filter(id__in=order_list).update(
+        sequence=Case(
+            *[
+                When(pk=cand_id, then=Value(index))
+                for index, cand_id in enumerate(order_list)
+            ],
+            output_field=IntegerField(),
+        ),
+        stage_id=stage,
+        **fields,
+    )
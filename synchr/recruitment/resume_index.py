@@ -0,0 +1,167 @@
+"""
+resume_index.py
+
+This module is used to index the resume text once and match the
+recruitment skills against the index.
+"""
+
+import logging
+import re
+import threading
+from collections import defaultdict
+
+import fitz  # type: ignore
+from django.db import transaction
+
+from recruitment.models import Resume, ResumeTerm
+
+logger = logging.getLogger(__name__)
+
+# Longest word sequence stored as a single term, longer skills are matched
+# through all of their consecutive word pairs
+MAX_TERM_WORDS = 2
+
+
+# Words keep their inner dots and trailing + and #, so that skills such as
+# C++, C#, .NET and Node.js are not reduced to their letters
+TERM_PATTERN = re.compile(r"\.?\w(?:[\w+#.]*[\w+#])?")
+
+
+def tokenize(text):
+    """
+    Lower cased words of the text
+    """
+    return TERM_PATTERN.findall(text.lower())
+
+
+def extract_words_from_pdf(pdf_file):
+    """
+    This method is used to extract the words from the pdf file into a list.
+    Args:
+        pdf_file: pdf file
+
+    """
+    pdf_document = fitz.open(pdf_file.path)
+
+    words = []
+
+    for page_num in range(len(pdf_document)):
+        page = pdf_document.load_page(page_num)
+        words.extend(tokenize(page.get_text()))
+
+    pdf_document.close()
+
+    return words
+
+
+def phrase_terms(words):
+    """
+    Terms a phrase has to match, the phrase itself when it is short enough
+    """
+    if len(words) <= MAX_TERM_WORDS:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[index : index + MAX_TERM_WORDS])
+        for index in range(len(words) - MAX_TERM_WORDS + 1)
+    }
+
+
+def resume_terms(words):
+    """
+    All the words and word pairs of the resume
+    """
+    terms = set()
+    for size in range(1, MAX_TERM_WORDS + 1):
+        for index in range(len(words) - size + 1):
+            term = " ".join(words[index : index + size])
+            if len(term) <= 255:
+                terms.add(term)
+    return terms
+
+
+def index_resume(resume):
+    """
+    Store the terms of the resume, resumes without text (scanned images or
+    unreadable files) are indexed with no words
+    """
+    try:
+        words = extract_words_from_pdf(resume.file)
+    except Exception as e:
+        logger.error(f"Could not read the text of resume {resume.pk}: {e}")
+        words = []
+
+    with transaction.atomic():
+        ResumeTerm.objects.filter(resume_id=resume).delete()
+        ResumeTerm.objects.bulk_create(
+            [ResumeTerm(resume_id=resume, term=term) for term in resume_terms(words)],
+            batch_size=999,
+            ignore_conflicts=True,
+        )
+        Resume.objects.filter(pk=resume.pk).update(word_count=len(words))
+    resume.word_count = len(words)
+
+
+def index_resume_in_thread(resume_id):
+    """
+    Index a newly uploaded resume without holding up the request
+    """
+
+    def run():
+        try:
+            resume = Resume.objects.filter(pk=resume_id).first()
+            if resume:
+                index_resume(resume)
+        except Exception as e:
+            # The scheduler picks the resume up again later
+            logger.error(f"Could not index resume {resume_id}: {e}")
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def index_pending_resumes(batch_size=100, queryset=None):
+    """
+    Index the resumes that have not been indexed yet, returns the count
+    """
+    queryset = Resume.objects.all() if queryset is None else queryset
+    resumes = list(queryset.filter(word_count__isnull=True)[:batch_size])
+    for resume in resumes:
+        index_resume(resume)
+    return len(resumes)
+
+
+def skill_alternatives(skill):
+    """
+    Term sets of the skill title and its synonyms, any one set matching
+    means the resume has the skill
+    """
+    names = [skill.title] + (skill.synonyms or "").split(",")
+    alternatives = [phrase_terms(tokenize(name)) for name in names]
+    return [terms for terms in alternatives if terms]
+
+
+def resume_skill_matches(recruitment):
+    """
+    Number of recruitment skills found in each resume of the recruitment
+    with a single query on the resume index, the resumes not indexed yet are
+    left to the scheduler and the index_resumes command
+    """
+    skills = [skill_alternatives(skill) for skill in recruitment.skills.all()]
+    all_terms = {
+        term for alternatives in skills for terms in alternatives for term in terms
+    }
+
+    found = defaultdict(set)
+    for resume_id, term in ResumeTerm.objects.filter(
+        resume_id__recruitment_id=recruitment,
+        resume_id__word_count__isnull=False,
+        term__in=all_terms,
+    ).values_list("resume_id", "term"):
+        found[resume_id].add(term)
+
+    return {
+        resume_id: sum(
+            any(terms <= terms_found for terms in alternatives)
+            for alternatives in skills
+        )
+        for resume_id, terms_found in found.items()
+    }
@@ -47,6 +47,15 @@ def candidate_convert():
             cand.save()
 
 
+def index_resumes():
+    """
+    Index the text of the resumes uploaded before the resume index existed
+    """
+    from recruitment.resume_index import index_pending_resumes
+
+    index_pending_resumes()
+
+
 if not any(
     cmd in sys.argv
     for cmd in ["makemigrations", "migrate", "compilemessages", "flush", "shell"]
@@ -57,5 +66,6 @@ if not any(
     scheduler = BackgroundScheduler()
     scheduler.add_job(candidate_convert, "interval", minutes=5)
     scheduler.add_job(recruitment_close, "interval", hours=1)
+    scheduler.add_job(index_resumes, "interval", minutes=10)
 
     scheduler.start()
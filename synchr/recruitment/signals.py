@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
 
@@ -5,6 +6,7 @@ from recruitment.models import (
     CandidateDocument,
     CandidateDocumentRequest,
     Recruitment,
+    Resume,
     Stage,
 )
 
@@ -49,3 +51,15 @@ def candidate_document_create(instance):
         )
         document.title = f"Upload {instance.title}"
         document.save()
+
+
+@receiver(post_save, sender=Resume)
+def index_uploaded_resume(sender, instance, created, **kwargs):
+    """
+    Index the text of a newly uploaded resume for skill matching
+    """
+    if created:
+        from recruitment.resume_index import index_resume_in_thread
+
+        resume_id = instance.pk
+        transaction.on_commit(lambda: index_resume_in_thread(resume_id))
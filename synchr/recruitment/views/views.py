@@ -28,7 +28,6 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.models import User
 from django.core import serializers
-from django.core.cache import cache as CACHE
 from django.core.mail import EmailMessage
 from django.core.paginator import Paginator
 from django.db import IntegrityError, transaction
@@ -119,6 +118,13 @@ from recruitment.models import (
     StageFiles,
     StageNote,
 )
+from recruitment.pipeline_loader import load_stage_candidates
+from recruitment.pipeline_state import (
+    get_pipeline_state,
+    resequence_candidates,
+    save_pipeline_state,
+)
+from recruitment.resume_index import resume_skill_matches
 from recruitment.views.linkedin import delete_post, post_recruitment_in_linkedin
 from recruitment.views.paginator_qry import paginator_qry
 
@@ -476,18 +482,7 @@ def filter_pipeline(request):
     filter_dict = parse_qs(request.GET.urlencode())
     filter_dict = get_key_instances(Recruitment, filter_dict)
 
-    CACHE.set(
-        request.session.session_key + "pipeline",
-        {
-            "candidates": candidate_filter.qs.filter(is_active=True).order_by(
-                "sequence"
-            ),
-            "stages": stage_filter.qs.order_by("sequence"),
-            "recruitments": recruitments,
-            "filter_dict": filter_dict,
-            "filter_query": request.GET,
-        },
-    )
+    save_pipeline_state(request, recruitments, filter_dict)
 
     previous_data = request.GET.urlencode()
     paginator = Paginator(recruitments, 4)
@@ -532,9 +527,13 @@ def stage_component(request, view: str = "list"):
     """
     recruitment_id = request.GET["rec_id"]
     recruitment = Recruitment.objects.get(id=recruitment_id)
-    ordered_stages = CACHE.get(request.session.session_key + "pipeline")[
-        "stages"
-    ].filter(recruitment_id__id=recruitment_id)
+    pipeline = get_pipeline_state(request)
+    ordered_stages = load_stage_candidates(
+        pipeline["stages"]
+        .filter(recruitment_id__id=recruitment_id)
+        .prefetch_related("stage_managers"),
+        pipeline["candidates"],
+    )
     template = "pipeline/components/stages_tab_content.html"
     if view == "card":
         template = "pipeline/kanban_components/kanban_stage_components.html"
@@ -544,9 +543,8 @@ def stage_component(request, view: str = "list"):
         {
             "rec": recruitment,
             "ordered_stages": ordered_stages,
-            "filter_dict": CACHE.get(request.session.session_key + "pipeline")[
-                "filter_dict"
-            ],
+            "filter_dict": pipeline["filter_dict"],
+            "now": timezone.now(),
         },
     )
 
@@ -559,17 +557,10 @@ def update_candidate_stage_and_sequence(request):
     """
     order_list = request.GET.getlist("order")
     stage_id = request.GET["stage_id"]
-    stage = (
-        CACHE.get(request.session.session_key + "pipeline")["stages"]
-        .filter(id=stage_id)
-        .first()
-    )
+    pipeline = get_pipeline_state(request)
+    stage = pipeline["stages"].filter(id=stage_id).first()
     context = {}
-    for index, cand_id in enumerate(order_list):
-        candidate = CACHE.get(request.session.session_key + "pipeline")[
-            "candidates"
-        ].filter(id=cand_id)
-        candidate.update(sequence=index, stage_id=stage)
+    resequence_candidates(pipeline["candidates"], order_list, stage)
     if stage.stage_type == "hired":
         if stage.recruitment_id.is_vacancy_filled():
             context["message"] = _("Vaccancy is filled")
@@ -585,20 +576,16 @@ def update_candidate_sequence(request):
     """
     order_list = request.GET.getlist("order")
     stage_id = request.GET["stage_id"]
-    stage = (
-        CACHE.get(request.session.session_key + "pipeline")["stages"]
-        .filter(id=stage_id)
-        .first()
-    )
+    pipeline = get_pipeline_state(request)
+    stage = pipeline["stages"].filter(id=stage_id).first()
     data = {}
 
-    for index, cand_id in enumerate(order_list):
-        candidate = CACHE.get(request.session.session_key + "pipeline")[
-            "candidates"
-        ].filter(id=cand_id)
-        candidate.update(
-            sequence=index, stage_id=stage, hired=(stage.stage_type == "hired")
-        )
+    resequence_candidates(
+        pipeline["candidates"],
+        order_list,
+        stage,
+        hired=(stage.stage_type == "hired"),
+    )
 
     return JsonResponse(data)
 
@@ -620,20 +607,12 @@ def candidate_component(request):
     Candidate component
     """
     stage_id = request.GET.get("stage_id")
-    stage = (
-        CACHE.get(request.session.session_key + "pipeline")["stages"]
-        .filter(id=stage_id)
-        .first()
-    )
-    candidates = CACHE.get(request.session.session_key + "pipeline")[
-        "candidates"
-    ].filter(stage_id=stage)
+    pipeline = get_pipeline_state(request)
+    stage = pipeline["stages"].filter(id=stage_id).first()
+    candidates = pipeline["candidates"].filter(stage_id=stage)
 
     template = "pipeline/components/candidate_stage_component.html"
-    if (
-        CACHE.get(request.session.session_key + "pipeline")["filter_query"].get("view")
-        == "card"
-    ):
+    if pipeline["filter_query"].get("view") == "card":
         template = "pipeline/kanban_components/candidate_kanban_components.html"
 
     now = timezone.now()
@@ -3149,30 +3128,6 @@ def delete_resume_file(request):
     return redirect(f"{url}{query_params}")
 
 
-def extract_words_from_pdf(pdf_file):
-    """
-    This method is used to extract the words from the pdf file into a list.
-    Args:
-        pdf_file: pdf file
-
-    """
-    pdf_document = fitz.open(pdf_file.path)
-
-    words = []
-
-    for page_num in range(len(pdf_document)):
-        page = pdf_document.load_page(page_num)
-        page_text = page.get_text()
-
-        page_words = re.findall(r"\b\w+\b", page_text.lower())
-
-        words.extend(page_words)
-
-    pdf_document.close()
-
-    return words
-
-
 @login_required
 @hx_request_required
 @manager_can_enter("recruitment.add_candidate")
@@ -3185,18 +3140,19 @@ def matching_resumes(request, rec_id):
 
     """
     recruitment = Recruitment.objects.filter(id=rec_id).first()
-    skills = recruitment.skills.values_list("title", flat=True)
+    matching_skills = resume_skill_matches(recruitment)
     resumes = recruitment.resume.all()
     is_candidate = resumes.filter(is_candidate=True)
     is_candidate_ids = set(is_candidate.values_list("id", flat=True))
 
     resume_ranks = []
     for resume in resumes:
-        words = extract_words_from_pdf(resume.file)
-        matching_skills_count = sum(skill.lower() in words for skill in skills)
+        matching_skills_count = matching_skills.get(resume.id, 0)
 
         item = {"resume": resume, "matching_skills_count": matching_skills_count}
-        if not len(words):
+        if resume.word_count is None:
+            item["pending"] = True
+        elif not resume.word_count:
             item["image_pdf"] = True
 
         resume_ranks.append(item)
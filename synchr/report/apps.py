@@ -11,6 +11,7 @@ class ReportConfig(AppConfig):
 
         from horilla.horilla_settings import APPS
         from horilla.urls import urlpatterns
+        from report import signals
 
         urlpatterns.append(
             path("report/", include("report.urls")),
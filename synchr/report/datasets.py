@@ -0,0 +1,247 @@
+"""
+datasets.py
+
+This module is used to serve the report datasets. The response of a report
+endpoint is cached by the report, the selected company and a hash of the
+normalized filter parameters, and dropped when a version counter of one
+of the models the report reads changes. The rows can be sent as the usual
+JSON records, as dictionary encoded columns or as an Arrow IPC stream,
+gzip compressed when the client accepts it.
+"""
+
+import hashlib
+import io
+import json
+from functools import wraps
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from horilla.cache_versions import bump_version, get_versions
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+REPORT_DATASET_TIMEOUT = 60 * 30
+REPORT_DATASET_FORMATS = ["json", "columnar", "arrow"]
+# Parameters that change the encoding of a dataset but not its rows
+REPORT_DATASET_IGNORED_PARAMS = ["format"]
+
+EMPLOYEE_MODELS = (
+    "employee.Employee",
+    "employee.EmployeeWorkInformation",
+    "base.Company",
+    "base.Department",
+    "base.JobPosition",
+    "base.JobRole",
+    "base.WorkType",
+    "base.EmployeeShift",
+    "base.EmployeeType",
+)
+
+REPORT_DATASET_MODELS = {
+    "employee": EMPLOYEE_MODELS,
+    "attendance": EMPLOYEE_MODELS
+    + (
+        "attendance.Attendance",
+        "attendance.BatchAttendance",
+        "base.EmployeeShiftDay",
+    ),
+    "leave": EMPLOYEE_MODELS
+    + ("leave.LeaveRequest", "leave.AvailableLeave", "leave.LeaveType"),
+    "payroll": EMPLOYEE_MODELS + ("payroll.Payslip",),
+    "asset": EMPLOYEE_MODELS
+    + (
+        "asset.Asset",
+        "asset.AssetAssignment",
+        "asset.AssetCategory",
+        "asset.AssetLot",
+    ),
+    "pms": EMPLOYEE_MODELS
+    + (
+        "pms.Objective",
+        "pms.KeyResult",
+        "pms.EmployeeObjective",
+        "pms.EmployeeKeyResult",
+        "pms.Feedback",
+        "pms.Answer",
+        "pms.Question",
+        "pms.QuestionTemplate",
+    ),
+    "recruitment": EMPLOYEE_MODELS
+    + (
+        "recruitment.Recruitment",
+        "recruitment.Candidate",
+        "recruitment.Stage",
+        "onboarding.OnboardingStage",
+        "onboarding.OnboardingTask",
+    ),
+}
+
+REPORT_DATASET_WATCHED_MODELS = {
+    label for labels in REPORT_DATASET_MODELS.values() for label in labels
+}
+
+
+def model_version_key(label):
+    return f"report_model_version_{label.lower()}"
+
+
+def bump_model_version(label):
+    """
+    Drop the cached datasets of the reports that read the model
+    """
+    bump_version(model_version_key(label))
+
+
+def dataset_cache_key(request, name, data_format, gzip):
+    """
+    Cache key of the dataset for the filters of the request and the current
+    versions of the models of the report
+    """
+    params = sorted(
+        (key, sorted(value for value in request.GET.getlist(key) if value != ""))
+        for key in request.GET
+        if key not in REPORT_DATASET_IGNORED_PARAMS
+    )
+    keys = [model_version_key(label) for label in REPORT_DATASET_MODELS[name]]
+    versions = get_versions(keys)
+    digest = hashlib.md5(
+        json.dumps(
+            {
+                "path": request.path,
+                "params": [(key, values) for key, values in params if values],
+                "company": request.session.get("selected_company"),
+                "versions": [versions[key] for key in keys],
+            }
+        ).encode()
+    ).hexdigest()
+    return f"report_dataset_{name}_{data_format}_{'gz' if gzip else 'raw'}_{digest}"
+
+
+def columnar(records):
+    """
+    This method is used to turn the records into columns, a column that
+    repeats its values is sent as the distinct values and the index of the
+    value of every row
+
+    Returns:
+        {"length": rows, "columns": [{"name", "values"} or
+        {"name", "dictionary", "indexes"}]}
+    """
+    names = list(records[0]) if records else []
+    columns = []
+    for name in names:
+        values = [record.get(name) for record in records]
+        dictionary = {}
+        indexes = []
+        for value in values:
+            token = json.dumps(value, cls=DjangoJSONEncoder)
+            indexes.append(dictionary.setdefault(token, len(dictionary)))
+        if len(dictionary) * 2 <= len(values):
+            columns.append(
+                {
+                    "name": name,
+                    "dictionary": [json.loads(value) for value in dictionary],
+                    "indexes": indexes,
+                }
+            )
+        else:
+            columns.append({"name": name, "values": values})
+    return {"length": len(records), "columns": columns}
+
+
+def arrow_stream(records):
+    """
+    Arrow IPC stream of the records with the text columns dictionary
+    encoded
+    """
+    table = pyarrow.Table.from_pylist(records)
+    for index, field in enumerate(table.schema):
+        if pyarrow.types.is_string(field.type):
+            table = table.set_column(
+                index, field.name, table.column(index).dictionary_encode()
+            )
+    sink = io.BytesIO()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def encode_dataset(content, data_format):
+    """
+    Encode the JSON records of a report response in the format
+
+    Returns:
+        the content and its content type
+    """
+    if data_format == "json":
+        return content, "application/json"
+    records = json.loads(content)
+    if not isinstance(records, list):
+        # Pivots and other aggregated payloads are sent as they are
+        return content, "application/json"
+    if data_format == "arrow":
+        return arrow_stream(records), "application/vnd.apache.arrow.stream"
+    return (
+        json.dumps(columnar(records), cls=DjangoJSONEncoder).encode(),
+        "application/json",
+    )
+
+
+def report_dataset(name):
+    """
+    Decorator caching the JSON response of a report endpoint and encoding it
+    in the format of the format parameter
+
+    Args:
+        name: report of REPORT_DATASET_MODELS the endpoint reads
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def _wrapped(request, *args, **kwargs):
+            data_format = request.GET.get("format") or "json"
+            if data_format not in REPORT_DATASET_FORMATS:
+                return JsonResponse(
+                    {"error": f"Unknown format: {data_format}"}, status=400
+                )
+            if data_format == "arrow" and pyarrow is None:
+                return JsonResponse(
+                    {"error": "The arrow format needs pyarrow on the server"},
+                    status=400,
+                )
+            gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+            key = dataset_cache_key(request, name, data_format, gzip)
+            cached = cache.get(key)
+            status = "hit"
+            if cached is None:
+                status = "miss"
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or not response.get(
+                    "Content-Type", ""
+                ).startswith("application/json"):
+                    return response
+                content, content_type = encode_dataset(response.content, data_format)
+                if gzip:
+                    content = compress_string(content)
+                cached = (content, content_type)
+                cache.set(key, cached, timeout=REPORT_DATASET_TIMEOUT)
+
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            if gzip:
+                response["Content-Encoding"] = "gzip"
+            patch_vary_headers(response, ["Accept-Encoding", "Cookie"])
+            response["X-Report-Cache"] = status
+            return response
+
+        return _wrapped
+
+    return decorator
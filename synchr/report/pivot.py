@@ -0,0 +1,388 @@
+"""
+pivot.py
+
+This module is used to pivot the report querysets on the database. A pivot
+definition lists the dimensions the rows and columns can be grouped by and
+the measures that can be aggregated, the grouping and the SUM, AVG, MIN,
+MAX and COUNT are pushed into one GROUP BY query and only the aggregated
+cells are returned. The rows behind a cell are served page by page.
+
+The pivot endpoints of the report app take these GET parameters next to
+their filter parameters:
+
+    pivot=fields      the dimensions and measures of the report
+    pivot=aggregate   rows, columns: dimension labels, repeated
+                      measures: "<measure label>:<sum|avg|min|max>" or
+                      "count", repeated, count by default
+    pivot=rows        cell: JSON object of dimension label to value
+                      page, page_size: page of the underlying rows
+"""
+
+import json
+
+from django.core.paginator import EmptyPage, Paginator
+from django.db.models import (
+    Avg,
+    CharField,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    Min,
+    Q,
+    Sum,
+    Value,
+)
+from django.db.models.functions import (
+    Cast,
+    Concat,
+    ExtractHour,
+    ExtractMinute,
+    StrIndex,
+    Substr,
+    Trim,
+)
+from django.http import JsonResponse
+
+PIVOT_MAX_CELLS = 10000
+PIVOT_PAGE_SIZE = 50
+PIVOT_MAX_PAGE_SIZE = 500
+
+AGGREGATES = {
+    "sum": Sum,
+    "avg": Avg,
+    "min": Min,
+    "max": Max,
+}
+
+GENDER_CHOICES = {
+    "male": "Male",
+    "female": "Female",
+    "other": "Other",
+}
+
+
+def full_name(prefix=""):
+    """
+    First and last name of the employee at the lookup prefix
+    """
+    return Trim(
+        Concat(
+            f"{prefix}employee_first_name",
+            Value(" "),
+            f"{prefix}employee_last_name",
+            output_field=CharField(),
+        )
+    )
+
+
+def hhmm_seconds(field):
+    """
+    Seconds of a "HH:MM" char field
+    """
+    separator = StrIndex(field, Value(":"))
+    hours = Cast(Substr(field, 1, separator - 1), output_field=IntegerField())
+    minutes = Cast(Substr(field, separator + 1, 2), output_field=IntegerField())
+    return hours * 3600 + minutes * 60
+
+
+def time_seconds(field):
+    """
+    Seconds since midnight of a time field
+    """
+    return ExtractHour(field) * 3600 + ExtractMinute(field) * 60
+
+
+class Dimension:
+    """
+    Value the pivot rows and columns can be grouped by
+
+    Args:
+        label: label of the dimension in the report
+        expression: field lookup or query expression of the value
+        choices: labels of the stored values
+        empty: label of the rows without a value
+    """
+
+    def __init__(self, label, expression, choices=None, empty="-"):
+        self.label = label
+        self.expression = F(expression) if isinstance(expression, str) else expression
+        self.choices = choices or {}
+        self.empty = empty
+
+    def display(self, value):
+        if value is None or value == "":
+            return self.empty
+        return self.choices.get(value, value)
+
+    def lookup(self, alias, label):
+        """
+        Filter of the rows whose value has the label
+        """
+        if label == self.empty:
+            return Q(**{f"{alias}__isnull": True}) | Q(**{alias: ""})
+        values = [value for value, text in self.choices.items() if text == label]
+        if values:
+            return Q(**{f"{alias}__in": values})
+        return Q(**{alias: label})
+
+
+class Measure:
+    """
+    Value the pivot cells can aggregate
+
+    Args:
+        label: label of the measure in the report
+        expression: field lookup or query expression of the value, durations
+            are aggregated as seconds
+        aggregates: aggregate functions allowed on the measure
+    """
+
+    def __init__(self, label, expression, aggregates=tuple(AGGREGATES)):
+        self.label = label
+        self.expression = F(expression) if isinstance(expression, str) else expression
+        self.aggregates = aggregates
+
+
+class PivotError(Exception):
+    pass
+
+
+class PivotDefinition:
+    """
+    Dimensions and measures of a report
+    """
+
+    def __init__(self, dimensions, measures=()):
+        self.dimensions = {dimension.label: dimension for dimension in dimensions}
+        self.measures = {measure.label: measure for measure in measures}
+
+    def fields(self):
+        return {
+            "dimensions": list(self.dimensions),
+            "measures": [
+                {"label": measure.label, "aggregates": list(measure.aggregates)}
+                for measure in self.measures.values()
+            ]
+            + [{"label": "Count", "aggregates": ["count"]}],
+        }
+
+    def _dimensions(self, labels):
+        unknown = [label for label in labels if label not in self.dimensions]
+        if unknown:
+            raise PivotError(f"Unknown dimensions: {', '.join(unknown)}")
+        return [
+            (f"pivot_d{index}", self.dimensions[label])
+            for index, label in enumerate(labels)
+        ]
+
+    def _measures(self, specs):
+        measures = {}
+        for spec in specs or ["count"]:
+            if spec.lower() == "count":
+                measures["Count"] = Count("pk")
+                continue
+            label, _, aggregate = spec.rpartition(":")
+            measure = self.measures.get(label)
+            if measure is None or aggregate not in measure.aggregates:
+                raise PivotError(f"Unknown measure: {spec}")
+            measures[f"{label} ({aggregate})"] = AGGREGATES[aggregate](
+                measure.expression
+            )
+        return measures
+
+    def _group(self, queryset, dimensions, measures):
+        aliases = {f"pivot_m{index}": label for index, label in enumerate(measures)}
+        aggregates = dict(zip(aliases, measures.values()))
+        if not dimensions:
+            return [queryset.aggregate(**aggregates)], aliases
+        grouped = (
+            queryset.order_by()
+            .values(**{alias: dimension.expression for alias, dimension in dimensions})
+            .annotate(**aggregates)
+            .order_by(*[alias for alias, _dimension in dimensions])
+        )
+        return grouped, aliases
+
+    @staticmethod
+    def _values(row, aliases):
+        values = {}
+        for alias, label in aliases.items():
+            value = row[alias]
+            if isinstance(value, float):
+                value = round(value, 2)
+            values[label] = value
+        return values
+
+    def aggregate(self, queryset, rows=(), columns=(), measures=()):
+        """
+        This method is used to pivot the queryset on the row and column
+        dimensions
+
+        Returns:
+            the cells of every row and column value pair with the totals of
+            the rows, the columns and the whole queryset
+        """
+        row_dimensions = self._dimensions(rows)
+        column_dimensions = self._dimensions(columns)
+        dimensions = self._dimensions(list(rows) + list(columns))
+        measures = self._measures(measures)
+
+        grouped, aliases = self._group(queryset, dimensions, measures)
+        grouped = list(grouped[: PIVOT_MAX_CELLS + 1])
+        if len(grouped) > PIVOT_MAX_CELLS:
+            raise PivotError(
+                f"The pivot has more than {PIVOT_MAX_CELLS} cells, "
+                "use fewer dimensions or narrow the filters"
+            )
+
+        def keys(row, dimensions):
+            return [dimension.display(row[alias]) for alias, dimension in dimensions]
+
+        row_count = len(row_dimensions)
+        cells = [
+            {
+                "row": keys(row, dimensions)[:row_count],
+                "column": keys(row, dimensions)[row_count:],
+                "values": self._values(row, aliases),
+            }
+            for row in grouped
+        ]
+        totals = {}
+        for key, total_dimensions in [
+            ("row_totals", row_dimensions),
+            ("column_totals", column_dimensions),
+        ]:
+            if not total_dimensions:
+                continue
+            total_rows, _aliases = self._group(queryset, total_dimensions, measures)
+            totals[key] = [
+                {
+                    "key": keys(row, total_dimensions),
+                    "values": self._values(row, aliases),
+                }
+                for row in total_rows
+            ]
+        grand_total, _aliases = self._group(queryset, [], measures)
+        return {
+            "rows": list(rows),
+            "columns": list(columns),
+            "measures": list(measures),
+            "cells": cells,
+            **totals,
+            "grand_total": self._values(grand_total[0], aliases),
+        }
+
+    def drill_down(self, queryset, cell, page=1, page_size=PIVOT_PAGE_SIZE):
+        """
+        This method is used to return a page of the rows behind a pivot cell
+
+        Args:
+            cell: dimension label to value of the cell, the rows of the whole
+                queryset when it is empty
+        """
+        dimensions = self._dimensions(list(cell))
+        queryset = queryset.annotate(
+            **{alias: dimension.expression for alias, dimension in dimensions}
+        )
+        for alias, dimension in dimensions:
+            queryset = queryset.filter(dimension.lookup(alias, cell[dimension.label]))
+
+        detail = list(self.dimensions.values()) + list(self.measures.values())
+        aliases = {f"pivot_f{index}": field for index, field in enumerate(detail)}
+        rows = queryset.order_by("pk").values(
+            **{alias: field.expression for alias, field in aliases.items()}
+        )
+        paginator = Paginator(rows, page_size)
+        try:
+            rows_page = paginator.page(page)
+        except EmptyPage:
+            rows_page = []
+        return {
+            "count": paginator.count,
+            "num_pages": paginator.num_pages,
+            "page": page,
+            "results": [
+                {
+                    field.label: (
+                        field.display(row[alias])
+                        if isinstance(field, Dimension)
+                        else row[alias]
+                    )
+                    for alias, field in aliases.items()
+                }
+                for row in rows_page
+            ],
+        }
+
+
+def employee_dimensions(prefix="employee_id__", name_label="Name"):
+    """
+    Dimensions of the employee at the lookup prefix
+    """
+    work_info = f"{prefix}employee_work_info__"
+    return [
+        Dimension(name_label, full_name(prefix)),
+        Dimension("Gender", f"{prefix}gender", GENDER_CHOICES),
+        Dimension("Email", f"{prefix}email"),
+        Dimension("Phone", f"{prefix}phone"),
+        Dimension("Department", f"{work_info}department_id__department"),
+        Dimension("Job Position", f"{work_info}job_position_id__job_position"),
+        Dimension("Job Role", f"{work_info}job_role_id__job_role"),
+        Dimension("Work Type", f"{work_info}work_type_id__work_type"),
+        Dimension("Shift", f"{work_info}shift_id__employee_shift"),
+        Dimension("Employee Type", f"{work_info}employee_type_id__employee_type"),
+        Dimension("Company", f"{work_info}company_id__company"),
+    ]
+
+
+def _positive_int(value, default):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def pivot_response(request, definition, queryset):
+    """
+    This method is used to answer the pivot parameters of a report request
+
+    Returns:
+        the JSON response of the pivot, None when the request asks for the
+        plain rows of the report
+    """
+    action = request.GET.get("pivot")
+    if not action:
+        return None
+    try:
+        if action == "fields":
+            data = definition.fields()
+        elif action == "aggregate":
+            data = definition.aggregate(
+                queryset,
+                rows=request.GET.getlist("rows"),
+                columns=request.GET.getlist("columns"),
+                measures=request.GET.getlist("measures"),
+            )
+        elif action == "rows":
+            try:
+                cell = json.loads(request.GET.get("cell") or "{}")
+            except ValueError:
+                raise PivotError("The cell is not valid JSON")
+            if not isinstance(cell, dict):
+                raise PivotError("The cell is not a JSON object")
+            data = definition.drill_down(
+                queryset,
+                cell,
+                page=_positive_int(request.GET.get("page"), 1),
+                page_size=min(
+                    _positive_int(request.GET.get("page_size"), PIVOT_PAGE_SIZE),
+                    PIVOT_MAX_PAGE_SIZE,
+                ),
+            )
+        else:
+            raise PivotError(f"Unknown pivot action: {action}")
+    except PivotError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+    return JsonResponse(data)
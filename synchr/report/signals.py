@@ -0,0 +1,29 @@
+# report/signals.py
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from horilla.signals import post_bulk_update
+from report.datasets import REPORT_DATASET_WATCHED_MODELS, bump_model_version
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(post_bulk_update)
+def refresh_report_datasets(sender, **kwargs):
+    """
+    Drop the cached report datasets that read the changed model
+    """
+    label = getattr(getattr(sender, "_meta", None), "label", None)
+    if label in REPORT_DATASET_WATCHED_MODELS:
+        bump_model_version(label)
+
+
+@receiver(m2m_changed)
+def refresh_report_datasets_relations(sender, instance, action, **kwargs):
+    """
+    Drop the cached report datasets when a many to many relation of a model
+    they read changes
+    """
+    if action.startswith("post_"):
+        refresh_report_datasets(type(instance))
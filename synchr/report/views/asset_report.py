@@ -8,6 +8,47 @@ if apps.is_installed("asset"):
     from asset.models import Asset
     from base.models import Company
     from horilla_views.cbv_methods import login_required, permission_required
+    from report.datasets import report_dataset
+    from report.pivot import (
+        GENDER_CHOICES,
+        Dimension,
+        Measure,
+        PivotDefinition,
+        full_name,
+        pivot_response,
+    )
+
+    ASSET_USER = "assetassignment__assigned_by_employee_id__"
+    ASSET_PIVOT = PivotDefinition(
+        [
+            Dimension("Asset Name", "asset_name"),
+            Dimension("Asset User", full_name(ASSET_USER)),
+            Dimension("Email", f"{ASSET_USER}email"),
+            Dimension("Phone", f"{ASSET_USER}phone"),
+            Dimension("Gender", f"{ASSET_USER}gender", GENDER_CHOICES),
+            Dimension(
+                "Department",
+                f"{ASSET_USER}employee_work_info__department_id__department",
+            ),
+            Dimension(
+                "Job Position",
+                f"{ASSET_USER}employee_work_info__job_position_id__job_position",
+            ),
+            Dimension(
+                "Job Role", f"{ASSET_USER}employee_work_info__job_role_id__job_role"
+            ),
+            Dimension("Asset Purchce Date", "asset_purchase_date"),
+            Dimension("Status", "asset_status"),
+            Dimension("Assigned Date", "assetassignment__assigned_date"),
+            Dimension("Return Date", "assetassignment__return_date"),
+            Dimension("Return Condition", "assetassignment__return_status"),
+            Dimension("Category", "asset_category_id__asset_category_name"),
+            Dimension("Batch Number", "asset_lot_number_id__lot_number"),
+            Dimension("Tracking ID", "asset_tracking_id"),
+            Dimension("Expiry Date", "expiry_date"),
+        ],
+        [Measure("Asset Cost", "asset_purchase_cost")],
+    )
 
     @login_required
     @permission_required(perm="asset.view_asset")
@@ -30,6 +71,7 @@ if apps.is_installed("asset"):
 
     @login_required
     @permission_required(perm="asset.view_asset")
+    @report_dataset("asset")
     def asset_pivot(request):
         qs = Asset.objects.all()
 
@@ -48,6 +90,10 @@ if apps.is_installed("asset"):
         if asset_purchase_date := request.GET.get("asset_purchase_date"):
             qs = qs.filter(asset_purchase_date=asset_purchase_date)
 
+        response = pivot_response(request, ASSET_PIVOT, qs)
+        if response:
+            return response
+
         data = list(
             qs.values(
                 "asset_name",
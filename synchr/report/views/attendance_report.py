@@ -9,7 +9,60 @@ if apps.is_installed("attendance"):
     from attendance.filters import AttendanceFilters
     from attendance.models import Attendance
     from base.models import Company
+    from employee.methods.experience import experience_expression
     from horilla_views.cbv_methods import login_required, permission_required
+    from report.datasets import report_dataset
+    from report.pivot import (
+        Dimension,
+        Measure,
+        PivotDefinition,
+        employee_dimensions,
+        hhmm_seconds,
+        pivot_response,
+        time_seconds,
+    )
+
+    # The work type and shift of the attendance replace the ones of the
+    # employee work information
+    ATTENDANCE_PIVOT = PivotDefinition(
+        employee_dimensions()
+        + [
+            Dimension("Work Type", "work_type_id__work_type"),
+            Dimension("Shift", "shift_id__employee_shift"),
+            Dimension("Attendance Date", "attendance_date"),
+            Dimension(
+                "Attendance Day",
+                "attendance_day__day",
+                {
+                    "monday": "Monday",
+                    "tuesday": "Tuesday",
+                    "wednesday": "Wednesday",
+                    "thursday": "Thursday",
+                    "friday": "Friday",
+                    "saturday": "Saturday",
+                    "sunday": "Sunday",
+                },
+            ),
+            Dimension("Batch", "batch_attendance_id__title"),
+        ],
+        [
+            Measure(
+                "Clock-in", time_seconds("attendance_clock_in"), ("avg", "min", "max")
+            ),
+            Measure(
+                "Clock-out", time_seconds("attendance_clock_out"), ("avg", "min", "max")
+            ),
+            Measure("At Work", "at_work_second"),
+            Measure("Worked Hour", hhmm_seconds("attendance_worked_hour")),
+            Measure("Minimum Hour", hhmm_seconds("minimum_hour")),
+            Measure("Overtime", "overtime_second"),
+            Measure(
+                "Experience",
+                experience_expression("employee_id__employee_work_info__"),
+                ("avg", "min", "max"),
+            ),
+        ],
+    )
 
     def convert_time_to_decimal_w(time_str):
         try:
@@ -58,11 +111,16 @@ if apps.is_installed("attendance"):
 
     @login_required
     @permission_required(perm="attendance.view_attendance")
+    @report_dataset("attendance")
     def attendance_pivot(request):
         qs = Attendance.objects.all()
         filter_obj = AttendanceFilters(request.GET, queryset=qs)
         qs = filter_obj.qs
 
+        response = pivot_response(request, ATTENDANCE_PIVOT, qs)
+        if response:
+            return response
+
         data = list(
             qs.values(
                 "employee_id__employee_first_name",
@@ -84,9 +142,11 @@ if apps.is_installed("attendance"):
                 "employee_id__employee_work_info__job_role_id__job_role",
                 "employee_id__employee_work_info__job_position_id__job_position",
                 "employee_id__employee_work_info__employee_type_id__employee_type",
-                "employee_id__employee_work_info__experience",
                 "batch_attendance_id__title",
                 "employee_id__employee_work_info__company_id__company",
+                work_experience=experience_expression(
+                    "employee_id__employee_work_info__"
+                ),
             )
         )
         DAY = {
@@ -140,7 +200,7 @@ if apps.is_installed("attendance"):
                     if item["shift_id__employee_shift"]
                     else "-"
                 ),
-                "Experience": item["employee_id__employee_work_info__experience"],
+                "Experience": item["work_experience"],
                 "Attendance Date": item["attendance_date"],
                 "Attendance Day": DAY.get(item["attendance_day__day"]),
                 "Clock-in": format_time(item["attendance_clock_in"]),
@@ -3,8 +3,36 @@ from django.shortcuts import render
 
 from base.models import Company
 from employee.filters import EmployeeFilter
+from employee.methods.experience import experience_expression
 from employee.models import Employee
 from horilla_views.cbv_methods import login_required, permission_required
+from report.datasets import report_dataset
+from report.pivot import (
+    Dimension,
+    Measure,
+    PivotDefinition,
+    employee_dimensions,
+    full_name,
+    pivot_response,
+)
+
+EMPLOYEE_PIVOT = PivotDefinition(
+    employee_dimensions(prefix="")
+    + [
+        Dimension(
+            "Reporting Manager",
+            full_name("employee_work_info__reporting_manager_id__"),
+        ),
+        Dimension("Date of Joining", "employee_work_info__date_joining"),
+    ],
+    [
+        Measure(
+            "Experience",
+            experience_expression("employee_work_info__"),
+            ("avg", "min", "max"),
+        ),
+    ],
+)
 
 
 @login_required
@@ -24,11 +52,16 @@ def employee_report(request):
 
 @login_required
 @permission_required(perm="employee.view_employee")
+@report_dataset("employee")
 def employee_pivot(request):
     qs = Employee.objects.all()
     filtered_qs = EmployeeFilter(request.GET, queryset=qs)
     qs = filtered_qs.qs
 
+    response = pivot_response(request, EMPLOYEE_PIVOT, qs)
+    if response:
+        return response
+
     data = list(
         qs.values(
             "employee_first_name",
@@ -46,7 +79,7 @@ def employee_pivot(request):
             "employee_work_info__reporting_manager_id__employee_last_name",
             "employee_work_info__company_id__company",
             "employee_work_info__date_joining",
-            "employee_work_info__experience",
+            work_experience=experience_expression("employee_work_info__"),
         )
     )
     choice_gender = {
@@ -102,7 +135,7 @@ def employee_pivot(request):
                 if item["employee_work_info__date_joining"]
                 else "-"
             ),
-            "Experience": round(float(item["employee_work_info__experience"] or 0), 2),
+            "Experience": round(float(item["work_experience"] or 0), 2),
             "Company": item["employee_work_info__company_id__company"],
         }
         for item in data
@@ -5,9 +5,70 @@ from django.shortcuts import render
 if apps.is_installed("leave"):
 
     from base.models import Company
+    from employee.methods.experience import experience_expression
     from horilla_views.cbv_methods import login_required, permission_required
     from leave.filters import AssignedLeaveFilter, LeaveRequestFilter
     from leave.models import AvailableLeave, LeaveRequest
+    from report.datasets import report_dataset
+    from report.pivot import (
+        Dimension,
+        Measure,
+        PivotDefinition,
+        employee_dimensions,
+        pivot_response,
+    )
+
+    LEAVE_REQUEST_PIVOT = PivotDefinition(
+        employee_dimensions()
+        + [
+            Dimension("Leave Type", "leave_type_id__name"),
+            Dimension("Start Date", "start_date"),
+            Dimension(
+                "Start Date Breakdown",
+                "start_date_breakdown",
+                {
+                    "full_day": "Full Day",
+                    "first_half": "First Half",
+                    "second_half": "Second Half",
+                },
+            ),
+            Dimension("End Date", "end_date"),
+            Dimension(
+                "End Date Breakdown",
+                "end_date_breakdown",
+                {
+                    "full_day": "Full Day",
+                    "first_half": "First Half",
+                    "second_half": "Second Half",
+                },
+            ),
+            Dimension(
+                "Status",
+                "status",
+                {
+                    "requested": "Requested",
+                    "approved": "Approved",
+                    "cancelled": "Cancelled",
+                    "rejected": "Rejected",
+                },
+            ),
+        ],
+        [Measure("Requested Days", "requested_days")],
+    )
+    AVAILABLE_LEAVE_PIVOT = PivotDefinition(
+        employee_dimensions()
+        + [
+            Dimension("Leave Type", "leave_type_id__name"),
+            Dimension("Assigned Date", "assigned_date"),
+            Dimension("Reset Date", "reset_date"),
+            Dimension("Expired Date", "expired_date"),
+        ],
+        [
+            Measure("Available Days", "available_days"),
+            Measure("Carryforward Days", "carryforward_days"),
+            Measure("Total Leave Days", "total_leave_days"),
+        ],
+    )
 
     @login_required
     @permission_required(perm="leave.view_leaverequest")
@@ -31,6 +92,7 @@ if apps.is_installed("leave"):
 
     @login_required
     @permission_required(perm="leave.view_leaverequest")
+    @report_dataset("leave")
     def leave_pivot(request):
         model_type = request.GET.get(
             "model", "leave_request"
@@ -42,6 +104,10 @@ if apps.is_installed("leave"):
             leave_filter = LeaveRequestFilter(request.GET, queryset=qs)
             qs = leave_filter.qs
 
+            response = pivot_response(request, LEAVE_REQUEST_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "employee_id__employee_first_name",
@@ -60,10 +126,12 @@ if apps.is_installed("leave"):
                     "employee_id__employee_work_info__job_role_id__job_role",
                     "employee_id__employee_work_info__job_position_id__job_position",
                     "employee_id__employee_work_info__employee_type_id__employee_type",
-                    "employee_id__employee_work_info__experience",
                     "employee_id__employee_work_info__work_type_id__work_type",
                     "employee_id__employee_work_info__shift_id__employee_shift",
                     "employee_id__employee_work_info__company_id__company",
+                    work_experience=experience_expression(
+                        "employee_id__employee_work_info__"
+                    ),
                 )
             )
             BREAKDOWN_MAP = {
@@ -131,7 +199,7 @@ if apps.is_installed("leave"):
                         ]
                         else "-"
                     ),
-                    "Experience": item["employee_id__employee_work_info__experience"],
+                    "Experience": item["work_experience"],
                     "Leave Type": item["leave_type_id__name"],
                     "Start Date": item["start_date"],
                     "Start Date Breakdown": BREAKDOWN_MAP.get(
@@ -155,6 +223,10 @@ if apps.is_installed("leave"):
             available_leave_filter = AssignedLeaveFilter(request.GET, queryset=qs)
             qs = available_leave_filter.qs
 
+            response = pivot_response(request, AVAILABLE_LEAVE_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "employee_id__employee_first_name",
@@ -173,10 +245,12 @@ if apps.is_installed("leave"):
                     "employee_id__employee_work_info__job_role_id__job_role",
                     "employee_id__employee_work_info__job_position_id__job_position",
                     "employee_id__employee_work_info__employee_type_id__employee_type",
-                    "employee_id__employee_work_info__experience",
                     "employee_id__employee_work_info__work_type_id__work_type",
                     "employee_id__employee_work_info__shift_id__employee_shift",
                     "employee_id__employee_work_info__company_id__company",
+                    work_experience=experience_expression(
+                        "employee_id__employee_work_info__"
+                    ),
                 )
             )
             choice_gender = {
@@ -231,7 +305,7 @@ if apps.is_installed("leave"):
                         ]
                         else "-"
                     ),
-                    "Experience": item["employee_id__employee_work_info__experience"],
+                    "Experience": item["work_experience"],
                     "Leave Type": item["leave_type_id__name"],
                     "Available Days": item["available_days"],
                     "Carryforward Days": item["carryforward_days"],
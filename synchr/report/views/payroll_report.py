@@ -6,9 +6,44 @@ from django.utils.dateparse import parse_date
 if apps.is_installed("payroll"):
 
     from base.models import Company
+    from employee.methods.experience import experience_expression
     from horilla_views.cbv_methods import login_required, permission_required
     from payroll.filters import PayslipFilter
     from payroll.models.models import Payslip
+    from report.datasets import report_dataset
+    from report.pivot import (
+        Dimension,
+        Measure,
+        PivotDefinition,
+        employee_dimensions,
+        pivot_response,
+    )
+
+    PAYSLIP_PIVOT = PivotDefinition(
+        employee_dimensions(name_label="Employee")
+        + [
+            Dimension("Payslip Start Date", "start_date"),
+            Dimension("Payslip End Date", "end_date"),
+            Dimension("Batch Name", "group_name"),
+            Dimension(
+                "Status",
+                "status",
+                {
+                    "draft": "Draft",
+                    "review_ongoing": "Review Ongoing",
+                    "confirmed": "Confirmed",
+                    "paid": "Paid",
+                },
+            ),
+        ],
+        [
+            Measure("Contract Wage", "contract_wage"),
+            Measure("Basic Salary", "basic_pay"),
+            Measure("Gross Pay", "gross_pay"),
+            Measure("Deduction", "deduction"),
+            Measure("Net Pay", "net_pay"),
+        ],
+    )
 
     @login_required
     @permission_required(perm="payroll.view_payslip")
@@ -35,6 +70,7 @@ if apps.is_installed("payroll"):
 
     @login_required
     @permission_required(perm="payroll.view_payslip")
+    @report_dataset("payroll")
     def payroll_pivot(request):
         model_type = request.GET.get("model", "payslip")
 
@@ -86,6 +122,10 @@ if apps.is_installed("payroll"):
             if net_pay_lte:
                 qs = qs.filter(net_pay__lte=net_pay_lte)
 
+            response = pivot_response(request, PAYSLIP_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "id",  # Include payslip ID to fetch pay_head_data later
@@ -109,7 +149,9 @@ if apps.is_installed("payroll"):
                     "employee_id__employee_work_info__work_type_id__work_type",
                     "employee_id__employee_work_info__shift_id__employee_shift",
                     "employee_id__employee_work_info__employee_type_id__employee_type",
-                    "employee_id__employee_work_info__experience",
+                    work_experience=experience_expression(
+                        "employee_id__employee_work_info__"
+                    ),
                 )
             )
 
@@ -264,9 +306,7 @@ if apps.is_installed("payroll"):
                         "Total Deduction Amount": round(total_deduction_amount, 2),
                         "Status": STATUS.get(item["status"]),
                         "Experience": round(
-                            float(
-                                item["employee_id__employee_work_info__experience"] or 0
-                            ),
+                            float(item["work_experience"] or 0),
                             2,
                         ),
                     }
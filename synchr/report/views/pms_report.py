@@ -9,6 +9,96 @@ if apps.is_installed("pms"):
     from pms.filters import EmployeeObjectiveFilter, FeedbackFilter
     from pms.models import EmployeeKeyResult, EmployeeObjective, Feedback, Objective
     from pms.views import objective_filter_pagination
+    from report.datasets import report_dataset
+    from report.pivot import (
+        Dimension,
+        Measure,
+        PivotDefinition,
+        full_name,
+        pivot_response,
+    )
+
+    DURATION_UNIT = {
+        "days": "Days",
+        "months": "Months",
+        "years": "Years",
+    }
+    OBJECTIVE_PIVOT = PivotDefinition(
+        [
+            Dimension("Objective", "title"),
+            Dimension("Objective Duration Unit", "duration_unit", DURATION_UNIT),
+            Dimension("Manager", full_name("managers__")),
+            Dimension("Assignees", full_name("assignees__")),
+            Dimension(
+                "Assignee Department",
+                "assignees__employee_work_info__department_id__department",
+            ),
+            Dimension(
+                "Assignee Job Position",
+                "assignees__employee_work_info__job_position_id__job_position",
+            ),
+            Dimension(
+                "Assignee Job Role",
+                "assignees__employee_work_info__job_role_id__job_role",
+            ),
+            Dimension("Key Results", "key_result_id__title"),
+            Dimension("Company", "company_id__company"),
+        ],
+        [
+            Measure("Objective Duration", "duration"),
+            Measure("Key Result Duration", "key_result_id__duration"),
+            Measure("Key Result Target", "key_result_id__target_value"),
+        ],
+    )
+    KEY_RESULT_EMPLOYEE = "employee_objective_id__employee_id__"
+    EMPLOYEE_KEY_RESULT_PIVOT = PivotDefinition(
+        [
+            Dimension("Employee", full_name(KEY_RESULT_EMPLOYEE)),
+            Dimension(
+                "Department",
+                f"{KEY_RESULT_EMPLOYEE}employee_work_info__department_id__department",
+            ),
+            Dimension(
+                "Job Position",
+                f"{KEY_RESULT_EMPLOYEE}employee_work_info__job_position_id__"
+                "job_position",
+            ),
+            Dimension(
+                "Job Role",
+                f"{KEY_RESULT_EMPLOYEE}employee_work_info__job_role_id__job_role",
+            ),
+            Dimension("Employee Keyresult", "key_result"),
+            Dimension("Objective", "employee_objective_id__objective_id__title"),
+            Dimension(
+                "Keyresult Progress Type",
+                "progress_type",
+                {"%": "%", "#": "Number", "Currency": "Currency"},
+            ),
+            Dimension("Keyresult Status", "status"),
+            Dimension("Keyresult Start Date", "start_date"),
+            Dimension("Keyresult End Date", "end_date"),
+        ],
+        [
+            Measure("Keyresult Start Value", "start_value"),
+            Measure("Keyresult Target Value", "target_value"),
+            Measure("Keyresult Current Value", "current_value"),
+        ],
+    )
+    FEEDBACK_PIVOT = PivotDefinition(
+        [
+            Dimension("Title", "review_cycle"),
+            Dimension("Employee", full_name("employee_id__")),
+            Dimension("Manager", full_name("manager_id__")),
+            Dimension("Status", "status"),
+            Dimension("Start Date", "start_date"),
+            Dimension("End Date", "end_date"),
+            Dimension("Is Cyclic", "cyclic_feedback", {True: "Yes", False: "No"}),
+            Dimension("Questions", "question_template_id__question__question"),
+            Dimension(
+                "Answered Employees", full_name("feedback_answer__employee_id__")
+            ),
+        ]
+    )
 
     @login_required
     @permission_required(perm="pms.view_objective")
@@ -49,6 +139,7 @@ if apps.is_installed("pms"):
 
     @login_required
     @permission_required(perm="pms.view_objective")
+    @report_dataset("pms")
     def pms_pivot(request):
 
         model_type = request.GET.get("model", "objective")
@@ -64,6 +155,10 @@ if apps.is_installed("pms"):
             if key_result_id := request.GET.get("employee_objective__key_result_id"):
                 qs = qs.filter(key_result_id=key_result_id)
 
+            response = pivot_response(request, OBJECTIVE_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "title",
@@ -169,6 +264,10 @@ if apps.is_installed("pms"):
             if end_date := request.GET.get("end_date"):
                 feedbacks = feedbacks.filter(created_at__date__lte=end_date)
 
+            response = pivot_response(request, FEEDBACK_PIVOT, feedbacks)
+            if response:
+                return response
+
             for feedback in feedbacks:
                 manager = (
                     f"{feedback.manager_id.employee_first_name} {feedback.manager_id.employee_last_name}"
@@ -288,6 +387,10 @@ if apps.is_installed("pms"):
             if end_date_to:
                 qs = qs.filter(end_date__lte=end_date_to)
 
+            response = pivot_response(request, EMPLOYEE_KEY_RESULT_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "key_result",
@@ -10,6 +10,82 @@ if apps.is_installed("recruitment"):
     from onboarding.models import OnboardingStage
     from recruitment.filters import CandidateFilter, RecruitmentFilter
     from recruitment.models import Candidate, Recruitment
+    from report.datasets import report_dataset
+    from report.pivot import (
+        GENDER_CHOICES,
+        Dimension,
+        Measure,
+        PivotDefinition,
+        full_name,
+        pivot_response,
+    )
+
+    CANDIDATE_PIVOT = PivotDefinition(
+        [
+            Dimension("Candidate", "name"),
+            Dimension("Gender", "gender", GENDER_CHOICES),
+            Dimension("Country", "country"),
+            Dimension("State", "state"),
+            Dimension("City", "city"),
+            Dimension(
+                "Source",
+                "source",
+                {
+                    "application": "Application Form",
+                    "software": "Inside Software",
+                    "other": "Other",
+                },
+            ),
+            Dimension("Job Position", "job_position_id__job_position"),
+            Dimension("Department", "job_position_id__department_id__department"),
+            Dimension(
+                "Offer Letter",
+                "offer_letter_status",
+                {
+                    "not_sent": "Not Sent",
+                    "sent": "Sent",
+                    "accepted": "Accepted",
+                    "rejected": "Rejected",
+                    "joined": "Joined",
+                },
+            ),
+            Dimension("Recruitment", "recruitment_id__title"),
+            Dimension("Current Stage", "stage_id__stage"),
+            Dimension(
+                "Recruitment Status",
+                "recruitment_id__closed",
+                {True: "Closed", False: "Open"},
+            ),
+            Dimension("Company", "recruitment_id__company_id__company"),
+        ],
+        [Measure("Vacancy", "recruitment_id__vacancy")],
+    )
+    RECRUITMENT_PIVOT = PivotDefinition(
+        [
+            Dimension("Recruitment", "title"),
+            Dimension("Manager", full_name("recruitment_managers__")),
+            Dimension("Is Closed", "closed", {True: "Closed", False: "Open"}),
+            Dimension(
+                "Status", "is_published", {True: "Published", False: "Not Published"}
+            ),
+            Dimension("Start Date", "start_date"),
+            Dimension("End Date", "end_date"),
+            Dimension("Job Position", "open_positions__job_position"),
+            Dimension("Company", "company_id__company"),
+        ],
+        [Measure("Vacancy", "vacancy")],
+    )
+    ONBOARDING_PIVOT = PivotDefinition(
+        [
+            Dimension("Recruitment", "recruitment_id__title"),
+            Dimension("Stage", "stage_title"),
+            Dimension("Stage Manager", full_name("employee_id__")),
+            Dimension("Task", "onboarding_task__task_title"),
+            Dimension("Task Manager", full_name("onboarding_task__employee_id__")),
+            Dimension("Candidates", "onboarding_task__candidates__name"),
+            Dimension("Company", "recruitment_id__company_id__company"),
+        ]
+    )
 
     @login_required
     @permission_required(perm="recruitment.view_recruitment")
@@ -31,6 +107,7 @@ if apps.is_installed("recruitment"):
 
     @login_required
     @permission_required(perm="recruitment.view_recruitment")
+    @report_dataset("recruitment")
     def recruitment_pivot(request):
         model_type = request.GET.get("model", "candidate")  # Default to Candidate
 
@@ -39,6 +116,10 @@ if apps.is_installed("recruitment"):
             filter_obj = CandidateFilter(request.GET, queryset=qs)
             qs = filter_obj.qs
 
+            response = pivot_response(request, CANDIDATE_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "name",
@@ -112,6 +193,11 @@ if apps.is_installed("recruitment"):
             qs = Recruitment.objects.all()
             filter_obj = RecruitmentFilter(request.GET, queryset=qs)
             qs = filter_obj.qs
+
+            response = pivot_response(request, RECRUITMENT_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "title",
@@ -145,6 +231,10 @@ if apps.is_installed("recruitment"):
             filter_obj = OnboardingStageFilter(request.GET, queryset=qs)
             qs = filter_obj.qs
 
+            response = pivot_response(request, ONBOARDING_PIVOT, qs)
+            if response:
+                return response
+
             data = list(
                 qs.values(
                     "stage_title",
@@ -0,0 +1,272 @@
+/*
+ * Server side pivot of the report pages.
+ *
+ * The grouping and the aggregates run on the database through the
+ * pivot=fields, pivot=aggregate and pivot=rows parameters of the report
+ * endpoints, the browser only receives the aggregated cells and one page of
+ * the rows behind a cell at a time. The table keeps the pvtTable markup so
+ * the Excel export of the report pages works on it unchanged.
+ */
+(function ($) {
+    const DRILL_DOWN_PAGE_SIZE = 50;
+
+    const ESCAPES = { "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" };
+
+    function escapeHtml(value) {
+        return String(value === null || value === undefined ? "" : value).replace(/[&<>"']/g, (char) => ESCAPES[char]);
+    }
+
+    function keyOf(values) {
+        return JSON.stringify(values);
+    }
+
+    class ServerPivot {
+        /*
+         * container: element the pivot is rendered into
+         * options.url: report endpoint answering the pivot parameters
+         * options.params: function returning the filter query string
+         * options.rows, options.cols: default row and column dimensions
+         * options.labels: translated labels of the controls
+         */
+        constructor(container, options) {
+            this.$container = $(container);
+            this.options = options;
+            this.labels = Object.assign(
+                {
+                    rows: "Rows",
+                    cols: "Columns",
+                    measure: "Measure",
+                    totals: "Totals",
+                    rowsOf: "Rows of the cell",
+                    previous: "Previous",
+                    next: "Next",
+                    empty: "No data",
+                },
+                options.labels || {}
+            );
+            this.fields = null;
+        }
+
+        query(params) {
+            const filters = this.options.params ? this.options.params() : "";
+            const separator = this.options.url.includes("?") ? "&" : "?";
+            return `${this.options.url}${separator}${$.param(params, true)}${filters ? "&" + filters : ""}`;
+        }
+
+        load() {
+            if (this.fields) {
+                return this.refresh();
+            }
+            $.getJSON(this.query({ pivot: "fields" }), (fields) => {
+                this.fields = fields;
+                this.renderControls();
+                this.refresh();
+            });
+        }
+
+        renderControls() {
+            const dimensions = this.fields.dimensions;
+            const dimensionOptions = (selected) =>
+                dimensions
+                    .map((label) => `<option value="${escapeHtml(label)}" ${selected.includes(label) ? "selected" : ""}>${escapeHtml(label)}</option>`)
+                    .join("");
+            const measureOptions = this.fields.measures
+                .flatMap((measure) =>
+                    measure.aggregates.map((aggregate) => {
+                        const value = aggregate === "count" ? "count" : `${measure.label}:${aggregate}`;
+                        const text = aggregate === "count" ? measure.label : `${measure.label} (${aggregate})`;
+                        return `<option value="${escapeHtml(value)}">${escapeHtml(text)}</option>`;
+                    })
+                )
+                .join("");
+            const rows = (this.options.rows || []).filter((label) => dimensions.includes(label));
+            const cols = (this.options.cols || []).filter((label) => dimensions.includes(label));
+
+            this.$container.html(`
+                <div class="row mb-3 server-pivot__controls">
+                    <div class="col-md-4">
+                        <label class="oh-label">${escapeHtml(this.labels.rows)}</label>
+                        <select class="oh-select w-100 server-pivot__rows" multiple size="5">${dimensionOptions(rows)}</select>
+                    </div>
+                    <div class="col-md-4">
+                        <label class="oh-label">${escapeHtml(this.labels.cols)}</label>
+                        <select class="oh-select w-100 server-pivot__cols" multiple size="5">${dimensionOptions(cols)}</select>
+                    </div>
+                    <div class="col-md-4">
+                        <label class="oh-label">${escapeHtml(this.labels.measure)}</label>
+                        <select class="oh-select w-100 server-pivot__measure">${measureOptions}</select>
+                    </div>
+                </div>
+                <div class="server-pivot__error text-danger mb-2"></div>
+                <div class="server-pivot__table" style="overflow-x: auto;"></div>
+                <div class="server-pivot__rows-page mt-3"></div>
+            `);
+            this.$container.find(".server-pivot__measure").val("count");
+            this.$container.find("select").on("change", () => this.refresh());
+        }
+
+        selected(name) {
+            return this.$container.find(`.server-pivot__${name}`).val() || [];
+        }
+
+        refresh() {
+            const params = {
+                pivot: "aggregate",
+                rows: this.selected("rows"),
+                columns: this.selected("cols"),
+                measures: this.selected("measure"),
+            };
+            this.$container.find(".server-pivot__rows-page").empty();
+            $.getJSON(this.query(params))
+                .done((data) => {
+                    this.$container.find(".server-pivot__error").empty();
+                    this.renderTable(data);
+                })
+                .fail((xhr) => {
+                    const error = (xhr.responseJSON && xhr.responseJSON.error) || xhr.statusText;
+                    this.$container.find(".server-pivot__error").text(error);
+                    this.$container.find(".server-pivot__table").empty();
+                });
+        }
+
+        renderTable(data) {
+            const measure = data.measures[0];
+            const rowKeys = [];
+            const colKeys = [];
+            const seenRows = new Set();
+            const seenCols = new Set();
+            const cells = {};
+            data.cells.forEach((cell) => {
+                const rowKey = keyOf(cell.row);
+                const colKey = keyOf(cell.column);
+                if (!seenRows.has(rowKey)) {
+                    seenRows.add(rowKey);
+                    rowKeys.push(cell.row);
+                }
+                if (!seenCols.has(colKey)) {
+                    seenCols.add(colKey);
+                    colKeys.push(cell.column);
+                }
+                cells[keyOf([cell.row, cell.column])] = cell.values[measure];
+            });
+            colKeys.sort((a, b) => keyOf(a).localeCompare(keyOf(b)));
+            const totalsOf = (totals) => {
+                const values = {};
+                (totals || []).forEach((total) => (values[keyOf(total.key)] = total.values[measure]));
+                return values;
+            };
+            const rowTotals = totalsOf(data.row_totals);
+            const colTotals = totalsOf(data.column_totals);
+            const rowSpan = Math.max(data.rows.length, 1);
+            const hasCols = data.columns.length > 0;
+            const format = (value) => (value === null || value === undefined ? "" : escapeHtml(value));
+            const cellAttributes = (row, column, className = "pvtVal") => `class="${className} server-pivot__cell" style="cursor: pointer;" data-row="${escapeHtml(keyOf(row))}" data-column="${escapeHtml(keyOf(column))}"`;
+
+            let html = '<table class="pvtTable"><thead>';
+            data.columns.forEach((label, level) => {
+                html += "<tr>";
+                if (level === 0) {
+                    html += `<th colspan="${rowSpan}" rowspan="${data.columns.length}"></th>`;
+                }
+                html += `<th class="pvtAxisLabel">${escapeHtml(label)}</th>`;
+                colKeys.forEach((column) => (html += `<th class="pvtColLabel">${escapeHtml(column[level])}</th>`));
+                if (level === 0) {
+                    html += `<th class="pvtTotalLabel" rowspan="${data.columns.length + 1}">${escapeHtml(this.labels.totals)}</th>`;
+                }
+                html += "</tr>";
+            });
+            html += "<tr>";
+            if (data.rows.length) {
+                data.rows.forEach((label) => (html += `<th class="pvtAxisLabel">${escapeHtml(label)}</th>`));
+            } else {
+                html += "<th></th>";
+            }
+            if (hasCols) {
+                html += `<th colspan="${colKeys.length + 1}"></th>`;
+            } else {
+                html += `<th class="pvtTotalLabel">${escapeHtml(measure)}</th>`;
+            }
+            html += "</tr></thead><tbody>";
+
+            if (!data.cells.length) {
+                html += `<tr><td colspan="${rowSpan + colKeys.length + 2}">${escapeHtml(this.labels.empty)}</td></tr>`;
+            }
+            if (data.rows.length) {
+                rowKeys.forEach((row) => {
+                    html += "<tr>";
+                    row.forEach((value) => (html += `<th class="pvtRowLabel">${escapeHtml(value)}</th>`));
+                    if (hasCols) {
+                        html += "<td></td>";
+                        colKeys.forEach((column) => (html += `<td ${cellAttributes(row, column)}>${format(cells[keyOf([row, column])])}</td>`));
+                        html += `<td ${cellAttributes(row, [], "pvtTotal")}>${format(rowTotals[keyOf(row)])}</td>`;
+                    } else {
+                        html += `<td ${cellAttributes(row, [])}>${format(cells[keyOf([row, []])])}</td>`;
+                    }
+                    html += "</tr>";
+                });
+            }
+            html += `<tr><th class="pvtTotalLabel" colspan="${rowSpan}">${escapeHtml(this.labels.totals)}</th>`;
+            if (hasCols) {
+                html += "<td></td>";
+                colKeys.forEach((column) => (html += `<td ${cellAttributes([], column, "pvtTotal")}>${format(colTotals[keyOf(column)])}</td>`));
+            }
+            html += `<td ${cellAttributes([], [], "pvtGrandTotal")}>${format(data.grand_total[measure])}</td></tr>`;
+            html += "</tbody></table>";
+
+            const $table = this.$container.find(".server-pivot__table").html(html);
+            $table.find(".server-pivot__cell").on("click", (event) => {
+                const $cell = $(event.currentTarget);
+                const cell = {};
+                JSON.parse($cell.attr("data-row")).forEach((value, index) => (cell[data.rows[index]] = value));
+                JSON.parse($cell.attr("data-column")).forEach((value, index) => (cell[data.columns[index]] = value));
+                this.loadRows(cell, 1);
+            });
+            if (this.options.onRender) {
+                this.options.onRender(this);
+            }
+        }
+
+        loadRows(cell, page) {
+            const params = {
+                pivot: "rows",
+                cell: JSON.stringify(cell),
+                page: page,
+                page_size: DRILL_DOWN_PAGE_SIZE,
+            };
+            $.getJSON(this.query(params), (data) => this.renderRows(cell, data));
+        }
+
+        renderRows(cell, data) {
+            const $page = this.$container.find(".server-pivot__rows-page");
+            if (!data.results.length) {
+                $page.html(`<p>${escapeHtml(this.labels.empty)}</p>`);
+                return;
+            }
+            const columns = Object.keys(data.results[0]);
+            const title = Object.entries(cell)
+                .map(([label, value]) => `${label}: ${value}`)
+                .join(", ");
+            let html = `<h6 class="fw-bold">${escapeHtml(this.labels.rowsOf)} ${escapeHtml(title)} (${data.count})</h6>`;
+            html += '<div style="overflow-x: auto;"><table class="table table-sm table-bordered"><thead><tr>';
+            columns.forEach((column) => (html += `<th>${escapeHtml(column)}</th>`));
+            html += "</tr></thead><tbody>";
+            data.results.forEach((row) => {
+                html += "<tr>";
+                columns.forEach((column) => (html += `<td>${escapeHtml(row[column])}</td>`));
+                html += "</tr>";
+            });
+            html += "</tbody></table></div>";
+            html += `
+                <div class="d-flex justify-content-end">
+                    <button type="button" class="oh-btn oh-btn--secondary oh-btn--small me-2 server-pivot__previous" ${data.page <= 1 ? "disabled" : ""}>${escapeHtml(this.labels.previous)}</button>
+                    <span class="me-2">${data.page} / ${data.num_pages}</span>
+                    <button type="button" class="oh-btn oh-btn--secondary oh-btn--small server-pivot__next" ${data.page >= data.num_pages ? "disabled" : ""}>${escapeHtml(this.labels.next)}</button>
+                </div>`;
+            $page.html(html);
+            $page.find(".server-pivot__previous").on("click", () => this.loadRows(cell, data.page - 1));
+            $page.find(".server-pivot__next").on("click", () => this.loadRows(cell, data.page + 1));
+        }
+    }
+
+    window.ServerPivot = ServerPivot;
+})(jQuery);